@@ -15,9 +15,50 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 import pandas as pd
-import numpy as np
-from gerar_graficos import GeradorGraficos
-from gerar_relatorio import GeradorRelatorioCompleto
+from dados_sinteticos import gerar_dados_sinteticos
+from pipeline import Pipeline
+from etapas_pipeline import ETAPAS_GRAFICOS, adicionar_etapas_graficos_e_relatorio
+
+
+# Arquivos de saída
+ARQUIVO_DADOS = 'dados/dados_simulados.csv'
+ARQUIVO_RELATORIO = 'Relatorio_Violencia_Mulher_Regiao_Norte.pdf'
+
+# Textos do relatório
+INTRODUCAO = (
+    "Este relatório apresenta uma análise detalhada dos índices de violência contra mulheres "
+    "nos estados do Amazonas, Roraima e Acre, abrangendo o período de 2015 a 2025. "
+    "\n\n"
+    "A violência contra a mulher é um grave problema de saúde pública e violação dos direitos "
+    "humanos. Na região Norte do Brasil, devido às suas características geográficas, sociais "
+    "e econômicas particulares, este fenômeno apresenta desafios específicos que requerem "
+    "atenção especial das políticas públicas. "
+    "\n\n"
+    "O presente estudo busca contribuir para a compreensão da evolução temporal destes índices, "
+    "identificando tendências e fornecendo subsídios para o desenvolvimento de estratégias "
+    "mais efetivas de prevenção e combate à violência de gênero."
+)
+
+CONCLUSAO = (
+    "A análise dos dados de violência contra mulheres na região Norte, especificamente "
+    "nos estados do Amazonas, Roraima e Acre, durante o período de 2015 a 2025, revela "
+    "aspectos importantes que merecem atenção. "
+    "\n\n"
+    "Os gráficos de série temporal demonstram variações significativas ao longo dos anos, "
+    "indicando tanto avanços quanto desafios persistentes no combate à violência de gênero. "
+    "A análise comparativa entre os estados evidencia a necessidade de abordagens "
+    "contextualizadas, considerando as especificidades de cada região. "
+    "\n\n"
+    "É fundamental que as políticas públicas de enfrentamento à violência contra a mulher "
+    "sejam baseadas em evidências e dados confiáveis. Este estudo contribui para essa "
+    "base de conhecimento e aponta para a necessidade de continuidade no monitoramento "
+    "destes indicadores, bem como na avaliação da efetividade das intervenções implementadas. "
+    "\n\n"
+    "Recomenda-se: (1) fortalecimento das redes de proteção à mulher; (2) ampliação dos "
+    "canais de denúncia e acolhimento; (3) investimento em educação e conscientização; "
+    "(4) integração entre os diferentes setores e esferas de governo no enfrentamento "
+    "à violência de gênero."
+)
 
 
 def gerar_dados_simulados() -> pd.DataFrame:
@@ -29,160 +70,84 @@ def gerar_dados_simulados() -> pd.DataFrame:
     """
     print("🔄 Gerando dados simulados...")
     
-    np.random.seed(42)  # Para reprodutibilidade
-    
-    # Configurações
-    estados = ['Amazonas', 'Roraima', 'Acre']
-    anos = list(range(2015, 2026))  # 2015 a 2025
-    indices_violencia = ['Feminicídio', 'Estupro', 'Lesão Corporal', 'Violência Doméstica']
-    
-    # Gera dados
-    dados = []
-    
-    for estado in estados:
-        # Fatores de multiplicação específicos por estado
-        if estado == 'Amazonas':
-            fator_base = 2.5
-        elif estado == 'Roraima':
-            fator_base = 1.2
-        else:  # Acre
-            fator_base = 1.0
-        
-        for indice in indices_violencia:
-            # Base específica por tipo de violência
-            if indice == 'Feminicídio':
-                base = 15
-                tendencia = 0.5  # Leve aumento ao longo dos anos
-            elif indice == 'Estupro':
-                base = 120
-                tendencia = -1.5  # Tendência de redução (melhoria na denúncia)
-            elif indice == 'Lesão Corporal':
-                base = 350
-                tendencia = 2.0  # Aumento (mais denúncias)
-            else:  # Violência Doméstica
-                base = 280
-                tendencia = 1.0
-            
-            for i, ano in enumerate(anos):
-                # Valor com tendência temporal e variação aleatória
-                valor = (base * fator_base + 
-                        tendencia * i +
-                        np.random.normal(0, base * 0.15))
-                
-                valor = max(0, int(valor))  # Garante valores positivos
-                
-                dados.append({
-                    'Ano': ano,
-                    'Estado': estado,
-                    'Índice de Violência': indice,
-                    'Valor': valor
-                })
-    
-    df = pd.DataFrame(dados)
+    # Amazonas, Roraima e Acre, 2015 a 2025, semente fixa para reprodutibilidade
+    df = gerar_dados_sinteticos(anos=range(2015, 2026), semente=42)
     
     print(f"✅ Dados simulados gerados: {len(df)} registros")
-    print(f"   - Estados: {', '.join(estados)}")
-    print(f"   - Anos: {anos[0]} a {anos[-1]}")
-    print(f"   - Tipos de violência: {len(indices_violencia)}")
+    print(f"   - Estados: {', '.join(df['Estado'].unique())}")
+    print(f"   - Anos: {df['Ano'].min()} a {df['Ano'].max()}")
+    print(f"   - Tipos de violência: {df['Índice de Violência'].nunique()}")
     
     return df
 
 
-def executar_exemplo_completo():
-    """Executa o fluxo completo do projeto com dados simulados"""
+def montar_pipeline(modo_rascunho: bool = False, perfil: bool = False) -> Pipeline:
+    """
+    Define o pipeline do exemplo: dados simulados → CSV → gráficos → relatório
+    
+    Args:
+        modo_rascunho: Se True, gera gráficos em baixa resolução e relatório com miniaturas
+        perfil: Se True, perfila as etapas e salva os perfis na pasta 'perfil/'
+        
+    Returns:
+        Pipeline pronto para executar
+    """
+    pipeline = Pipeline(pasta_perfil='perfil' if perfil else None)
+    pipeline.etapa('dados', gerar_dados_simulados)
+    
+    return adicionar_etapas_graficos_e_relatorio(
+        pipeline, 'dados',
+        pasta_graficos='graficos',
+        arquivo_saida=ARQUIVO_RELATORIO,
+        modo_rascunho=modo_rascunho,
+        arquivo_dados=ARQUIVO_DADOS,
+        titulo="Análise de Violência contra Mulheres",
+        subtitulo="Região Norte - Amazonas, Roraima e Acre",
+        periodo="2015-2025",
+        autor="Pesquisa Acadêmica",
+        instituicao="IFPI - Campus Picos",
+        introducao=INTRODUCAO,
+        conclusao=CONCLUSAO
+    )
+
+
+def executar_exemplo_completo(modo_rascunho: bool = False, perfil: bool = False):
+    """
+    Executa o fluxo completo do projeto com dados simulados
+    
+    Etapas sem alterações desde a última execução são lidas do cache.
+    
+    Args:
+        modo_rascunho: Se True, gera gráficos em baixa resolução e relatório com miniaturas
+        perfil: Se True, perfila as etapas e salva os perfis na pasta 'perfil/'
+    """
     
     print("\n" + "="*70)
     print("🚀 EXEMPLO COMPLETO - ANÁLISE DE VIOLÊNCIA CONTRA MULHERES")
     print("="*70 + "\n")
     
-    # 1. Gera dados simulados
-    df_dados = gerar_dados_simulados()
-    
-    # Salva dados em CSV para referência
-    arquivo_dados = 'dados/dados_simulados.csv'
-    df_dados.to_csv(arquivo_dados, index=False, encoding='utf-8-sig')
-    print(f"\n💾 Dados salvos em: {arquivo_dados}")
+    resultados = montar_pipeline(modo_rascunho, perfil).executar()
+    df_dados = resultados['dados']
+    cubo = resultados['cubo']
+    caminhos_graficos = [caminho for etapa in ETAPAS_GRAFICOS for caminho in resultados[etapa]]
     
     # Mostra estatísticas básicas
     print("\n📊 Estatísticas dos Dados:")
     print("-" * 70)
     print(f"Total de registros: {len(df_dados)}")
     print(f"\nTotal por Estado:")
-    print(df_dados.groupby('Estado')['Valor'].sum().to_string())
+    print(cubo.totais('Estado').to_string())
     print(f"\nTotal por Tipo de Violência:")
-    print(df_dados.groupby('Índice de Violência')['Valor'].sum().to_string())
-    
-    # 2. Gera gráficos
-    print("\n" + "="*70)
-    gerador_graficos = GeradorGraficos(df_dados, pasta_saida='graficos')
-    caminhos_graficos = gerador_graficos.gerar_todos_graficos()
-    
-    if not caminhos_graficos:
-        print("❌ Nenhum gráfico foi gerado!")
-        return
-    
-    # 3. Gera relatório PDF
-    print("\n" + "="*70)
-    
-    # Textos do relatório
-    introducao = (
-        "Este relatório apresenta uma análise detalhada dos índices de violência contra mulheres "
-        "nos estados do Amazonas, Roraima e Acre, abrangendo o período de 2015 a 2025. "
-        "\n\n"
-        "A violência contra a mulher é um grave problema de saúde pública e violação dos direitos "
-        "humanos. Na região Norte do Brasil, devido às suas características geográficas, sociais "
-        "e econômicas particulares, este fenômeno apresenta desafios específicos que requerem "
-        "atenção especial das políticas públicas. "
-        "\n\n"
-        "O presente estudo busca contribuir para a compreensão da evolução temporal destes índices, "
-        "identificando tendências e fornecendo subsídios para o desenvolvimento de estratégias "
-        "mais efetivas de prevenção e combate à violência de gênero."
-    )
-    
-    conclusao = (
-        "A análise dos dados de violência contra mulheres na região Norte, especificamente "
-        "nos estados do Amazonas, Roraima e Acre, durante o período de 2015 a 2025, revela "
-        "aspectos importantes que merecem atenção. "
-        "\n\n"
-        "Os gráficos de série temporal demonstram variações significativas ao longo dos anos, "
-        "indicando tanto avanços quanto desafios persistentes no combate à violência de gênero. "
-        "A análise comparativa entre os estados evidencia a necessidade de abordagens "
-        "contextualizadas, considerando as especificidades de cada região. "
-        "\n\n"
-        "É fundamental que as políticas públicas de enfrentamento à violência contra a mulher "
-        "sejam baseadas em evidências e dados confiáveis. Este estudo contribui para essa "
-        "base de conhecimento e aponta para a necessidade de continuidade no monitoramento "
-        "destes indicadores, bem como na avaliação da efetividade das intervenções implementadas. "
-        "\n\n"
-        "Recomenda-se: (1) fortalecimento das redes de proteção à mulher; (2) ampliação dos "
-        "canais de denúncia e acolhimento; (3) investimento em educação e conscientização; "
-        "(4) integração entre os diferentes setores e esferas de governo no enfrentamento "
-        "à violência de gênero."
-    )
-    
-    gerador_relatorio = GeradorRelatorioCompleto(
-        titulo="Análise de Violência contra Mulheres",
-        subtitulo="Região Norte - Amazonas, Roraima e Acre",
-        periodo="2015-2025"
-    )
-    
-    sucesso = gerador_relatorio.gerar_relatorio(
-        caminhos_graficos=caminhos_graficos,
-        arquivo_saida='Relatorio_Violencia_Mulher_Regiao_Norte.pdf',
-        autor="Pesquisa Acadêmica",
-        instituicao="IFPI - Campus Picos",
-        introducao=introducao,
-        conclusao=conclusao
-    )
+    print(cubo.totais('Índice de Violência').to_string())
     
-    if sucesso:
+    if resultados['relatorio']:
         print("\n" + "="*70)
         print("🎉 EXEMPLO CONCLUÍDO COM SUCESSO!")
         print("="*70)
         print("\n📁 Arquivos gerados:")
-        print(f"   - Dados: {arquivo_dados}")
+        print(f"   - Dados: {ARQUIVO_DADOS}")
         print(f"   - Gráficos: {len(caminhos_graficos)} arquivos na pasta 'graficos/'")
-        print(f"   - Relatório: Relatorio_Violencia_Mulher_Regiao_Norte.pdf")
+        print(f"   - Relatório: {ARQUIVO_RELATORIO}")
         print("\n💡 Próximos passos:")
         print("   1. Revise o relatório PDF gerado")
         print("   2. Confira os gráficos na pasta 'graficos/'")
@@ -193,4 +158,7 @@ def executar_exemplo_completo():
 
 
 if __name__ == "__main__":
-    executar_exemplo_completo()
+    # Use --rascunho para uma execução rápida de pré-visualização
+    # e --perfil para medir onde o tempo é gasto
+    executar_exemplo_completo(modo_rascunho='--rascunho' in sys.argv,
+                              perfil='--perfil' in sys.argv)
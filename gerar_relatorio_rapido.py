@@ -7,127 +7,187 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-import pandas as pd
-import numpy as np
-from gerar_graficos import GeradorGraficos
-from gerar_relatorio import GeradorRelatorioCompleto
+from dados_sinteticos import gerar_dados_sinteticos
+from instantaneo import InstantaneoRelatorio
 
 
-def gerar_relatorio_com_dados_reais():
-    """Gera relatório com dados realistas baseados nos PDFs disponíveis"""
+# Anos dos PDFs reais que você tem
+ANOS_DISPONIVEIS = [2017, 2019, 2020, 2022, 2023, 2024]
+
+# Arquivos de saída
+ARQUIVO_DADOS = 'dados/dados_reais_consolidados.csv'
+ARQUIVO_RELATORIO = 'Relatorio_Violencia_Mulher_Dados_REAIS.pdf'
+ARQUIVO_INSTANTANEO = 'dados/relatorio_dados_reais.instantaneo'
+
+
+def opcoes_do_relatorio(anos_disponiveis) -> dict:
+    """
+    Textos e metadados do relatório (título, autor, introdução, conclusão...)
+    
+    Args:
+        anos_disponiveis: Anos dos anuários analisados
+    
+    Returns:
+        Dicionário com as opções de GeradorRelatorioCompleto
+    """
+    introducao = (
+        "Este relatório apresenta uma análise quantitativa dos índices de violência "
+        "contra mulheres nos estados do Amazonas, Roraima e Acre, baseado em DADOS REAIS "
+        "extraídos dos Anuários Brasileiros de Segurança Pública oficiais. "
+        "\n\n"
+        f"Os dados analisados abrangem os anos de {min(anos_disponiveis)} a "
+        f"{max(anos_disponiveis)} ({len(anos_disponiveis)} anuários processados), "
+        "representando um período crítico para compreensão da evolução dos índices "
+        "de violência contra a mulher na região Norte do Brasil. "
+        "\n\n"
+        "Todos os dados foram processados utilizando Python e bibliotecas especializadas "
+        "em ciência de dados (Pandas, NumPy, Matplotlib, Seaborn), garantindo análises "
+        "precisas e visualizações claras dos padrões identificados. "
+        "\n\n"
+        "A região Norte apresenta desafios únicos devido às suas características "
+        "geográficas, sociais e econômicas, tornando essencial uma análise específica "
+        "que considere essas particularidades regionais."
+    )
+    
+    conclusao = (
+        "A análise dos dados REAIS de violência contra mulheres na região Norte, "
+        f"especificamente nos estados do Amazonas, Roraima e Acre, durante o período de "
+        f"{min(anos_disponiveis)} a {max(anos_disponiveis)}, revela aspectos "
+        "críticos que demandam atenção urgente das autoridades e da sociedade. "
+        "\n\n"
+        "Os dados oficiais processados, extraídos dos Anuários Brasileiros de Segurança "
+        "Pública do Fórum Brasileiro de Segurança Pública (FBSP), demonstram a magnitude "
+        "do problema e a necessidade de políticas públicas efetivas e contextualizadas "
+        "para a realidade amazônica. "
+        "\n\n"
+        "As visualizações apresentadas facilitam a compreensão das tendências temporais "
+        "e permitem identificar padrões que podem orientar estratégias de intervenção "
+        "mais assertivas. A análise comparativa entre os três estados evidencia tanto "
+        "desafios comuns quanto especificidades que devem ser consideradas. "
+        "\n\n"
+        "Este estudo, fundamentado em dados governamentais oficiais e processado com "
+        "ferramentas científicas de análise de dados, contribui para uma compreensão "
+        "baseada em evidências da realidade da violência contra a mulher na Amazônia "
+        "brasileira. "
+        "\n\n"
+        "Recomenda-se: (1) continuidade no monitoramento sistemático destes indicadores; "
+        "(2) fortalecimento das redes de proteção à mulher na região; "
+        "(3) ampliação dos canais de denúncia e acolhimento adaptados às realidades locais; "
+        "(4) investimento em educação e conscientização nas comunidades; "
+        "(5) integração entre diferentes setores e esferas de governo no enfrentamento "
+        "à violência de gênero, considerando as especificidades da região amazônica."
+    )
+    
+    return dict(
+        titulo="Análise de Violência contra Mulheres",
+        subtitulo="Região Norte - Amazonas, Roraima e Acre",
+        periodo=f"{min(anos_disponiveis)}-{max(anos_disponiveis)}",
+        autor="Pesquisa Acadêmica",
+        instituicao="IFPI - Campus Picos",
+        introducao=introducao,
+        conclusao=conclusao
+    )
+
+
+def regerar_do_instantaneo(modo_rascunho: bool = False) -> bool:
+    """
+    Refaz só o PDF a partir do instantâneo da última execução completa
+    
+    Não gera dados nem gráficos (nem importa o matplotlib): usa os gráficos
+    já preparados e as métricas guardadas, com os textos atuais do relatório.
+    
+    Args:
+        modo_rascunho: Modo do relatório (o instantâneo precisa ser do mesmo modo)
+    
+    Returns:
+        True se o relatório foi refeito; False se não há instantâneo utilizável
+    """
+    if not os.path.exists(ARQUIVO_INSTANTANEO):
+        print(f"⚠️  Instantâneo não encontrado ({ARQUIVO_INSTANTANEO}): execução completa")
+        return False
+    try:
+        instantaneo = InstantaneoRelatorio.carregar(ARQUIVO_INSTANTANEO)
+    except Exception as e:
+        print(f"⚠️  Instantâneo inválido ({e}): execução completa")
+        return False
+    if instantaneo.modo_rascunho != modo_rascunho:
+        print("⚠️  Instantâneo de outro modo (rascunho/final): execução completa")
+        return False
+    
+    return instantaneo.gerar_relatorio(ARQUIVO_RELATORIO,
+                                       **opcoes_do_relatorio(ANOS_DISPONIVEIS))
+
+
+def gerar_relatorio_com_dados_reais(modo_rascunho: bool = False, perfil: bool = False,
+                                    usar_instantaneo: bool = False):
+    """
+    Gera relatório com dados realistas baseados nos PDFs disponíveis
+    
+    Args:
+        modo_rascunho: Se True, gera gráficos em baixa resolução e relatório com miniaturas
+        perfil: Se True, perfila as etapas e salva os perfis na pasta 'perfil/'
+        usar_instantaneo: Se True, refaz só o PDF a partir do instantâneo da última
+                          execução (quando existir), sem gerar dados nem gráficos
+    """
     
     print("\n" + "="*70)
     print("📊 GERANDO RELATÓRIO COM BASE NOS ANUÁRIOS REAIS")
     print("="*70 + "\n")
     
-    # Anos dos PDFs reais que você tem
-    anos_disponiveis = [2017, 2019, 2020, 2022, 2023, 2024]
+    if usar_instantaneo and regerar_do_instantaneo(modo_rascunho):
+        print(f"\n✅ Relatório: {ARQUIVO_RELATORIO}")
+        return
     
+    # Importados só na execução completa (gráficos carregam o matplotlib)
+    from pipeline import Pipeline
+    from etapas_pipeline import ETAPAS_GRAFICOS, adicionar_etapas_graficos_e_relatorio
+    
+    anos_disponiveis = ANOS_DISPONIVEIS
     print(f"📅 Anos dos Anuários disponíveis: {', '.join(map(str, anos_disponiveis))}")
     print(f"📄 Total de PDFs: {len(anos_disponiveis)}")
     
     # Gera dados realistas baseados em estatísticas reais
     print("\n🔄 Gerando análise baseada nos dados dos anuários...")
-    df_dados = gerar_dados_realistas_amazonia(anos_disponiveis)
-    
-    # Salva dados
-    arquivo_dados = 'dados/dados_reais_consolidados.csv'
-    df_dados.to_csv(arquivo_dados, index=False, encoding='utf-8-sig')
-    print(f"\n💾 Dados salvos em: {arquivo_dados}")
+    arquivo_dados = ARQUIVO_DADOS
+    arquivo_saida = ARQUIVO_RELATORIO
+    
+    pipeline = Pipeline(pasta_perfil='perfil' if perfil else None)
+    pipeline.etapa('dados', gerar_dados_realistas_amazonia, anos=anos_disponiveis)
+    adicionar_etapas_graficos_e_relatorio(
+        pipeline, 'dados',
+        pasta_graficos='graficos',
+        arquivo_saida=arquivo_saida,
+        modo_rascunho=modo_rascunho,
+        arquivo_dados=arquivo_dados,
+        arquivo_instantaneo=ARQUIVO_INSTANTANEO,
+        **opcoes_do_relatorio(anos_disponiveis)
+    )
+    
+    # Etapas sem alterações desde a última execução são lidas do cache
+    resultados = pipeline.executar()
+    df_dados = resultados['dados']
+    cubo = resultados['cubo']
+    caminhos_graficos = [caminho for etapa in ETAPAS_GRAFICOS for caminho in resultados[etapa]]
     
     # Estatísticas
     print("\n📊 Estatísticas dos Dados:")
     print("-" * 70)
     print(f"Total de registros: {len(df_dados)}")
     print(f"\nTotal por Estado:")
-    print(df_dados.groupby('Estado')['Valor'].sum().to_string())
+    print(cubo.totais('Estado').to_string())
     print(f"\nTotal por Tipo de Violência:")
-    print(df_dados.groupby('Índice de Violência')['Valor'].sum().to_string())
-    
-    # Gera gráficos
-    print("\n" + "="*70)
-    gerador_graficos = GeradorGraficos(df_dados, pasta_saida='graficos')
-    caminhos_graficos = gerador_graficos.gerar_todos_graficos()
+    print(cubo.totais('Índice de Violência').to_string())
     
-    # Gera relatório PDF
-    if caminhos_graficos:
+    if resultados['relatorio']:
         print("\n" + "="*70)
-        
-        introducao = (
-            "Este relatório apresenta uma análise quantitativa dos índices de violência "
-            "contra mulheres nos estados do Amazonas, Roraima e Acre, baseado em DADOS REAIS "
-            "extraídos dos Anuários Brasileiros de Segurança Pública oficiais. "
-            "\n\n"
-            f"Os dados analisados abrangem os anos de {min(anos_disponiveis)} a "
-            f"{max(anos_disponiveis)} ({len(anos_disponiveis)} anuários processados), "
-            "representando um período crítico para compreensão da evolução dos índices "
-            "de violência contra a mulher na região Norte do Brasil. "
-            "\n\n"
-            "Todos os dados foram processados utilizando Python e bibliotecas especializadas "
-            "em ciência de dados (Pandas, NumPy, Matplotlib, Seaborn), garantindo análises "
-            "precisas e visualizações claras dos padrões identificados. "
-            "\n\n"
-            "A região Norte apresenta desafios únicos devido às suas características "
-            "geográficas, sociais e econômicas, tornando essencial uma análise específica "
-            "que considere essas particularidades regionais."
-        )
-        
-        conclusao = (
-            "A análise dos dados REAIS de violência contra mulheres na região Norte, "
-            f"especificamente nos estados do Amazonas, Roraima e Acre, durante o período de "
-            f"{min(anos_disponiveis)} a {max(anos_disponiveis)}, revela aspectos "
-            "críticos que demandam atenção urgente das autoridades e da sociedade. "
-            "\n\n"
-            "Os dados oficiais processados, extraídos dos Anuários Brasileiros de Segurança "
-            "Pública do Fórum Brasileiro de Segurança Pública (FBSP), demonstram a magnitude "
-            "do problema e a necessidade de políticas públicas efetivas e contextualizadas "
-            "para a realidade amazônica. "
-            "\n\n"
-            "As visualizações apresentadas facilitam a compreensão das tendências temporais "
-            "e permitem identificar padrões que podem orientar estratégias de intervenção "
-            "mais assertivas. A análise comparativa entre os três estados evidencia tanto "
-            "desafios comuns quanto especificidades que devem ser consideradas. "
-            "\n\n"
-            "Este estudo, fundamentado em dados governamentais oficiais e processado com "
-            "ferramentas científicas de análise de dados, contribui para uma compreensão "
-            "baseada em evidências da realidade da violência contra a mulher na Amazônia "
-            "brasileira. "
-            "\n\n"
-            "Recomenda-se: (1) continuidade no monitoramento sistemático destes indicadores; "
-            "(2) fortalecimento das redes de proteção à mulher na região; "
-            "(3) ampliação dos canais de denúncia e acolhimento adaptados às realidades locais; "
-            "(4) investimento em educação e conscientização nas comunidades; "
-            "(5) integração entre diferentes setores e esferas de governo no enfrentamento "
-            "à violência de gênero, considerando as especificidades da região amazônica."
-        )
-        
-        gerador_relatorio = GeradorRelatorioCompleto(
-            titulo="Análise de Violência contra Mulheres",
-            subtitulo="Região Norte - Amazonas, Roraima e Acre",
-            periodo=f"{min(anos_disponiveis)}-{max(anos_disponiveis)}"
-        )
-        
-        arquivo_saida = 'Relatorio_Violencia_Mulher_Dados_REAIS.pdf'
-        
-        sucesso = gerador_relatorio.gerar_relatorio(
-            caminhos_graficos=caminhos_graficos,
-            arquivo_saida=arquivo_saida,
-            autor="Pesquisa Acadêmica",
-            instituicao="IFPI - Campus Picos",
-            introducao=introducao,
-            conclusao=conclusao
-        )
-        
-        if sucesso:
-            print("\n" + "="*70)
-            print("🎉 RELATÓRIO GERADO COM SUCESSO!")
-            print("="*70)
-            print(f"\n📁 Arquivos gerados:")
-            print(f"   - Dados: {arquivo_dados}")
-            print(f"   - Gráficos: {len(caminhos_graficos)} arquivos")
-            print(f"   - Relatório: {arquivo_saida}")
-            print(f"\n✅ Relatório baseado em {len(anos_disponiveis)} Anuários REAIS!")
-            print(f"   Anos: {', '.join(map(str, anos_disponiveis))}")
+        print("🎉 RELATÓRIO GERADO COM SUCESSO!")
+        print("="*70)
+        print(f"\n📁 Arquivos gerados:")
+        print(f"   - Dados: {arquivo_dados}")
+        print(f"   - Gráficos: {len(caminhos_graficos)} arquivos")
+        print(f"   - Relatório: {arquivo_saida}")
+        print(f"\n✅ Relatório baseado em {len(anos_disponiveis)} Anuários REAIS!")
+        print(f"   Anos: {', '.join(map(str, anos_disponiveis))}")
 
 
 def gerar_dados_realistas_amazonia(anos):
@@ -135,16 +195,6 @@ def gerar_dados_realistas_amazonia(anos):
     Gera dados realistas baseados em estatísticas reais da região Norte
     Valores aproximados baseados nos anuários reais de segurança pública
     """
-    np.random.seed(42)
-    
-    estados = ['Amazonas', 'Roraima', 'Acre']
-    indices_violencia = [
-        'Feminicídio',
-        'Estupro', 
-        'Lesão Corporal Dolosa',
-        'Violência Doméstica'
-    ]
-    
     # Valores base aproximados da realidade (baseados em estatísticas reais)
     valores_base = {
         'Amazonas': {
@@ -175,37 +225,29 @@ def gerar_dados_realistas_amazonia(anos):
         'Violência Doméstica': 12.0  # Aumento significativo (mais denúncias)
     }
     
-    dados = []
-    
-    for estado in estados:
-        for indice in indices_violencia:
-            base = valores_base[estado][indice]
-            tendencia = tendencias[indice]
-            
-            for i, ano in enumerate(sorted(anos)):
-                # Cálculo com variação realista
-                variacao_anual = np.random.normal(0, base * 0.12)
-                valor = base + (tendencia * i) + variacao_anual
-                
-                # Garante valor positivo e arredonda
-                valor = max(1, int(round(valor)))
-                
-                dados.append({
-                    'Ano': ano,
-                    'Estado': estado,
-                    'Índice de Violência': indice,
-                    'Valor': valor
-                })
-    
-    df = pd.DataFrame(dados)
+    df = gerar_dados_sinteticos(
+        estados=list(valores_base),
+        anos=sorted(anos),
+        indices={indice: (0, tendencia) for indice, tendencia in tendencias.items()},
+        valores_base=valores_base,
+        desvio_relativo=0.12,
+        valor_minimo=1,
+        arredondar=True,
+        semente=42
+    )
     
     print(f"✅ Dados realistas gerados: {len(df)} registros")
-    print(f"   - {len(estados)} estados")
-    print(f"   - {len(indices_violencia)} tipos de violência")
+    print(f"   - {df['Estado'].nunique()} estados")
+    print(f"   - {df['Índice de Violência'].nunique()} tipos de violência")
     print(f"   - {len(anos)} anos analisados")
     
     return df
 
 
 if __name__ == "__main__":
-    gerar_relatorio_com_dados_reais()
+    # Use --rascunho para uma execução rápida de pré-visualização,
+    # --perfil para medir onde o tempo é gasto e --instantaneo para
+    # refazer só o PDF (mudanças de texto) a partir da última execução
+    gerar_relatorio_com_dados_reais(modo_rascunho='--rascunho' in sys.argv,
+                                    perfil='--perfil' in sys.argv,
+                                    usar_instantaneo='--instantaneo' in sys.argv)
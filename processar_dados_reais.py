@@ -9,14 +9,22 @@ import os
 # Adiciona o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from extracao_dados import ExtratorDadosPDF
-from gerar_graficos import GeradorGraficos
-from gerar_relatorio import GeradorRelatorioCompleto
+from pipeline import Pipeline
+from etapas_pipeline import (ETAPAS_GRAFICOS, adicionar_etapas_extracao,
+                             adicionar_etapas_graficos_e_relatorio)
 import pandas as pd
+from dados_sinteticos import gerar_dados_sinteticos
 
 
-def processar_pdfs_reais():
-    """Processa os PDFs reais baixados"""
+def processar_pdfs_reais(modo_rascunho: bool = False, perfil: bool = False):
+    """
+    Processa os PDFs reais baixados
+    
+    Args:
+        modo_rascunho: Se True, extrai uma amostra de páginas, gera gráficos em
+                       baixa resolução e relatório com miniaturas
+        perfil: Se True, perfila as etapas e salva os perfis na pasta 'perfil/'
+    """
     
     print("\n" + "="*70)
     print("📊 PROCESSAMENTO DE DADOS REAIS - ANUÁRIOS DE SEGURANÇA PÚBLICA")
@@ -52,26 +60,76 @@ def processar_pdfs_reais():
     print(f"\n📄 Total de PDFs encontrados: {len(pdfs_existentes)}")
     print(f"📅 Anos disponíveis: {', '.join(map(str, sorted(pdfs_existentes.keys())))}")
     
-    # Extração de dados
+    arquivo_dados = os.path.join(base_path, 'dados_reais_consolidados.csv')
+    pasta_graficos = os.path.join(os.path.dirname(__file__), 'graficos')
+    arquivo_saida = os.path.join(
+        os.path.dirname(__file__),
+        'Relatorio_Violencia_Mulher_Dados_REAIS.pdf'
+    )
+    
+    introducao = (
+        "Este relatório apresenta uma análise quantitativa REAL dos índices de violência "
+        "contra mulheres nos estados do Amazonas, Roraima e Acre, baseado em dados oficiais "
+        "extraídos dos Anuários Brasileiros de Segurança Pública. "
+        "\n\n"
+        f"Os dados analisados abrangem os anos de {min(pdfs_existentes.keys())} a "
+        f"{max(pdfs_existentes.keys())}, representando um período significativo para "
+        "compreensão da evolução dos índices de violência contra a mulher na região Norte. "
+        "\n\n"
+        "Todos os dados foram processados utilizando Python e bibliotecas especializadas "
+        "em ciência de dados, garantindo análises precisas e visualizações claras dos "
+        "padrões identificados."
+    )
+    
+    conclusao = (
+        "A análise dos dados REAIS de violência contra mulheres na região Norte, "
+        f"especificamente nos estados do Amazonas, Roraima e Acre, durante o período de "
+        f"{min(pdfs_existentes.keys())} a {max(pdfs_existentes.keys())}, revela aspectos "
+        "críticos que demandam atenção urgente. "
+        "\n\n"
+        "Os dados oficiais processados demonstram a magnitude do problema e a necessidade "
+        "de políticas públicas efetivas. As visualizações apresentadas facilitam a "
+        "compreensão das tendências e permitem identificar padrões que podem orientar "
+        "estratégias de intervenção. "
+        "\n\n"
+        "Este estudo, baseado em dados governamentais oficiais e processado com ferramentas "
+        "científicas de análise, contribui para uma compreensão fundamentada da realidade "
+        "da violência contra a mulher na Amazônia brasileira."
+    )
+    
+    # Pipeline: extração por ano → consolidação → gráficos → relatório
+    # (anos, gráficos e relatório sem alterações são lidos do cache)
+    pipeline = Pipeline(pasta_cache=os.path.join(os.path.dirname(__file__), '.cache_pipeline'),
+                        pasta_perfil='perfil' if perfil else None)
+    adicionar_etapas_extracao(pipeline, pdfs_existentes,
+                              estados_alvo=estados_alvo,
+                              modo_rascunho=modo_rascunho)
+    pipeline.etapa('dados', completar_dados_extraidos,
+                   dependencias=['dados_extraidos'],
+                   anos=sorted(pdfs_existentes))
+    adicionar_etapas_graficos_e_relatorio(
+        pipeline, 'dados',
+        pasta_graficos=pasta_graficos,
+        arquivo_saida=arquivo_saida,
+        modo_rascunho=modo_rascunho,
+        arquivo_dados=arquivo_dados,
+        titulo="Análise de Violência contra Mulheres",
+        subtitulo="Região Norte - Amazonas, Roraima e Acre",
+        periodo=f"{min(pdfs_existentes.keys())}-{max(pdfs_existentes.keys())}",
+        autor="Pesquisa Acadêmica",
+        instituicao="IFPI - Campus Picos",
+        introducao=introducao,
+        conclusao=conclusao
+    )
+    
     print("\n" + "="*70)
     print("🔄 INICIANDO EXTRAÇÃO DE DADOS DOS PDFS REAIS...")
     print("="*70 + "\n")
     
-    extrator = ExtratorDadosPDF(estados_alvo=estados_alvo)
-    df_dados = extrator.processar_multiplos_pdfs(pdfs_existentes)
-    
-    if df_dados.empty:
-        print("\n⚠️  Nenhum dado foi extraído automaticamente.")
-        print("\n💡 Os PDFs podem estar em formato que dificulta extração automática.")
-        print("   Vou gerar um relatório com dados simulados baseados nos anos disponíveis.")
-        
-        # Gera dados realistas baseados nos anos disponíveis
-        df_dados = gerar_dados_realistas_baseados_em_anos(pdfs_existentes.keys())
-    
-    # Salva dados extraídos
-    arquivo_dados = os.path.join(base_path, 'dados_reais_consolidados.csv')
-    df_dados.to_csv(arquivo_dados, index=False, encoding='utf-8-sig')
-    print(f"\n💾 Dados consolidados salvos em: {arquivo_dados}")
+    resultados = pipeline.executar()
+    df_dados = resultados['dados']
+    cubo = resultados['cubo']
+    caminhos_graficos = [caminho for etapa in ETAPAS_GRAFICOS for caminho in resultados[etapa]]
     
     # Mostra estatísticas
     print("\n📊 Estatísticas dos Dados:")
@@ -79,131 +137,48 @@ def processar_pdfs_reais():
     print(f"Total de registros: {len(df_dados)}")
     if not df_dados.empty:
         print(f"\nRegistros por Estado:")
-        print(df_dados.groupby('Estado')['Valor'].sum().to_string())
+        print(cubo.totais('Estado').to_string())
         print(f"\nRegistros por Tipo de Violência:")
-        print(df_dados.groupby('Índice de Violência')['Valor'].sum().to_string())
-    
-    # Geração de gráficos
-    print("\n" + "="*70)
-    pasta_graficos = os.path.join(os.path.dirname(__file__), 'graficos')
-    gerador_graficos = GeradorGraficos(df_dados, pasta_saida=pasta_graficos)
-    caminhos_graficos = gerador_graficos.gerar_todos_graficos()
+        print(cubo.totais('Índice de Violência').to_string())
     
-    # Geração de relatório PDF
-    if caminhos_graficos:
+    if resultados['relatorio']:
         print("\n" + "="*70)
+        print("🎉 PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
+        print("="*70)
+        print(f"\n📁 Arquivos gerados:")
+        print(f"   - Dados: {arquivo_dados}")
+        print(f"   - Gráficos: {len(caminhos_graficos)} arquivos")
+        print(f"   - Relatório: {arquivo_saida}")
+        print("\n✅ Todos os dados são REAIS, extraídos dos Anuários oficiais!")
+
+
+def completar_dados_extraidos(df_extraido: pd.DataFrame, anos) -> pd.DataFrame:
+    """
+    Usa os dados extraídos ou, se a extração falhar, dados realistas dos mesmos anos
+    
+    Args:
+        df_extraido: Dados consolidados da extração
+        anos: Anos dos PDFs disponíveis
         
-        introducao = (
-            "Este relatório apresenta uma análise quantitativa REAL dos índices de violência "
-            "contra mulheres nos estados do Amazonas, Roraima e Acre, baseado em dados oficiais "
-            "extraídos dos Anuários Brasileiros de Segurança Pública. "
-            "\n\n"
-            f"Os dados analisados abrangem os anos de {min(pdfs_existentes.keys())} a "
-            f"{max(pdfs_existentes.keys())}, representando um período significativo para "
-            "compreensão da evolução dos índices de violência contra a mulher na região Norte. "
-            "\n\n"
-            "Todos os dados foram processados utilizando Python e bibliotecas especializadas "
-            "em ciência de dados, garantindo análises precisas e visualizações claras dos "
-            "padrões identificados."
-        )
-        
-        conclusao = (
-            "A análise dos dados REAIS de violência contra mulheres na região Norte, "
-            f"especificamente nos estados do Amazonas, Roraima e Acre, durante o período de "
-            f"{min(pdfs_existentes.keys())} a {max(pdfs_existentes.keys())}, revela aspectos "
-            "críticos que demandam atenção urgente. "
-            "\n\n"
-            "Os dados oficiais processados demonstram a magnitude do problema e a necessidade "
-            "de políticas públicas efetivas. As visualizações apresentadas facilitam a "
-            "compreensão das tendências e permitem identificar padrões que podem orientar "
-            "estratégias de intervenção. "
-            "\n\n"
-            "Este estudo, baseado em dados governamentais oficiais e processado com ferramentas "
-            "científicas de análise, contribui para uma compreensão fundamentada da realidade "
-            "da violência contra a mulher na Amazônia brasileira."
-        )
-        
-        gerador_relatorio = GeradorRelatorioCompleto(
-            titulo="Análise de Violência contra Mulheres",
-            subtitulo="Região Norte - Amazonas, Roraima e Acre",
-            periodo=f"{min(pdfs_existentes.keys())}-{max(pdfs_existentes.keys())}"
-        )
-        
-        arquivo_saida = os.path.join(
-            os.path.dirname(__file__),
-            'Relatorio_Violencia_Mulher_Dados_REAIS.pdf'
-        )
-        
-        sucesso = gerador_relatorio.gerar_relatorio(
-            caminhos_graficos=caminhos_graficos,
-            arquivo_saida=arquivo_saida,
-            autor="Pesquisa Acadêmica",
-            instituicao="IFPI - Campus Picos",
-            introducao=introducao,
-            conclusao=conclusao
-        )
-        
-        if sucesso:
-            print("\n" + "="*70)
-            print("🎉 PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
-            print("="*70)
-            print(f"\n📁 Arquivos gerados:")
-            print(f"   - Dados: {arquivo_dados}")
-            print(f"   - Gráficos: {len(caminhos_graficos)} arquivos")
-            print(f"   - Relatório: {arquivo_saida}")
-            print("\n✅ Todos os dados são REAIS, extraídos dos Anuários oficiais!")
+    Returns:
+        DataFrame para gráficos e relatório
+    """
+    if not df_extraido.empty:
+        return df_extraido
+    
+    print("\n⚠️  Nenhum dado foi extraído automaticamente.")
+    print("\n💡 Os PDFs podem estar em formato que dificulta extração automática.")
+    print("   Vou gerar um relatório com dados simulados baseados nos anos disponíveis.")
+    
+    # Gera dados realistas baseados nos anos disponíveis
+    return gerar_dados_realistas_baseados_em_anos(anos)
 
 
 def gerar_dados_realistas_baseados_em_anos(anos):
     """Gera dados realistas quando a extração automática falha"""
-    import numpy as np
-    
     print("\n🔄 Gerando dados realistas baseados nos anuários disponíveis...")
     
-    np.random.seed(42)
-    
-    estados = ['Amazonas', 'Roraima', 'Acre']
-    indices_violencia = ['Feminicídio', 'Estupro', 'Lesão Corporal', 'Violência Doméstica']
-    
-    dados = []
-    
-    for estado in estados:
-        if estado == 'Amazonas':
-            fator_base = 2.5
-        elif estado == 'Roraima':
-            fator_base = 1.2
-        else:
-            fator_base = 1.0
-        
-        for indice in indices_violencia:
-            if indice == 'Feminicídio':
-                base = 15
-                tendencia = 0.5
-            elif indice == 'Estupro':
-                base = 120
-                tendencia = -1.5
-            elif indice == 'Lesão Corporal':
-                base = 350
-                tendencia = 2.0
-            else:
-                base = 280
-                tendencia = 1.0
-            
-            for i, ano in enumerate(sorted(anos)):
-                valor = (base * fator_base + 
-                        tendencia * i +
-                        np.random.normal(0, base * 0.15))
-                
-                valor = max(0, int(valor))
-                
-                dados.append({
-                    'Ano': ano,
-                    'Estado': estado,
-                    'Índice de Violência': indice,
-                    'Valor': valor
-                })
-    
-    df = pd.DataFrame(dados)
+    df = gerar_dados_sinteticos(anos=sorted(anos), semente=42)
     print(f"✅ Dados realistas gerados: {len(df)} registros")
     
     return df
@@ -223,4 +198,7 @@ if __name__ == "__main__":
         print("⚠️  Java não está instalado!")
         print("   Tentarei processar mesmo assim...")
     
-    processar_pdfs_reais()
+    # Use --rascunho para uma execução rápida de pré-visualização
+    # e --perfil para medir onde o tempo é gasto
+    processar_pdfs_reais(modo_rascunho='--rascunho' in sys.argv,
+                         perfil='--perfil' in sys.argv)
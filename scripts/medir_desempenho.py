@@ -0,0 +1,24 @@
+"""
+Script da Suíte de Desempenho
+Mede limpeza, transformação, gráficos e relatório com dados sintéticos e compara
+com a linha de base gravada (benchmarks/linha_de_base.json)
+
+    python scripts/medir_desempenho.py --gravar               # cria a linha de base
+    python scripts/medir_desempenho.py                        # compara (saída 1 se regredir)
+    python scripts/medir_desempenho.py --escalas grande --limite 0.5
+    python scripts/medir_desempenho.py --filtro heatmap --repeticoes 5
+
+Use --help para ver todas as opções.
+"""
+
+import sys
+import os
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from desempenho import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,37 @@ Módulos disponíveis:
 - extracao_dados: Extração de dados de PDFs
 - gerar_graficos: Geração de visualizações
 - gerar_relatorio: Criação de relatórios PDF
+- relatorios_lote: Geração de vários relatórios com gráficos compartilhados
+- pipeline: Execução de etapas com cache por hash de conteúdo
+- etapas_pipeline: Etapas padrão (extração, gráficos, relatório) do pipeline
+- linha_comando: Linha de comando não interativa (extract, charts, report, all, watch)
+- monitoramento: Detecção de anuários novos ou alterados na pasta de dados
+- perfilamento: Perfis cProfile por etapa (pstats e pilhas colapsadas)
+- dados_sinteticos: Gerador vetorizado de dados sintéticos (até UFs × municípios × meses)
+- cubo_agregado: Cubo Estado × Ano × Índice com totais marginais pré-calculados
+- analise_temporal: Variação anual, CAGR, médias móveis e tendências de todas as séries
+- desempenho: Suíte de desempenho com linha de base em JSON e limite de regressão
+- populacao: População feminina de referência (IBGE), interpolação e taxas por 100 mil mulheres
+- completar_series: Interpolação de anos sem anuário e projeção com bandas de confiança
+- anomalias: Detecção de valores anômalos (z robusto, MAD, razão aos vizinhos) e quarentena
+- planilhas: Leitura em fluxo de planilhas XLSX/CSV do FBSP e do IPEA no formato longo
+- armazenamento: Banco local (SQLite/DuckDB) com upsert em lote e consultas filtradas
+- localidades: Índice de UFs e municípios tolerante a acentos, notas de rodapé e OCR
+- orquestrador: Extração, gráficos e relatório sobrepostos com asyncio e pools de processos
+- instantaneo: Instantâneo binário (dados, gráficos prontos, métricas) para refazer só o PDF
+- proveniencia: Origem de cada linha extraída (PDF, página, tabela, linha, método) em inteiros
+- cabecalhos: Cabeçalhos de várias linhas remontados pelas coordenadas das células (tabula JSON)
+- memoria_compartilhada: Tabelas devolvidas entre processos por arquivos mapeados, sem pickle
+- paginas_pdf: PDFs mapeados em memória e cache do texto das páginas pelo hash do arquivo
 """
 
 __version__ = '1.0.0'
 __author__ = 'Projeto Python - Análise de Violência'
-__all__ = ['extracao_dados', 'gerar_graficos', 'gerar_relatorio']
+__all__ = ['extracao_dados', 'gerar_graficos', 'gerar_relatorio', 'relatorios_lote',
+           'pipeline', 'etapas_pipeline', 'linha_comando',
+           'monitoramento', 'perfilamento', 'dados_sinteticos', 'cubo_agregado',
+           'analise_temporal', 'desempenho', 'populacao',
+           'completar_series', 'anomalias', 'planilhas',
+           'armazenamento', 'localidades', 'orquestrador', 'instantaneo',
+           'proveniencia', 'cabecalhos', 'memoria_compartilhada',
+           'paginas_pdf']
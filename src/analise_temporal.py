@@ -0,0 +1,344 @@
+"""
+Módulo de Análise Temporal
+Calcula, para todas as séries de uma vez (matriz séries × anos), a variação
+anual, a taxa de crescimento composta (CAGR), médias móveis e a tendência
+linear, respeitando os anos sem dados, e descreve os resultados em texto
+"""
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Tuple
+
+from cubo_agregado import CuboAgregado
+
+
+JANELA_MEDIA_MOVEL = 3
+
+# Colunas da tabela de métricas (além dos rótulos das séries)
+COLUNAS_METRICAS = ['Ano Inicial', 'Ano Final', 'Valor Inicial', 'Valor Final',
+                    'Variação Anual (%)', 'CAGR (%)', 'Tendência (por ano)',
+                    'Tendência (%/ano)', 'R²']
+
+# Variação (% ao ano) abaixo da qual uma série é considerada estável nos textos
+LIMIAR_ESTABILIDADE = 1.0
+
+
+def series_do_cubo(cubo: CuboAgregado) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Séries Estado × Índice do cubo como matriz séries × anos
+    
+    Args:
+        cubo: Cubo agregado
+    
+    Returns:
+        Tupla (rótulos das séries com Estado e Índice de Violência, anos, matriz)
+    """
+    cubo_series = cubo.agregar('Estado', 'Índice de Violência', 'Ano')
+    n_estados, n_indices, n_anos = cubo_series.shape
+    estados, indices = np.divmod(np.arange(n_estados * n_indices), n_indices)
+    rotulos = pd.DataFrame({
+        'Estado': cubo.rotulos['Estado'][estados],
+        'Índice de Violência': cubo.rotulos['Índice de Violência'][indices],
+    })
+    matriz = cubo_series.reshape(-1, n_anos)
+    
+    # Apenas pares (estado, índice) com algum dado
+    com_dados = np.isfinite(matriz).any(axis=1)
+    return rotulos[com_dados].reset_index(drop=True), cubo.rotulos['Ano'], matriz[com_dados]
+
+
+def codigos_das_series(df: pd.DataFrame,
+                        chaves: Sequence[str] = ('Estado', 'Índice de Violência')
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Série e coluna de ano de cada linha dos dados em formato longo
+    
+    Args:
+        df: Dados com as colunas de `chaves` e 'Ano'
+        chaves: Colunas que identificam uma série
+    
+    Returns:
+        Tupla (código da série por linha, código do ano por linha, anos em
+        ordem crescente); -1 nas linhas com chave ou ano ausente
+    """
+    codigos_serie = df.groupby(list(chaves), sort=True, observed=True).ngroup().to_numpy()
+    codigos_ano, anos = pd.factorize(df['Ano'], sort=True)
+    return codigos_serie, codigos_ano, np.asarray(anos)
+
+
+def series_dos_dados(df: pd.DataFrame,
+                     chaves: Sequence[str] = ('Estado', 'Índice de Violência')
+                     ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Séries de qualquer combinação de colunas (ex.: municípios) como matriz séries × anos
+    
+    Args:
+        df: Dados em formato longo com as colunas de `chaves`, 'Ano' e 'Valor'
+        chaves: Colunas que identificam uma série
+    
+    Returns:
+        Tupla (rótulos das séries, anos, matriz com NaN nos anos sem dados)
+    """
+    codigos_serie, codigos_ano, anos = codigos_das_series(df, chaves)
+    valores = pd.to_numeric(df['Valor'], errors='coerce').to_numpy(dtype=float)
+    validos = (codigos_serie >= 0) & (codigos_ano >= 0) & ~np.isnan(valores)
+    
+    n_series = int(codigos_serie.max()) + 1 if len(codigos_serie) else 0
+    forma = (n_series, len(anos))
+    posicao = codigos_serie[validos] * len(anos) + codigos_ano[validos]
+    soma = np.bincount(posicao, weights=valores[validos], minlength=n_series * len(anos))
+    contagem = np.bincount(posicao, minlength=n_series * len(anos))
+    matriz = np.where(contagem > 0, soma, np.nan).reshape(forma)
+    
+    codigos, primeiras = np.unique(codigos_serie, return_index=True)
+    primeiras = primeiras[codigos >= 0]
+    rotulos = df.iloc[primeiras][list(chaves)].reset_index(drop=True)
+    return rotulos, anos, matriz
+
+
+def _anterior_valido(matriz: np.ndarray) -> np.ndarray:
+    """Para cada célula, a coluna do último valor válido antes dela (-1 se nenhum)"""
+    colunas = np.where(np.isfinite(matriz), np.arange(matriz.shape[1]), -1)
+    ultimo = np.maximum.accumulate(colunas, axis=1)
+    anterior = np.full_like(ultimo, -1)
+    anterior[:, 1:] = ultimo[:, :-1]
+    return anterior
+
+
+def variacao_anual(matriz: np.ndarray, anos: Sequence[int]) -> np.ndarray:
+    """
+    Variação em relação ao ano anterior com dados, anualizada
+    
+    Quando há anos sem dados entre duas observações (ex.: 2017 → 2019), a
+    variação é a taxa anual equivalente, (v / v_anterior) ** (1 / intervalo) - 1,
+    em vez de atribuir ao último ano a mudança de todo o intervalo.
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna (crescente)
+    
+    Returns:
+        Matriz de variações (fração; NaN sem valor anterior ou com anterior <= 0)
+    """
+    anos = np.asarray(anos, dtype=float)
+    anterior = _anterior_valido(matriz)
+    tem_anterior = anterior >= 0
+    coluna = np.maximum(anterior, 0)
+    valor_anterior = np.take_along_axis(matriz, coluna, axis=1)
+    intervalo = anos[None, :] - anos[coluna]
+    
+    validos = tem_anterior & np.isfinite(matriz) & (valor_anterior > 0) & (matriz >= 0)
+    variacao = np.full(matriz.shape, np.nan)
+    razao = matriz[validos] / valor_anterior[validos]
+    variacao[validos] = razao ** (1 / intervalo[validos]) - 1
+    return variacao
+
+
+def extremos_validos(matriz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Colunas do primeiro e do último valor válido de cada série
+    
+    Returns:
+        Tupla (primeira, última); -1 nas séries sem dados
+    """
+    validos = np.isfinite(matriz)
+    tem_dados = validos.any(axis=1)
+    primeira = np.where(tem_dados, np.argmax(validos, axis=1), -1)
+    ultima = np.where(tem_dados, matriz.shape[1] - 1 - np.argmax(validos[:, ::-1], axis=1), -1)
+    return primeira, ultima
+
+
+def taxa_crescimento_composta(matriz: np.ndarray, anos: Sequence[int]) -> np.ndarray:
+    """
+    CAGR entre o primeiro e o último ano com dados de cada série
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna
+    
+    Returns:
+        CAGR por série (fração; NaN com menos de dois anos ou valor inicial <= 0)
+    """
+    anos = np.asarray(anos, dtype=float)
+    primeira, ultima = extremos_validos(matriz)
+    linhas = np.arange(len(matriz))
+    inicial = matriz[linhas, np.maximum(primeira, 0)]
+    final = matriz[linhas, np.maximum(ultima, 0)]
+    periodo = anos[np.maximum(ultima, 0)] - anos[np.maximum(primeira, 0)]
+    
+    validos = (ultima > primeira) & (inicial > 0) & (final >= 0)
+    cagr = np.full(len(matriz), np.nan)
+    cagr[validos] = (final[validos] / inicial[validos]) ** (1 / periodo[validos]) - 1
+    return cagr
+
+
+def media_movel(matriz: np.ndarray, anos: Sequence[int],
+                janela: int = JANELA_MEDIA_MOVEL,
+                minimo_observacoes: Optional[int] = None) -> np.ndarray:
+    """
+    Média móvel em janelas de anos do calendário (não de colunas)
+    
+    A janela de cada ano t cobre t - janela + 1 .. t; anos sem dados ficam
+    fora da média em vez de contarem como zero.
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna (inteiros crescentes)
+        janela: Tamanho da janela em anos
+        minimo_observacoes: Observações exigidas na janela (padrão: metade, arredondada para cima)
+    
+    Returns:
+        Matriz séries × anos com as médias (NaN sem observações suficientes)
+    """
+    anos = np.asarray(anos, dtype=np.int64)
+    minimo = minimo_observacoes or (janela + 1) // 2
+    if matriz.size == 0:
+        return np.full(matriz.shape, np.nan)
+    
+    # Grade com todos os anos do calendário e somas acumuladas
+    colunas = anos - anos[0]
+    validos = np.isfinite(matriz)
+    grade_soma = np.zeros((len(matriz), colunas[-1] + 2))
+    grade_contagem = np.zeros_like(grade_soma)
+    grade_soma[:, colunas + 1] = np.where(validos, matriz, 0)
+    grade_contagem[:, colunas + 1] = validos
+    soma = np.cumsum(grade_soma, axis=1)
+    contagem = np.cumsum(grade_contagem, axis=1)
+    
+    fim = colunas + 1
+    inicio = np.maximum(fim - janela, 0)
+    soma_janela = soma[:, fim] - soma[:, inicio]
+    contagem_janela = contagem[:, fim] - contagem[:, inicio]
+    
+    media = np.full(matriz.shape, np.nan)
+    suficientes = contagem_janela >= minimo
+    media[suficientes] = soma_janela[suficientes] / contagem_janela[suficientes]
+    return media
+
+
+def tendencia_linear(matriz: np.ndarray,
+                     anos: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reta de mínimos quadrados de cada série, usando apenas os anos com dados
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna
+    
+    Returns:
+        Tupla (inclinação por ano, valor da reta no ano médio da série, R²);
+        NaN nas séries com menos de dois anos
+    """
+    anos = np.asarray(anos, dtype=float)
+    validos = np.isfinite(matriz)
+    pesos = validos.astype(float)
+    n = pesos.sum(axis=1)
+    y = np.where(validos, matriz, 0.0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media_x = (pesos * anos).sum(axis=1) / n
+        media_y = y.sum(axis=1) / n
+        dx = (anos[None, :] - media_x[:, None]) * pesos
+        dy = (y - media_y[:, None]) * pesos
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+        
+        inclinacao = np.where((n >= 2) & (sxx > 0), sxy / sxx, np.nan)
+        r2 = np.where(syy > 0, sxy * sxy / (sxx * syy), 1.0)
+    r2 = np.where(np.isnan(inclinacao), np.nan, r2)
+    return inclinacao, np.where(n > 0, media_y, np.nan), r2
+
+
+def calcular_metricas(rotulos: pd.DataFrame, anos: Sequence[int],
+                      matriz: np.ndarray) -> pd.DataFrame:
+    """
+    Tabela de métricas de todas as séries
+    
+    Args:
+        rotulos: Rótulos das séries (uma linha por série)
+        anos: Ano de cada coluna
+        matriz: Séries × anos
+    
+    Returns:
+        DataFrame com os rótulos e as colunas de COLUNAS_METRICAS
+    """
+    anos = np.asarray(anos)
+    linhas = np.arange(len(matriz))
+    primeira, ultima = extremos_validos(matriz)
+    primeira_col, ultima_col = np.maximum(primeira, 0), np.maximum(ultima, 0)
+    
+    variacoes = variacao_anual(matriz, anos)
+    inclinacao, media, r2 = tendencia_linear(matriz, anos)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relativa = np.where(media > 0, inclinacao / media, np.nan)
+    
+    metricas = rotulos.reset_index(drop=True).copy()
+    metricas['Ano Inicial'] = anos[primeira_col]
+    metricas['Ano Final'] = anos[ultima_col]
+    metricas['Valor Inicial'] = matriz[linhas, primeira_col]
+    metricas['Valor Final'] = matriz[linhas, ultima_col]
+    metricas['Variação Anual (%)'] = 100 * variacoes[linhas, ultima_col]
+    metricas['CAGR (%)'] = 100 * taxa_crescimento_composta(matriz, anos)
+    metricas['Tendência (por ano)'] = inclinacao
+    metricas['Tendência (%/ano)'] = 100 * relativa
+    metricas['R²'] = r2
+    return metricas
+
+
+def metricas_do_cubo(cubo: CuboAgregado) -> pd.DataFrame:
+    """Métricas de todas as séries Estado × Índice do cubo"""
+    return calcular_metricas(*series_do_cubo(cubo))
+
+
+def _percentual(valor: float, sinal: bool = True) -> str:
+    """Percentual com vírgula decimal (ex.: +3,2% ou 3,2%)"""
+    return (f"{valor:+.1f}%" if sinal else f"{valor:.1f}%").replace('.', ',')
+
+
+def descrever_tendencias(metricas: pd.DataFrame) -> List[str]:
+    """
+    Parágrafos do relatório a partir das métricas por Estado e Índice
+    
+    Args:
+        metricas: Resultado de metricas_do_cubo
+    
+    Returns:
+        Lista de parágrafos (um geral e um por estado)
+    """
+    metricas = metricas.dropna(subset=['CAGR (%)'])
+    if metricas.empty:
+        return []
+    
+    paragrafos = []
+    inicio, fim = int(metricas['Ano Inicial'].min()), int(metricas['Ano Final'].max())
+    altas = metricas['CAGR (%)'] > LIMIAR_ESTABILIDADE
+    quedas = metricas['CAGR (%)'] < -LIMIAR_ESTABILIDADE
+    maior = metricas.loc[metricas['CAGR (%)'].idxmax()]
+    menor = metricas.loc[metricas['CAGR (%)'].idxmin()]
+    paragrafos.append(
+        f"Entre {inicio} e {fim}, {int(altas.sum())} das {len(metricas)} séries analisadas "
+        f"(estado e tipo de violência) apresentaram crescimento médio anual acima de "
+        f"{LIMIAR_ESTABILIDADE:.0f}% e {int(quedas.sum())} apresentaram queda. O maior "
+        f"crescimento composto foi de {maior['Índice de Violência']} em {maior['Estado']} "
+        f"({_percentual(maior['CAGR (%)'])} ao ano) e a maior redução, de "
+        f"{menor['Índice de Violência']} em {menor['Estado']} "
+        f"({_percentual(menor['CAGR (%)'])} ao ano)."
+    )
+    
+    for estado, grupo in metricas.groupby('Estado', sort=True):
+        descricoes = []
+        for _, serie in grupo.sort_values('CAGR (%)', ascending=False).iterrows():
+            cagr = serie['CAGR (%)']
+            if cagr > LIMIAR_ESTABILIDADE:
+                sentido = f"cresceu {_percentual(cagr, False)} ao ano"
+            elif cagr < -LIMIAR_ESTABILIDADE:
+                sentido = f"caiu {_percentual(-cagr, False)} ao ano"
+            else:
+                sentido = "ficou estável"
+            ultimo = serie['Variação Anual (%)']
+            if np.isfinite(ultimo):
+                sentido += f" ({_percentual(ultimo)} em {int(serie['Ano Final'])})"
+            descricoes.append(f"{serie['Índice de Violência']} {sentido}")
+        paragrafos.append(f"{estado}: " + "; ".join(descricoes) + ".")
+    return paragrafos
@@ -0,0 +1,282 @@
+"""
+Módulo de Detecção de Anomalias
+Procura, em todas as séries de uma vez (matriz séries × anos), valores
+absurdos deixados por erros de extração - tabela deslocada uma coluna,
+separador de milhar lido como decimal (valores 1000× maiores ou menores) -
+com z-score robusto (mediana e MAD) e razão em relação aos anos vizinhos,
+gera a lista das linhas marcadas e, opcionalmente, as põe em quarentena
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Tuple
+
+from analise_temporal import codigos_das_series
+
+
+# Z-score robusto (Iglewicz e Hoaglin): 0,6745 · (x - mediana) / MAD
+FATOR_MAD = 0.6745
+# Sem MAD (mais da metade dos anos iguais), usa o desvio absoluto médio
+FATOR_DESVIO_MEDIO = 0.7979
+LIMIAR_Z_ROBUSTO = 3.5
+
+# Razão em relação aos anos vizinhos com dados
+LIMIAR_RAZAO_VIZINHOS = 5.0
+# Razão que por si só indica erro (ex.: separador de milhar), mesmo em séries curtas
+LIMIAR_RAZAO_EXTREMA = 100.0
+# Contagens pequenas (ex.: 4 → 40 feminicídios) não são comparadas por razão
+VALOR_MINIMO_RAZAO = 50.0
+
+# Anos com dados exigidos para o z-score robusto
+MINIMO_OBSERVACOES = 4
+
+# Colunas da tabela de anomalias (além das chaves das séries e de 'Ano' e 'Valor')
+COLUNAS_ANOMALIAS = ['Mediana da Série', 'MAD', 'Z Robusto', 'Valor Vizinhos',
+                     'Razão Vizinhos', 'Motivo']
+
+
+def chaves_padrao(df: pd.DataFrame) -> List[str]:
+    """Colunas que identificam uma série: Estado, [Município] e Índice de Violência"""
+    return [coluna for coluna in ('Estado', 'Município', 'Índice de Violência')
+            if coluna in df.columns]
+
+
+def z_robusto(matriz: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Z-score robusto de cada valor em relação à própria série
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+    
+    Returns:
+        Tupla (z-score séries × anos, mediana por série, MAD por série);
+        NaN nas séries com menos de MINIMO_OBSERVACOES anos
+    """
+    n = np.isfinite(matriz).sum(axis=1)
+    suficientes = n >= MINIMO_OBSERVACOES
+    z = np.full(matriz.shape, np.nan)
+    mediana = np.full(len(matriz), np.nan)
+    mad = np.full(len(matriz), np.nan)
+    if not suficientes.any():
+        return z, mediana, mad
+    
+    series = matriz[suficientes]
+    mediana[suficientes] = np.nanmedian(series, axis=1)
+    desvios = np.abs(series - mediana[suficientes, None])
+    mad[suficientes] = np.nanmedian(desvios, axis=1)
+    desvio_medio = np.nanmean(desvios, axis=1)
+    
+    # Escala: MAD / 0,6745 ou, com MAD nulo, desvio médio / 0,7979 (ambos ≈ σ)
+    escala = np.where(mad[suficientes] > 0, mad[suficientes] / FATOR_MAD,
+                      desvio_medio / FATOR_DESVIO_MEDIO)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z[suficientes] = (series - mediana[suficientes, None]) / escala[:, None]
+    z[suficientes] = np.where(desvios == 0, 0.0, z[suficientes])
+    return z, mediana, mad
+
+
+def valores_vizinhos(matriz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valor do ano anterior e do seguinte com dados, para cada célula
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+    
+    Returns:
+        Tupla (anterior, seguinte), séries × anos (NaN quando não existe)
+    """
+    n_colunas = matriz.shape[1]
+    validos = np.isfinite(matriz)
+    colunas = np.arange(n_colunas)
+    linhas = np.arange(len(matriz))[:, None]
+    
+    # Última observação antes de cada coluna e primeira depois dela
+    anterior = np.maximum.accumulate(np.where(validos, colunas, -1), axis=1)
+    anterior = np.concatenate([np.full((len(matriz), 1), -1), anterior[:, :-1]], axis=1)
+    posterior = np.minimum.accumulate(np.where(validos, colunas, n_colunas)[:, ::-1],
+                                      axis=1)[:, ::-1]
+    posterior = np.concatenate([posterior[:, 1:], np.full((len(matriz), 1), n_colunas)],
+                               axis=1)
+    
+    valor_anterior = np.where(anterior >= 0, matriz[linhas, np.maximum(anterior, 0)], np.nan)
+    valor_posterior = np.where(posterior < n_colunas,
+                               matriz[linhas, np.minimum(posterior, n_colunas - 1)], np.nan)
+    return valor_anterior, valor_posterior
+
+
+def razao_vizinhos(matriz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Razão de cada valor para os anos vizinhos, a mais próxima de 1
+    
+    Usar a razão mais moderada das duas faz com que só o próprio pico seja
+    marcado, e não os anos ao lado dele (cuja média com o pico seria distorcida).
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+    
+    Returns:
+        Tupla (razão, média dos vizinhos), séries × anos (NaN sem vizinho positivo)
+    """
+    anterior, posterior = valores_vizinhos(matriz)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log_anterior = np.where(anterior > 0, np.log(matriz / anterior), np.nan)
+        log_posterior = np.where(posterior > 0, np.log(matriz / posterior), np.nan)
+        # Vizinhos em lados opostos (um acima e outro abaixo): não é pico
+        mesmo_sentido = ~(np.sign(log_anterior) * np.sign(log_posterior) < 0)
+        log_razao = np.where(np.abs(log_posterior) < np.abs(log_anterior),
+                             log_posterior, log_anterior)
+        log_razao = np.where(np.isnan(log_anterior), log_posterior, log_razao)
+        razao = np.where(mesmo_sentido, np.exp(log_razao), 1.0)
+        razao = np.where(np.isnan(log_razao), np.nan, razao)
+        media = np.nanmean(np.stack([anterior, posterior]), axis=0)
+    return razao, media
+
+
+def _motivos(z: np.ndarray, razao: np.ndarray, suspeito_z: np.ndarray,
+             suspeito_razao: np.ndarray) -> np.ndarray:
+    """Descrição textual do motivo de cada anomalia"""
+    motivos = []
+    for valor_z, valor_razao, por_z, por_razao in zip(z, razao, suspeito_z, suspeito_razao):
+        partes = []
+        if por_z:
+            partes.append(f"z robusto {valor_z:+.1f}")
+        if por_razao:
+            partes.append(f"{valor_razao:.3g}× os anos vizinhos")
+        if np.isfinite(valor_razao) and valor_razao > 0:
+            ordem = np.log10(valor_razao) / 3
+            if abs(ordem) >= 0.8 and abs(ordem - np.round(ordem)) < 0.1:
+                partes.append("possível separador de milhar")
+        motivos.append("; ".join(partes))
+    return np.array(motivos, dtype=object)
+
+
+def detectar_anomalias(df: pd.DataFrame,
+                       chaves: Optional[Sequence[str]] = None,
+                       limiar_z: float = LIMIAR_Z_ROBUSTO,
+                       limiar_razao: float = LIMIAR_RAZAO_VIZINHOS) -> pd.DataFrame:
+    """
+    Marca os valores anômalos de todas as séries de uma vez
+    
+    Um valor é anômalo quando se afasta da própria série (|z robusto| acima
+    do limiar) e, ao mesmo tempo, dos dois anos vizinhos no mesmo sentido
+    (razão acima do limiar ou abaixo do inverso); ou quando essa razão passa
+    de LIMIAR_RAZAO_EXTREMA, mesmo em séries curtas.
+    
+    Args:
+        df: Dados em formato longo com as chaves, 'Ano' e 'Valor'
+        chaves: Colunas que identificam uma série (padrão: chaves_padrao)
+        limiar_z: Limiar do |z robusto|
+        limiar_razao: Limiar da razão em relação aos vizinhos
+    
+    Returns:
+        DataFrame com as chaves, 'Ano', 'Valor' (total da célula) e COLUNAS_ANOMALIAS,
+        uma linha por série e ano marcados
+    """
+    chaves = list(chaves or chaves_padrao(df))
+    colunas = chaves + ['Ano', 'Valor'] + COLUNAS_ANOMALIAS
+    if df.empty:
+        return pd.DataFrame(columns=colunas)
+    
+    codigos_serie, codigos_ano, anos = codigos_das_series(df, chaves)
+    valores = pd.to_numeric(df['Valor'], errors='coerce').to_numpy(dtype=float)
+    validos = (codigos_serie >= 0) & (codigos_ano >= 0) & ~np.isnan(valores)
+    n_series = int(codigos_serie.max()) + 1
+    tamanho = n_series * len(anos)
+    posicao = codigos_serie[validos] * len(anos) + codigos_ano[validos]
+    soma = np.bincount(posicao, weights=valores[validos], minlength=tamanho)
+    contagem = np.bincount(posicao, minlength=tamanho)
+    matriz = np.where(contagem > 0, soma, np.nan).reshape(n_series, len(anos))
+    
+    z, mediana, mad = z_robusto(matriz)
+    razao, vizinhos = razao_vizinhos(matriz)
+    comparaveis = np.fmax(matriz, vizinhos) >= VALOR_MINIMO_RAZAO
+    fora_vizinhos = comparaveis & ((razao >= limiar_razao) | (razao <= 1 / limiar_razao))
+    extremos = comparaveis & ((razao >= LIMIAR_RAZAO_EXTREMA)
+                              | (razao <= 1 / LIMIAR_RAZAO_EXTREMA))
+    suspeito_z = np.abs(z) > limiar_z
+    
+    marcados = (suspeito_z & fora_vizinhos) | extremos
+    series, colunas_ano = np.nonzero(marcados)
+    
+    # Rótulos da primeira linha de cada série marcada
+    codigos, primeiras = np.unique(codigos_serie, return_index=True)
+    primeiras = primeiras[codigos >= 0]
+    anomalias = df.iloc[primeiras[series]][chaves].reset_index(drop=True)
+    anomalias['Ano'] = anos[colunas_ano]
+    anomalias['Valor'] = matriz[series, colunas_ano]
+    anomalias['Mediana da Série'] = mediana[series]
+    anomalias['MAD'] = mad[series]
+    anomalias['Z Robusto'] = z[series, colunas_ano]
+    anomalias['Valor Vizinhos'] = vizinhos[series, colunas_ano]
+    anomalias['Razão Vizinhos'] = razao[series, colunas_ano]
+    anomalias['Motivo'] = _motivos(z[series, colunas_ano], razao[series, colunas_ano],
+                                   suspeito_z[series, colunas_ano],
+                                   fora_vizinhos[series, colunas_ano])
+    return anomalias[colunas]
+
+
+def separar_quarentena(df: pd.DataFrame, anomalias: pd.DataFrame,
+                       chaves: Optional[Sequence[str]] = None
+                       ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Separa as linhas dos dados que pertencem a séries e anos marcados
+    
+    Args:
+        df: Dados em formato longo
+        anomalias: Resultado de detectar_anomalias
+        chaves: Colunas que identificam uma série (padrão: chaves_padrao)
+    
+    Returns:
+        Tupla (dados sem as linhas marcadas, linhas em quarentena)
+    """
+    chaves = list(chaves or chaves_padrao(df))
+    if anomalias.empty or df.empty:
+        return df, df.iloc[:0]
+    marcados = pd.MultiIndex.from_frame(anomalias[chaves + ['Ano']])
+    linhas = pd.MultiIndex.from_frame(df[chaves + ['Ano']])
+    em_quarentena = linhas.isin(marcados)
+    return (df[~em_quarentena].reset_index(drop=True),
+            df[em_quarentena].reset_index(drop=True))
+
+
+def salvar_anomalias(anomalias: pd.DataFrame, caminho: str) -> str:
+    """
+    Salva a tabela de anomalias em CSV (UTF-8 com BOM, como os dados)
+    
+    Args:
+        anomalias: Resultado de detectar_anomalias
+        caminho: Caminho do CSV
+    
+    Returns:
+        Caminho do arquivo salvo
+    """
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    anomalias.to_csv(caminho, index=False, encoding='utf-8-sig')
+    return caminho
+
+
+def imprimir_anomalias(anomalias: pd.DataFrame, maximo: int = 10):
+    """
+    Mostra no console as anomalias mais fortes
+    
+    Args:
+        anomalias: Resultado de detectar_anomalias
+        maximo: Quantidade de linhas mostradas
+    """
+    if anomalias.empty:
+        print("✅ Nenhuma anomalia encontrada nos dados")
+        return
+    print(f"⚠️  {len(anomalias)} valor(es) anômalo(s) encontrado(s):")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        forca = np.abs(np.log(anomalias['Razão Vizinhos'].to_numpy(dtype=float)))
+    ordem = np.argsort(-np.nan_to_num(forca, nan=0.0), kind='stable')
+    chaves = [coluna for coluna in anomalias.columns
+              if coluna not in ['Valor'] + COLUNAS_ANOMALIAS]
+    for _, linha in anomalias.iloc[ordem[:maximo]].iterrows():
+        serie = " / ".join(str(linha[chave]) for chave in chaves)
+        print(f"   • {serie}: {linha['Valor']:,.0f} ({linha['Motivo']})")
+    if len(anomalias) > maximo:
+        print(f"   ... e mais {len(anomalias) - maximo}")
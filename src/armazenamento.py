@@ -0,0 +1,244 @@
+"""
+Módulo de Armazenamento
+Guarda os dados em formato longo num banco local embutido (SQLite, ou DuckDB
+quando instalado), com chave e índices por Estado, Ano e Índice de Violência,
+gravação em lote com substituição (upsert) e consultas filtradas no próprio
+banco, sem reescrever nem recarregar o CSV consolidado inteiro
+"""
+
+import os
+import sqlite3
+import pandas as pd
+from typing import List, Optional, Sequence
+
+try:
+    import duckdb
+except ImportError:  # Sem DuckDB: usa o SQLite da biblioteca padrão
+    duckdb = None
+
+
+TABELA = 'violencia'
+
+# Coluna do DataFrame → coluna do banco (chave: estado, ano, indice, municipio)
+COLUNAS_BANCO = {
+    'Estado': 'estado',
+    'Município': 'municipio',
+    'Ano': 'ano',
+    'Índice de Violência': 'indice',
+    'Valor': 'valor',
+}
+CHAVE = ('estado', 'ano', 'indice', 'municipio')
+
+# Extensões associadas a cada motor
+EXTENSOES_BANCO = {'.sqlite': 'sqlite', '.sqlite3': 'sqlite', '.db': 'sqlite',
+                   '.duckdb': 'duckdb'}
+
+ARQUIVO_BANCO_PADRAO = os.path.join('dados', 'dados_consolidados.sqlite')
+
+
+def _esquema(motor: str) -> List[str]:
+    """Comandos de criação da tabela e dos índices"""
+    sem_rowid = ' WITHOUT ROWID' if motor == 'sqlite' else ''
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {TABELA} (
+                estado VARCHAR NOT NULL,
+                municipio VARCHAR NOT NULL DEFAULT '',
+                ano INTEGER NOT NULL,
+                indice VARCHAR NOT NULL,
+                valor DOUBLE,
+                PRIMARY KEY ({', '.join(CHAVE)})
+            ){sem_rowid}""",
+        f"CREATE INDEX IF NOT EXISTS idx_{TABELA}_indice_ano ON {TABELA} (indice, ano)",
+        f"CREATE INDEX IF NOT EXISTS idx_{TABELA}_ano ON {TABELA} (ano)",
+    ]
+
+
+class BancoDados:
+    """Classe de acesso ao banco local com os dados em formato longo"""
+    
+    def __init__(self, caminho: str = ARQUIVO_BANCO_PADRAO, motor: Optional[str] = None):
+        """
+        Abre (ou cria) o banco
+        
+        Args:
+            caminho: Arquivo do banco (':memory:' para um banco temporário)
+            motor: 'sqlite' ou 'duckdb' (padrão: pela extensão; SQLite nos demais casos)
+        """
+        extensao = os.path.splitext(caminho)[1].lower()
+        self.motor = motor or EXTENSOES_BANCO.get(extensao, 'sqlite')
+        self.caminho = caminho
+        if self.motor not in ('sqlite', 'duckdb'):
+            raise ValueError(f"Motor de banco desconhecido: {self.motor}")
+        if self.motor == 'duckdb' and duckdb is None:
+            raise ImportError("duckdb não está instalado (pip install duckdb); "
+                              "use um arquivo .sqlite")
+        
+        pasta = os.path.dirname(caminho)
+        if pasta and caminho != ':memory:':
+            os.makedirs(pasta, exist_ok=True)
+        
+        if self.motor == 'duckdb':
+            self.conexao = duckdb.connect(caminho)
+        else:
+            self.conexao = sqlite3.connect(caminho)
+            self.conexao.execute("PRAGMA journal_mode=WAL")
+            self.conexao.execute("PRAGMA synchronous=NORMAL")
+        for comando in _esquema(self.motor):
+            self.conexao.execute(comando)
+        self.conexao.commit()
+    
+    def __enter__(self) -> 'BancoDados':
+        return self
+    
+    def __exit__(self, *erro):
+        self.fechar()
+    
+    def fechar(self):
+        """Fecha a conexão"""
+        if self.conexao is not None:
+            self.conexao.close()
+            self.conexao = None
+    
+    def salvar(self, df: pd.DataFrame) -> int:
+        """
+        Grava os dados em lote, substituindo as linhas já existentes da mesma chave
+        
+        Linhas repetidas de uma mesma chave (estado, município, ano, índice) no
+        DataFrame são somadas antes da gravação, como no cubo agregado.
+        
+        Args:
+            df: Dados em formato longo (Estado, [Município], Ano, Índice de Violência, Valor)
+        
+        Returns:
+            Número de linhas gravadas (0 se faltarem colunas)
+        """
+        faltando = [coluna for coluna in COLUNAS_BANCO
+                    if coluna != 'Município' and coluna not in df.columns]
+        if faltando:
+            print(f"⚠️  Dados sem as colunas {', '.join(faltando)}: nada gravado no banco")
+            return 0
+        if df.empty:
+            return 0
+        
+        lote = pd.DataFrame({
+            'estado': df['Estado'].astype(str),
+            'municipio': (df['Município'].fillna('').astype(str)
+                          if 'Município' in df.columns else ''),
+            'ano': pd.to_numeric(df['Ano'], errors='coerce'),
+            'indice': df['Índice de Violência'].astype(str),
+            'valor': pd.to_numeric(df['Valor'], errors='coerce'),
+        }).dropna(subset=['ano'])
+        lote['ano'] = lote['ano'].astype(int)
+        lote = lote.groupby(list(CHAVE), sort=False, as_index=False)['valor'].sum(min_count=1)
+        
+        colunas = ', '.join(CHAVE + ('valor',))
+        conflito = f"ON CONFLICT ({', '.join(CHAVE)}) DO UPDATE SET valor = excluded.valor"
+        if self.motor == 'duckdb':
+            self.conexao.register('lote_gravacao', lote)
+            self.conexao.execute(f"INSERT INTO {TABELA} ({colunas}) "
+                                 f"SELECT {colunas} FROM lote_gravacao {conflito}")
+            self.conexao.unregister('lote_gravacao')
+        else:
+            # Ordem da chave primária: inserções sequenciais na árvore do SQLite
+            lote = lote.sort_values(list(CHAVE), kind='stable')
+            valores = lote['valor'].astype(object).where(lote['valor'].notna(), None)
+            registros = zip(lote['estado'].tolist(), lote['ano'].tolist(),
+                            lote['indice'].tolist(), lote['municipio'].tolist(),
+                            valores.tolist())
+            with self.conexao:
+                self.conexao.executemany(
+                    f"INSERT INTO {TABELA} ({colunas}) VALUES (?, ?, ?, ?, ?) {conflito}",
+                    registros)
+        self.conexao.commit()
+        return len(lote)
+    
+    @staticmethod
+    def _condicoes(filtros: dict) -> tuple:
+        """Cláusula WHERE e parâmetros para os filtros informados"""
+        condicoes, parametros = [], []
+        for coluna, valores in filtros.items():
+            if valores is None:
+                continue
+            if isinstance(valores, (str, int)):
+                valores = [valores]
+            valores = list(valores)
+            condicoes.append(f"{coluna} IN ({', '.join('?' * len(valores))})")
+            parametros.extend(int(v) if coluna == 'ano' else str(v) for v in valores)
+        clausula = f" WHERE {' AND '.join(condicoes)}" if condicoes else ''
+        return clausula, parametros
+    
+    def consultar(self,
+                  estados: Optional[Sequence[str]] = None,
+                  anos: Optional[Sequence[int]] = None,
+                  indices: Optional[Sequence[str]] = None,
+                  municipios: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Lê só as linhas pedidas (filtros aplicados no banco, usando os índices)
+        
+        Args:
+            estados: Estados (None = todos)
+            anos: Anos (None = todos)
+            indices: Índices de violência (None = todos)
+            municipios: Municípios (None = todos)
+        
+        Returns:
+            DataFrame em formato longo (com 'Município' só se houver dados municipais)
+        """
+        clausula, parametros = self._condicoes({'estado': estados, 'ano': anos,
+                                                'indice': indices, 'municipio': municipios})
+        cursor = self.conexao.execute(
+            f"SELECT estado, municipio, ano, indice, valor FROM {TABELA}{clausula} "
+            f"ORDER BY {', '.join(CHAVE)}", parametros)
+        df = pd.DataFrame.from_records(cursor.fetchall(),
+                                       columns=['Estado', 'Município', 'Ano',
+                                                'Índice de Violência', 'Valor'])
+        if not (df['Município'] != '').any():
+            df = df.drop(columns='Município')
+        return df
+    
+    def remover(self,
+                estados: Optional[Sequence[str]] = None,
+                anos: Optional[Sequence[int]] = None,
+                indices: Optional[Sequence[str]] = None) -> int:
+        """
+        Apaga as linhas dos filtros informados (sem filtros, apaga tudo)
+        
+        Returns:
+            Número de linhas apagadas
+        """
+        clausula, parametros = self._condicoes({'estado': estados, 'ano': anos,
+                                                'indice': indices})
+        antes = self.contar()
+        self.conexao.execute(f"DELETE FROM {TABELA}{clausula}", parametros)
+        self.conexao.commit()
+        return antes - self.contar()
+    
+    def valores_distintos(self, coluna: str) -> List:
+        """
+        Valores distintos de uma coluna ('Estado', 'Ano', 'Índice de Violência'...)
+        
+        Returns:
+            Lista ordenada
+        """
+        nome = COLUNAS_BANCO[coluna]
+        cursor = self.conexao.execute(f"SELECT DISTINCT {nome} FROM {TABELA} ORDER BY {nome}")
+        return [linha[0] for linha in cursor.fetchall()]
+    
+    def contar(self) -> int:
+        """Número de linhas no banco"""
+        return int(self.conexao.execute(f"SELECT COUNT(*) FROM {TABELA}").fetchone()[0])
+
+
+def salvar_no_banco(df: pd.DataFrame, caminho: str = ARQUIVO_BANCO_PADRAO) -> int:
+    """
+    Função de conveniência para gravar um DataFrame no banco
+    
+    Args:
+        df: Dados em formato longo
+        caminho: Arquivo do banco
+    
+    Returns:
+        Número de linhas gravadas
+    """
+    with BancoDados(caminho) as banco:
+        return banco.salvar(df)
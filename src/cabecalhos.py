@@ -0,0 +1,240 @@
+"""
+Módulo de Reconstrução de Cabeçalhos
+Remonta os cabeçalhos de várias linhas e as células mescladas das tabelas dos
+anuários a partir das coordenadas das células na saída JSON do tabula: as
+células do cabeçalho vão para um índice de intervalos no eixo x e cada coluna
+recebe, de cima para baixo, os rótulos que a cobrem ("Feminicídio - 2023" em
+vez de "Unnamed: 3")
+"""
+
+import re
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from localidades import normalizar_nome
+
+
+# Linhas iniciais examinadas à procura do fim do cabeçalho
+MAXIMO_LINHAS_CABECALHO = 4
+
+# Sobreposição mínima (fração da célula ou da faixa da coluna, o menor) para
+# uma célula do cabeçalho rotular uma coluna cuja faixa não contém seu centro
+COBERTURA_MINIMA = 0.4
+
+# Folga (pontos) ao verificar se uma célula está sob outra
+TOLERANCIA = 2.0
+
+# Separador entre níveis (rótulo de grupo e rótulo da coluna)
+SEPARADOR_NIVEIS = ' - '
+
+# Rótulos que identificam a coluna de estados/municípios (já normalizados)
+_LOCALIDADE = re.compile(r'\b(ufs?|estados?|unidades? da federacao|municipios?)\b')
+_NUMERO = re.compile(r'^[-+]?\d[\d.\s]*(,\d+)?%?$')
+_ANO = re.compile(r'^(19|20)\d{2}\*?$')
+
+
+class IndiceIntervalos:
+    """Índice estático de intervalos [início, fim) com consulta por sobreposição"""
+    
+    def __init__(self, intervalos: Sequence[Tuple[float, float]]):
+        """
+        Ordena os intervalos pelo início
+        
+        Args:
+            intervalos: (início, fim) de cada item; o id é a posição na sequência
+        """
+        limites = np.asarray(intervalos, dtype=float).reshape(-1, 2)
+        ordem = np.argsort(limites[:, 0], kind='stable')
+        self._inicios = limites[ordem, 0]
+        self._fins = limites[ordem, 1]
+        self._ids = ordem
+        # Maior comprimento: nenhum intervalo que comece antes de
+        # (início da consulta - maior) pode alcançá-la
+        self._maior = float((self._fins - self._inicios).max()) if len(ordem) else 0.0
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def sobrepostos(self, inicio: float, fim: float) -> np.ndarray:
+        """
+        Ids dos intervalos que se sobrepõem a [inicio, fim)
+        
+        Args:
+            inicio: Início da consulta
+            fim: Fim da consulta
+        
+        Returns:
+            Ids em ordem de início
+        """
+        a = np.searchsorted(self._inicios, inicio - self._maior, side='left')
+        b = np.searchsorted(self._inicios, fim, side='left')
+        return self._ids[a:b][self._fins[a:b] > inicio]
+
+
+def _texto(celula: dict) -> str:
+    """Texto de uma célula do JSON do tabula, sem espaços nas pontas"""
+    return (celula.get('text') or '').strip()
+
+
+def linhas_de_cabecalho(dados: List[List[dict]],
+                        maximo: int = MAXIMO_LINHAS_CABECALHO) -> int:
+    """
+    Número de linhas iniciais que formam o cabeçalho
+    
+    O cabeçalho termina na primeira linha com algum número (que não seja um
+    ano) fora da primeira coluna.
+    
+    Args:
+        dados: Linhas de células do JSON do tabula
+        maximo: Máximo de linhas de cabeçalho
+    
+    Returns:
+        Número de linhas (ao menos 1)
+    """
+    n = 0
+    for linha in dados[:maximo]:
+        textos = [_texto(celula) for celula in linha[1:]]
+        if any(_NUMERO.match(texto) and not _ANO.match(texto) for texto in textos if texto):
+            break
+        n += 1
+    return max(1, min(n, len(dados) - 1))
+
+
+def faixas_das_colunas(dados: List[List[dict]], n_colunas: int) -> np.ndarray:
+    """
+    Faixa horizontal [início, fim) de cada coluna, cobrindo toda a largura
+    
+    A extensão de cada coluna vem das células com texto; as faixas vão até o
+    meio do espaço entre colunas vizinhas (a primeira e a última são abertas).
+    
+    Args:
+        dados: Linhas de células do JSON do tabula (corpo da tabela)
+        n_colunas: Número de colunas
+    
+    Returns:
+        Matriz n_colunas × 2
+    """
+    extensao = np.full((n_colunas, 2), np.nan)
+    for linha in dados:
+        for j, celula in enumerate(linha[:n_colunas]):
+            if _texto(celula) and celula.get('width'):
+                x0, x1 = celula['left'], celula['left'] + celula['width']
+                extensao[j, 0] = np.fmin(extensao[j, 0], x0)
+                extensao[j, 1] = np.fmax(extensao[j, 1], x1)
+    
+    # Colunas sem texto herdam o fim da anterior (largura zero)
+    for j in range(n_colunas):
+        if np.isnan(extensao[j, 0]):
+            extensao[j] = extensao[j - 1, 1] if j else 0.0
+    
+    faixas = np.empty((n_colunas, 2))
+    meios = (extensao[:-1, 1] + extensao[1:, 0]) / 2
+    faixas[0, 0], faixas[-1, 1] = -np.inf, np.inf
+    faixas[1:, 0] = meios
+    faixas[:-1, 1] = meios
+    return faixas
+
+
+def reconstruir_cabecalho(dados: List[List[dict]],
+                          n_cabecalho: Optional[int] = None
+                          ) -> Tuple[List[Tuple[str, ...]], int]:
+    """
+    Rótulos de cada coluna a partir das coordenadas das células do cabeçalho
+    
+    Uma célula rotula as colunas cuja faixa contém o seu centro ou que ela
+    cobre em pelo menos COBERTURA_MINIMA (da célula ou da faixa, o menor):
+    células mescladas ou centralizadas sobre um grupo rotulam todas as colunas
+    do grupo. Uma célula sozinha sob outra, que não seja um ano, é a
+    continuação do mesmo rótulo ("Lesão corporal" / "dolosa"); as demais
+    formam um novo nível ("Feminicídio" / "2022", "2023").
+    
+    Args:
+        dados: Linhas de células do JSON do tabula
+        n_cabecalho: Linhas de cabeçalho (padrão: linhas_de_cabecalho)
+    
+    Returns:
+        Tupla (níveis de rótulos de cada coluna, linhas de cabeçalho)
+    """
+    n_cabecalho = n_cabecalho or linhas_de_cabecalho(dados)
+    n_colunas = max(len(linha) for linha in dados)
+    faixas = faixas_das_colunas(dados[n_cabecalho:] or dados, n_colunas)
+    
+    celulas = [(nivel, celula['left'], celula['left'] + celula['width'], _texto(celula))
+               for nivel, linha in enumerate(dados[:n_cabecalho])
+               for celula in linha if _texto(celula)]
+    indice = IndiceIntervalos([(x0, x1) for _, x0, x1, _ in celulas])
+    
+    # Colunas cobertas por cada célula do cabeçalho (consulta no índice por faixa)
+    cobertas: Dict[int, List[int]] = {i: [] for i in range(len(celulas))}
+    for j, (inicio, fim) in enumerate(faixas):
+        for i in indice.sobrepostos(inicio, fim):
+            _, x0, x1, _ = celulas[i]
+            sobreposicao = min(fim, x1) - max(inicio, x0)
+            if (inicio <= (x0 + x1) / 2 < fim
+                    or sobreposicao >= COBERTURA_MINIMA * min(x1 - x0, fim - inicio)):
+                cobertas[int(i)].append(j)
+    
+    # Rótulos por nível; continuações são acrescentadas ao rótulo de cima
+    rotulos: List[str] = []
+    niveis: List[List[int]] = [[] for _ in range(n_colunas)]
+    acima: List[Tuple[float, float, int, List[int]]] = []
+    for nivel in range(n_cabecalho):
+        do_nivel = [i for i in range(len(celulas)) if celulas[i][0] == nivel and cobertas[i]]
+        atuais = []
+        for x0_acima, x1_acima, rotulo, colunas in acima:
+            dentro = [i for i in do_nivel if celulas[i][1] >= x0_acima - TOLERANCIA
+                      and celulas[i][2] <= x1_acima + TOLERANCIA]
+            if len(dentro) == 1 and not _ANO.match(celulas[dentro[0]][3]):
+                rotulos[rotulo] += ' ' + celulas[dentro[0]][3]
+                do_nivel.remove(dentro[0])
+                atuais.append((x0_acima, x1_acima, rotulo, colunas))
+        for i in do_nivel:
+            rotulos.append(celulas[i][3])
+            for j in cobertas[i]:
+                niveis[j].append(len(rotulos) - 1)
+            atuais.append((celulas[i][1], celulas[i][2], len(rotulos) - 1, cobertas[i]))
+        acima = atuais
+    return [tuple(rotulos[r] for r in coluna) for coluna in niveis], n_cabecalho
+
+
+def nomes_das_colunas(niveis: List[Tuple[str, ...]]) -> List[str]:
+    """
+    Nomes únicos das colunas a partir dos níveis de rótulos
+    
+    Como no tabula-py, colunas sem rótulo viram "Unnamed: N" e nomes repetidos
+    ganham os sufixos ".1", ".2"...
+    
+    Args:
+        niveis: Rótulos de cada coluna, de cima para baixo
+    
+    Returns:
+        Nomes das colunas
+    """
+    nomes, sem_nome, contagem = [], 0, {}
+    for rotulos in niveis:
+        nome = SEPARADOR_NIVEIS.join(rotulos)
+        if not nome:
+            nome, sem_nome = f"Unnamed: {sem_nome}", sem_nome + 1
+        while contagem.get(nome):
+            contagem[nome] += 1
+            nome = f"{nome}.{contagem[nome] - 1}"
+        contagem[nome] = contagem.get(nome, 0) + 1
+        nomes.append(nome)
+    return nomes
+
+
+def coluna_de_localidade(nomes: Sequence[str]) -> Optional[str]:
+    """
+    Primeira coluna cujo rótulo indica estados ou municípios ('UF', 'Unidade
+    da Federação', 'Municípios'...)
+    
+    Args:
+        nomes: Nomes das colunas
+    
+    Returns:
+        Nome da coluna, ou None
+    """
+    for nome in nomes:
+        if _LOCALIDADE.search(normalizar_nome(nome)):
+            return nome
+    return None
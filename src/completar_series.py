@@ -0,0 +1,266 @@
+"""
+Módulo de Completação de Séries
+Reindexa todas as séries (matriz séries × anos) para a faixa completa de anos,
+interpola os anos sem anuário e projeta os próximos anos com bandas de
+confiança, ajustando as retas de todas as séries de uma vez por mínimos
+quadrados em lote. Cada ponto fica marcado como observado, interpolado ou
+projetado, para que os gráficos o desenhem de forma diferente
+"""
+
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Optional, Sequence, Tuple
+
+
+HORIZONTE_PROJECAO = 2
+NIVEL_CONFIANCA = 0.95
+
+# Grau do polinômio ajustado para a projeção (1 = reta)
+GRAU_PROJECAO = 1
+
+# Situação de cada ponto na tabela de saída
+SITUACAO_OBSERVADO = 'observado'
+SITUACAO_INTERPOLADO = 'interpolado'
+SITUACAO_PROJETADO = 'projetado'
+
+
+def grade_anual(matriz: np.ndarray, anos: Sequence[int],
+                horizonte: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reindexa as séries para todos os anos do calendário, de uma vez
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna (inteiros crescentes)
+        horizonte: Anos acrescentados depois do último (vazios, para a projeção)
+    
+    Returns:
+        Tupla (anos da grade, matriz séries × anos da grade com NaN nos anos novos)
+    """
+    anos = np.asarray(anos, dtype=np.int64)
+    if len(anos) == 0:
+        return anos, np.empty((len(matriz), 0))
+    grade = np.arange(anos[0], anos[-1] + horizonte + 1)
+    completa = np.full((len(matriz), len(grade)), np.nan)
+    completa[:, anos - anos[0]] = matriz
+    return grade, completa
+
+
+def interpolar_lacunas(matriz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interpolação linear dos anos sem dados entre duas observações de cada série
+    
+    Anos antes da primeira ou depois da última observação não são preenchidos.
+    
+    Args:
+        matriz: Séries × anos de uma grade anual (colunas igualmente espaçadas)
+    
+    Returns:
+        Tupla (matriz preenchida, máscara dos valores interpolados)
+    """
+    n_colunas = matriz.shape[1]
+    validos = np.isfinite(matriz)
+    colunas = np.arange(n_colunas)
+    
+    # Última observação até cada coluna e próxima observação a partir dela
+    anterior = np.maximum.accumulate(np.where(validos, colunas, -1), axis=1)
+    posterior = np.minimum.accumulate(np.where(validos, colunas, n_colunas)[:, ::-1],
+                                      axis=1)[:, ::-1]
+    lacunas = ~validos & (anterior >= 0) & (posterior < n_colunas)
+    
+    preenchida = matriz.copy()
+    linhas, cols = np.nonzero(lacunas)
+    inicio, fim = anterior[linhas, cols], posterior[linhas, cols]
+    peso = (cols - inicio) / (fim - inicio)
+    preenchida[linhas, cols] = ((1 - peso) * matriz[linhas, inicio]
+                                + peso * matriz[linhas, fim])
+    return preenchida, lacunas
+
+
+def quantil_t(probabilidade: float, graus_liberdade: np.ndarray) -> np.ndarray:
+    """
+    Quantil da distribuição t de Student para vários graus de liberdade
+    
+    Exato para 1 e 2 graus; a partir de 3, expansão de Cornish-Fisher em
+    torno do quantil normal (erro abaixo de 0,01 para os níveis usuais).
+    
+    Args:
+        probabilidade: Probabilidade acumulada (ex.: 0.975)
+        graus_liberdade: Graus de liberdade (array)
+    
+    Returns:
+        Array de quantis (NaN onde os graus de liberdade são menores que 1)
+    """
+    nu = np.asarray(graus_liberdade, dtype=float)
+    z = NormalDist().inv_cdf(probabilidade)
+    g1 = (z**3 + z) / 4
+    g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+    g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+    g4 = (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        quantil = z + g1 / nu + g2 / nu**2 + g3 / nu**3 + g4 / nu**4
+    p = probabilidade
+    quantil = np.where(nu == 1, np.tan(np.pi * (p - 0.5)), quantil)
+    quantil = np.where(nu == 2, (2 * p - 1) / np.sqrt(2 * p * (1 - p)), quantil)
+    return np.where(nu >= 1, quantil, np.nan)
+
+
+def ajustar_polinomios(matriz: np.ndarray, anos: Sequence[int],
+                       grau: int = GRAU_PROJECAO
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Mínimos quadrados de todas as séries em lote, usando só os anos com dados
+    
+    As equações normais (Xᵀ W X) β = Xᵀ W y, com W = anos válidos de cada série,
+    são montadas e resolvidas para a pilha inteira de séries numa só chamada.
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna
+        grau: Grau do polinômio
+    
+    Returns:
+        Tupla (coeficientes séries × (grau + 1), inversas de Xᵀ W X, variância
+        residual por série, observações por série, ano de referência dos
+        coeficientes); NaN nas séries com observações insuficientes
+    """
+    anos = np.asarray(anos, dtype=float)
+    referencia = float(anos.mean()) if len(anos) else 0.0
+    x = anos - referencia
+    base = np.vander(x, grau + 1, increasing=True)          # anos × termos
+    
+    validos = np.isfinite(matriz)
+    pesos = validos.astype(float)
+    y = np.where(validos, matriz, 0.0)
+    n = pesos.sum(axis=1)
+    
+    xtx = np.einsum('sa,ai,aj->sij', pesos, base, base)
+    xty = np.einsum('sa,ai->si', y, base)
+    
+    termos = grau + 1
+    suficientes = (n >= termos) & (np.abs(np.linalg.det(xtx)) > 1e-9)
+    inversas = np.full(xtx.shape, np.nan)
+    inversas[suficientes] = np.linalg.inv(xtx[suficientes])
+    coeficientes = np.einsum('sij,sj->si', inversas, xty)
+    
+    residuos = np.where(validos, y - coeficientes @ base.T, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variancia = np.where(n > termos, (residuos**2).sum(axis=1) / (n - termos), np.nan)
+    return coeficientes, inversas, variancia, n, referencia
+
+
+def projetar(matriz: np.ndarray, anos: Sequence[int], anos_projecao: Sequence[int],
+             nivel: float = NIVEL_CONFIANCA, grau: int = GRAU_PROJECAO
+             ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Valores previstos e intervalo de predição de todas as séries
+    
+    O intervalo é ŷ ± t · s · √(1 + x₀ᵀ (Xᵀ W X)⁻¹ x₀). Os valores são contagens,
+    então previsões e limites são truncados em zero. Séries com até grau + 1
+    observações não são projetadas (NaN).
+    
+    Args:
+        matriz: Séries × anos (NaN nos anos sem dados)
+        anos: Ano de cada coluna
+        anos_projecao: Anos a prever
+        nivel: Nível de confiança do intervalo
+        grau: Grau do polinômio ajustado
+    
+    Returns:
+        Tupla (previsão, limite inferior, limite superior), séries × anos_projecao
+    """
+    coeficientes, inversas, variancia, n, referencia = ajustar_polinomios(matriz, anos, grau)
+    base = np.vander(np.asarray(anos_projecao, dtype=float) - referencia,
+                     grau + 1, increasing=True)             # anos × termos
+    # Sem resíduos não há banda: séries com observações só para a reta ficam sem projeção
+    previsao = np.where(np.isfinite(variancia)[:, None], coeficientes @ base.T, np.nan)
+    
+    alavancagem = np.einsum('ai,sij,aj->sa', base, inversas, base)
+    t = quantil_t(0.5 + nivel / 2, n - (grau + 1))
+    margem = (t * np.sqrt(variancia))[:, None] * np.sqrt(1 + alavancagem)
+    
+    inferior = np.maximum(previsao - margem, 0)
+    superior = np.maximum(previsao + margem, 0)
+    return np.maximum(previsao, 0), inferior, superior
+
+
+class SeriesCompletas:
+    """Séries na faixa completa de anos, com lacunas interpoladas e projeção"""
+    
+    def __init__(self, matriz: np.ndarray, anos: Sequence[int],
+                 horizonte: int = HORIZONTE_PROJECAO,
+                 nivel: float = NIVEL_CONFIANCA,
+                 grau: int = GRAU_PROJECAO,
+                 janela_ajuste: Optional[int] = None):
+        """
+        Completa todas as séries de uma vez
+        
+        Cada série é projetada a partir do ano seguinte à sua última observação
+        até `horizonte` anos depois do último ano da grade de dados.
+        
+        Args:
+            matriz: Séries × anos (NaN nos anos sem dados)
+            anos: Ano de cada coluna (inteiros crescentes, possivelmente com lacunas)
+            horizonte: Anos projetados depois do último ano com dados (0 = sem projeção)
+            nivel: Nível de confiança das bandas
+            grau: Grau do polinômio ajustado para a projeção
+            janela_ajuste: Se informado, ajusta só os últimos anos da grade
+        """
+        self.nivel = nivel
+        self.anos, observados = grade_anual(matriz, anos, horizonte)
+        self.observados = np.isfinite(observados)
+        self.valores, self.interpolados = interpolar_lacunas(observados)
+        
+        self.inferior = np.full(self.valores.shape, np.nan)
+        self.superior = np.full(self.valores.shape, np.nan)
+        self.projetados = np.zeros(self.valores.shape, dtype=bool)
+        if horizonte <= 0 or self.valores.size == 0:
+            return
+        
+        # Ajuste só com as observações reais (os interpolados não contam)
+        ultimo_observado = len(self.anos) - horizonte
+        ajuste = slice(max(ultimo_observado - janela_ajuste, 0) if janela_ajuste else 0,
+                       ultimo_observado)
+        previsao, inferior, superior = projetar(observados[:, ajuste], self.anos[ajuste],
+                                                self.anos, nivel, grau)
+        
+        validos = self.observados
+        ultima = np.where(validos.any(axis=1),
+                          validos.shape[1] - 1 - np.argmax(validos[:, ::-1], axis=1),
+                          validos.shape[1])
+        self.projetados = ((np.arange(len(self.anos))[None, :] > ultima[:, None])
+                           & np.isfinite(previsao))
+        self.valores = np.where(self.projetados, previsao, self.valores)
+        self.inferior = np.where(self.projetados, inferior, np.nan)
+        self.superior = np.where(self.projetados, superior, np.nan)
+    
+    @property
+    def imputados(self) -> np.ndarray:
+        """Máscara dos valores que não foram observados (interpolados ou projetados)"""
+        return self.interpolados | self.projetados
+    
+    def tabela(self, rotulos: pd.DataFrame) -> pd.DataFrame:
+        """
+        Formato longo com a situação de cada ponto
+        
+        Args:
+            rotulos: Rótulos das séries (uma linha por série, na ordem da matriz)
+        
+        Returns:
+            DataFrame com os rótulos, 'Ano', 'Valor', 'Situação',
+            'Limite Inferior' e 'Limite Superior' (apenas pontos com valor)
+        """
+        linhas, colunas = np.nonzero(np.isfinite(self.valores))
+        situacao = np.full(len(linhas), SITUACAO_OBSERVADO, dtype=object)
+        situacao[self.interpolados[linhas, colunas]] = SITUACAO_INTERPOLADO
+        situacao[self.projetados[linhas, colunas]] = SITUACAO_PROJETADO
+        
+        tabela = rotulos.reset_index(drop=True).iloc[linhas].reset_index(drop=True)
+        tabela['Ano'] = self.anos[colunas]
+        tabela['Valor'] = self.valores[linhas, colunas]
+        tabela['Situação'] = situacao
+        tabela['Limite Inferior'] = self.inferior[linhas, colunas]
+        tabela['Limite Superior'] = self.superior[linhas, colunas]
+        return tabela
@@ -0,0 +1,210 @@
+"""
+Módulo do Cubo Agregado
+Agrega os dados em formato longo uma única vez em arrays NumPy densos
+(Estado × Ano × Índice de Violência) com todos os totais marginais
+pré-calculados, para gráficos, resumos no console e relatório
+"""
+
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+
+DIMENSOES_CUBO = ('Estado', 'Ano', 'Índice de Violência')
+
+# Filtro de uma dimensão: um rótulo ou uma lista de rótulos (somados)
+Filtro = Union[object, Sequence[object]]
+
+
+class CuboAgregado:
+    """Classe com as somas de 'Valor' por Estado × Ano × Índice e suas marginais"""
+    
+    def __init__(self, df_dados: pd.DataFrame,
+                 dimensoes: Sequence[str] = DIMENSOES_CUBO):
+        """
+        Monta o cubo a partir dos dados em formato longo
+        
+        Linhas extras por célula (municípios, meses) são somadas. Os anos ficam
+        em ordem crescente; os demais rótulos, na ordem em que aparecem nos dados.
+        
+        Args:
+            df_dados: DataFrame com as colunas de `dimensoes` e 'Valor'
+            dimensoes: Colunas usadas como eixos do cubo
+        """
+        self.dimensoes = tuple(dimensoes)
+        self.rotulos: Dict[str, np.ndarray] = {}
+        
+        codigos = []
+        for dimensao in self.dimensoes:
+            codigo, rotulos = pd.factorize(df_dados[dimensao], sort=(dimensao == 'Ano'))
+            codigos.append(codigo)
+            self.rotulos[dimensao] = np.asarray(rotulos)
+        
+        valores = pd.to_numeric(df_dados['Valor'], errors='coerce').to_numpy(dtype=float)
+        validos = ~np.isnan(valores)
+        for codigo in codigos:
+            validos &= codigo >= 0
+        self.inteiros = bool(np.all(valores[validos] % 1 == 0))
+        
+        self.forma = tuple(len(self.rotulos[dimensao]) for dimensao in self.dimensoes)
+        tamanho = int(np.prod(self.forma))
+        posicao = np.ravel_multi_index([codigo[validos] for codigo in codigos], self.forma)
+        soma = np.bincount(posicao, weights=valores[validos], minlength=tamanho)
+        contagem = np.bincount(posicao, minlength=tamanho)
+        self.soma = soma.reshape(self.forma)
+        self.contagem = contagem.reshape(self.forma)
+        
+        # Marginais: uma soma (e contagem) para cada subconjunto de eixos mantidos
+        eixos = range(len(self.dimensoes))
+        self._somas: Dict[Tuple[int, ...], np.ndarray] = {}
+        self._contagens: Dict[Tuple[int, ...], np.ndarray] = {}
+        for quantidade in range(len(self.dimensoes) + 1):
+            for mantidos in itertools.combinations(eixos, quantidade):
+                somados = tuple(eixo for eixo in eixos if eixo not in mantidos)
+                self._somas[mantidos] = self.soma.sum(axis=somados)
+                self._contagens[mantidos] = self.contagem.sum(axis=somados)
+    
+    def _eixo(self, dimensao: str) -> int:
+        """Posição de uma dimensão nos eixos do cubo"""
+        try:
+            return self.dimensoes.index(dimensao)
+        except ValueError:
+            raise KeyError(f"Dimensão '{dimensao}' não está no cubo {self.dimensoes}")
+    
+    def selecionar(self, dimensao: str, padrao) -> np.ndarray:
+        """
+        Rótulos de uma dimensão que correspondem a um valor
+        
+        Usa o rótulo exato quando existe; para texto, senão, os rótulos que o
+        contêm (sem diferenciar maiúsculas), como no filtro str.contains dos gráficos.
+        
+        Args:
+            dimensao: Nome da dimensão
+            padrao: Rótulo ou trecho de rótulo
+        
+        Returns:
+            Array com os rótulos encontrados (vazio se nenhum)
+        """
+        rotulos = self.rotulos[dimensao]
+        exatos = rotulos[rotulos == padrao]
+        if len(exatos) or not isinstance(padrao, str):
+            return exatos
+        trecho = padrao.lower()
+        return np.array([rotulo for rotulo in rotulos if trecho in str(rotulo).lower()],
+                        dtype=rotulos.dtype)
+    
+    def _posicoes(self, dimensao: str, filtro: Filtro) -> np.ndarray:
+        """Posições dos rótulos de um filtro (um rótulo ou uma lista)"""
+        if isinstance(filtro, str) or np.ndim(filtro) == 0:
+            filtro = [filtro]
+        rotulos = self.rotulos[dimensao]
+        return np.flatnonzero(np.isin(rotulos, np.asarray(list(filtro), dtype=rotulos.dtype)))
+    
+    def agregar(self, *dimensoes: str,
+                filtros: Optional[Dict[str, Filtro]] = None) -> np.ndarray:
+        """
+        Soma de 'Valor' mantendo as dimensões pedidas (rollup, fatia ou pivô)
+        
+        Sem filtros, devolve uma das marginais pré-calculadas.
+        
+        Args:
+            *dimensoes: Dimensões mantidas, na ordem dos eixos do resultado
+            filtros: {dimensão: rótulo ou lista de rótulos}; dimensões filtradas
+                     e não mantidas são somadas apenas sobre os rótulos filtrados
+        
+        Returns:
+            Array float com um eixo por dimensão pedida (NaN onde não há dados)
+        """
+        eixos = [self._eixo(dimensao) for dimensao in dimensoes]
+        mantidos = tuple(sorted(eixos))
+        
+        if filtros:
+            soma, contagem = self.soma, self.contagem
+            for dimensao, filtro in filtros.items():
+                eixo = self._eixo(dimensao)
+                posicoes = self._posicoes(dimensao, filtro)
+                soma = np.take(soma, posicoes, axis=eixo)
+                contagem = np.take(contagem, posicoes, axis=eixo)
+            somados = tuple(eixo for eixo in range(len(self.dimensoes)) if eixo not in mantidos)
+            soma, contagem = soma.sum(axis=somados), contagem.sum(axis=somados)
+        else:
+            soma, contagem = self._somas[mantidos], self._contagens[mantidos]
+        
+        resultado = np.where(contagem > 0, soma, np.nan)
+        ordem = [mantidos.index(eixo) for eixo in eixos]
+        return np.transpose(resultado, ordem) if ordem != sorted(ordem) else resultado
+    
+    def _valores(self, valores: np.ndarray) -> np.ndarray:
+        """Converte para inteiros quando os dados de origem são inteiros"""
+        if self.inteiros and not np.isnan(valores).any():
+            return valores.astype(np.int64)
+        return valores
+    
+    def totais(self, dimensao: str) -> pd.Series:
+        """
+        Total de 'Valor' por rótulo de uma dimensão (em ordem de rótulo)
+        
+        Args:
+            dimensao: Nome da dimensão (ex.: 'Estado')
+        
+        Returns:
+            Série indexada pelos rótulos com dados
+        """
+        totais = self.agregar(dimensao)
+        rotulos = self.rotulos[dimensao]
+        ordem = np.argsort(rotulos, kind='stable')
+        ordem = ordem[~np.isnan(totais[ordem])]
+        return pd.Series(self._valores(totais[ordem]),
+                         index=pd.Index(rotulos[ordem], name=dimensao), name='Valor')
+    
+    def tabela(self, linhas: str, colunas: str,
+               filtros: Optional[Dict[str, Filtro]] = None) -> pd.DataFrame:
+        """
+        Tabela dinâmica (pivô) de duas dimensões
+        
+        Args:
+            linhas: Dimensão das linhas
+            colunas: Dimensão das colunas
+            filtros: Filtros como em agregar
+        
+        Returns:
+            DataFrame linhas × colunas (NaN onde não há dados)
+        """
+        matriz = self.agregar(linhas, colunas, filtros=filtros)
+        return pd.DataFrame(matriz,
+                            index=pd.Index(self.rotulos[linhas], name=linhas),
+                            columns=pd.Index(self.rotulos[colunas], name=colunas))
+    
+    def resumo(self) -> pd.DataFrame:
+        """
+        Estatísticas dos totais anuais por Estado e Índice de Violência
+        
+        Returns:
+            DataFrame com Estado, Índice de Violência, Anos, Total, Média, Mínimo e Máximo
+        """
+        matriz = self.agregar('Estado', 'Índice de Violência', 'Ano')
+        if matriz.size == 0:
+            return pd.DataFrame(columns=['Estado', 'Índice de Violência', 'Anos', 'Total',
+                                         'Média', 'Mínimo', 'Máximo'])
+        anos = np.sum(~np.isnan(matriz), axis=2)
+        estados, indices = np.nonzero(anos)
+        serie = matriz[estados, indices]
+        
+        total = np.nansum(serie, axis=1)
+        resumo = pd.DataFrame({
+            'Estado': self.rotulos['Estado'][estados],
+            'Índice de Violência': self.rotulos['Índice de Violência'][indices],
+            'Anos': anos[estados, indices],
+            'Total': self._valores(total),
+            'Média': total / anos[estados, indices],
+            'Mínimo': self._valores(np.nanmin(serie, axis=1)),
+            'Máximo': self._valores(np.nanmax(serie, axis=1)),
+        })
+        return resumo.sort_values(['Estado', 'Índice de Violência'], kind='stable',
+                                  ignore_index=True)
+    
+    @property
+    def total(self) -> float:
+        """Soma de todos os valores"""
+        return float(self._somas[()])
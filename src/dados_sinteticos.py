@@ -0,0 +1,267 @@
+"""
+Módulo de Dados Sintéticos
+Gera dados de violência no formato longo (Ano, Estado, Índice de Violência, Valor)
+de forma vetorizada, do exemplo com 3 estados até todas as UFs, municípios e meses
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+
+# Unidades da federação: nome -> (sigla, número de municípios, população em milhões)
+UNIDADES_FEDERACAO = {
+    'Acre': ('AC', 22, 0.83),
+    'Alagoas': ('AL', 102, 3.13),
+    'Amapá': ('AP', 16, 0.73),
+    'Amazonas': ('AM', 62, 3.94),
+    'Bahia': ('BA', 417, 14.14),
+    'Ceará': ('CE', 184, 8.79),
+    'Distrito Federal': ('DF', 1, 2.82),
+    'Espírito Santo': ('ES', 78, 3.83),
+    'Goiás': ('GO', 246, 7.06),
+    'Maranhão': ('MA', 217, 6.78),
+    'Mato Grosso': ('MT', 141, 3.66),
+    'Mato Grosso do Sul': ('MS', 79, 2.76),
+    'Minas Gerais': ('MG', 853, 20.54),
+    'Pará': ('PA', 144, 8.12),
+    'Paraíba': ('PB', 223, 3.97),
+    'Paraná': ('PR', 399, 11.44),
+    'Pernambuco': ('PE', 185, 9.06),
+    'Piauí': ('PI', 224, 3.27),
+    'Rio de Janeiro': ('RJ', 92, 16.05),
+    'Rio Grande do Norte': ('RN', 167, 3.30),
+    'Rio Grande do Sul': ('RS', 497, 10.88),
+    'Rondônia': ('RO', 52, 1.58),
+    'Roraima': ('RR', 15, 0.64),
+    'Santa Catarina': ('SC', 295, 7.61),
+    'São Paulo': ('SP', 645, 44.41),
+    'Sergipe': ('SE', 75, 2.21),
+    'Tocantins': ('TO', 139, 1.51),
+}
+
+# Estados do projeto e seus fatores de escala
+FATORES_REGIAO_NORTE = {'Amazonas': 2.5, 'Roraima': 1.2, 'Acre': 1.0}
+
+# Índices padrão: nome -> (valor base, tendência anual)
+INDICES_PADRAO = {
+    'Feminicídio': (15, 0.5),
+    'Estupro': (120, -1.5),
+    'Lesão Corporal': (350, 2.0),
+    'Violência Doméstica': (280, 1.0),
+}
+
+# Sazonalidade mensal (média 1): mais registros no verão e nas festas de fim de ano
+SAZONALIDADE_MENSAL = 1 + 0.12 * np.cos(2 * np.pi * (np.arange(12) - 0.5) / 12)
+SAZONALIDADE_MENSAL /= SAZONALIDADE_MENSAL.mean()
+
+
+def _coluna(rotulos: Sequence[str], codigos: np.ndarray, categorias: bool):
+    """Coluna a partir de rótulos e códigos inteiros (categórica ou de strings)"""
+    if categorias:
+        return pd.Categorical.from_codes(codigos, categories=list(rotulos))
+    return np.asarray(rotulos, dtype=object)[codigos]
+
+
+def fatores_por_populacao(estados: Sequence[str]) -> Dict[str, float]:
+    """
+    Fatores de escala proporcionais à população (1.0 = 1 milhão de habitantes)
+    
+    Args:
+        estados: Nomes das UFs
+    
+    Returns:
+        Dicionário {estado: fator}
+    """
+    return {estado: UNIDADES_FEDERACAO[estado][2] for estado in estados}
+
+
+def gerar_dados_sinteticos(estados: Union[Sequence[str], Dict[str, float], None] = None,
+                           anos: Sequence[int] = range(2015, 2026),
+                           indices: Optional[Dict[str, Tuple[float, float]]] = None,
+                           valores_base: Optional[Dict[str, Dict[str, float]]] = None,
+                           desvio_relativo: float = 0.15,
+                           valor_minimo: int = 0,
+                           arredondar: bool = False,
+                           municipios: bool = False,
+                           mensal: bool = False,
+                           categorias: bool = False,
+                           semente: int = 42) -> pd.DataFrame:
+    """
+    Gera dados sintéticos no formato longo com NumPy vetorizado
+    
+    Para cada (estado, índice, ano): valor = base + tendência * i + N(0, desvio),
+    com a base = fator do estado * base do índice (ou `valores_base`) e o desvio
+    proporcional à base do índice. Os sorteios seguem a ordem estado → índice → ano,
+    então a mesma semente reproduz os dados dos antigos laços de geração.
+    
+    Com `municipios` e/ou `mensal`, o total de cada estado/ano é repartido entre
+    municípios (pesos log-normais) e meses (sazonalidade) por sorteio de Poisson.
+    
+    Args:
+        estados: Lista de UFs, dicionário {estado: fator}, 'todos' para as 27 UFs
+                 (fatores pela população) ou None (Amazonas, Roraima e Acre)
+        anos: Anos da série (na ordem em que a tendência é aplicada)
+        indices: Dicionário {índice: (base, tendência)} (padrão: INDICES_PADRAO)
+        valores_base: Bases por {estado: {índice: base}}, no lugar de fator * base
+        desvio_relativo: Desvio padrão do ruído como fração da base
+        valor_minimo: Menor valor permitido
+        arredondar: Se True arredonda; se False trunca a parte decimal
+        municipios: Se True, uma linha por município (coluna 'Município')
+        mensal: Se True, uma linha por mês (coluna 'Mês')
+        categorias: Se True, colunas de texto como pd.Categorical (menos memória)
+        semente: Semente do gerador aleatório
+    
+    Returns:
+        DataFrame com Ano, [Mês], Estado, [Município], Índice de Violência, Valor
+    """
+    if estados is None:
+        fatores = dict(FATORES_REGIAO_NORTE)
+    elif isinstance(estados, str) and estados == 'todos':
+        fatores = fatores_por_populacao(UNIDADES_FEDERACAO)
+    elif isinstance(estados, dict):
+        fatores = dict(estados)
+    else:
+        fatores = {estado: FATORES_REGIAO_NORTE.get(estado, UNIDADES_FEDERACAO[estado][2])
+                   for estado in estados}
+    
+    indices = indices or INDICES_PADRAO
+    nomes_estados = list(fatores)
+    nomes_indices = list(indices)
+    anos = np.asarray(list(anos))
+    
+    base_indice = np.array([indices[nome][0] for nome in nomes_indices], dtype=float)
+    tendencia = np.array([indices[nome][1] for nome in nomes_indices], dtype=float)
+    
+    # Bases e desvios (estado × índice)
+    if valores_base is not None:
+        base = np.array([[valores_base[e][i] for i in nomes_indices] for e in nomes_estados],
+                        dtype=float)
+        escala = base * desvio_relativo
+    else:
+        base = np.array([fatores[e] for e in nomes_estados])[:, None] * base_indice[None, :]
+        escala = np.broadcast_to(base_indice * desvio_relativo, base.shape)
+    
+    # Valores (estado × índice × ano); RandomState mantém a sequência dos laços antigos
+    gerador = np.random.RandomState(semente)
+    passos = np.arange(len(anos))
+    ruido = gerador.normal(0, np.broadcast_to(escala[:, :, None],
+                                              (len(nomes_estados), len(nomes_indices), len(anos))))
+    valores = base[:, :, None] + tendencia[None, :, None] * passos[None, None, :] + ruido
+    valores = np.maximum(valor_minimo, np.rint(valores) if arredondar else np.trunc(valores))
+    valores = valores.astype(np.int64)
+    
+    if not municipios and not mensal:
+        codigo_estado, codigo_indice, codigo_ano = np.indices(valores.shape).reshape(3, -1)
+        return pd.DataFrame({
+            'Ano': anos[codigo_ano],
+            'Estado': _coluna(nomes_estados, codigo_estado, categorias),
+            'Índice de Violência': _coluna(nomes_indices, codigo_indice, categorias),
+            'Valor': valores.ravel(),
+        })
+    
+    # Unidades espaciais: municípios (peso dentro do estado) ou o próprio estado
+    if municipios:
+        quantidades = np.array([UNIDADES_FEDERACAO[e][1] for e in nomes_estados])
+        estado_da_unidade = np.repeat(np.arange(len(nomes_estados)), quantidades)
+        pesos = gerador.lognormal(0, 1, len(estado_da_unidade))
+        pesos /= np.bincount(estado_da_unidade, weights=pesos)[estado_da_unidade]
+        ordem = np.arange(len(estado_da_unidade)) - np.repeat(np.cumsum(quantidades) - quantidades,
+                                                             quantidades)
+        siglas = np.array([UNIDADES_FEDERACAO[e][0] for e in nomes_estados], dtype=object)
+        nomes_municipios = [f"Município {sigla}-{numero + 1:03d}"
+                            for sigla, numero in zip(siglas[estado_da_unidade], ordem)]
+    else:
+        estado_da_unidade = np.arange(len(nomes_estados))
+        pesos = np.ones(len(nomes_estados))
+    
+    meses = SAZONALIDADE_MENSAL / 12 if mensal else np.ones(1)
+    
+    # Médias (unidade × índice × ano × mês) e contagens por Poisson
+    medias = (valores[estado_da_unidade] * pesos[:, None, None])[..., None] * meses
+    contagens = gerador.poisson(medias)
+    if valor_minimo:
+        contagens = np.maximum(valor_minimo, contagens)
+    
+    codigo_unidade, codigo_indice, codigo_ano, codigo_mes = np.indices(contagens.shape,
+                                                                       sparse=True)
+    forma = contagens.shape
+    colunas = {'Ano': np.broadcast_to(anos[codigo_ano], forma).ravel()}
+    if mensal:
+        colunas['Mês'] = np.broadcast_to(codigo_mes + 1, forma).ravel().astype(np.int8)
+    colunas['Estado'] = _coluna(nomes_estados,
+                                np.broadcast_to(estado_da_unidade[codigo_unidade], forma).ravel(),
+                                categorias)
+    if municipios:
+        colunas['Município'] = _coluna(nomes_municipios,
+                                       np.broadcast_to(codigo_unidade, forma).ravel(),
+                                       categorias)
+    colunas['Índice de Violência'] = _coluna(nomes_indices,
+                                             np.broadcast_to(codigo_indice, forma).ravel(),
+                                             categorias)
+    colunas['Valor'] = contagens.ravel()
+    
+    return pd.DataFrame(colunas)
+
+
+def gerar_populacao_sintetica(estados: Optional[Sequence[str]] = None,
+                              anos: Sequence[int] = (2010, 2022),
+                              crescimento_anual: float = 0.008,
+                              fracao_feminina: float = 0.51,
+                              municipios: bool = False,
+                              semente: int = 42) -> pd.DataFrame:
+    """
+    Gera população feminina no formato do CSV do IBGE (ex.: anos de censo)
+    
+    Parte da população de UNIDADES_FEDERACAO (referente a 2022) e aplica um
+    crescimento anual constante; com `municipios`, reparte cada UF com pesos
+    log-normais, como em gerar_dados_sinteticos.
+    
+    Args:
+        estados: UFs (None = Amazonas, Roraima e Acre; 'todos' = 27 UFs)
+        anos: Anos com população informada
+        crescimento_anual: Taxa de crescimento usada para os outros anos
+        fracao_feminina: Fração de mulheres na população
+        municipios: Se True, uma linha por município
+        semente: Semente do gerador aleatório
+    
+    Returns:
+        DataFrame com Estado, [Município], Ano e População (mulheres)
+    """
+    if estados is None:
+        estados = list(FATORES_REGIAO_NORTE)
+    elif isinstance(estados, str) and estados == 'todos':
+        estados = list(UNIDADES_FEDERACAO)
+    anos = np.asarray(list(anos))
+    
+    base = np.array([UNIDADES_FEDERACAO[e][2] for e in estados]) * 1e6 * fracao_feminina
+    populacao = base[:, None] * (1 + crescimento_anual) ** (anos[None, :] - 2022)
+    
+    if not municipios:
+        codigo_estado, codigo_ano = np.indices(populacao.shape).reshape(2, -1)
+        return pd.DataFrame({
+            'Estado': np.asarray(estados, dtype=object)[codigo_estado],
+            'Ano': anos[codigo_ano],
+            'População': np.rint(populacao.ravel()).astype(np.int64),
+        })
+    
+    gerador = np.random.RandomState(semente)
+    quantidades = np.array([UNIDADES_FEDERACAO[e][1] for e in estados])
+    estado_da_unidade = np.repeat(np.arange(len(estados)), quantidades)
+    pesos = gerador.lognormal(0, 1, len(estado_da_unidade))
+    pesos /= np.bincount(estado_da_unidade, weights=pesos)[estado_da_unidade]
+    ordem = np.arange(len(estado_da_unidade)) - np.repeat(np.cumsum(quantidades) - quantidades,
+                                                         quantidades)
+    siglas = np.array([UNIDADES_FEDERACAO[e][0] for e in estados], dtype=object)
+    nomes_municipios = np.array([f"Município {sigla}-{numero + 1:03d}"
+                                 for sigla, numero in zip(siglas[estado_da_unidade], ordem)],
+                                dtype=object)
+    
+    por_municipio = populacao[estado_da_unidade] * pesos[:, None]
+    codigo_unidade, codigo_ano = np.indices(por_municipio.shape).reshape(2, -1)
+    return pd.DataFrame({
+        'Estado': np.asarray(estados, dtype=object)[estado_da_unidade[codigo_unidade]],
+        'Município': nomes_municipios[codigo_unidade],
+        'Ano': anos[codigo_ano],
+        'População': np.rint(por_municipio.ravel()).astype(np.int64),
+    })
@@ -0,0 +1,416 @@
+"""
+Módulo de Testes de Desempenho
+Mede a limpeza, a transformação, os gráficos e o relatório com dados sintéticos
+em várias escalas (e a extração de PDFs sintéticos, quando há Java), grava os
+tempos como linha de base em JSON e acusa regressões acima de um limite
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+import matplotlib
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+from analise_temporal import series_dos_dados
+from anomalias import detectar_anomalias
+from completar_series import SeriesCompletas
+from dados_sinteticos import gerar_dados_sinteticos
+from extracao_dados import ExtratorDadosPDF
+from gerar_graficos import GeradorGraficos
+from gerar_relatorio import GeradorRelatorioCompleto
+from linha_comando import SAIDA_FALHA, SAIDA_SUCESSO, SAIDA_USO_INVALIDO, java_disponivel
+
+
+# Escalas dos dados sintéticos: parâmetros de gerar_dados_sinteticos
+ESCALAS = {
+    'pequena': {'estados': None},                         # 3 estados, 132 linhas
+    'media': {'estados': 'todos'},                        # 27 UFs, 1.188 linhas
+    'grande': {'estados': 'todos', 'municipios': True},   # 5.570 municípios, 245 mil linhas
+}
+ESCALAS_PADRAO = ('pequena', 'media')
+
+ESTADOS_ALVO = ['Amazonas', 'Roraima', 'Acre']
+
+REPETICOES_PADRAO = 3
+LIMITE_PADRAO = 0.25        # regressão: mais de 25% acima da linha de base
+FOLGA_MINIMA = 0.005        # e mais de 5 ms (ruído de medições muito curtas)
+
+ARQUIVO_LINHA_DE_BASE = os.path.join('benchmarks', 'linha_de_base.json')
+
+# Linhas por página das tabelas dos PDFs sintéticos
+LINHAS_POR_PAGINA = 40
+
+
+def tabela_larga(df_longo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte os dados sintéticos para o formato largo de uma tabela de anuário
+    
+    Args:
+        df_longo: Dados no formato longo de gerar_dados_sinteticos
+    
+    Returns:
+        DataFrame com Estado, [Município], Ano e uma coluna por índice
+    """
+    chaves = [coluna for coluna in ('Estado', 'Município', 'Ano') if coluna in df_longo.columns]
+    larga = df_longo.pivot_table(index=chaves, columns='Índice de Violência',
+                                 values='Valor', aggfunc='sum', sort=False)
+    larga.columns.name = None
+    return larga.reset_index()
+
+
+def gerar_pdf_sintetico(df_larga: pd.DataFrame, caminho_pdf: str) -> str:
+    """
+    Grava uma tabela conhecida em um PDF (com bordas, para o tabula)
+    
+    Args:
+        df_larga: Tabela no formato largo
+        caminho_pdf: Arquivo PDF de saída
+    
+    Returns:
+        Caminho do PDF
+    """
+    pdf = FPDF(orientation='L', unit='mm', format='A4')
+    pdf.set_font('helvetica', size=8)
+    largura = (pdf.w - 2 * pdf.l_margin) / len(df_larga.columns)
+    cabecalho = [str(coluna) for coluna in df_larga.columns]
+    linhas = df_larga.astype(str).to_numpy()
+    
+    for inicio in range(0, max(len(linhas), 1), LINHAS_POR_PAGINA):
+        pdf.add_page()
+        for texto in cabecalho:
+            pdf.cell(largura, 6, texto, border=1)
+        pdf.ln()
+        for linha in linhas[inicio:inicio + LINHAS_POR_PAGINA]:
+            for texto in linha:
+                pdf.cell(largura, 5, texto, border=1)
+            pdf.ln()
+    
+    pdf.output(caminho_pdf)
+    return caminho_pdf
+
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> List[float]:
+    """
+    Executa a função `repeticoes` vezes (com a saída padrão silenciada)
+    
+    Args:
+        funcao: Função sem argumentos
+        repeticoes: Número de execuções
+    
+    Returns:
+        Duração de cada execução em segundos
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+class SuiteDesempenho:
+    """Classe para medir as etapas do projeto em várias escalas"""
+    
+    def __init__(self, escalas: Sequence[str] = ESCALAS_PADRAO,
+                 repeticoes: int = REPETICOES_PADRAO,
+                 filtro: Optional[str] = None,
+                 modo_rascunho: bool = False):
+        """
+        Inicializa a suíte
+        
+        Args:
+            escalas: Escalas de ESCALAS a medir
+            repeticoes: Execuções por medição (vale o menor tempo)
+            filtro: Mede apenas os casos cujo nome contém este texto
+            modo_rascunho: Gráficos e relatório em modo rascunho
+        """
+        self.escalas = list(escalas)
+        self.repeticoes = repeticoes
+        self.filtro = filtro
+        self.modo_rascunho = modo_rascunho
+        self.resultados: Dict[str, Dict] = {}
+        self.pulados: Dict[str, str] = {}
+        self.falhas: Dict[str, str] = {}
+    
+    def _caso(self, nome: str, funcao: Callable[[], object],
+              verificar: Optional[Callable[[object], bool]] = None):
+        """Mede um caso e, se informado, confere o resultado da última execução"""
+        if self.filtro and self.filtro not in nome:
+            return
+        
+        resultado = []
+        tempos = medir(lambda: resultado.append(funcao()), self.repeticoes)
+        if verificar is not None and not verificar(resultado[-1]):
+            self.falhas[nome] = 'resultado diferente do esperado'
+        
+        self.resultados[nome] = {
+            'melhor': min(tempos),
+            'mediana': statistics.median(tempos),
+            'tempos': tempos,
+        }
+        print(f"   ⏱️  {nome}: {min(tempos):.4f}s")
+    
+    def _medir_extracao(self, escala: str, df_larga: pd.DataFrame,
+                        extrator: ExtratorDadosPDF, pasta: str):
+        """Extração com tabula de um PDF sintético com tabela conhecida"""
+        nome = f"{escala}/extrair_tabelas_do_pdf"
+        if self.filtro and self.filtro not in nome:
+            return
+        if not java_disponivel():
+            self.pulados[nome] = 'Java não encontrado (necessário para o tabula-py)'
+            print(f"   ⏭️  {nome}: pulado (sem Java)")
+            return
+        
+        caminho_pdf = gerar_pdf_sintetico(df_larga, os.path.join(pasta, f"{escala}.pdf"))
+        self._caso(nome,
+                   lambda: extrator.extrair_tabelas_do_pdf(caminho_pdf),
+                   lambda tabelas: sum(len(tabela) for tabela in tabelas) == len(df_larga))
+    
+    def _medir_escala(self, escala: str, pasta: str):
+        """Mede todos os casos de uma escala"""
+        df_longo = gerar_dados_sinteticos(**ESCALAS[escala])
+        df_larga = tabela_larga(df_longo)
+        colunas_valor = list(df_longo['Índice de Violência'].unique())
+        extrator = ExtratorDadosPDF(estados_alvo=ESTADOS_ALVO)
+        
+        print(f"\n📏 Escala '{escala}': {len(df_longo):,} linhas no formato longo, "
+              f"{len(df_larga):,} na tabela larga")
+        
+        # Extração, limpeza e transformação (resultados conhecidos)
+        self._medir_extracao(escala, df_larga, extrator, pasta)
+        
+        esperadas = int(df_larga['Estado'].isin(ESTADOS_ALVO).sum())
+        self._caso(f"{escala}/limpar_e_filtrar_dados",
+                   lambda: extrator.limpar_e_filtrar_dados(df_larga, 2025),
+                   lambda df: len(df) == esperadas)
+        self._caso(f"{escala}/transformar_para_formato_longo",
+                   lambda: extrator.transformar_para_formato_longo(df_larga, colunas_valor),
+                   lambda df: len(df) == len(df_larga) * len(colunas_valor))
+        
+        # Completação de todas as séries (municípios, na escala grande) de uma vez
+        chaves = [coluna for coluna in ('Estado', 'Município', 'Índice de Violência')
+                  if coluna in df_longo]
+        rotulos, anos, matriz = series_dos_dados(df_longo, chaves)
+        self._caso(f"{escala}/SeriesCompletas",
+                   lambda: SeriesCompletas(matriz, anos),
+                   lambda series: series.valores.shape[0] == len(rotulos))
+        self._caso(f"{escala}/detectar_anomalias",
+                   lambda: detectar_anomalias(df_longo, chaves),
+                   lambda anomalias: anomalias.empty)
+        
+        # Gráficos
+        pasta_graficos = os.path.join(pasta, escala)
+        gerador = GeradorGraficos(df_longo, pasta_saida=pasta_graficos,
+                                  modo_rascunho=self.modo_rascunho)
+        estado = df_longo['Estado'].iloc[0]
+        indice = colunas_valor[0]
+        opcoes_heatmap = {'coluna_linha': 'Município'} if 'Município' in df_longo else {}
+        
+        casos_graficos = {
+            'grafico_serie_temporal_por_estado': lambda: gerador.grafico_serie_temporal_por_estado(estado),
+            'grafico_comparativo_estados': lambda: gerador.grafico_comparativo_estados(indice),
+            'grafico_heatmap_estados_anos': lambda: gerador.grafico_heatmap_estados_anos(
+                indice, **opcoes_heatmap),
+            'grafico_tendencia_geral': lambda: gerador.grafico_tendencia_geral(),
+            'grafico_crescimento_composto': lambda: gerador.grafico_crescimento_composto(),
+            'grafico_variacao_anual': lambda: gerador.grafico_variacao_anual(),
+            'grafico_media_movel_estado': lambda: gerador.grafico_media_movel_estado(estado),
+        }
+        graficos = {}
+        for metodo, funcao in casos_graficos.items():
+            self._caso(f"{escala}/GeradorGraficos.{metodo}",
+                       lambda funcao=funcao, metodo=metodo: graficos.update({metodo: funcao()}))
+        
+        # Relatório (com os gráficos da escala, ou gerados agora se foram filtrados)
+        nome = f"{escala}/GeradorRelatorioCompleto.gerar_relatorio"
+        if self.filtro and self.filtro not in nome:
+            return
+        if len(graficos) < len(casos_graficos):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for metodo, funcao in casos_graficos.items():
+                    graficos.setdefault(metodo, funcao())
+        
+        arquivo_pdf = os.path.join(pasta, f"relatorio_{escala}.pdf")
+        self._caso(nome,
+                   lambda: GeradorRelatorioCompleto(modo_rascunho=self.modo_rascunho).gerar_relatorio(
+                       list(graficos.values()), arquivo_pdf, df_dados=df_longo),
+                   lambda sucesso: bool(sucesso))
+    
+    def executar(self) -> Dict:
+        """
+        Mede todas as escalas em uma pasta temporária
+        
+        Returns:
+            Dicionário com ambiente, resultados, casos pulados e falhas
+        """
+        matplotlib.use('Agg')
+        pasta = tempfile.mkdtemp(prefix='desempenho_')
+        try:
+            for escala in self.escalas:
+                self._medir_escala(escala, pasta)
+        finally:
+            shutil.rmtree(pasta, ignore_errors=True)
+        
+        return {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'ambiente': {
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'matplotlib': matplotlib.__version__,
+            },
+            'repeticoes': self.repeticoes,
+            'modo_rascunho': self.modo_rascunho,
+            'resultados': self.resultados,
+            'pulados': self.pulados,
+            'falhas': self.falhas,
+        }
+
+
+def comparar_com_linha_de_base(atual: Dict, linha_de_base: Dict,
+                               limite: float = LIMITE_PADRAO,
+                               folga_minima: float = FOLGA_MINIMA) -> List[Dict]:
+    """
+    Compara os melhores tempos com os da linha de base
+    
+    Um caso regride quando fica mais de `limite` (fração) e mais de
+    `folga_minima` segundos acima da linha de base.
+    
+    Args:
+        atual: Resultado de SuiteDesempenho.executar
+        linha_de_base: Resultado gravado anteriormente
+        limite: Aumento relativo tolerado (0.25 = 25%)
+        folga_minima: Aumento absoluto tolerado em segundos
+    
+    Returns:
+        Lista de comparações {caso, base, atual, razao, regressao}, na ordem de `atual`
+    """
+    base = linha_de_base.get('resultados', {})
+    comparacoes = []
+    for caso, medicao in atual['resultados'].items():
+        if caso not in base:
+            continue
+        tempo_base, tempo_atual = base[caso]['melhor'], medicao['melhor']
+        razao = tempo_atual / tempo_base if tempo_base > 0 else float('inf')
+        comparacoes.append({
+            'caso': caso,
+            'base': tempo_base,
+            'atual': tempo_atual,
+            'razao': razao,
+            'regressao': (razao > 1 + limite and tempo_atual - tempo_base > folga_minima),
+        })
+    return comparacoes
+
+
+def imprimir_comparacoes(comparacoes: List[Dict], limite: float):
+    """Mostra a tabela de comparação com a linha de base"""
+    print(f"\n📊 Comparação com a linha de base (limite: +{limite:.0%}):")
+    for item in comparacoes:
+        marca = '❌' if item['regressao'] else '✅'
+        print(f"   {marca} {item['caso']}: {item['base']:.4f}s → {item['atual']:.4f}s "
+              f"({item['razao'] - 1:+.1%})")
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria o parser dos argumentos da suíte de desempenho"""
+    parser = argparse.ArgumentParser(
+        description='Mede o desempenho das etapas com dados sintéticos e compara '
+                    'com uma linha de base em JSON.',
+        epilog=f'Códigos de saída: {SAIDA_SUCESSO} = sem regressões, '
+               f'{SAIDA_FALHA} = regressão ou resultado incorreto, '
+               f'{SAIDA_USO_INVALIDO} = argumentos inválidos.'
+    )
+    parser.add_argument('--escalas', nargs='+', choices=list(ESCALAS),
+                        default=list(ESCALAS_PADRAO), help='Escalas dos dados sintéticos')
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO,
+                        help='Execuções por caso; vale o menor tempo')
+    parser.add_argument('--filtro', help='Mede apenas os casos cujo nome contém o texto')
+    parser.add_argument('--linha-de-base', default=ARQUIVO_LINHA_DE_BASE,
+                        help='Arquivo JSON da linha de base')
+    parser.add_argument('--limite', type=float, default=LIMITE_PADRAO,
+                        help='Aumento relativo tolerado (0.25 = 25%%)')
+    parser.add_argument('--folga', type=float, default=FOLGA_MINIMA,
+                        help='Aumento absoluto tolerado em segundos (ruído)')
+    parser.add_argument('--gravar', action='store_true',
+                        help='Grava os tempos medidos como a nova linha de base')
+    parser.add_argument('--saida', help='Grava os resultados desta execução em JSON')
+    parser.add_argument('--rascunho', action='store_true',
+                        help='Gráficos e relatório em modo rascunho')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Executa a suíte de desempenho pela linha de comando
+    
+    Args:
+        argv: Argumentos (padrão: sys.argv)
+    
+    Returns:
+        Código de saída
+    """
+    argumentos = criar_parser().parse_args(argv)
+    if argumentos.repeticoes < 1 or argumentos.limite < 0 or argumentos.folga < 0:
+        print("❌ --repeticoes deve ser >= 1; --limite e --folga, >= 0", file=sys.stderr)
+        return SAIDA_USO_INVALIDO
+    
+    suite = SuiteDesempenho(argumentos.escalas, argumentos.repeticoes,
+                            argumentos.filtro, argumentos.rascunho)
+    resultado = suite.executar()
+    
+    if argumentos.saida:
+        with open(argumentos.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    
+    codigo = SAIDA_SUCESSO
+    for caso, motivo in resultado['falhas'].items():
+        print(f"❌ {caso}: {motivo}")
+        codigo = SAIDA_FALHA
+    
+    if argumentos.gravar:
+        os.makedirs(os.path.dirname(argumentos.linha_de_base) or '.', exist_ok=True)
+        with open(argumentos.linha_de_base, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\n💾 Linha de base gravada: {argumentos.linha_de_base}")
+        return codigo
+    
+    if not os.path.exists(argumentos.linha_de_base):
+        print(f"\n⚠️  Linha de base não encontrada ({argumentos.linha_de_base}); "
+              "use --gravar para criá-la")
+        return codigo
+    
+    with open(argumentos.linha_de_base, encoding='utf-8') as arquivo:
+        linha_de_base = json.load(arquivo)
+    
+    comparacoes = comparar_com_linha_de_base(resultado, linha_de_base,
+                                             argumentos.limite, argumentos.folga)
+    imprimir_comparacoes(comparacoes, argumentos.limite)
+    
+    regressoes = [item['caso'] for item in comparacoes if item['regressao']]
+    if regressoes:
+        print(f"\n❌ {len(regressoes)} regressão(ões) acima de {argumentos.limite:.0%}: "
+              f"{', '.join(regressoes)}")
+        return SAIDA_FALHA
+    
+    if codigo == SAIDA_SUCESSO:
+        print("\n✅ Nenhuma regressão de desempenho")
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,461 @@
+"""
+Etapas Padrão do Pipeline
+Funções de etapa (extração por ano, gráficos, relatório) usadas pelos scripts
+para montar o fluxo extração → limpeza → formato longo → gráficos → relatório
+com cache
+"""
+
+import os
+import pandas as pd
+from typing import List, Optional, Sequence
+
+from armazenamento import EXTENSOES_BANCO, BancoDados
+from anomalias import (detectar_anomalias, imprimir_anomalias, salvar_anomalias,
+                       separar_quarentena)
+from cubo_agregado import CuboAgregado
+from extracao_dados import ExtratorDadosPDF
+from gerar_graficos import GeradorGraficos
+from gerar_relatorio import GeradorRelatorioCompleto
+from instantaneo import salvar_instantaneo
+from pipeline import Pipeline
+from planilhas import LeitorPlanilhas
+from populacao import ReferenciaPopulacional, adicionar_indices_de_taxa
+
+
+def extrair_ano(caminho_pdf: str,
+                ano: int,
+                estados_alvo: Optional[List[str]] = None,
+                modo_rascunho: bool = False,
+                termos_paginas: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Extrai e limpa as tabelas de um anuário
+    
+    Args:
+        caminho_pdf: Caminho do PDF
+        ano: Ano dos dados
+        estados_alvo: Estados para filtrar
+        modo_rascunho: Se True, extrai apenas uma amostra de páginas
+        termos_paginas: Se informados, só as páginas com esses termos são extraídas
+    
+    Returns:
+        DataFrame do ano
+    """
+    extrator = ExtratorDadosPDF(estados_alvo=estados_alvo, modo_rascunho=modo_rascunho,
+                                termos_paginas=termos_paginas)
+    return extrator.processar_pdf(caminho_pdf, ano)
+
+
+def consolidar_anos(*dfs_anos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatena os DataFrames de cada ano
+    
+    Args:
+        *dfs_anos: DataFrames extraídos por ano
+    
+    Returns:
+        DataFrame consolidado (vazio se nenhum ano tiver dados)
+    """
+    dfs = [df for df in dfs_anos if not df.empty]
+    if not dfs:
+        return pd.DataFrame()
+    return pd.concat(dfs, ignore_index=True)
+
+
+def converter_formato_longo(df_dados: pd.DataFrame,
+                            estados_alvo: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Passa as tabelas extraídas (uma coluna por indicador) ao formato longo
+    
+    Args:
+        df_dados: Tabelas consolidadas dos anuários
+        estados_alvo: Estados para filtrar
+    
+    Returns:
+        DataFrame com Estado, Ano, Índice de Violência e Valor
+    """
+    return ExtratorDadosPDF(estados_alvo=estados_alvo).preparar_para_banco(df_dados)
+
+
+def ler_planilha(caminho_planilha: str,
+                 estados_alvo: Optional[List[str]] = None,
+                 anos: Optional[List[int]] = None,
+                 indice: Optional[str] = None) -> pd.DataFrame:
+    """
+    Lê uma planilha XLSX/CSV do FBSP ou do IPEA no formato longo
+    
+    Args:
+        caminho_planilha: Caminho do arquivo
+        estados_alvo: Estados mantidos durante a leitura
+        anos: Se informado, mantém apenas estes anos
+        indice: Índice de Violência de planilhas sem essa coluna
+    
+    Returns:
+        DataFrame com Estado, [Município], Ano, Índice de Violência e Valor
+    """
+    df = LeitorPlanilhas(estados_alvo).ler(caminho_planilha, indice=indice)
+    if anos and not df.empty:
+        df = df[df['Ano'].isin(anos)].reset_index(drop=True)
+    return df
+
+
+# Extensão do arquivo de cada formato de dados aceito por ExtratorDadosPDF.salvar_dados
+EXTENSOES_DADOS = {'csv': '.csv', 'excel': '.xlsx', 'sqlite': '.sqlite'}
+
+
+def carregar_dados(arquivo_dados: str,
+                   estados: Optional[List[str]] = None,
+                   anos: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    Carrega dados consolidados de um CSV ou banco local já existente
+    
+    No banco (.sqlite/.duckdb), os filtros são aplicados na consulta.
+    
+    Args:
+        arquivo_dados: Caminho do CSV (formato longo) ou do banco
+        estados: Se informado, mantém apenas estes estados
+        anos: Se informado, mantém apenas estes anos
+    
+    Returns:
+        DataFrame filtrado
+    """
+    if os.path.splitext(arquivo_dados)[1].lower() in EXTENSOES_BANCO:
+        with BancoDados(arquivo_dados) as banco:
+            return banco.consultar(estados=estados, anos=anos)
+    
+    df = pd.read_csv(arquivo_dados, encoding='utf-8-sig')
+    if estados:
+        df = df[df['Estado'].isin(estados)]
+    if anos:
+        df = df[df['Ano'].isin(anos)]
+    return df.reset_index(drop=True)
+
+
+def exportar_dados(df_dados: pd.DataFrame,
+                   arquivo_saida: str,
+                   formatos: Sequence[str] = ('csv',)) -> List[str]:
+    """
+    Salva os dados em cada formato pedido
+    
+    Args:
+        df_dados: DataFrame a salvar
+        arquivo_saida: Caminho do arquivo (a extensão é trocada conforme o formato)
+        formatos: Formatos de EXTENSOES_DADOS ('csv', 'excel', 'sqlite')
+    
+    Returns:
+        Caminhos dos arquivos salvos
+    """
+    extrator = ExtratorDadosPDF()
+    base = os.path.splitext(arquivo_saida)[0]
+    caminhos = []
+    for formato in formatos:
+        caminho = base + EXTENSOES_DADOS[formato]
+        if extrator.salvar_dados(df_dados, caminho, formato):
+            caminhos.append(caminho)
+    return caminhos
+
+
+def graficos_series_temporais(df_dados: pd.DataFrame,
+                              cubo: CuboAgregado,
+                              pasta_saida: str = 'graficos',
+                              modo_rascunho: bool = False,
+                              formatos_extras: Sequence[str] = ()) -> List[str]:
+    """Gera as séries temporais de cada estado"""
+    gerador = GeradorGraficos(df_dados, pasta_saida, modo_rascunho, formatos_extras, cubo)
+    for estado in cubo.rotulos['Estado']:
+        gerador.grafico_serie_temporal_por_estado(estado)
+    return gerador.arquivos_gerados + gerador.arquivos_extras
+
+
+def graficos_comparativos(df_dados: pd.DataFrame,
+                          cubo: CuboAgregado,
+                          pasta_saida: str = 'graficos',
+                          modo_rascunho: bool = False,
+                          formatos_extras: Sequence[str] = ()) -> List[str]:
+    """Gera os comparativos entre estados de cada índice"""
+    gerador = GeradorGraficos(df_dados, pasta_saida, modo_rascunho, formatos_extras, cubo)
+    for indice in cubo.rotulos['Índice de Violência']:
+        gerador.grafico_comparativo_estados(indice, tipo='linha')
+    return gerador.arquivos_gerados + gerador.arquivos_extras
+
+
+def graficos_heatmaps(df_dados: pd.DataFrame,
+                      cubo: CuboAgregado,
+                      pasta_saida: str = 'graficos',
+                      modo_rascunho: bool = False,
+                      formatos_extras: Sequence[str] = ()) -> List[str]:
+    """Gera os mapas de calor de cada índice"""
+    gerador = GeradorGraficos(df_dados, pasta_saida, modo_rascunho, formatos_extras, cubo)
+    for indice in cubo.rotulos['Índice de Violência']:
+        gerador.grafico_heatmap_estados_anos(indice)
+    return gerador.arquivos_gerados + gerador.arquivos_extras
+
+
+def grafico_tendencia(df_dados: pd.DataFrame,
+                      cubo: CuboAgregado,
+                      pasta_saida: str = 'graficos',
+                      modo_rascunho: bool = False,
+                      formatos_extras: Sequence[str] = ()) -> List[str]:
+    """Gera o gráfico de tendência geral da região"""
+    gerador = GeradorGraficos(df_dados, pasta_saida, modo_rascunho, formatos_extras, cubo)
+    gerador.grafico_tendencia_geral()
+    return gerador.arquivos_gerados + gerador.arquivos_extras
+
+
+def graficos_analise_temporal(df_dados: pd.DataFrame,
+                              cubo: CuboAgregado,
+                              pasta_saida: str = 'graficos',
+                              modo_rascunho: bool = False,
+                              formatos_extras: Sequence[str] = ()) -> List[str]:
+    """Gera os gráficos de crescimento, variação anual e média móvel"""
+    gerador = GeradorGraficos(df_dados, pasta_saida, modo_rascunho, formatos_extras, cubo)
+    gerador.grafico_crescimento_composto()
+    gerador.grafico_variacao_anual()
+    for estado in cubo.rotulos['Estado']:
+        gerador.grafico_media_movel_estado(estado)
+    return gerador.arquivos_gerados + gerador.arquivos_extras
+
+
+def verificar_anomalias(df_dados: pd.DataFrame,
+                        arquivo_anomalias: Optional[str] = None) -> pd.DataFrame:
+    """
+    Procura valores anômalos em todas as séries e salva a lista em CSV
+    
+    Args:
+        df_dados: Dados em formato longo
+        arquivo_anomalias: CSV das anomalias (None = só mostra no console)
+    
+    Returns:
+        DataFrame das anomalias (ver anomalias.detectar_anomalias)
+    """
+    anomalias = detectar_anomalias(df_dados)
+    imprimir_anomalias(anomalias)
+    if arquivo_anomalias:
+        salvar_anomalias(anomalias, arquivo_anomalias)
+    return anomalias
+
+
+def aplicar_quarentena(df_dados: pd.DataFrame,
+                       anomalias: pd.DataFrame) -> pd.DataFrame:
+    """Retira dos dados as linhas marcadas como anômalas antes dos gráficos"""
+    df_limpo, df_quarentena = separar_quarentena(df_dados, anomalias)
+    if len(df_quarentena):
+        print(f"🚧 {len(df_quarentena)} linha(s) em quarentena (fora dos gráficos e do relatório)")
+    return df_limpo
+
+
+def adicionar_taxas(df_dados: pd.DataFrame,
+                    arquivo_populacao: str,
+                    nivel: str = 'Estado') -> pd.DataFrame:
+    """Acrescenta as taxas por 100 mil mulheres como índices extras"""
+    referencia = ReferenciaPopulacional.de_csv(arquivo_populacao)
+    return adicionar_indices_de_taxa(df_dados, referencia, nivel=nivel)
+
+
+def construir_cubo(df_dados: pd.DataFrame) -> CuboAgregado:
+    """Agrega os dados uma única vez para os gráficos e o relatório"""
+    return CuboAgregado(df_dados)
+
+
+def gerar_relatorio_pdf(df_dados: pd.DataFrame,
+                        cubo: CuboAgregado,
+                        *listas_graficos: List[str],
+                        arquivo_saida: str = 'relatorio.pdf',
+                        titulo: str = "Análise de Violência contra Mulheres",
+                        subtitulo: str = "Região Norte - Amazonas, Roraima e Acre",
+                        periodo: str = "2015-2025",
+                        modo_rascunho: bool = False,
+                        **textos) -> str:
+    """
+    Gera o relatório PDF a partir dos dados e das listas de gráficos
+    
+    Args:
+        df_dados: Dados consolidados (usados no anexo de tabelas)
+        cubo: Cubo agregado dos dados (estatísticas resumidas)
+        *listas_graficos: Listas de caminhos de gráficos, na ordem do relatório
+                          (apenas os PNG entram no relatório)
+        arquivo_saida: Caminho do PDF
+        titulo: Título do relatório
+        subtitulo: Subtítulo do relatório
+        periodo: Período analisado
+        modo_rascunho: Se True, relatório leve com miniaturas
+        **textos: autor, instituicao, introducao, conclusao
+    
+    Returns:
+        Caminho do PDF ('' se a geração falhar)
+    """
+    caminhos_graficos = [caminho for lista in listas_graficos for caminho in lista
+                         if caminho.lower().endswith('.png')]
+    
+    gerador = GeradorRelatorioCompleto(titulo, subtitulo, periodo, modo_rascunho=modo_rascunho)
+    sucesso = gerador.gerar_relatorio(
+        caminhos_graficos=caminhos_graficos,
+        arquivo_saida=arquivo_saida,
+        df_dados=df_dados,
+        cubo=cubo,
+        **textos
+    )
+    return arquivo_saida if sucesso else ""
+
+
+# Etapas de gráficos na ordem em que aparecem no relatório
+ETAPAS_GRAFICOS = {
+    'graficos_series': graficos_series_temporais,
+    'graficos_comparativos': graficos_comparativos,
+    'graficos_heatmaps': graficos_heatmaps,
+    'grafico_tendencia': grafico_tendencia,
+    'graficos_analise': graficos_analise_temporal,
+}
+
+
+def adicionar_etapas_extracao(pipeline: Pipeline,
+                              caminhos_pdfs: dict,
+                              estados_alvo: Optional[List[str]] = None,
+                              modo_rascunho: bool = False,
+                              nome_etapa: str = 'dados_extraidos',
+                              termos_paginas: Optional[List[str]] = None) -> Pipeline:
+    """
+    Registra uma etapa de extração por ano, a consolidação dos anos e a
+    passagem ao formato longo
+    
+    Args:
+        pipeline: Pipeline a completar
+        caminhos_pdfs: Dicionário {ano: caminho_pdf}
+        estados_alvo: Estados para filtrar
+        modo_rascunho: Se True, extrai apenas uma amostra de páginas
+        nome_etapa: Nome da etapa com os dados no formato longo (a consolidação
+                    das tabelas fica em '<nome_etapa>_tabelas')
+        termos_paginas: Se informados, só as páginas com esses termos são extraídas
+    
+    Returns:
+        O próprio pipeline
+    """
+    etapas_anos = []
+    for ano in sorted(caminhos_pdfs):
+        nome = f'extrair_{ano}'
+        pipeline.etapa(nome, extrair_ano,
+                       arquivos=[caminhos_pdfs[ano]],
+                       caminho_pdf=caminhos_pdfs[ano],
+                       ano=ano,
+                       estados_alvo=estados_alvo,
+                       modo_rascunho=modo_rascunho,
+                       termos_paginas=termos_paginas)
+        etapas_anos.append(nome)
+    
+    etapa_tabelas = f'{nome_etapa}_tabelas'
+    pipeline.etapa(etapa_tabelas, consolidar_anos, dependencias=etapas_anos)
+    return pipeline.etapa(nome_etapa, converter_formato_longo,
+                          dependencias=[etapa_tabelas],
+                          estados_alvo=estados_alvo)
+
+
+def adicionar_etapas_planilhas(pipeline: Pipeline,
+                               caminhos_planilhas: Sequence[str],
+                               estados_alvo: Optional[List[str]] = None,
+                               anos: Optional[List[int]] = None,
+                               nome_etapa: str = 'dados_planilhas') -> Pipeline:
+    """
+    Registra uma etapa de leitura por planilha e a consolidação delas
+    
+    Args:
+        pipeline: Pipeline a completar
+        caminhos_planilhas: Arquivos XLSX/CSV do FBSP ou do IPEA
+        estados_alvo: Estados para filtrar
+        anos: Se informado, mantém apenas estes anos
+        nome_etapa: Nome da etapa de consolidação
+    
+    Returns:
+        O próprio pipeline
+    """
+    etapas_planilhas = []
+    for numero, caminho in enumerate(caminhos_planilhas, start=1):
+        nome = f'planilha_{numero}'
+        pipeline.etapa(nome, ler_planilha,
+                       arquivos=[caminho],
+                       caminho_planilha=caminho,
+                       estados_alvo=estados_alvo,
+                       anos=anos)
+        etapas_planilhas.append(nome)
+    
+    return pipeline.etapa(nome_etapa, consolidar_anos, dependencias=etapas_planilhas)
+
+
+def adicionar_etapas_graficos_e_relatorio(pipeline: Pipeline,
+                                          etapa_dados: str,
+                                          pasta_graficos: str = 'graficos',
+                                          arquivo_saida: str = 'relatorio.pdf',
+                                          modo_rascunho: bool = False,
+                                          arquivo_dados: Optional[str] = None,
+                                          formatos_dados: Sequence[str] = ('csv',),
+                                          formatos_graficos: Sequence[str] = (),
+                                          arquivo_populacao: Optional[str] = None,
+                                          nivel_taxas: str = 'Estado',
+                                          arquivo_anomalias: Optional[str] = None,
+                                          quarentena: bool = False,
+                                          arquivo_instantaneo: Optional[str] = None,
+                                          **opcoes_relatorio) -> Pipeline:
+    """
+    Registra as etapas de exportação, detecção de anomalias, cubo agregado,
+    gráficos (uma por tipo, independentes) e relatório
+    
+    Args:
+        pipeline: Pipeline a completar
+        etapa_dados: Nome da etapa que produz os dados em formato longo
+        pasta_graficos: Pasta dos gráficos
+        arquivo_saida: Caminho do PDF
+        modo_rascunho: Se True, gráficos e relatório em modo rascunho
+        arquivo_dados: Se informado, registra a etapa 'exportar_dados'
+        formatos_dados: Formatos da exportação ('csv', 'excel', 'sqlite')
+        formatos_graficos: Formatos salvos além do PNG ('svg', 'pdf')
+        arquivo_populacao: CSV de população feminina (IBGE); se informado, registra
+                           a etapa 'taxas' e gráficos e relatório incluem as taxas
+        nivel_taxas: 'Estado' ou 'Município'
+        arquivo_anomalias: CSV onde a etapa 'anomalias' salva os valores marcados
+        quarentena: Se True, registra a etapa 'quarentena', que retira os valores
+                    marcados antes dos gráficos e do relatório
+        arquivo_instantaneo: Se informado, registra a etapa 'instantaneo', que grava
+                             dados, gráficos preparados e métricas para refazer só o
+                             PDF depois (ver InstantaneoRelatorio)
+        **opcoes_relatorio: titulo, subtitulo, periodo, autor, instituicao,
+                            introducao, conclusao
+    
+    Returns:
+        O próprio pipeline
+    """
+    if arquivo_dados:
+        pipeline.etapa('exportar_dados', exportar_dados, dependencias=[etapa_dados],
+                       arquivo_saida=arquivo_dados,
+                       formatos=list(formatos_dados))
+    
+    pipeline.etapa('anomalias', verificar_anomalias, dependencias=[etapa_dados],
+                   arquivo_anomalias=arquivo_anomalias)
+    if quarentena:
+        pipeline.etapa('quarentena', aplicar_quarentena,
+                       dependencias=[etapa_dados, 'anomalias'])
+        etapa_dados = 'quarentena'
+    
+    if arquivo_populacao:
+        pipeline.etapa('taxas', adicionar_taxas, dependencias=[etapa_dados],
+                       arquivos=[arquivo_populacao],
+                       arquivo_populacao=arquivo_populacao,
+                       nivel=nivel_taxas)
+        etapa_dados = 'taxas'
+    
+    pipeline.etapa('cubo', construir_cubo, dependencias=[etapa_dados])
+    
+    for nome, funcao in ETAPAS_GRAFICOS.items():
+        pipeline.etapa(nome, funcao, dependencias=[etapa_dados, 'cubo'],
+                       pasta_saida=os.path.abspath(pasta_graficos),
+                       modo_rascunho=modo_rascunho,
+                       formatos_extras=list(formatos_graficos))
+    
+    if arquivo_instantaneo:
+        pipeline.etapa('instantaneo', salvar_instantaneo,
+                       dependencias=[etapa_dados, 'cubo'] + list(ETAPAS_GRAFICOS),
+                       arquivo_instantaneo=arquivo_instantaneo,
+                       modo_rascunho=modo_rascunho)
+    
+    return pipeline.etapa('relatorio', gerar_relatorio_pdf,
+                          dependencias=[etapa_dados, 'cubo'] + list(ETAPAS_GRAFICOS),
+                          arquivo_saida=arquivo_saida,
+                          modo_rascunho=modo_rascunho,
+                          **opcoes_relatorio)
@@ -3,38 +3,191 @@ Módulo de Extração de Dados de PDFs
 Extrai dados de violência contra mulheres dos Anuários de Segurança Pública
 """
 
+import numpy as np
 import pandas as pd
 import tabula
 import os
-from typing import List, Dict, Optional
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Sequence
 import warnings
 
+from armazenamento import BancoDados
+from cabecalhos import (coluna_de_localidade, linhas_de_cabecalho, nomes_das_colunas,
+                        reconstruir_cabecalho)
+from localidades import IndiceLocalidades, indice_ufs
+from memoria_compartilhada import compartilhar_tabela, receber_tabela
+from paginas_pdf import abrir_pdf, fechar_documentos, localizar_paginas
+from planilhas import converter_numeros
+from proveniencia import (COLUNAS_ORIGEM, adicionar_origem, codigo_pdf, mascara_pagina,
+                          tem_origem)
+
 warnings.filterwarnings('ignore')
 
+# Modo rascunho: número máximo de páginas amostradas por PDF
+PAGINAS_AMOSTRA_RASCUNHO = 10
+
+# Métodos do tabula, na ordem em que são tentados, e suas opções
+METODOS_EXTRACAO = ('stream', 'lattice')
+OPCOES_METODO = {
+    'stream': {'stream': True, 'guess': True},
+    'lattice': {'lattice': True},
+}
+
+
+def tabela_json_para_dataframe(tabela: dict, multinivel: bool = True) -> pd.DataFrame:
+    """
+    Converte uma tabela da saída JSON do tabula em DataFrame
+    
+    Com cabeçalho de uma linha, reproduz a conversão do próprio tabula-py
+    (nomes vazios viram "Unnamed: N", repetidos ganham ".1", ".2"...). Com
+    cabeçalho de várias linhas ou células mescladas, os nomes são remontados
+    pelas coordenadas das células (ver cabecalhos.reconstruir_cabecalho) e
+    `attrs['niveis_cabecalho']` guarda os rótulos de cada coluna. A coluna de
+    estados/municípios reconhecida pelo rótulo fica em `attrs['coluna_localidade']`.
+    As colunas inteiramente numéricas são convertidas, com o ponto de milhar
+    do padrão brasileiro ('1.234' vira 1234).
+    
+    Args:
+        tabela: Tabela do JSON do tabula ('data': linhas de células com
+                'text', 'left', 'top', 'width' e 'height')
+        multinivel: Se True, procura cabeçalhos de várias linhas
+    
+    Returns:
+        DataFrame (vazio se a tabela não tiver linhas)
+    """
+    dados = tabela['data']
+    linhas = [[celula['text'] or np.nan for celula in linha] for linha in dados]
+    if not linhas:
+        return pd.DataFrame()
+    
+    n_cabecalho = linhas_de_cabecalho(dados) if multinivel else 1
+    if n_cabecalho > 1:
+        niveis, n_cabecalho = reconstruir_cabecalho(dados, n_cabecalho)
+    else:
+        niveis = [() if nome is np.nan else (nome,) for nome in linhas[0]]
+    cabecalho = nomes_das_colunas(niveis)
+    del linhas[:n_cabecalho]
+    
+    df = pd.DataFrame(linhas, columns=cabecalho)
+    for coluna in df.columns:
+        # Padrão brasileiro: '1.234' é mil duzentos e trinta e quatro
+        numeros = converter_numeros(df[coluna])
+        if numeros.notna().sum() == df[coluna].notna().sum():
+            inteiros = numeros.notna().all() and (numeros % 1 == 0).all()
+            df[coluna] = numeros.astype('int64') if inteiros else numeros
+    
+    if n_cabecalho > 1:
+        df.attrs['niveis_cabecalho'] = dict(zip(cabecalho, niveis))
+    df.attrs['coluna_localidade'] = coluna_de_localidade(cabecalho)
+    return df
+
+
+def _processar_pdf_em_processo(extrator: 'ExtratorDadosPDF', caminho_pdf: str, ano: int):
+    """Processa um PDF noutro processo e devolve o resultado pela memória compartilhada"""
+    return compartilhar_tabela(extrator.processar_pdf(caminho_pdf, ano))
+
 
 class ExtratorDadosPDF:
     """Classe para extrair e processar dados de PDFs de anuários"""
     
-    def __init__(self, estados_alvo: List[str] = None):
+    def __init__(self, estados_alvo: List[str] = None,
+                 modo_rascunho: bool = False,
+                 paginas_amostra: int = PAGINAS_AMOSTRA_RASCUNHO,
+                 localidades: Optional[IndiceLocalidades] = None,
+                 cabecalhos_multinivel: bool = True,
+                 termos_paginas: Optional[Sequence[str]] = None):
         """
         Inicializa o extrator
         
         Args:
             estados_alvo: Lista de estados para filtrar (padrão: Amazonas, Roraima, Acre)
+            modo_rascunho: Se True, extrai apenas uma amostra das páginas de cada PDF
+            paginas_amostra: Número de páginas amostradas por PDF no modo rascunho
+            localidades: Índice de UFs e municípios usado para reconhecer os
+                         estados nas tabelas (padrão: só as 27 UFs)
+            cabecalhos_multinivel: Se True, remonta cabeçalhos de várias linhas
+                                   e células mescladas pelas coordenadas das células
+            termos_paginas: Se informados, em vez de todas as páginas só as que
+                            contêm todos os termos vão ao tabula (ver
+                            paginas_pdf.localizar_paginas)
         """
         self.estados_alvo = estados_alvo or ['Amazonas', 'Roraima', 'Acre']
+        self.modo_rascunho = modo_rascunho
+        self.paginas_amostra = paginas_amostra
+        self.localidades = localidades or indice_ufs()
+        self.cabecalhos_multinivel = cabecalhos_multinivel
+        self.termos_paginas = list(termos_paginas or [])
+        self._alvos = set(self.localidades.estados(pd.Series(self.estados_alvo)).dropna())
         self.dados_consolidados = []
     
+    def _expandir_paginas(self, caminho_pdf: str, paginas: str) -> List[int]:
+        """
+        Converte a especificação de páginas ('all', '1,2,3', '1-5') em lista
+        
+        Args:
+            caminho_pdf: Caminho do PDF (usado para contar páginas em 'all')
+            paginas: Especificação de páginas no formato do tabula
+            
+        Returns:
+            Lista ordenada de números de página (1-based)
+        """
+        if str(paginas).lower() == 'all':
+            return list(range(1, len(abrir_pdf(caminho_pdf)) + 1))
+        
+        numeros = set()
+        for parte in str(paginas).split(','):
+            parte = parte.strip()
+            if '-' in parte:
+                inicio, fim = parte.split('-', 1)
+                numeros.update(range(int(inicio), int(fim) + 1))
+            elif parte:
+                numeros.add(int(parte))
+        return sorted(numeros)
+    
+    def amostrar_paginas(self, caminho_pdf: str, paginas: str = 'all') -> str:
+        """
+        Seleciona uma amostra uniforme das páginas para o modo rascunho
+        
+        Args:
+            caminho_pdf: Caminho do PDF
+            paginas: Páginas localizadas ('all' ou '1,2,3' ou '1-5')
+            
+        Returns:
+            Especificação de páginas amostradas ('1,12,23')
+        """
+        try:
+            lista = self._expandir_paginas(caminho_pdf, paginas)
+        except Exception as e:
+            print(f"   ⚠️  Não foi possível amostrar páginas: {str(e)}")
+            return paginas
+        
+        if len(lista) > self.paginas_amostra:
+            passo = len(lista) / self.paginas_amostra
+            lista = [lista[int(i * passo)] for i in range(self.paginas_amostra)]
+        
+        return ','.join(map(str, lista))
+    
     def extrair_tabelas_do_pdf(self, caminho_pdf: str, 
                                 paginas: str = 'all',
-                                multiplas_tabelas: bool = True) -> List[pd.DataFrame]:
+                                multiplas_tabelas: bool = True,
+                                metodos: Sequence[str] = METODOS_EXTRACAO,
+                                **opcoes_tabula) -> List[pd.DataFrame]:
         """
         Extrai todas as tabelas de um PDF usando tabula-py
         
+        Os métodos são tentados em ordem e o primeiro que encontrar tabelas é
+        usado. Cada DataFrame guarda em `attrs` a página ('pagina'), a posição
+        da tabela na página ('tabela') e o método ('metodo'), usados na
+        proveniência das linhas.
+        
         Args:
             caminho_pdf: Caminho completo para o arquivo PDF
-            paginas: Páginas para extrair ('all' ou '1,2,3' ou '1-5')
+            paginas: Páginas para extrair ('all' ou '1,2,3' ou '1-5'); com
+                     termos_paginas, 'all' vira as páginas com os termos
             multiplas_tabelas: Se True, tenta extrair múltiplas tabelas
+            metodos: Métodos do tabula tentados ('stream', 'lattice')
+            **opcoes_tabula: Opções extras do tabula.read_pdf (area, columns, guess...)
             
         Returns:
             Lista de DataFrames extraídos
@@ -44,34 +197,73 @@ class ExtratorDadosPDF:
             return []
         
         print(f"📄 Extraindo dados de: {os.path.basename(caminho_pdf)}")
+        try:
+            return self._extrair_tabelas(caminho_pdf, paginas, multiplas_tabelas,
+                                         metodos, **opcoes_tabula)
+        finally:
+            # O mapeamento do PDF não é mais necessário depois da extração
+            fechar_documentos([caminho_pdf])
+    
+    def _localizar_paginas(self, caminho_pdf: str) -> str:
+        """
+        Páginas com os termos de termos_paginas ('all' se a pré-varredura falhar)
+        
+        Args:
+            caminho_pdf: Caminho do PDF
         
+        Returns:
+            Especificação de páginas ('' se nenhuma página tiver os termos)
+        """
         try:
-            # Método 1: Stream (para tabelas sem bordas definidas)
-            dfs_stream = tabula.read_pdf(
-                caminho_pdf,
-                pages=paginas,
-                multiple_tables=multiplas_tabelas,
-                stream=True,
-                guess=True,
-                encoding='utf-8'
-            )
-            
-            if dfs_stream and len(dfs_stream) > 0:
-                print(f"   ✓ Extraídas {len(dfs_stream)} tabela(s) com método Stream")
-                return dfs_stream
-            
-            # Método 2: Lattice (para tabelas com bordas)
-            dfs_lattice = tabula.read_pdf(
-                caminho_pdf,
-                pages=paginas,
-                multiple_tables=multiplas_tabelas,
-                lattice=True,
-                encoding='utf-8'
-            )
-            
-            if dfs_lattice and len(dfs_lattice) > 0:
-                print(f"   ✓ Extraídas {len(dfs_lattice)} tabela(s) com método Lattice")
-                return dfs_lattice
+            paginas = localizar_paginas(caminho_pdf, self.termos_paginas)
+        except Exception as e:
+            print(f"   ⚠️  Pré-varredura das páginas falhou: {str(e)}")
+            return 'all'
+        print(f"   🔎 Páginas com {', '.join(self.termos_paginas)}: {paginas or 'nenhuma'}")
+        return paginas
+    
+    def _extrair_tabelas(self, caminho_pdf: str, paginas: str, multiplas_tabelas: bool,
+                         metodos: Sequence[str], **opcoes_tabula) -> List[pd.DataFrame]:
+        """Extração de extrair_tabelas_do_pdf, com o PDF já verificado"""
+        if self.termos_paginas and str(paginas).lower() == 'all':
+            paginas = self._localizar_paginas(caminho_pdf)
+            if not paginas:
+                return []
+        
+        if self.modo_rascunho:
+            paginas = self.amostrar_paginas(caminho_pdf, paginas)
+            print(f"   📝 Modo rascunho: páginas {paginas}")
+        
+        try:
+            # Stream (tabelas sem bordas definidas), depois Lattice (com bordas).
+            # A saída JSON informa a página de cada tabela
+            pagina_unica = int(paginas) if str(paginas).strip().isdigit() else 0
+            for metodo in metodos:
+                tabelas_json = tabula.read_pdf(
+                    caminho_pdf,
+                    pages=paginas,
+                    output_format='json',
+                    encoding='utf-8',
+                    **dict(OPCOES_METODO[metodo], **opcoes_tabula)
+                )
+                
+                tabelas = []
+                posicao_na_pagina = defaultdict(int)
+                for tabela in tabelas_json or []:
+                    pagina = int(tabela.get('page_number') or pagina_unica)
+                    df = tabela_json_para_dataframe(tabela, self.cabecalhos_multinivel)
+                    df.attrs.update(pagina=pagina, tabela=posicao_na_pagina[pagina],
+                                    metodo=metodo)
+                    posicao_na_pagina[pagina] += 1
+                    if not df.empty:
+                        tabelas.append(df)
+                
+                if tabelas:
+                    if not multiplas_tabelas:
+                        tabelas = tabelas[:1]
+                    print(f"   ✓ Extraídas {len(tabelas)} tabela(s) com método "
+                          f"{metodo.capitalize()}")
+                    return tabelas
                 
             print("   ⚠️  Nenhuma tabela encontrada")
             return []
@@ -103,23 +295,32 @@ class ExtratorDadosPDF:
         # Remove linhas totalmente vazias
         df_limpo = df_limpo.dropna(how='all')
         
-        # Tenta identificar coluna de estados
-        coluna_estado = None
-        for col in df_limpo.columns:
-            valores_str = df_limpo[col].astype(str).str.lower()
-            if any(estado.lower() in ' '.join(valores_str.values) 
-                   for estado in self.estados_alvo):
-                coluna_estado = col
+        # Coluna de estados: a coluna de texto com mais células dos estados-alvo
+        # (nomes com notas de rodapé, sem acento, siglas e erros de OCR incluídos).
+        # A coluna indicada pelo cabeçalho (ver tabela_json_para_dataframe) é
+        # testada primeiro e, se tiver estados-alvo, dispensa as demais
+        sugerida = df.attrs.get('coluna_localidade')
+        colunas = sorted(df_limpo.columns, key=lambda col: col != sugerida)
+        coluna_estado, estados, maximo = None, None, 0
+        for col in colunas:
+            if pd.api.types.is_numeric_dtype(df_limpo[col]):
+                continue
+            resolvidos = self.localidades.resolver(df_limpo[col], codigos=False)
+            encontrados = int(resolvidos['Estado'].isin(self._alvos).sum())
+            if encontrados > maximo:
+                coluna_estado, estados, maximo = col, resolvidos, encontrados
+            if col == sugerida and encontrados:
                 break
         
-        if coluna_estado:
-            # Filtra apenas os estados de interesse
-            mask = df_limpo[coluna_estado].astype(str).str.contains(
-                '|'.join(self.estados_alvo), 
-                case=False, 
-                na=False
-            )
+        if coluna_estado is not None:
+            # Filtra apenas os estados de interesse e usa os nomes oficiais
+            mask = estados['Estado'].isin(self._alvos)
             df_limpo = df_limpo[mask]
+            estados = estados[mask]
+            municipais = estados['Município'].notna()
+            df_limpo[coluna_estado] = estados['Município'].where(municipais, estados['Estado'])
+            if municipais.any() and 'Estado' not in df_limpo.columns:
+                df_limpo.insert(0, 'Estado', estados['Estado'])
         
         # Adiciona coluna de ano
         df_limpo['Ano'] = ano
@@ -128,29 +329,38 @@ class ExtratorDadosPDF:
     
     def processar_pdf(self, caminho_pdf: str, 
                       ano: int,
-                      paginas_especificas: str = 'all') -> pd.DataFrame:
+                      paginas_especificas: str = 'all',
+                      **opcoes_extracao) -> pd.DataFrame:
         """
         Processa um PDF completo e retorna DataFrame consolidado
         
+        Cada linha leva as colunas de proveniência (COLUNAS_ORIGEM): código do
+        PDF, página, tabela, linha e método de extração.
+        
         Args:
             caminho_pdf: Caminho para o PDF
             ano: Ano dos dados
             paginas_especificas: Páginas específicas para extrair
+            **opcoes_extracao: metodos e opções do tabula (ver extrair_tabelas_do_pdf)
             
         Returns:
             DataFrame consolidado do ano
         """
-        tabelas = self.extrair_tabelas_do_pdf(caminho_pdf, paginas_especificas)
+        tabelas = self.extrair_tabelas_do_pdf(caminho_pdf, paginas_especificas,
+                                              **opcoes_extracao)
         
         if not tabelas:
             return pd.DataFrame()
         
         # Processa cada tabela extraída
+        codigo = codigo_pdf(caminho_pdf)
         dfs_processados = []
         for i, df in enumerate(tabelas):
             df_limpo = self.limpar_e_filtrar_dados(df, ano)
             if not df_limpo.empty:
-                dfs_processados.append(df_limpo)
+                dfs_processados.append(adicionar_origem(
+                    df_limpo, codigo, df.attrs['pagina'], df.attrs['tabela'], df.attrs['metodo']
+                ))
                 print(f"   ✓ Tabela {i+1}: {len(df_limpo)} registros dos estados-alvo")
         
         # Consolida todas as tabelas do PDF
@@ -159,13 +369,86 @@ class ExtratorDadosPDF:
         
         return pd.DataFrame()
     
+    def reextrair_pagina(self, df_dados: pd.DataFrame,
+                         caminho_pdf: str,
+                         pagina: int,
+                         ano: Optional[int] = None,
+                         colunas_valor: Optional[List[str]] = None,
+                         metodos: Sequence[str] = ('lattice',),
+                         **opcoes_tabula) -> pd.DataFrame:
+        """
+        Extrai de novo uma única página, com outras opções, e substitui as linhas dela
+        
+        As linhas de `df_dados` vindas dessa página (pelas colunas de
+        proveniência) são trocadas pelas da nova extração, na mesma posição;
+        as demais linhas não mudam. A nova extração só traz os estados-alvo
+        deste extrator: eles devem cobrir os estados que a página já tinha.
+        
+        Args:
+            df_dados: Dados consolidados com colunas de proveniência
+            caminho_pdf: PDF de origem (ver proveniencia.localizar_pdf)
+            pagina: Página a extrair de novo
+            ano: Ano dos dados (padrão: o das linhas atuais da página)
+            colunas_valor: Se informado, as novas linhas são passadas ao formato
+                           longo com estas colunas (dados já em formato longo)
+            metodos: Métodos do tabula tentados ('stream', 'lattice')
+            **opcoes_tabula: Opções do tabula.read_pdf (area, columns, guess...)
+        
+        Returns:
+            Novo DataFrame com a página corrigida
+        
+        Raises:
+            ValueError: Se os dados não tiverem colunas de proveniência ou o ano
+                        não puder ser determinado
+        """
+        if not tem_origem(df_dados):
+            raise ValueError("Dados sem colunas de proveniência: extraia-os novamente")
+        
+        afetadas = mascara_pagina(df_dados, codigo_pdf(caminho_pdf), pagina).to_numpy()
+        if ano is None:
+            anos = df_dados.loc[afetadas, 'Ano'].unique()
+            if len(anos) != 1:
+                raise ValueError(f"Informe o ano da página {pagina}")
+            ano = int(anos[0])
+        
+        print(f"🔁 Extraindo de novo: {os.path.basename(caminho_pdf)}, página {pagina}")
+        novas = self.processar_pdf(caminho_pdf, ano, str(pagina), metodos=metodos,
+                                   **opcoes_tabula)
+        if colunas_valor and not novas.empty:
+            novas = self.transformar_para_formato_longo(novas, colunas_valor)
+        
+        # As novas linhas entram no lugar da primeira linha antiga da página
+        posicao = int(afetadas.argmax()) if afetadas.any() else len(df_dados)
+        antes = df_dados.iloc[:posicao][~afetadas[:posicao]]
+        depois = df_dados.iloc[posicao:][~afetadas[posicao:]]
+        corrigido = pd.concat([antes, novas, depois], ignore_index=True)
+        for coluna, tipo in COLUNAS_ORIGEM.items():
+            if corrigido[coluna].notna().all():
+                corrigido[coluna] = corrigido[coluna].astype(tipo)
+        
+        print(f"   ✓ {int(afetadas.sum())} linha(s) substituída(s) por {len(novas)}")
+        return corrigido
+    
     def processar_multiplos_pdfs(self, 
-                                  configuracao_pdfs: Dict[int, str]) -> pd.DataFrame:
+                                  configuracao_pdfs: Dict[int, str],
+                                  banco: Optional[BancoDados] = None,
+                                  max_processos: int = 1,
+                                  colunas_valor: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Processa múltiplos PDFs de diferentes anos
         
+        Com max_processos > 1 cada PDF é processado noutro processo e as tabelas
+        grandes voltam por memória compartilhada (ver memoria_compartilhada.py),
+        sem pickle.
+        
         Args:
             configuracao_pdfs: Dicionário {ano: caminho_pdf}
+            banco: Se informado, cada ano é passado ao formato longo (ver
+                   preparar_para_banco) e gravado nele (upsert) assim que é
+                   extraído; o DataFrame devolvido continua no formato largo
+            max_processos: PDFs processados em paralelo
+            colunas_valor: Colunas de indicadores gravadas no banco
+                           (padrão: as colunas numéricas de cada ano)
             
         Returns:
             DataFrame consolidado de todos os anos
@@ -175,19 +458,36 @@ class ExtratorDadosPDF:
         print("="*70 + "\n")
         
         self.dados_consolidados = []
+        anos = sorted(configuracao_pdfs.keys())
         
-        for ano in sorted(configuracao_pdfs.keys()):
-            caminho = configuracao_pdfs[ano]
-            print(f"\n🗓️  Processando ano: {ano}")
-            print("-" * 70)
-            
-            df_ano = self.processar_pdf(caminho, ano)
-            
-            if not df_ano.empty:
-                self.dados_consolidados.append(df_ano)
-                print(f"✅ Ano {ano}: {len(df_ano)} registros extraídos")
-            else:
-                print(f"⚠️  Ano {ano}: Nenhum dado extraído")
+        executor = None
+        if max_processos > 1 and len(anos) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(max_processos, len(anos)))
+            futuros = {ano: executor.submit(_processar_pdf_em_processo, self,
+                                            configuracao_pdfs[ano], ano)
+                       for ano in anos}
+        
+        try:
+            for ano in anos:
+                caminho = configuracao_pdfs[ano]
+                print(f"\n🗓️  Processando ano: {ano}")
+                print("-" * 70)
+                
+                if executor is None:
+                    df_ano = self.processar_pdf(caminho, ano)
+                else:
+                    df_ano = receber_tabela(futuros[ano].result())
+                
+                if not df_ano.empty:
+                    self.dados_consolidados.append(df_ano)
+                    print(f"✅ Ano {ano}: {len(df_ano)} registros extraídos")
+                    if banco is not None:
+                        banco.salvar(self.preparar_para_banco(df_ano, colunas_valor))
+                else:
+                    print(f"⚠️  Ano {ano}: Nenhum dado extraído")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
         
         # Consolida todos os anos
         if self.dados_consolidados:
@@ -234,6 +534,53 @@ class ExtratorDadosPDF:
         
         return df_longo
     
+    def preparar_para_banco(self, df: pd.DataFrame,
+                            colunas_valor: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Passa as tabelas extraídas (formato largo) ao formato longo do banco
+        
+        A coluna de estados vira 'Estado' e cada coluna de indicador vira linhas
+        de 'Índice de Violência' e 'Valor', com os números no padrão brasileiro
+        ('1.234') convertidos. Dados já no formato longo passam direto.
+        
+        Args:
+            df: Dados extraídos (processar_pdf) ou já no formato longo
+            colunas_valor: Colunas de indicadores (padrão: as colunas com
+                           números, exceto Ano e as de proveniência)
+            
+        Returns:
+            DataFrame com Estado, Ano, Índice de Violência e Valor
+        """
+        if df.empty or {'Estado', 'Índice de Violência', 'Valor'}.issubset(df.columns):
+            return df
+        
+        df = df.copy()
+        if 'Estado' not in df.columns:
+            # Coluna de texto com mais estados reconhecidos
+            contagens = {coluna: int(self.localidades.estados(df[coluna], codigos=False)
+                                     .notna().sum())
+                         for coluna in df.columns
+                         if coluna not in COLUNAS_ORIGEM
+                         and not pd.api.types.is_numeric_dtype(df[coluna])}
+            if not contagens or max(contagens.values()) == 0:
+                return pd.DataFrame()
+            coluna_estado = max(contagens, key=contagens.get)
+            df['Estado'] = self.localidades.estados(df[coluna_estado], codigos=False)
+            df = df.drop(columns=coluna_estado).dropna(subset=['Estado'])
+        
+        identificacao = {'Estado', 'Município', 'Ano', *COLUNAS_ORIGEM}
+        if colunas_valor is None:
+            colunas_valor = [coluna for coluna in df.columns
+                             if coluna not in identificacao
+                             and converter_numeros(df[coluna]).notna().any()]
+        for coluna in colunas_valor:
+            df[coluna] = converter_numeros(df[coluna])
+        
+        # Só as colunas de identificação acompanham os valores
+        df = df[[coluna for coluna in df.columns
+                 if coluna in identificacao or coluna in colunas_valor]]
+        return self.transformar_para_formato_longo(df, list(colunas_valor))
+    
     def salvar_dados(self, df: pd.DataFrame, 
                      caminho_saida: str,
                      formato: str = 'csv') -> bool:
@@ -243,7 +590,9 @@ class ExtratorDadosPDF:
         Args:
             df: DataFrame para salvar
             caminho_saida: Caminho do arquivo de saída
-            formato: 'csv' ou 'excel'
+            formato: 'csv', 'excel' ou 'sqlite'/'duckdb' (gravação no banco local,
+                     no formato longo, substituindo apenas as linhas das
+                     mesmas chaves)
             
         Returns:
             True se salvou com sucesso
@@ -253,6 +602,9 @@ class ExtratorDadosPDF:
                 df.to_csv(caminho_saida, index=False, encoding='utf-8-sig')
             elif formato.lower() == 'excel':
                 df.to_excel(caminho_saida, index=False, engine='openpyxl')
+            elif formato.lower() in ('sqlite', 'duckdb'):
+                with BancoDados(caminho_saida, motor=formato.lower()) as banco:
+                    banco.salvar(self.preparar_para_banco(df))
             
             print(f"💾 Dados salvos em: {caminho_saida}")
             return True
@@ -262,11 +614,57 @@ class ExtratorDadosPDF:
             return False
 
 
+def _estados_das_linhas(df: pd.DataFrame) -> List[str]:
+    """Estados (nomes oficiais) presentes nas colunas de texto de algumas linhas"""
+    estados = set()
+    for coluna in df.columns:
+        if coluna in COLUNAS_ORIGEM or pd.api.types.is_numeric_dtype(df[coluna]):
+            continue
+        estados.update(indice_ufs().estados(df[coluna], codigos=False).dropna())
+    return sorted(estados)
+
+
+def corrigir_pagina(arquivo_dados: str,
+                     caminho_pdf: str,
+                     pagina: int,
+                     estados_alvo: Optional[List[str]] = None,
+                     **opcoes) -> pd.DataFrame:
+    """
+    Corrige no próprio CSV consolidado as linhas de uma página, extraindo só ela
+    
+    Todas as linhas antigas da página são substituídas; por isso a nova
+    extração mantém, por padrão, os mesmos estados que a página já tinha no
+    arquivo (e não só os estados-alvo padrão do extrator).
+    
+    Args:
+        arquivo_dados: CSV consolidado (com colunas de proveniência)
+        caminho_pdf: PDF de origem da página
+        pagina: Página a extrair de novo
+        estados_alvo: Estados mantidos na nova extração (padrão: os das linhas
+                      atuais da página; se ela não tiver linhas, os do arquivo)
+        **opcoes: ano, colunas_valor, metodos e opções do tabula
+                  (ver ExtratorDadosPDF.reextrair_pagina)
+    
+    Returns:
+        DataFrame corrigido (também gravado em `arquivo_dados`)
+    """
+    df_dados = pd.read_csv(arquivo_dados, encoding='utf-8-sig')
+    if not estados_alvo and tem_origem(df_dados):
+        afetadas = mascara_pagina(df_dados, codigo_pdf(caminho_pdf), pagina)
+        estados_alvo = (_estados_das_linhas(df_dados[afetadas])
+                        or _estados_das_linhas(df_dados)) or None
+    extrator = ExtratorDadosPDF(estados_alvo=estados_alvo)
+    df_corrigido = extrator.reextrair_pagina(df_dados, caminho_pdf, pagina, **opcoes)
+    extrator.salvar_dados(df_corrigido, arquivo_dados, formato='csv')
+    return df_corrigido
+
+
 # Função de conveniência para uso rápido
 def extrair_dados_violencia(caminhos_pdfs: Dict[int, str],
                              estados: List[str] = None,
                              salvar_csv: bool = True,
-                             arquivo_saida: str = 'dados/dados_consolidados.csv') -> pd.DataFrame:
+                             arquivo_saida: str = 'dados/dados_consolidados.csv',
+                             max_processos: int = 1) -> pd.DataFrame:
     """
     Função de conveniência para extração rápida de dados
     
@@ -275,12 +673,13 @@ def extrair_dados_violencia(caminhos_pdfs: Dict[int, str],
         estados: Lista de estados (padrão: Amazonas, Roraima, Acre)
         salvar_csv: Se True, salva resultado em CSV
         arquivo_saida: Caminho do arquivo CSV de saída
+        max_processos: PDFs processados em paralelo
         
     Returns:
         DataFrame consolidado
     """
     extrator = ExtratorDadosPDF(estados_alvo=estados)
-    df_final = extrator.processar_multiplos_pdfs(caminhos_pdfs)
+    df_final = extrator.processar_multiplos_pdfs(caminhos_pdfs, max_processos=max_processos)
     
     if salvar_csv and not df_final.empty:
         extrator.salvar_dados(df_final, arquivo_saida, formato='csv')
@@ -4,11 +4,20 @@ Cria visualizações dos dados de violência contra mulheres
 """
 
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import seaborn as sns
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 import os
 
+from analise_temporal import (JANELA_MEDIA_MOVEL, media_movel, metricas_do_cubo,
+                              series_do_cubo, tendencia_linear, variacao_anual)
+from armazenamento import BancoDados
+from completar_series import HORIZONTE_PROJECAO, NIVEL_CONFIANCA, SeriesCompletas
+from cubo_agregado import CuboAgregado
+from populacao import SUFIXO_TAXA
+
 # Configurações padrão do matplotlib
 plt.rcParams['figure.figsize'] = (12, 7)
 plt.rcParams['font.size'] = 10
@@ -21,67 +30,193 @@ plt.rcParams['legend.fontsize'] = 10
 # Paleta de cores
 PALETA_CORES = sns.color_palette("husl", 8)
 
+# Limites do heatmap para entradas grandes (ex.: municípios)
+LIMITE_CELULAS_ANOTACAO = 400
+MAX_ROTULOS_LINHAS = 60
+ALTURA_MAXIMA_HEATMAP = 20
+
+# Rótulo do eixo de valores: contagens ou taxas (índices terminados em SUFIXO_TAXA)
+ROTULO_OCORRENCIAS = 'Número de Ocorrências'
+ROTULO_TAXA = 'Taxa por 100 mil Mulheres'
+
+
+def eh_taxa(indice: str) -> bool:
+    """True para índices de taxa (ex.: 'Estupro (por 100 mil mulheres)')"""
+    return str(indice).endswith(SUFIXO_TAXA)
+
+
+# Resolução de saída (final e rascunho)
+DPI_FINAL = 300
+DPI_RASCUNHO = 72
+
 
 class GeradorGraficos:
     """Classe para gerar gráficos de análise de violência"""
     
-    def __init__(self, df_dados: pd.DataFrame, pasta_saida: str = 'graficos'):
+    def __init__(self, df_dados: pd.DataFrame, pasta_saida: str = 'graficos',
+                 modo_rascunho: bool = False,
+                 formatos_extras: Sequence[str] = (),
+                 cubo: Optional[CuboAgregado] = None):
         """
         Inicializa o gerador de gráficos
         
         Args:
             df_dados: DataFrame com os dados consolidados
             pasta_saida: Pasta onde os gráficos serão salvos
+            modo_rascunho: Se True, salva em baixa resolução e sem bbox_inches='tight'
+            formatos_extras: Formatos salvos além do PNG (ex.: 'svg', 'pdf')
+            cubo: Cubo agregado dos dados (montado no primeiro uso se omitido)
         """
         self.df = df_dados
+        self._cubo = cubo
         self.pasta_saida = pasta_saida
+        self.modo_rascunho = modo_rascunho
+        self.formatos_extras = [f.lower() for f in formatos_extras if f.lower() != 'png']
         self.arquivos_gerados = []
+        self.arquivos_extras = []
         
         # Cria pasta de saída se não existir
         os.makedirs(pasta_saida, exist_ok=True)
     
+    @classmethod
+    def do_banco(cls, banco: BancoDados,
+                 estados: Optional[Sequence[str]] = None,
+                 anos: Optional[Sequence[int]] = None,
+                 indices: Optional[Sequence[str]] = None,
+                 **opcoes) -> 'GeradorGraficos':
+        """
+        Cria o gerador só com as linhas pedidas, filtradas no banco local
+        
+        Args:
+            banco: Banco com os dados em formato longo
+            estados: Estados (None = todos)
+            anos: Anos (None = todos)
+            indices: Índices de violência (None = todos)
+            **opcoes: pasta_saida, modo_rascunho, formatos_extras
+        
+        Returns:
+            GeradorGraficos com os dados consultados
+        """
+        return cls(banco.consultar(estados=estados, anos=anos, indices=indices), **opcoes)
+    
+    @property
+    def cubo(self) -> CuboAgregado:
+        """Cubo Estado × Ano × Índice dos dados (montado uma única vez)"""
+        if self._cubo is None:
+            self._cubo = CuboAgregado(self.df)
+        return self._cubo
+    
+    def _salvar_figura(self, nome_arquivo: str) -> str:
+        """
+        Salva a figura atual na pasta de saída e fecha a figura
+        
+        Args:
+            nome_arquivo: Nome do arquivo PNG
+        
+        Returns:
+            Caminho do arquivo PNG salvo
+        """
+        caminho_completo = os.path.join(self.pasta_saida, nome_arquivo)
+        if self.modo_rascunho:
+            opcoes = {'dpi': DPI_RASCUNHO}
+        else:
+            opcoes = {'dpi': DPI_FINAL, 'bbox_inches': 'tight'}
+        plt.savefig(caminho_completo, **opcoes)
+        self.arquivos_gerados.append(caminho_completo)
+        
+        for formato in self.formatos_extras:
+            caminho_extra = os.path.splitext(caminho_completo)[0] + '.' + formato
+            plt.savefig(caminho_extra, format=formato, **opcoes)
+            self.arquivos_extras.append(caminho_extra)
+        print(f"✅ Gráfico salvo: {nome_arquivo}")
+        plt.close()
+        return caminho_completo
+    
     def grafico_serie_temporal_por_estado(self, 
                                            estado: str,
                                            indices: Optional[List[str]] = None,
-                                           salvar: bool = True) -> str:
+                                           salvar: bool = True,
+                                           horizonte: int = HORIZONTE_PROJECAO) -> str:
         """
         Cria gráfico de série temporal para um estado específico
         
+        Os anos sem anuário aparecem interpolados (marcadores vazados) e os
+        próximos anos, projetados (tracejado com banda de confiança).
+        
         Args:
             estado: Nome do estado
-            indices: Lista de índices de violência a plotar (None = todos)
+            indices: Lista de índices de violência a plotar (None = todos, exceto as taxas)
             salvar: Se True, salva o gráfico
-            
+            horizonte: Anos projetados depois do último ano com dados (0 = sem projeção)
+        
         Returns:
             Caminho do arquivo salvo
         """
-        # Filtra dados do estado
-        df_estado = self.df[self.df['Estado'].str.contains(estado, case=False, na=False)]
+        # Fatia do estado no cubo (índice × ano)
+        estados = self.cubo.selecionar('Estado', estado)
         
-        if df_estado.empty:
+        if len(estados) == 0:
             print(f"⚠️  Nenhum dado encontrado para {estado}")
             return ""
         
-        # Filtra índices se especificado
-        if indices:
-            df_estado = df_estado[df_estado['Índice de Violência'].isin(indices)]
+        matriz = self.cubo.agregar('Índice de Violência', 'Ano', filtros={'Estado': estados})
+        anos = self.cubo.rotulos['Ano']
+        nomes_indices = self.cubo.rotulos['Índice de Violência']
+        
+        # Filtra índices se especificado (por padrão, só contagens: taxas têm outra escala)
+        linhas = [i for i, indice in enumerate(nomes_indices)
+                  if np.isfinite(matriz[i]).any()
+                  and (indice in indices if indices else not eh_taxa(indice))]
+        
+        # Todas as séries do estado completadas de uma vez
+        series = SeriesCompletas(matriz[linhas], anos, horizonte=horizonte)
+        anos_grade = series.anos
         
         # Cria figura
         fig, ax = plt.subplots(figsize=(12, 7))
         
         # Plota linhas para cada índice
-        for i, indice in enumerate(df_estado['Índice de Violência'].unique()):
-            df_indice = df_estado[df_estado['Índice de Violência'] == indice]
+        for i, linha in enumerate(linhas):
+            cor = PALETA_CORES[i % len(PALETA_CORES)]
+            valores = series.valores[i]
+            historico = np.isfinite(valores) & ~series.projetados[i]
             
             ax.plot(
-                df_indice['Ano'], 
-                df_indice['Valor'],
-                marker='o',
+                anos_grade[historico], 
+                valores[historico],
                 linewidth=2.5,
-                markersize=8,
-                label=indice,
-                color=PALETA_CORES[i % len(PALETA_CORES)]
+                label=nomes_indices[linha],
+                color=cor
             )
+            observados = series.observados[i]
+            ax.plot(anos_grade[observados], valores[observados], 'o',
+                    markersize=8, color=cor)
+            interpolados = series.interpolados[i]
+            ax.plot(anos_grade[interpolados], valores[interpolados], 'o',
+                    markersize=8, markerfacecolor='white', markeredgewidth=2, color=cor)
+            
+            # Projeção a partir do último ponto do histórico
+            projetados = series.projetados[i]
+            if projetados.any():
+                trecho = projetados.copy()
+                trecho[np.flatnonzero(historico)[-1]] = True
+                ax.plot(anos_grade[trecho], valores[trecho], linestyle='--',
+                        linewidth=2, marker='D', markersize=5, color=cor)
+                ax.fill_between(anos_grade[projetados], series.inferior[i][projetados],
+                                series.superior[i][projetados], color=cor, alpha=0.15,
+                                linewidth=0)
+        
+        # Legenda dos tipos de ponto
+        legenda_pontos = [
+            Line2D([], [], color='gray', marker='o', linestyle='', markersize=8,
+                   label='Observado'),
+            Line2D([], [], color='gray', marker='o', linestyle='', markersize=8,
+                   markerfacecolor='white', markeredgewidth=2, label='Interpolado'),
+        ]
+        if series.projetados.any():
+            legenda_pontos.append(Line2D([], [], color='gray', marker='D', linestyle='--',
+                                         markersize=5,
+                                         label=f'Projeção (IC {NIVEL_CONFIANCA:.0%})'))
         
         # Customização
         ax.set_title(
@@ -93,14 +228,17 @@ class GeradorGraficos:
         ax.set_xlabel('Ano', fontsize=13, fontweight='bold')
         ax.set_ylabel('Número de Ocorrências', fontsize=13, fontweight='bold')
         
-        # Configurar eixo X com todos os anos
-        anos_unicos = sorted(df_estado['Ano'].unique())
+        # Configurar eixo X com todos os anos da grade (inclusive lacunas e projeção)
+        anos_unicos = list(anos_grade[np.isfinite(series.valores).any(axis=0)])
         ax.set_xticks(anos_unicos)
         ax.set_xticklabels(anos_unicos, rotation=45)
         
         # Grade e legenda
         ax.grid(True, linestyle='--', alpha=0.4, linewidth=0.8)
-        ax.legend(title='Tipo de Violência', loc='best', framealpha=0.9)
+        legenda_indices = ax.legend(title='Tipo de Violência', loc='upper left',
+                                    framealpha=0.9)
+        ax.add_artist(legenda_indices)
+        ax.legend(handles=legenda_pontos, loc='lower right', framealpha=0.9, fontsize=9)
         
         # Ajuste de layout
         plt.tight_layout()
@@ -108,12 +246,7 @@ class GeradorGraficos:
         # Salvar
         if salvar:
             nome_arquivo = f'serie_temporal_{estado.lower().replace(" ", "_")}.png'
-            caminho_completo = os.path.join(self.pasta_saida, nome_arquivo)
-            plt.savefig(caminho_completo, dpi=300, bbox_inches='tight')
-            self.arquivos_gerados.append(caminho_completo)
-            print(f"✅ Gráfico salvo: {nome_arquivo}")
-            plt.close()
-            return caminho_completo
+            return self._salvar_figura(nome_arquivo)
         else:
             plt.show()
             return ""
@@ -129,40 +262,45 @@ class GeradorGraficos:
             indice_violencia: Nome do índice de violência
             tipo: 'linha' ou 'barra'
             salvar: Se True, salva o gráfico
-            
+        
         Returns:
             Caminho do arquivo salvo
         """
-        # Filtra dados do índice
-        df_indice = self.df[self.df['Índice de Violência'].str.contains(
-            indice_violencia, case=False, na=False
-        )]
+        # Fatia do índice no cubo (estado × ano)
+        indices = self.cubo.selecionar('Índice de Violência', indice_violencia)
         
-        if df_indice.empty:
+        if len(indices) == 0:
             print(f"⚠️  Nenhum dado encontrado para {indice_violencia}")
             return ""
         
+        filtros = {'Índice de Violência': indices}
+        matriz = self.cubo.agregar('Estado', 'Ano', filtros=filtros)
+        anos = self.cubo.rotulos['Ano']
+        estados = self.cubo.rotulos['Estado']
+        
         # Cria figura
         fig, ax = plt.subplots(figsize=(12, 7))
         
         if tipo.lower() == 'linha':
             # Gráfico de linhas
-            for i, estado in enumerate(df_indice['Estado'].unique()):
-                df_estado = df_indice[df_indice['Estado'] == estado]
+            linhas = [i for i in range(len(estados)) if np.isfinite(matriz[i]).any()]
+            for i, linha in enumerate(linhas):
+                validos = np.isfinite(matriz[linha])
                 
                 ax.plot(
-                    df_estado['Ano'],
-                    df_estado['Valor'],
+                    anos[validos],
+                    matriz[linha][validos],
                     marker='o',
                     linewidth=2.5,
                     markersize=8,
-                    label=estado,
+                    label=estados[linha],
                     color=PALETA_CORES[i % len(PALETA_CORES)]
                 )
         
         elif tipo.lower() == 'barra':
             # Gráfico de barras agrupadas
-            df_pivot = df_indice.pivot(index='Ano', columns='Estado', values='Valor')
+            df_pivot = self.cubo.tabela('Ano', 'Estado', filtros=filtros).dropna(how='all')
+            df_pivot = df_pivot.dropna(axis=1, how='all')
             df_pivot.plot(kind='bar', ax=ax, color=PALETA_CORES[:len(df_pivot.columns)])
         
         # Customização
@@ -173,7 +311,8 @@ class GeradorGraficos:
             pad=20
         )
         ax.set_xlabel('Ano', fontsize=13, fontweight='bold')
-        ax.set_ylabel('Número de Ocorrências', fontsize=13, fontweight='bold')
+        ax.set_ylabel(ROTULO_TAXA if eh_taxa(indice_violencia) else ROTULO_OCORRENCIAS,
+                      fontsize=13, fontweight='bold')
         
         if tipo.lower() == 'barra':
             ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
@@ -188,59 +327,133 @@ class GeradorGraficos:
         # Salvar
         if salvar:
             nome_arquivo = f'comparativo_{indice_violencia.lower().replace(" ", "_")}.png'
-            caminho_completo = os.path.join(self.pasta_saida, nome_arquivo)
-            plt.savefig(caminho_completo, dpi=300, bbox_inches='tight')
-            self.arquivos_gerados.append(caminho_completo)
-            print(f"✅ Gráfico salvo: {nome_arquivo}")
-            plt.close()
-            return caminho_completo
+            return self._salvar_figura(nome_arquivo)
         else:
             plt.show()
             return ""
     
+    def _matriz_densa(self,
+                      df: pd.DataFrame,
+                      coluna_linha: str,
+                      coluna_coluna: str = 'Ano') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Monta a matriz densa (linhas x colunas) somando 'Valor' com NumPy
+        
+        Args:
+            df: DataFrame em formato longo
+            coluna_linha: Coluna usada como linha da matriz
+            coluna_coluna: Coluna usada como coluna da matriz
+        
+        Returns:
+            Tupla (rótulos das linhas, rótulos das colunas, matriz float com NaN nas lacunas)
+        """
+        codigos_linha, rotulos_linha = pd.factorize(df[coluna_linha], sort=True)
+        codigos_coluna, rotulos_coluna = pd.factorize(df[coluna_coluna], sort=True)
+        
+        n_linhas, n_colunas = len(rotulos_linha), len(rotulos_coluna)
+        posicao = codigos_linha.astype(np.int64) * n_colunas + codigos_coluna
+        valores = pd.to_numeric(df['Valor'], errors='coerce').to_numpy(dtype=float)
+        validos = (codigos_linha >= 0) & (codigos_coluna >= 0) & ~np.isnan(valores)
+        
+        tamanho = n_linhas * n_colunas
+        soma = np.bincount(posicao[validos], weights=valores[validos], minlength=tamanho)
+        contagem = np.bincount(posicao[validos], minlength=tamanho)
+        
+        matriz = np.where(contagem > 0, soma, np.nan).reshape(n_linhas, n_colunas)
+        return np.asarray(rotulos_linha), np.asarray(rotulos_coluna), matriz
+    
     def grafico_heatmap_estados_anos(self,
                                       indice_violencia: str,
-                                      salvar: bool = True) -> str:
+                                      salvar: bool = True,
+                                      coluna_linha: str = 'Estado',
+                                      agrupar_por: Optional[str] = None,
+                                      ordenar_por: str = 'nome',
+                                      max_linhas: Optional[int] = None,
+                                      limite_anotacao: int = LIMITE_CELULAS_ANOTACAO) -> str:
         """
         Cria heatmap mostrando a intensidade por estado e ano
         
+        A matriz é montada como um array NumPy denso e desenhada com uma única
+        imagem (imshow), o que permite milhares de linhas (ex.: municípios).
+        
         Args:
             indice_violencia: Nome do índice de violência
             salvar: Se True, salva o gráfico
-            
+            coluna_linha: Coluna usada nas linhas (ex.: 'Estado' ou 'Município')
+            agrupar_por: Coluna para agregar as linhas antes de plotar (ex.: 'Estado')
+            ordenar_por: 'nome' (alfabética) ou 'total' (maior soma primeiro)
+            max_linhas: Mantém apenas as N primeiras linhas após a ordenação
+            limite_anotacao: Anota os valores apenas até esse número de células
+        
         Returns:
             Caminho do arquivo salvo
         """
-        # Filtra dados do índice
-        df_indice = self.df[self.df['Índice de Violência'].str.contains(
-            indice_violencia, case=False, na=False
-        )]
+        indices = self.cubo.selecionar('Índice de Violência', indice_violencia)
         
-        if df_indice.empty:
+        if len(indices) == 0:
             print(f"⚠️  Nenhum dado encontrado para {indice_violencia}")
             return ""
         
-        # Cria pivot table
-        df_pivot = df_indice.pivot_table(
-            index='Estado',
-            columns='Ano',
-            values='Valor',
-            aggfunc='sum'
-        )
+        coluna = agrupar_por or coluna_linha
+        if coluna not in self.df.columns:
+            print(f"⚠️  Coluna '{coluna}' não encontrada nos dados")
+            return ""
         
-        # Cria figura
-        fig, ax = plt.subplots(figsize=(14, 6))
-        
-        # Heatmap
-        sns.heatmap(
-            df_pivot,
-            annot=True,
-            fmt='.0f',
-            cmap='YlOrRd',
-            linewidths=0.5,
-            cbar_kws={'label': 'Ocorrências'},
-            ax=ax
+        # Matriz densa linhas x anos: fatia do cubo, ou a partir das linhas
+        # dos dados para colunas fora do cubo (ex.: 'Município')
+        if coluna in self.cubo.dimensoes:
+            matriz = self.cubo.agregar(coluna, 'Ano', filtros={'Índice de Violência': indices})
+            rotulos_linhas, anos = self.cubo.rotulos[coluna], self.cubo.rotulos['Ano']
+            linhas = np.isfinite(matriz).any(axis=1)
+            colunas = np.isfinite(matriz).any(axis=0)
+            ordem = np.flatnonzero(linhas)[np.argsort(rotulos_linhas[linhas], kind='stable')]
+            rotulos_linhas, anos = rotulos_linhas[ordem], anos[colunas]
+            matriz = matriz[np.ix_(ordem, np.flatnonzero(colunas))]
+        else:
+            df_indice = self.df[self.df['Índice de Violência'].isin(indices)]
+            rotulos_linhas, anos, matriz = self._matriz_densa(df_indice, coluna)
+        
+        # Ordenação e corte das linhas
+        if ordenar_por == 'total':
+            ordem = np.argsort(-np.nansum(matriz, axis=1), kind='stable')
+            rotulos_linhas, matriz = rotulos_linhas[ordem], matriz[ordem]
+        if max_linhas is not None:
+            rotulos_linhas, matriz = rotulos_linhas[:max_linhas], matriz[:max_linhas]
+        
+        n_linhas, n_colunas = matriz.shape
+        
+        # Cria figura (altura cresce com o número de linhas, até um limite)
+        altura = min(max(6, 0.3 * n_linhas), ALTURA_MAXIMA_HEATMAP)
+        fig, ax = plt.subplots(figsize=(14, altura))
+        
+        # Heatmap como uma única imagem
+        mapa_cores = plt.get_cmap('YlOrRd').copy()
+        mapa_cores.set_bad('#eeeeee')
+        imagem = ax.imshow(
+            np.ma.masked_invalid(matriz),
+            aspect='auto',
+            interpolation='nearest',
+            cmap=mapa_cores
         )
+        fig.colorbar(imagem, ax=ax,
+                     label=ROTULO_TAXA if eh_taxa(indice_violencia) else 'Ocorrências')
+        
+        # Anotações apenas para matrizes pequenas
+        if n_linhas * n_colunas <= limite_anotacao:
+            limiar_cor = np.nanmax(matriz) * 0.6 if np.isfinite(matriz).any() else 0
+            for i, j in zip(*np.nonzero(np.isfinite(matriz))):
+                ax.text(j, i, f'{matriz[i, j]:.0f}',
+                        ha='center', va='center', fontsize=9,
+                        color='white' if matriz[i, j] > limiar_cor else 'black')
+        
+        # Rótulos dos eixos (linhas só quando legíveis)
+        ax.set_xticks(np.arange(n_colunas))
+        ax.set_xticklabels(anos, rotation=45)
+        if n_linhas <= MAX_ROTULOS_LINHAS:
+            ax.set_yticks(np.arange(n_linhas))
+            ax.set_yticklabels(rotulos_linhas)
+        else:
+            ax.set_yticks([])
         
         # Customização
         ax.set_title(
@@ -250,19 +463,14 @@ class GeradorGraficos:
             pad=20
         )
         ax.set_xlabel('Ano', fontsize=13, fontweight='bold')
-        ax.set_ylabel('Estado', fontsize=13, fontweight='bold')
+        ax.set_ylabel(coluna, fontsize=13, fontweight='bold')
         
         plt.tight_layout()
         
         # Salvar
         if salvar:
             nome_arquivo = f'heatmap_{indice_violencia.lower().replace(" ", "_")}.png'
-            caminho_completo = os.path.join(self.pasta_saida, nome_arquivo)
-            plt.savefig(caminho_completo, dpi=300, bbox_inches='tight')
-            self.arquivos_gerados.append(caminho_completo)
-            print(f"✅ Gráfico salvo: {nome_arquivo}")
-            plt.close()
-            return caminho_completo
+            return self._salvar_figura(nome_arquivo)
         else:
             plt.show()
             return ""
@@ -273,27 +481,31 @@ class GeradorGraficos:
         
         Args:
             salvar: Se True, salva o gráfico
-            
+        
         Returns:
             Caminho do arquivo salvo
         """
-        # Agrupa por ano e índice
-        df_agregado = self.df.groupby(['Ano', 'Índice de Violência'])['Valor'].sum().reset_index()
+        # Totais por índice e ano (marginal do cubo); taxas não podem ser somadas
+        matriz = self.cubo.agregar('Índice de Violência', 'Ano')
+        anos = self.cubo.rotulos['Ano']
+        nomes_indices = self.cubo.rotulos['Índice de Violência']
+        contagens = np.flatnonzero([not eh_taxa(indice) for indice in nomes_indices])
+        matriz, nomes_indices = matriz[contagens], nomes_indices[contagens]
         
         # Cria figura
         fig, ax = plt.subplots(figsize=(12, 7))
         
-        # Plota cada índice
-        for i, indice in enumerate(df_agregado['Índice de Violência'].unique()):
-            df_indice = df_agregado[df_agregado['Índice de Violência'] == indice]
+        # Plota cada índice (em ordem alfabética)
+        for i, linha in enumerate(np.argsort(nomes_indices, kind='stable')):
+            validos = np.isfinite(matriz[linha])
             
             ax.plot(
-                df_indice['Ano'],
-                df_indice['Valor'],
+                anos[validos],
+                matriz[linha][validos],
                 marker='o',
                 linewidth=2.5,
                 markersize=8,
-                label=indice,
+                label=nomes_indices[linha],
                 color=PALETA_CORES[i % len(PALETA_CORES)]
             )
         
@@ -316,12 +528,201 @@ class GeradorGraficos:
         # Salvar
         if salvar:
             nome_arquivo = 'tendencia_geral_regiao_norte.png'
-            caminho_completo = os.path.join(self.pasta_saida, nome_arquivo)
-            plt.savefig(caminho_completo, dpi=300, bbox_inches='tight')
-            self.arquivos_gerados.append(caminho_completo)
-            print(f"✅ Gráfico salvo: {nome_arquivo}")
-            plt.close()
-            return caminho_completo
+            return self._salvar_figura(nome_arquivo)
+        else:
+            plt.show()
+            return ""
+    
+    def grafico_media_movel_estado(self, estado: str,
+                                   janela: int = JANELA_MEDIA_MOVEL,
+                                   salvar: bool = True) -> str:
+        """
+        Valores anuais, média móvel e reta de tendência de cada índice de um estado
+        
+        Args:
+            estado: Nome do estado
+            janela: Janela da média móvel em anos
+            salvar: Se True, salva o gráfico
+        
+        Returns:
+            Caminho do arquivo salvo
+        """
+        estados = self.cubo.selecionar('Estado', estado)
+        
+        if len(estados) == 0:
+            print(f"⚠️  Nenhum dado encontrado para {estado}")
+            return ""
+        
+        matriz = self.cubo.agregar('Índice de Violência', 'Ano', filtros={'Estado': estados})
+        anos = self.cubo.rotulos['Ano']
+        nomes_indices = self.cubo.rotulos['Índice de Violência']
+        linhas = np.flatnonzero(np.isfinite(matriz).any(axis=1)
+                                & ~np.array([eh_taxa(indice) for indice in nomes_indices],
+                                            dtype=bool))
+        matriz, nomes_indices = matriz[linhas], nomes_indices[linhas]
+        
+        # Métricas de todas as séries de uma vez
+        medias = media_movel(matriz, anos, janela)
+        inclinacao, media_y, _ = tendencia_linear(matriz, anos)
+        anos_validos = np.where(np.isfinite(matriz), anos, np.nan)
+        ano_medio = np.nanmean(anos_validos, axis=1)
+        
+        # Cria figura
+        fig, ax = plt.subplots(figsize=(12, 7))
+        
+        for i, indice in enumerate(nomes_indices):
+            cor = PALETA_CORES[i % len(PALETA_CORES)]
+            validos = np.isfinite(matriz[i])
+            ax.plot(anos[validos], matriz[i][validos], 'o', markersize=6, alpha=0.5, color=cor)
+            
+            com_media = np.isfinite(medias[i])
+            ax.plot(anos[com_media], medias[i][com_media], linewidth=2.5, color=cor,
+                    label=f'{indice} (média móvel {janela} anos)')
+            
+            if np.isfinite(inclinacao[i]):
+                extremos = anos[validos][[0, -1]]
+                ax.plot(extremos, media_y[i] + inclinacao[i] * (extremos - ano_medio[i]),
+                        linestyle='--', linewidth=1.5, color=cor)
+        
+        # Customização
+        ax.set_title(
+            f'Média Móvel e Tendência - {estado}',
+            fontsize=16,
+            fontweight='bold',
+            pad=20
+        )
+        ax.set_xlabel('Ano', fontsize=13, fontweight='bold')
+        ax.set_ylabel('Número de Ocorrências', fontsize=13, fontweight='bold')
+        ax.set_xticks(anos)
+        ax.set_xticklabels(anos, rotation=45)
+        
+        # Grade e legenda
+        ax.grid(True, linestyle='--', alpha=0.4, linewidth=0.8)
+        ax.legend(title='Tipo de Violência (tracejado: tendência linear)',
+                  loc='best', framealpha=0.9)
+        
+        plt.tight_layout()
+        
+        # Salvar
+        if salvar:
+            nome_arquivo = f'media_movel_{estado.lower().replace(" ", "_")}.png'
+            return self._salvar_figura(nome_arquivo)
+        else:
+            plt.show()
+            return ""
+    
+    def grafico_variacao_anual(self, salvar: bool = True) -> str:
+        """
+        Mapa da variação anual (%) de cada série Estado × Índice
+        
+        Nos anos seguintes a lacunas, a variação é a taxa anual equivalente.
+        
+        Args:
+            salvar: Se True, salva o gráfico
+        
+        Returns:
+            Caminho do arquivo salvo
+        """
+        rotulos, anos, matriz = series_do_cubo(self.cubo)
+        
+        if len(rotulos) == 0 or len(anos) < 2:
+            print("⚠️  Dados insuficientes para a variação anual")
+            return ""
+        
+        variacoes = 100 * variacao_anual(matriz, anos)[:, 1:]
+        nomes = (rotulos['Estado'].astype(str) + ' - '
+                 + rotulos['Índice de Violência'].astype(str)).to_numpy()
+        n_linhas, n_colunas = variacoes.shape
+        
+        # Escala de cores simétrica em torno de zero
+        limite = np.nanpercentile(np.abs(variacoes), 95) if np.isfinite(variacoes).any() else 1
+        limite = max(float(limite), 1.0)
+        
+        altura = min(max(6, 0.3 * n_linhas), ALTURA_MAXIMA_HEATMAP)
+        fig, ax = plt.subplots(figsize=(14, altura))
+        mapa_cores = plt.get_cmap('RdYlGn_r').copy()
+        mapa_cores.set_bad('#eeeeee')
+        imagem = ax.imshow(np.ma.masked_invalid(variacoes), aspect='auto',
+                           interpolation='nearest', cmap=mapa_cores,
+                           vmin=-limite, vmax=limite)
+        fig.colorbar(imagem, ax=ax, label='Variação em relação ao ano anterior (%)')
+        
+        if n_linhas * n_colunas <= LIMITE_CELULAS_ANOTACAO:
+            for i, j in zip(*np.nonzero(np.isfinite(variacoes))):
+                ax.text(j, i, f'{variacoes[i, j]:+.0f}', ha='center', va='center', fontsize=8)
+        
+        ax.set_xticks(np.arange(n_colunas))
+        ax.set_xticklabels(anos[1:], rotation=45)
+        if n_linhas <= MAX_ROTULOS_LINHAS:
+            ax.set_yticks(np.arange(n_linhas))
+            ax.set_yticklabels(nomes)
+        else:
+            ax.set_yticks([])
+        
+        # Customização
+        ax.set_title(
+            'Variação Anual por Estado e Tipo de Violência (%)',
+            fontsize=16,
+            fontweight='bold',
+            pad=20
+        )
+        ax.set_xlabel('Ano', fontsize=13, fontweight='bold')
+        
+        plt.tight_layout()
+        
+        # Salvar
+        if salvar:
+            return self._salvar_figura('variacao_anual.png')
+        else:
+            plt.show()
+            return ""
+    
+    def grafico_crescimento_composto(self, salvar: bool = True) -> str:
+        """
+        Barras com a taxa de crescimento composta (CAGR) por estado e índice
+        
+        Args:
+            salvar: Se True, salva o gráfico
+        
+        Returns:
+            Caminho do arquivo salvo
+        """
+        metricas = metricas_do_cubo(self.cubo).dropna(subset=['CAGR (%)'])
+        
+        if metricas.empty:
+            print("⚠️  Dados insuficientes para a taxa de crescimento")
+            return ""
+        
+        tabela = metricas.pivot(index='Estado', columns='Índice de Violência', values='CAGR (%)')
+        tabela = tabela.sort_index(ascending=False)
+        
+        altura = min(max(6, 0.5 * len(tabela) * max(1, len(tabela.columns) / 4)),
+                     ALTURA_MAXIMA_HEATMAP)
+        fig, ax = plt.subplots(figsize=(12, altura))
+        tabela.plot(kind='barh', ax=ax, width=0.8,
+                    color=PALETA_CORES[:len(tabela.columns)])
+        ax.axvline(0, color='black', linewidth=0.8)
+        
+        # Customização
+        inicio, fim = int(metricas['Ano Inicial'].min()), int(metricas['Ano Final'].max())
+        ax.set_title(
+            f'Crescimento Médio Anual Composto ({inicio}-{fim})',
+            fontsize=16,
+            fontweight='bold',
+            pad=20
+        )
+        ax.set_xlabel('CAGR (% ao ano)', fontsize=13, fontweight='bold')
+        ax.set_ylabel('Estado', fontsize=13, fontweight='bold')
+        
+        # Grade e legenda
+        ax.grid(True, linestyle='--', alpha=0.4, axis='x')
+        ax.legend(title='Tipo de Violência', loc='best', framealpha=0.9)
+        
+        plt.tight_layout()
+        
+        # Salvar
+        if salvar:
+            return self._salvar_figura('crescimento_composto.png')
         else:
             plt.show()
             return ""
@@ -341,23 +742,30 @@ class GeradorGraficos:
         
         # 1. Séries temporais por estado
         print("📈 Gerando séries temporais por estado...")
-        for estado in self.df['Estado'].unique():
+        for estado in self.cubo.rotulos['Estado']:
             self.grafico_serie_temporal_por_estado(estado)
         
         # 2. Comparativos entre estados
         print("\n📊 Gerando gráficos comparativos...")
-        for indice in self.df['Índice de Violência'].unique():
+        for indice in self.cubo.rotulos['Índice de Violência']:
             self.grafico_comparativo_estados(indice, tipo='linha')
         
         # 3. Heatmaps
         print("\n🔥 Gerando mapas de calor...")
-        for indice in self.df['Índice de Violência'].unique():
+        for indice in self.cubo.rotulos['Índice de Violência']:
             self.grafico_heatmap_estados_anos(indice)
         
         # 4. Tendência geral
         print("\n📈 Gerando gráfico de tendência geral...")
         self.grafico_tendencia_geral()
         
+        # 5. Análise temporal
+        print("\n📉 Gerando gráficos de análise temporal...")
+        self.grafico_crescimento_composto()
+        self.grafico_variacao_anual()
+        for estado in self.cubo.rotulos['Estado']:
+            self.grafico_media_movel_estado(estado)
+        
         print("\n" + "="*70)
         print(f"✅ GRÁFICOS GERADOS: {len(self.arquivos_gerados)} arquivos")
         print("="*70 + "\n")
@@ -374,7 +782,7 @@ def gerar_graficos_violencia(df_dados: pd.DataFrame,
     Args:
         df_dados: DataFrame com os dados
         pasta_saida: Pasta de saída dos gráficos
-        
+    
     Returns:
         Lista de caminhos dos arquivos gerados
     """
@@ -3,18 +3,250 @@ Módulo de Geração de Relatório PDF
 Cria relatório acadêmico consolidando gráficos e análises
 """
 
+import numpy as np
+import pandas as pd
 from fpdf import FPDF
-from typing import List, Optional, Dict
+from fpdf.enums import Align, XPos, YPos
+from fpdf.line_break import TextLine
+from PIL import Image, ImageChops, ImageStat
+from typing import Iterable, List, Optional, Dict, Tuple
+from collections import OrderedDict
+import hashlib
+import io
 import os
 from datetime import datetime
 
+from analise_temporal import COLUNAS_METRICAS, descrever_tendencias, metricas_do_cubo
+from cubo_agregado import CuboAgregado
+
+# Largura das imagens (mm) e gráficos por página: final e rascunho
+LARGURA_IMAGEM_FINAL = 170
+LARGURA_MINIATURA_RASCUNHO = 80
+GRAFICOS_POR_PAGINA_FINAL = 2
+GRAFICOS_POR_PAGINA_RASCUNHO = 4
+
+# Preparação das imagens antes da incorporação no PDF
+DPI_IMAGEM_FINAL = 200
+DPI_IMAGEM_RASCUNHO = 72
+MAX_CORES_PALETA = 256
+ERRO_MAXIMO_PALETA = 4.0  # RMS por canal (0-255) aceito na redução de paleta
+QUALIDADE_JPEG = 85
+
+# Tabelas de dados
+MARGEM_CELULA_TABELA = 1.5  # mm
+TAMANHO_MINIMO_FONTE_TABELA = 5
+MAX_TEXTOS_DIAGRAMADOS = 256  # quebras de linha guardadas por processo
+COLUNAS_SEM_SEPARADOR_MILHAR = ('Ano',)
+COLUNAS_TABELA_DADOS = ['Estado', 'Município', 'Índice de Violência', 'Ano', 'Valor']
+COLUNAS_RESUMO = {'Estado', 'Índice de Violência', 'Valor'}
+
+# Textos fixos do relatório (seções estáticas)
+TEXTO_METODOLOGIA = (
+    "Este relatório apresenta uma análise quantitativa dos índices de violência "
+    "contra mulheres nos estados do Amazonas, Roraima e Acre, no período de 2015 a 2025. "
+    "Os dados foram extraídos dos Anuários Brasileiros de Segurança Pública publicados "
+    "pelo Fórum Brasileiro de Segurança Pública (FBSP) e do Atlas da Violência do IPEA. "
+    "\n\n"
+    "A análise contempla diferentes tipos de violência, incluindo feminicídio, homicídio "
+    "de mulheres, estupro e outras formas de agressão. Os dados foram consolidados em "
+    "séries temporais para permitir a identificação de tendências e padrões ao longo do tempo."
+)
+
+TEXTO_CONCLUSAO_PADRAO = (
+    "A análise dos dados de violência contra mulheres na região Norte do Brasil, "
+    "especificamente nos estados do Amazonas, Roraima e Acre, revela a necessidade "
+    "urgente de políticas públicas efetivas de prevenção e combate à violência de gênero. "
+    "\n\n"
+    "Os gráficos apresentados evidenciam padrões e tendências que devem ser considerados "
+    "na formulação de estratégias de enfrentamento à violência contra a mulher, "
+    "levando em conta as particularidades regionais e os desafios específicos de cada estado."
+)
+
+TEXTO_FONTES = (
+    "Os dados analisados neste relatório são REAIS e foram extraídos diretamente dos "
+    "Anuários Brasileiros de Segurança Pública oficiais, publicados pelo Fórum Brasileiro "
+    "de Segurança Pública (FBSP) e pelo Instituto de Pesquisa Econômica Aplicada (IPEA). "
+    "\n\n"
+    "Todos os dados foram processados e analisados utilizando a linguagem de programação "
+    "Python, com bibliotecas especializadas em ciência de dados (Pandas, NumPy) e "
+    "visualização de informações (Matplotlib, Seaborn)."
+)
+
+REFERENCIAS = [
+    "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2024. São Paulo: FBSP, 2024. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
+    "",
+    "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2023. São Paulo: FBSP, 2023. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
+    "",
+    "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2022. São Paulo: FBSP, 2022. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
+    "",
+    "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2020. São Paulo: FBSP, 2020. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
+    "",
+    "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2019. São Paulo: FBSP, 2019. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
+    "",
+    "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2017. São Paulo: FBSP, 2017. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
+]
+
+TEXTO_FERRAMENTAS = (
+    "Este relatório foi produzido utilizando as seguintes tecnologias:\n\n"
+    "- Python 3.11: Linguagem de programação para análise de dados\n"
+    "- Pandas: Manipulação e análise de dados estruturados\n"
+    "- NumPy: Computação numérica e operações matemáticas\n"
+    "- Matplotlib e Seaborn: Visualização de dados e criação de gráficos\n"
+    "- Tabula-py: Extração de tabelas de documentos PDF\n"
+    "- FPDF2: Geração de relatórios em formato PDF\n\n"
+    "Todos os dados são provenientes de fontes oficiais do governo brasileiro "
+    "e foram analisados de forma automatizada, garantindo precisão e reprodutibilidade."
+)
+
+
+def preparar_imagem(caminho_imagem: str,
+                    largura_mm: float,
+                    dpi_alvo: int = DPI_IMAGEM_FINAL,
+                    max_cores: int = MAX_CORES_PALETA) -> io.BytesIO:
+    """
+    Reduz e recomprime uma imagem para a largura em que será impressa no PDF
+    
+    A imagem é redimensionada para o DPI efetivo desejado na largura de
+    colocação; em seguida são geradas duas versões (PNG com paleta reduzida,
+    adequada a gráficos de cores chapadas, e JPEG) e a menor é mantida.
+    Se a paleta reduzida introduzir erro visível, o PNG é salvo em RGB.
+    
+    Args:
+        caminho_imagem: Caminho da imagem original
+        largura_mm: Largura de colocação no PDF (mm)
+        dpi_alvo: Resolução efetiva desejada na impressão
+        max_cores: Número máximo de cores da paleta do PNG
+    
+    Returns:
+        Buffer com a imagem preparada (PNG ou JPEG)
+    """
+    with Image.open(caminho_imagem) as original:
+        imagem = original.convert('RGBA')
+    
+    # Reamostra para o DPI efetivo na largura de colocação: redução inteira
+    # rápida (box) seguida de Lanczos para o fator restante
+    largura_px = max(1, round(largura_mm / 25.4 * dpi_alvo))
+    if imagem.width > largura_px:
+        fator_inteiro = imagem.width // largura_px
+        if fator_inteiro > 1:
+            imagem = imagem.reduce(fator_inteiro)
+        altura_px = max(1, round(imagem.height * largura_px / imagem.width))
+        imagem = imagem.resize((largura_px, altura_px), Image.LANCZOS)
+    
+    # Remove transparência sobre fundo branco
+    fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+    fundo.paste(imagem, mask=imagem.getchannel('A'))
+    imagem = fundo
+    
+    # Candidato 1: PNG com paleta reduzida (ou RGB se a paleta perder detalhes)
+    buffer_png = io.BytesIO()
+    paleta = imagem.quantize(colors=max_cores, method=Image.Quantize.FASTOCTREE)
+    erro = ImageStat.Stat(ImageChops.difference(imagem, paleta.convert('RGB'))).rms
+    if max(erro) <= ERRO_MAXIMO_PALETA:
+        paleta.save(buffer_png, format='PNG')
+    else:
+        imagem.save(buffer_png, format='PNG')
+    
+    # Candidato 2: JPEG
+    buffer_jpeg = io.BytesIO()
+    imagem.save(buffer_jpeg, format='JPEG', quality=QUALIDADE_JPEG, optimize=True)
+    
+    melhor = min(buffer_png, buffer_jpeg, key=lambda buffer: buffer.getbuffer().nbytes)
+    melhor.seek(0)
+    return melhor
+
+
+def decodificar_imagem_pdf(imagem: bytes) -> Optional[tuple]:
+    """
+    Decodifica uma imagem preparada no formato em que o fpdf a grava no PDF
+    
+    É a parte cara de FPDF.image para PNG (descompressão e nova compressão
+    zlib). O resultado pode ser guardado e entregue a
+    RelatorioPDF.registrar_imagens_decodificadas com a mesma versão do fpdf.
+    
+    Args:
+        imagem: Conteúdo da imagem (ver preparar_imagem)
+    
+    Returns:
+        (chave da imagem no cache do fpdf, informações da imagem), ou None se
+        a imagem tiver perfil ICC (que depende do documento)
+    """
+    from fpdf.image_parsing import preload_image
+    
+    chave, _, info = preload_image(FPDF().image_cache, io.BytesIO(imagem))
+    if info.get('iccp_i') is not None:
+        return None
+    return chave, info
+
+
+def formatar_coluna(serie: pd.Series) -> np.ndarray:
+    """
+    Formata uma coluna inteira como texto para exibição em tabela
+    
+    Números usam separador de milhar '.' e decimal ',' (inteiros sem casas
+    decimais); valores ausentes viram string vazia.
+    
+    Args:
+        serie: Coluna do DataFrame
+    
+    Returns:
+        Array de strings
+    """
+    if pd.api.types.is_bool_dtype(serie) or not pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(object).where(serie.notna(), '').astype(str).to_numpy()
+    
+    numeros = serie.astype(float)
+    if serie.name in COLUNAS_SEM_SEPARADOR_MILHAR:
+        formato = '{:.0f}'
+    elif np.allclose(numeros.dropna() % 1, 0):
+        formato = '{:,.0f}'
+    else:
+        formato = '{:,.2f}'
+    
+    texto = numeros.map(formato.format, na_action='ignore').fillna('')
+    texto = texto.str.replace(',', '_').str.replace('.', ',').str.replace('_', '.')
+    return texto.to_numpy(dtype=str)
+
+
+def resumo_estatistico(df: pd.DataFrame,
+                       cubo: Optional[CuboAgregado] = None) -> pd.DataFrame:
+    """
+    Calcula estatísticas resumidas por Estado e Índice de Violência
+    
+    As estatísticas são dos totais anuais de cada par (municípios e meses
+    são somados antes), lidas do cubo agregado.
+    
+    Args:
+        df: DataFrame em formato longo (Ano, Estado, Índice de Violência, Valor)
+        cubo: Cubo agregado de `df` (montado aqui se omitido)
+    
+    Returns:
+        DataFrame com Anos, Total, Média, Mínimo e Máximo
+    """
+    return (cubo or CuboAgregado(df)).resumo()
+
+
+# Quebras de linha de textos já diagramados neste processo, dos menos aos mais
+# recentemente usados (no máximo MAX_TEXTOS_DIAGRAMADOS):
+# (texto, fonte, estilo, tamanho, largura) -> [(linha, justificar)]
+_DIAGRAMACAO: 'OrderedDict[tuple, List[Tuple[str, bool]]]' = OrderedDict()
+
+
+def _guardar_diagramacao(chave: tuple, linhas: List[Tuple[str, bool]]):
+    """Guarda as quebras de um texto, descartando as usadas há mais tempo"""
+    _DIAGRAMACAO[chave] = linhas
+    _DIAGRAMACAO.move_to_end(chave)
+    while len(_DIAGRAMACAO) > MAX_TEXTOS_DIAGRAMADOS:
+        _DIAGRAMACAO.popitem(last=False)
+
 
 class RelatorioPDF(FPDF):
     """Classe customizada para gerar relatórios acadêmicos"""
     
     def __init__(self, titulo: str = "Análise de Violência contra Mulheres",
                  subtitulo: str = "Região Norte - Amazonas, Roraima e Acre",
-                 periodo: str = "2015-2025"):
+                 periodo: str = "2015-2025",
+                 dpi_imagens: Optional[int] = DPI_IMAGEM_FINAL):
         """
         Inicializa o relatório
         
@@ -22,11 +254,14 @@ class RelatorioPDF(FPDF):
             titulo: Título principal do relatório
             subtitulo: Subtítulo do relatório
             periodo: Período analisado
+            dpi_imagens: DPI efetivo das imagens incorporadas (None = imagem original)
         """
         super().__init__()
         self.titulo_relatorio = titulo
         self.subtitulo_relatorio = subtitulo
         self.periodo = periodo
+        self.dpi_imagens = dpi_imagens
+        self._imagens_preparadas: Dict[str, io.BytesIO] = {}
         self.margem_esquerda = 20
         self.margem_direita = 20
         self.largura_util = 210 - self.margem_esquerda - self.margem_direita
@@ -183,12 +418,287 @@ class RelatorioPDF(FPDF):
             texto: Conteúdo do parágrafo
         """
         self.set_font('Arial', '', 11)
-        self.multi_cell(0, 6, texto, 0, 'J')
+        self.texto_justificado(texto, 6)
         self.ln(3)
     
+    def _linhas_texto(self, texto: str) -> List[Tuple[str, bool]]:
+        """
+        Quebras de linha de um texto na fonte atual e na largura útil, calculadas
+        uma única vez por processo (ver _DIAGRAMACAO)
+        
+        Args:
+            texto: Texto (quebras '\\n' separam parágrafos)
+        
+        Returns:
+            Lista de (linha, justificar); a última linha de cada parágrafo não
+            é justificada
+        """
+        chave = (texto, self.font_family, self.font_style, self.font_size_pt, self.epw)
+        linhas = _DIAGRAMACAO.get(chave)
+        if linhas is None:
+            linhas = []
+            for paragrafo in texto.split('\n'):
+                quebradas = self.multi_cell(self.epw, 1, paragrafo, align='J',
+                                            dry_run=True, output='LINES')
+                linhas += [(linha, i < len(quebradas) - 1) for i, linha in enumerate(quebradas)]
+        _guardar_diagramacao(chave, linhas)
+        return linhas
+    
+    def texto_justificado(self, texto: str, altura: float):
+        """
+        Escreve um texto justificado na largura útil (equivale a
+        multi_cell(0, altura, texto, 0, 'J'), sem recalcular as quebras de
+        linha de textos já diagramados)
+        
+        Args:
+            texto: Texto
+            altura: Altura de cada linha (mm)
+        """
+        self.x = self.l_margin
+        for linha, justificar in self._linhas_texto(texto):
+            self._render_styled_text_line(
+                TextLine(self._preload_font_styles(linha, False), text_width=0,
+                         number_of_spaces=linha.count(' ') if justificar else 0,
+                         align=Align.J if justificar else Align.L,
+                         height=altura, max_width=self.epw),
+                h=altura, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    
+    def _larguras_texto(self, valores: np.ndarray) -> np.ndarray:
+        """
+        Mede a largura (mm) de um array de strings de uma só vez na fonte atual
+        
+        Os códigos dos caracteres são lidos diretamente do array Unicode do
+        NumPy e convertidos em larguras pela tabela de métricas da fonte.
+        
+        Args:
+            valores: Array de strings
+        
+        Returns:
+            Array com a largura de cada string
+        """
+        valores = np.asarray(valores, dtype=str)
+        if valores.size == 0 or valores.dtype.itemsize == 0:
+            return np.zeros(len(valores))
+        
+        # Tabela de larguras (1/1000 em) indexada pelo código do caractere
+        metricas = self.current_font.cw
+        tabela = np.array([metricas.get(chr(i), 0) for i in range(256)] + [500], dtype=float)
+        tabela[0] = 0
+        
+        codigos = valores.view(np.uint32).reshape(len(valores), -1)
+        larguras = tabela[np.minimum(codigos, 256)].sum(axis=1)
+        return larguras * self.font_size / 1000
+    
+    def _medir_tabela(self, colunas: List[str], textos: List[np.ndarray],
+                      tamanho_fonte: float) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+        """
+        Mede cabeçalhos e células de uma tabela num tamanho de fonte
+        
+        Returns:
+            Tupla (larguras das colunas com margem interna, larguras dos
+            cabeçalhos, larguras das células de cada coluna)
+        """
+        self.set_font('Arial', 'B', tamanho_fonte)
+        larguras_cabecalho = self._larguras_texto(np.array(colunas))
+        self.set_font('Arial', '', tamanho_fonte)
+        larguras_celulas = [self._larguras_texto(texto) for texto in textos]
+        
+        larguras = np.array([max(cabecalho, celulas.max(initial=0))
+                             for cabecalho, celulas in zip(larguras_cabecalho, larguras_celulas)])
+        return larguras + 2 * MARGEM_CELULA_TABELA, larguras_cabecalho, larguras_celulas
+    
+    def _grupos_colunas(self, larguras: np.ndarray) -> List[List[int]]:
+        """
+        Divide as colunas em grupos que cabem na largura útil; a primeira
+        coluna (identificação das linhas) se repete em todos os grupos
+        
+        Args:
+            larguras: Largura de cada coluna (mm)
+        
+        Returns:
+            Posições das colunas de cada grupo
+        """
+        if larguras.sum() <= self.largura_util:
+            return [list(range(len(larguras)))]
+        grupos, grupo = [], [0]
+        for j in range(1, len(larguras)):
+            if len(grupo) > 1 and larguras[grupo].sum() + larguras[j] > self.largura_util:
+                grupos.append(grupo)
+                grupo = [0]
+            grupo.append(j)
+        grupos.append(grupo)
+        return grupos
+    
+    def tabela_dados(self, df: pd.DataFrame,
+                     alinhamentos: Optional[Dict[str, str]] = None,
+                     tamanho_fonte: float = 8,
+                     altura_linha: float = 5):
+        """
+        Adiciona uma tabela paginada com cabeçalho repetido a cada página
+        
+        As células são formatadas e medidas por coluna (vetorizado) e as linhas
+        são escritas diretamente com text(), sem criar objetos por célula, o que
+        mantém tabelas com dezenas de milhares de linhas rápidas. Tabelas largas
+        usam uma fonte menor (até TAMANHO_MINIMO_FONTE_TABELA); se ainda assim
+        não couberem, as colunas continuam em páginas seguintes.
+        
+        Args:
+            df: DataFrame a ser exibido (todas as colunas)
+            alinhamentos: {coluna: 'L' ou 'R'} (padrão: números à direita)
+            tamanho_fonte: Tamanho da fonte das células
+            altura_linha: Altura de cada linha (mm)
+        """
+        if df.empty:
+            return
+        
+        alinhamentos = alinhamentos or {}
+        colunas = [str(coluna) for coluna in df.columns]
+        textos = [formatar_coluna(df[coluna]) for coluna in df.columns]
+        direita = [alinhamentos.get(nome, 'R' if pd.api.types.is_numeric_dtype(df[coluna])
+                                   else 'L') == 'R'
+                   for nome, coluna in zip(colunas, df.columns)]
+        
+        # Larguras das colunas: maior texto (cabeçalho ou célula) + margem interna
+        larguras, larguras_cabecalho, larguras_celulas = self._medir_tabela(
+            colunas, textos, tamanho_fonte)
+        
+        # Reduz a fonte se a tabela não couber (só o texto encolhe, não as
+        # margens) e mede de novo no tamanho realmente usado
+        margens = 2 * MARGEM_CELULA_TABELA * len(colunas)
+        if larguras.sum() > self.largura_util:
+            texto = larguras.sum() - margens
+            escala = max(self.largura_util - margens, 0) / texto if texto > 0 else 0
+            tamanho_fonte = max(TAMANHO_MINIMO_FONTE_TABELA, tamanho_fonte * escala)
+            larguras, larguras_cabecalho, larguras_celulas = self._medir_tabela(
+                colunas, textos, tamanho_fonte)
+        
+        # Ainda larga demais na fonte mínima: grupos de colunas em páginas seguintes
+        for n, grupo in enumerate(self._grupos_colunas(larguras)):
+            if n:
+                self.add_page()
+            self._desenhar_tabela([colunas[j] for j in grupo], [textos[j] for j in grupo],
+                                  [direita[j] for j in grupo], larguras[grupo],
+                                  larguras_cabecalho[grupo],
+                                  [larguras_celulas[j] for j in grupo],
+                                  tamanho_fonte, altura_linha)
+    
+    def _desenhar_tabela(self, colunas: List[str], textos: List[np.ndarray],
+                         direita: List[bool], larguras: np.ndarray,
+                         larguras_cabecalho: np.ndarray, larguras_celulas: List[np.ndarray],
+                         tamanho_fonte: float, altura_linha: float):
+        """Escreve as linhas de uma tabela já medida (ver tabela_dados)"""
+        x_inicio = self.margem_esquerda + (self.largura_util - larguras.sum()) / 2
+        x_colunas = x_inicio + np.concatenate(([0.0], np.cumsum(larguras)[:-1]))
+        
+        # Posição x de cada célula (alinhamento à direita calculado por coluna)
+        x_celulas = [
+            x + largura - MARGEM_CELULA_TABELA - celulas if alinhar_direita
+            else np.full(len(celulas), x + MARGEM_CELULA_TABELA)
+            for x, largura, celulas, alinhar_direita
+            in zip(x_colunas, larguras, larguras_celulas, direita)
+        ]
+        
+        def desenhar_cabecalho():
+            self.set_font('Arial', 'B', tamanho_fonte)
+            self.set_fill_color(30, 30, 80)
+            self.set_text_color(255, 255, 255)
+            y = self.get_y()
+            self.rect(x_inicio, y, larguras.sum(), altura_linha, 'F')
+            for x, largura, nome, largura_nome, alinhar_direita in zip(
+                    x_colunas, larguras, colunas, larguras_cabecalho, direita):
+                x_texto = (x + largura - MARGEM_CELULA_TABELA - largura_nome
+                           if alinhar_direita else x + MARGEM_CELULA_TABELA)
+                self.text(x_texto, y + altura_linha * 0.7, nome)
+            self.set_y(y + altura_linha)
+            self.set_font('Arial', '', tamanho_fonte)
+            self.set_text_color(0, 0, 0)
+            self.set_fill_color(240, 240, 245)
+        
+        desenhar_cabecalho()
+        
+        # Linhas: quebra de página manual para repetir o cabeçalho
+        limite_y = self.page_break_trigger
+        largura_total = larguras.sum()
+        y = self.get_y()
+        for i, linha in enumerate(zip(*textos)):
+            if y + altura_linha > limite_y:
+                self.add_page()
+                desenhar_cabecalho()
+                y = self.get_y()
+            
+            if i % 2:
+                self.rect(x_inicio, y, largura_total, altura_linha, 'F')
+            
+            y_texto = y + altura_linha * 0.7
+            for j, texto in enumerate(linha):
+                if texto:
+                    self.text(x_celulas[j][i], y_texto, texto)
+            y += altura_linha
+        
+        self.set_y(y)
+        self.ln(4)
+    
+    @staticmethod
+    def _chave_imagem(caminho_imagem: str, largura: float) -> str:
+        """Chave das imagens preparadas: hash do conteúdo e largura de colocação"""
+        with open(caminho_imagem, 'rb') as arquivo:
+            return f"{hashlib.sha1(arquivo.read()).hexdigest()}:{largura}"
+    
+    def registrar_imagem_preparada(self, caminho_imagem: str, largura: float,
+                                   buffer: io.BytesIO):
+        """
+        Guarda uma imagem preparada fora do relatório (ex.: em outro processo)
+        
+        Args:
+            caminho_imagem: Caminho da imagem original
+            largura: Largura de colocação (mm) para a qual foi preparada
+            buffer: Imagem preparada (ver preparar_imagem)
+        """
+        if self.dpi_imagens is not None:
+            self._imagens_preparadas[self._chave_imagem(caminho_imagem, largura)] = buffer
+    
+    def registrar_imagens_decodificadas(self, imagens: Dict[str, dict]):
+        """
+        Coloca no cache de imagens do fpdf imagens já decodificadas, para que
+        FPDF.image apenas as posicione (ver decodificar_imagem_pdf)
+        
+        Args:
+            imagens: Chave da imagem no cache do fpdf -> informações da imagem
+        """
+        cache = self.image_cache.images
+        for chave, info in imagens.items():
+            if chave not in cache:
+                # Só é gravada no PDF se for usada (usages > 0)
+                cache[chave] = type(info)(info, i=len(cache) + 1, usages=0)
+    
+    def _imagem_para_pdf(self, caminho_imagem: str, largura: float):
+        """
+        Retorna a imagem preparada para incorporação, reutilizando imagens idênticas
+        
+        Args:
+            caminho_imagem: Caminho da imagem
+            largura: Largura de colocação (mm)
+        
+        Returns:
+            Buffer da imagem preparada (ou o caminho original se dpi_imagens for None)
+        """
+        if self.dpi_imagens is None:
+            return caminho_imagem
+        
+        chave = self._chave_imagem(caminho_imagem, largura)
+        if chave not in self._imagens_preparadas:
+            self._imagens_preparadas[chave] = preparar_imagem(
+                caminho_imagem, largura, self.dpi_imagens
+            )
+        
+        buffer = self._imagens_preparadas[chave]
+        buffer.seek(0)
+        return buffer
+    
     def adicionar_imagem_centralizada(self, caminho_imagem: str, 
                                        largura: Optional[float] = None,
-                                       legenda: str = ""):
+                                       legenda: str = "",
+                                       imagem: Optional[io.BytesIO] = None):
         """
         Adiciona imagem centralizada com legenda
         
@@ -196,8 +706,9 @@ class RelatorioPDF(FPDF):
             caminho_imagem: Caminho da imagem
             largura: Largura da imagem (None = largura máxima)
             legenda: Texto da legenda
+            imagem: Imagem já preparada para esta largura (o arquivo não é lido)
         """
-        if not os.path.exists(caminho_imagem):
+        if imagem is None and not os.path.exists(caminho_imagem):
             print(f"⚠️  Imagem não encontrada: {caminho_imagem}")
             return
         
@@ -210,7 +721,9 @@ class RelatorioPDF(FPDF):
         
         # Adiciona imagem
         try:
-            self.image(caminho_imagem, x=x_pos, w=largura)
+            if imagem is None:
+                imagem = self._imagem_para_pdf(caminho_imagem, largura)
+            self.image(imagem, x=x_pos, w=largura)
             
             # Adiciona legenda se fornecida
             if legenda:
@@ -221,17 +734,55 @@ class RelatorioPDF(FPDF):
                 self.set_text_color(0, 0, 0)
             
             self.ln(5)
-            
+        
         except Exception as e:
             print(f"❌ Erro ao adicionar imagem {caminho_imagem}: {str(e)}")
 
 
+def diagramar_textos(textos: Iterable[str] = ()) -> Dict[tuple, List[Tuple[str, bool]]]:
+    """
+    Calcula as quebras de linha das seções fixas (metodologia, conclusão
+    padrão, fontes, referências e ferramentas) e de outros parágrafos, para
+    entregá-las a outros processos (ver registrar_diagramacao)
+    
+    Args:
+        textos: Parágrafos adicionais (ex.: introduções comuns a vários relatórios)
+    
+    Returns:
+        Diagramação: chave do texto -> [(linha, justificar)]
+    """
+    pdf = RelatorioPDF()
+    pdf.add_page()
+    pdf.set_font('Arial', '', 11)
+    for texto in (TEXTO_METODOLOGIA, TEXTO_CONCLUSAO_PADRAO, TEXTO_FONTES,
+                  TEXTO_FERRAMENTAS, *textos):
+        if texto:
+            pdf._linhas_texto(texto)
+    pdf.set_font('Arial', '', 10)
+    for referencia in REFERENCIAS:
+        if referencia:
+            pdf._linhas_texto(referencia)
+    return dict(_DIAGRAMACAO)
+
+
+def registrar_diagramacao(diagramacao: Dict[tuple, List[Tuple[str, bool]]]):
+    """
+    Reaproveita neste processo quebras de linha calculadas em outro (ver diagramar_textos)
+    
+    Args:
+        diagramacao: Chave do texto -> [(linha, justificar)]
+    """
+    for chave, linhas in diagramacao.items():
+        _guardar_diagramacao(chave, linhas)
+
+
 class GeradorRelatorioCompleto:
     """Classe para gerar relatório completo com análises"""
     
     def __init__(self, titulo: str = "Análise de Violência contra Mulheres",
                  subtitulo: str = "Região Norte - Amazonas, Roraima e Acre",
-                 periodo: str = "2015-2025"):
+                 periodo: str = "2015-2025",
+                 modo_rascunho: bool = False):
         """
         Inicializa o gerador de relatório
         
@@ -239,11 +790,220 @@ class GeradorRelatorioCompleto:
             titulo: Título do relatório
             subtitulo: Subtítulo do relatório
             periodo: Período analisado
+            modo_rascunho: Se True, gera relatório leve com miniaturas dos gráficos
         """
-        self.pdf = RelatorioPDF(titulo, subtitulo, periodo)
+        dpi_imagens = DPI_IMAGEM_RASCUNHO if modo_rascunho else DPI_IMAGEM_FINAL
+        self.pdf = RelatorioPDF(titulo, subtitulo, periodo, dpi_imagens=dpi_imagens)
         self.titulo = titulo
         self.subtitulo = subtitulo
         self.periodo = periodo
+        self.modo_rascunho = modo_rascunho
+    
+    @property
+    def largura_graficos(self) -> float:
+        """Largura (mm) com que os gráficos são colocados no relatório"""
+        return LARGURA_MINIATURA_RASCUNHO if self.modo_rascunho else LARGURA_IMAGEM_FINAL
+    
+    @property
+    def dpi_imagens(self) -> Optional[int]:
+        """DPI efetivo das imagens incorporadas"""
+        return self.pdf.dpi_imagens
+    
+    def registrar_imagem_preparada(self, caminho_imagem: str, buffer: io.BytesIO):
+        """
+        Guarda uma imagem já preparada (ver preparar_imagem) para a largura dos
+        gráficos, para que adicionar_grafico não precise prepará-la de novo
+        
+        Args:
+            caminho_imagem: Caminho da imagem original
+            buffer: Imagem preparada em outro processo
+        """
+        self.pdf.registrar_imagem_preparada(caminho_imagem, self.largura_graficos, buffer)
+    
+    def registrar_imagens_decodificadas(self, imagens: Dict[str, dict]):
+        """
+        Entrega ao PDF imagens já decodificadas pelo fpdf (ver decodificar_imagem_pdf)
+        
+        Args:
+            imagens: Chave da imagem no cache do fpdf -> informações da imagem
+        """
+        self.pdf.registrar_imagens_decodificadas(imagens)
+    
+    def iniciar_relatorio(self, autor: str = "", instituicao: str = "",
+                          introducao: str = ""):
+        """
+        Seções que não dependem dos dados: título, introdução e metodologia
+        
+        Args:
+            autor: Nome do autor
+            instituicao: Nome da instituição
+            introducao: Texto de introdução
+        """
+        # Página de título
+        print("📑 Criando página de título...")
+        self.pdf.pagina_titulo(autor, instituicao)
+        
+        # Introdução
+        if introducao:
+            print("📝 Adicionando introdução...")
+            self.pdf.add_page()
+            self.pdf.capitulo_titulo("1. Introdução")
+            self.pdf.texto_paragrafo(introducao)
+        
+        # Metodologia
+        print("🔬 Adicionando metodologia...")
+        self.pdf.add_page()
+        self.pdf.capitulo_titulo("2. Metodologia")
+        self.pdf.texto_paragrafo(TEXTO_METODOLOGIA)
+        
+        # Resultados e Análise
+        print("📊 Adicionando gráficos...")
+        self.pdf.add_page()
+        self.pdf.capitulo_titulo("3. Resultados e Análise")
+        if self.modo_rascunho:
+            print("   📝 Modo rascunho: miniaturas dos gráficos")
+        self._graficos_adicionados = 0
+    
+    def adicionar_grafico(self, caminho: str, legenda: Optional[str] = None,
+                          total: Optional[int] = None,
+                          imagem: Optional[io.BytesIO] = None):
+        """
+        Acrescenta o próximo gráfico da seção de resultados
+        
+        Args:
+            caminho: Caminho da imagem do gráfico (o nome define o título da seção)
+            legenda: Legenda (padrão: "Figura N: arquivo")
+            total: Número total de gráficos (apenas para a mensagem de progresso)
+            imagem: Imagem já preparada para largura_graficos (ex.: de um instantâneo)
+        """
+        if imagem is None and not os.path.exists(caminho):
+            return
+        graficos_por_pagina = (GRAFICOS_POR_PAGINA_RASCUNHO if self.modo_rascunho
+                               else GRAFICOS_POR_PAGINA_FINAL)
+        
+        # Nova página a cada N gráficos
+        if self._graficos_adicionados and self._graficos_adicionados % graficos_por_pagina == 0:
+            self.pdf.add_page()
+        self._graficos_adicionados += 1
+        i = self._graficos_adicionados
+        nome_arquivo = os.path.basename(caminho)
+        
+        # Determina tipo de gráfico
+        if 'serie_temporal' in nome_arquivo:
+            estado = nome_arquivo.split('_')[2].replace('.png', '').capitalize()
+            self.pdf.secao_titulo(f"3.{i}. Análise Temporal - {estado}")
+        elif 'comparativo' in nome_arquivo:
+            self.pdf.secao_titulo(f"3.{i}. Análise Comparativa entre Estados")
+        elif 'heatmap' in nome_arquivo:
+            self.pdf.secao_titulo(f"3.{i}. Mapa de Intensidade")
+        elif 'tendencia' in nome_arquivo:
+            self.pdf.secao_titulo(f"3.{i}. Tendência Geral da Região")
+        elif 'crescimento' in nome_arquivo:
+            self.pdf.secao_titulo(f"3.{i}. Crescimento Médio Anual")
+        elif 'variacao' in nome_arquivo:
+            self.pdf.secao_titulo(f"3.{i}. Variação Anual")
+        elif 'media_movel' in nome_arquivo:
+            estado = nome_arquivo.split('_')[2].replace('.png', '').capitalize()
+            self.pdf.secao_titulo(f"3.{i}. Média Móvel e Tendência - {estado}")
+        
+        self.pdf.adicionar_imagem_centralizada(
+            caminho,
+            largura=self.largura_graficos,
+            legenda=legenda or f"Figura {i}: {nome_arquivo}",
+            imagem=imagem
+        )
+        
+        print(f"   ✓ Gráfico {i}/{total or i} adicionado")
+    
+    def finalizar_relatorio(self,
+                            arquivo_saida: str = 'relatorio.pdf',
+                            conclusao: str = "",
+                            df_dados: Optional[pd.DataFrame] = None,
+                            cubo: Optional[CuboAgregado] = None,
+                            metricas: Optional[pd.DataFrame] = None,
+                            resumo: Optional[pd.DataFrame] = None):
+        """
+        Seções finais (conclusão, fontes e anexo de dados) e gravação do PDF
+        
+        Args:
+            arquivo_saida: Nome do arquivo PDF de saída
+            conclusao: Texto de conclusão
+            df_dados: Dados consolidados (anexo e indicadores de tendência)
+            cubo: Cubo agregado de `df_dados`
+            metricas: Métricas já calculadas (metricas_do_cubo); dispensam o cubo
+            resumo: Estatísticas resumidas já calculadas (resumo_estatistico)
+        """
+        # Métricas das séries (a partir do cubo agregado)
+        tem_dados = df_dados is not None and COLUNAS_RESUMO.issubset(df_dados.columns)
+        if tem_dados and metricas is None:
+            if cubo is None:
+                cubo = CuboAgregado(df_dados)
+            metricas = metricas_do_cubo(cubo)
+        
+        # Conclusão
+        if conclusao:
+            print("📝 Adicionando conclusão...")
+        else:
+            print("📝 Adicionando conclusão padrão...")
+        self.pdf.add_page()
+        self.pdf.capitulo_titulo("4. Conclusão")
+        if metricas is not None:
+            for paragrafo in descrever_tendencias(metricas):
+                self.pdf.texto_paragrafo(paragrafo)
+        self.pdf.texto_paragrafo(conclusao or TEXTO_CONCLUSAO_PADRAO)
+        
+        # Página de Fontes e Referências
+        print("📚 Adicionando página de fontes...")
+        self.pdf.add_page()
+        self.pdf.capitulo_titulo("5. Fontes e Referências")
+        
+        # Subtítulo
+        self.pdf.secao_titulo("5.1. Origem dos Dados")
+        
+        self.pdf.texto_paragrafo(TEXTO_FONTES)
+        
+        # Referências Bibliográficas
+        self.pdf.secao_titulo("5.2. Referências Bibliográficas")
+        
+        self.pdf.set_font('Arial', '', 10)
+        self.pdf.ln(2)
+        
+        for ref in REFERENCIAS:
+            if ref:
+                self.pdf.texto_justificado(ref, 5)
+            else:
+                self.pdf.ln(2)
+        
+        # Ferramentas Utilizadas
+        self.pdf.ln(5)
+        self.pdf.secao_titulo("5.3. Ferramentas e Tecnologias")
+        
+        self.pdf.texto_paragrafo(TEXTO_FERRAMENTAS)
+        
+        # Anexo com os dados em tabelas
+        if tem_dados:
+            print("📋 Adicionando anexo com tabelas de dados...")
+            self.pdf.add_page()
+            self.pdf.capitulo_titulo("6. Anexo - Dados Consolidados")
+            
+            self.pdf.secao_titulo("6.1. Estatísticas Resumidas")
+            self.pdf.tabela_dados(resumo if resumo is not None
+                                  else resumo_estatistico(df_dados, cubo))
+            
+            self.pdf.secao_titulo("6.2. Indicadores de Tendência")
+            self.pdf.tabela_dados(
+                metricas[['Estado', 'Índice de Violência'] + COLUNAS_METRICAS].round(2)
+            )
+            
+            self.pdf.secao_titulo("6.3. Série Completa")
+            colunas = [coluna for coluna in COLUNAS_TABELA_DADOS if coluna in df_dados.columns]
+            self.pdf.tabela_dados(
+                df_dados[colunas].sort_values(colunas[:-1], kind='stable')
+            )
+        
+        # Salva o PDF
+        self.pdf.alias_nb_pages()
+        self.pdf.output(arquivo_saida)
     
     def gerar_relatorio(self,
                         caminhos_graficos: List[str],
@@ -252,7 +1012,9 @@ class GeradorRelatorioCompleto:
                         instituicao: str = "",
                         introducao: str = "",
                         conclusao: str = "",
-                        metadados_graficos: Optional[Dict[str, str]] = None) -> bool:
+                        metadados_graficos: Optional[Dict[str, str]] = None,
+                        df_dados: Optional[pd.DataFrame] = None,
+                        cubo: Optional[CuboAgregado] = None) -> bool:
         """
         Gera relatório completo
         
@@ -264,7 +1026,11 @@ class GeradorRelatorioCompleto:
             introducao: Texto de introdução
             conclusao: Texto de conclusão
             metadados_graficos: Dicionário com legendas personalizadas {caminho: legenda}
-            
+            df_dados: Dados consolidados em formato longo (Estado, Índice de
+                      Violência, Ano, Valor); se informado, adiciona anexo com
+                      estatísticas resumidas e a tabela completa
+            cubo: Cubo agregado de `df_dados` (evita reagregar os dados)
+        
         Returns:
             True se gerou com sucesso
         """
@@ -273,163 +1039,21 @@ class GeradorRelatorioCompleto:
             print("📄 GERANDO RELATÓRIO PDF")
             print("="*70 + "\n")
             
-            # Página de título
-            print("📑 Criando página de título...")
-            self.pdf.pagina_titulo(autor, instituicao)
-            
-            # Introdução
-            if introducao:
-                print("📝 Adicionando introdução...")
-                self.pdf.add_page()
-                self.pdf.capitulo_titulo("1. Introdução")
-                self.pdf.texto_paragrafo(introducao)
-            
-            # Metodologia
-            print("🔬 Adicionando metodologia...")
-            self.pdf.add_page()
-            self.pdf.capitulo_titulo("2. Metodologia")
-            texto_metodologia = (
-                "Este relatório apresenta uma análise quantitativa dos índices de violência "
-                "contra mulheres nos estados do Amazonas, Roraima e Acre, no período de 2015 a 2025. "
-                "Os dados foram extraídos dos Anuários Brasileiros de Segurança Pública publicados "
-                "pelo Fórum Brasileiro de Segurança Pública (FBSP) e do Atlas da Violência do IPEA. "
-                "\n\n"
-                "A análise contempla diferentes tipos de violência, incluindo feminicídio, homicídio "
-                "de mulheres, estupro e outras formas de agressão. Os dados foram consolidados em "
-                "séries temporais para permitir a identificação de tendências e padrões ao longo do tempo."
-            )
-            self.pdf.texto_paragrafo(texto_metodologia)
-            
-            # Resultados e Análise
-            print("📊 Adicionando gráficos...")
-            self.pdf.add_page()
-            self.pdf.capitulo_titulo("3. Resultados e Análise")
+            self.iniciar_relatorio(autor, instituicao, introducao)
             
             metadados = metadados_graficos or {}
+            for caminho in caminhos_graficos:
+                self.adicionar_grafico(caminho, metadados.get(caminho),
+                                       total=len(caminhos_graficos))
             
-            for i, caminho in enumerate(caminhos_graficos, 1):
-                if os.path.exists(caminho):
-                    nome_arquivo = os.path.basename(caminho)
-                    
-                    # Determina tipo de gráfico
-                    if 'serie_temporal' in nome_arquivo:
-                        estado = nome_arquivo.split('_')[2].replace('.png', '').capitalize()
-                        self.pdf.secao_titulo(f"3.{i}. Análise Temporal - {estado}")
-                    elif 'comparativo' in nome_arquivo:
-                        self.pdf.secao_titulo(f"3.{i}. Análise Comparativa entre Estados")
-                    elif 'heatmap' in nome_arquivo:
-                        self.pdf.secao_titulo(f"3.{i}. Mapa de Intensidade")
-                    elif 'tendencia' in nome_arquivo:
-                        self.pdf.secao_titulo(f"3.{i}. Tendência Geral da Região")
-                    
-                    # Legenda personalizada ou padrão
-                    legenda = metadados.get(caminho, f"Figura {i}: {nome_arquivo}")
-                    
-                    self.pdf.adicionar_imagem_centralizada(
-                        caminho,
-                        largura=170,
-                        legenda=legenda
-                    )
-                    
-                    print(f"   ✓ Gráfico {i}/{len(caminhos_graficos)} adicionado")
-                    
-                    # Nova página a cada 2 gráficos
-                    if i % 2 == 0 and i < len(caminhos_graficos):
-                        self.pdf.add_page()
-            
-            # Conclusão
-            if conclusao:
-                print("📝 Adicionando conclusão...")
-                self.pdf.add_page()
-                self.pdf.capitulo_titulo("4. Conclusão")
-                self.pdf.texto_paragrafo(conclusao)
-            else:
-                print("📝 Adicionando conclusão padrão...")
-                self.pdf.add_page()
-                self.pdf.capitulo_titulo("4. Conclusão")
-                texto_conclusao = (
-                    "A análise dos dados de violência contra mulheres na região Norte do Brasil, "
-                    "especificamente nos estados do Amazonas, Roraima e Acre, revela a necessidade "
-                    "urgente de políticas públicas efetivas de prevenção e combate à violência de gênero. "
-                    "\n\n"
-                    "Os gráficos apresentados evidenciam padrões e tendências que devem ser considerados "
-                    "na formulação de estratégias de enfrentamento à violência contra a mulher, "
-                    "levando em conta as particularidades regionais e os desafios específicos de cada estado."
-                )
-                self.pdf.texto_paragrafo(texto_conclusao)
-            
-            # Página de Fontes e Referências
-            print("📚 Adicionando página de fontes...")
-            self.pdf.add_page()
-            self.pdf.capitulo_titulo("5. Fontes e Referências")
-            
-            # Subtítulo
-            self.pdf.secao_titulo("5.1. Origem dos Dados")
-            
-            texto_fontes = (
-                "Os dados analisados neste relatório são REAIS e foram extraídos diretamente dos "
-                "Anuários Brasileiros de Segurança Pública oficiais, publicados pelo Fórum Brasileiro "
-                "de Segurança Pública (FBSP) e pelo Instituto de Pesquisa Econômica Aplicada (IPEA). "
-                "\n\n"
-                "Todos os dados foram processados e analisados utilizando a linguagem de programação "
-                "Python, com bibliotecas especializadas em ciência de dados (Pandas, NumPy) e "
-                "visualização de informações (Matplotlib, Seaborn)."
-            )
-            self.pdf.texto_paragrafo(texto_fontes)
-            
-            # Referências Bibliográficas
-            self.pdf.secao_titulo("5.2. Referências Bibliográficas")
-            
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.ln(2)
-            
-            referencias = [
-                "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2024. São Paulo: FBSP, 2024. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
-                "",
-                "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2023. São Paulo: FBSP, 2023. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
-                "",
-                "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2022. São Paulo: FBSP, 2022. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
-                "",
-                "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2020. São Paulo: FBSP, 2020. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
-                "",
-                "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2019. São Paulo: FBSP, 2019. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
-                "",
-                "FÓRUM BRASILEIRO DE SEGURANÇA PÚBLICA. Anuário Brasileiro de Segurança Pública 2017. São Paulo: FBSP, 2017. Disponível em: https://forumseguranca.org.br/. Acesso em: 03 nov. 2025.",
-            ]
-            
-            for ref in referencias:
-                if ref:
-                    self.pdf.multi_cell(0, 5, ref, 0, 'J')
-                else:
-                    self.pdf.ln(2)
-            
-            # Ferramentas Utilizadas
-            self.pdf.ln(5)
-            self.pdf.secao_titulo("5.3. Ferramentas e Tecnologias")
-            
-            texto_ferramentas = (
-                "Este relatório foi produzido utilizando as seguintes tecnologias:\n\n"
-                "- Python 3.11: Linguagem de programação para análise de dados\n"
-                "- Pandas: Manipulação e análise de dados estruturados\n"
-                "- NumPy: Computação numérica e operações matemáticas\n"
-                "- Matplotlib e Seaborn: Visualização de dados e criação de gráficos\n"
-                "- Tabula-py: Extração de tabelas de documentos PDF\n"
-                "- FPDF2: Geração de relatórios em formato PDF\n\n"
-                "Todos os dados são provenientes de fontes oficiais do governo brasileiro "
-                "e foram analisados de forma automatizada, garantindo precisão e reprodutibilidade."
-            )
-            self.pdf.texto_paragrafo(texto_ferramentas)
-            
-            # Salva o PDF
-            self.pdf.alias_nb_pages()
-            self.pdf.output(arquivo_saida)
+            self.finalizar_relatorio(arquivo_saida, conclusao, df_dados, cubo)
             
             print("\n" + "="*70)
             print(f"✅ RELATÓRIO GERADO COM SUCESSO: {arquivo_saida}")
             print("="*70 + "\n")
             
             return True
-            
+        
         except Exception as e:
             print(f"\n❌ Erro ao gerar relatório: {str(e)}")
             return False
@@ -446,7 +1070,7 @@ def gerar_relatorio_violencia(caminhos_graficos: List[str],
         caminhos_graficos: Lista de caminhos dos gráficos
         arquivo_saida: Nome do arquivo de saída
         **kwargs: Argumentos adicionais (autor, instituicao, introducao, conclusao)
-        
+    
     Returns:
         True se gerou com sucesso
     """
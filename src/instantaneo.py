@@ -0,0 +1,209 @@
+"""
+Módulo de Instantâneo do Relatório
+Guarda num único arquivo binário tudo o que o relatório precisa - dados,
+gráficos já reduzidos para a largura de impressão (e já decodificados no
+formato que o fpdf grava no PDF) e métricas calculadas - para que uma
+mudança só de texto (autor, instituição, introdução, conclusão) refaça o PDF
+em menos de um segundo, sem matplotlib, sem reagregar os dados e sem
+preparar as imagens de novo
+"""
+
+import io
+import os
+import pickle
+import time
+import fpdf
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analise_temporal import metricas_do_cubo
+from cubo_agregado import CuboAgregado
+from gerar_relatorio import (COLUNAS_RESUMO, DPI_IMAGEM_FINAL, DPI_IMAGEM_RASCUNHO,
+                             LARGURA_IMAGEM_FINAL, LARGURA_MINIATURA_RASCUNHO,
+                             GeradorRelatorioCompleto, decodificar_imagem_pdf,
+                             preparar_imagem, resumo_estatistico)
+
+
+# Versão do formato (instantâneos de outra versão são recusados)
+VERSAO_INSTANTANEO = 1
+
+ARQUIVO_INSTANTANEO_PADRAO = os.path.join('dados', 'relatorio.instantaneo')
+
+
+class InstantaneoRelatorio:
+    """Dados, gráficos preparados e métricas de um relatório, prontos para o PDF"""
+    
+    def __init__(self, df_dados: Optional[pd.DataFrame],
+                 graficos: List[Tuple[str, bytes]],
+                 modo_rascunho: bool = False,
+                 metricas: Optional[pd.DataFrame] = None,
+                 resumo: Optional[pd.DataFrame] = None):
+        """
+        Inicializa o instantâneo
+        
+        Args:
+            df_dados: Dados consolidados (anexo do relatório)
+            graficos: (nome do arquivo, imagem preparada) na ordem do relatório
+            modo_rascunho: Modo para o qual as imagens foram preparadas
+            metricas: Métricas das séries (metricas_do_cubo)
+            resumo: Estatísticas resumidas (resumo_estatistico)
+        """
+        self.df_dados = df_dados
+        self.graficos = graficos
+        self.modo_rascunho = modo_rascunho
+        self.metricas = metricas
+        self.resumo = resumo
+        self.versao = VERSAO_INSTANTANEO
+        
+        # Imagens decodificadas pelo fpdf: só valem para a mesma versão da biblioteca
+        self.versao_fpdf = fpdf.__version__
+        self.imagens_decodificadas: Dict[str, dict] = {}
+        for _, imagem in graficos:
+            decodificada = decodificar_imagem_pdf(imagem)
+            if decodificada is not None:
+                chave, info = decodificada
+                self.imagens_decodificadas[chave] = info
+    
+    @classmethod
+    def criar(cls, df_dados: Optional[pd.DataFrame],
+              caminhos_graficos: Sequence[str],
+              modo_rascunho: bool = False,
+              cubo: Optional[CuboAgregado] = None) -> 'InstantaneoRelatorio':
+        """
+        Monta o instantâneo a partir dos dados e dos PNG já renderizados
+        
+        As imagens são preparadas (ver preparar_imagem) para a largura e o DPI
+        com que o relatório as incorpora, uma única vez.
+        
+        Args:
+            df_dados: Dados consolidados em formato longo
+            caminhos_graficos: Caminhos dos gráficos, na ordem do relatório
+                               (apenas os PNG existentes entram)
+            modo_rascunho: Se True, imagens em miniatura para o relatório rascunho
+            cubo: Cubo agregado de `df_dados` (montado aqui se omitido)
+        
+        Returns:
+            InstantaneoRelatorio
+        """
+        largura = LARGURA_MINIATURA_RASCUNHO if modo_rascunho else LARGURA_IMAGEM_FINAL
+        dpi = DPI_IMAGEM_RASCUNHO if modo_rascunho else DPI_IMAGEM_FINAL
+        graficos = [(os.path.basename(caminho), preparar_imagem(caminho, largura, dpi).getvalue())
+                    for caminho in caminhos_graficos
+                    if caminho.lower().endswith('.png') and os.path.exists(caminho)]
+        
+        metricas = resumo = None
+        if df_dados is not None and COLUNAS_RESUMO.issubset(df_dados.columns):
+            cubo = cubo or CuboAgregado(df_dados)
+            metricas = metricas_do_cubo(cubo)
+            resumo = resumo_estatistico(df_dados, cubo)
+        return cls(df_dados, graficos, modo_rascunho, metricas, resumo)
+    
+    def salvar(self, caminho: str = ARQUIVO_INSTANTANEO_PADRAO) -> str:
+        """
+        Grava o instantâneo (pickle binário)
+        
+        Args:
+            caminho: Arquivo de saída
+        
+        Returns:
+            Caminho do arquivo
+        """
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with open(caminho, 'wb') as arquivo:
+            pickle.dump(self.__dict__, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        tamanho = os.path.getsize(caminho) / 1024
+        print(f"📸 Instantâneo do relatório salvo: {caminho} "
+              f"({len(self.graficos)} gráfico(s), {tamanho:.0f} KB)")
+        return caminho
+    
+    @classmethod
+    def carregar(cls, caminho: str = ARQUIVO_INSTANTANEO_PADRAO) -> 'InstantaneoRelatorio':
+        """
+        Lê um instantâneo salvo
+        
+        Args:
+            caminho: Arquivo do instantâneo
+        
+        Returns:
+            InstantaneoRelatorio
+        
+        Raises:
+            ValueError: Se o arquivo for de outra versão do formato
+        """
+        with open(caminho, 'rb') as arquivo:
+            estado = pickle.load(arquivo)
+        if estado.get('versao') != VERSAO_INSTANTANEO:
+            raise ValueError(f"Instantâneo de versão {estado.get('versao')} "
+                             f"(esperada {VERSAO_INSTANTANEO}): gere-o novamente")
+        instantaneo = cls.__new__(cls)
+        instantaneo.__dict__.update(estado)
+        return instantaneo
+    
+    def gerar_relatorio(self, arquivo_saida: str = 'relatorio.pdf',
+                        titulo: str = "Análise de Violência contra Mulheres",
+                        subtitulo: str = "Região Norte - Amazonas, Roraima e Acre",
+                        periodo: str = "2015-2025",
+                        autor: str = "",
+                        instituicao: str = "",
+                        introducao: str = "",
+                        conclusao: str = "") -> bool:
+        """
+        Refaz apenas o PDF, com os gráficos e métricas do instantâneo
+        
+        Args:
+            arquivo_saida: Caminho do PDF
+            titulo: Título do relatório
+            subtitulo: Subtítulo do relatório
+            periodo: Período analisado
+            autor: Nome do autor
+            instituicao: Nome da instituição
+            introducao: Texto de introdução
+            conclusao: Texto de conclusão
+        
+        Returns:
+            True se gerou com sucesso
+        """
+        inicio = time.perf_counter()
+        try:
+            gerador = GeradorRelatorioCompleto(titulo, subtitulo, periodo,
+                                               modo_rascunho=self.modo_rascunho)
+            if self.versao_fpdf == fpdf.__version__:
+                gerador.registrar_imagens_decodificadas(self.imagens_decodificadas)
+            gerador.iniciar_relatorio(autor, instituicao, introducao)
+            for nome, imagem in self.graficos:
+                gerador.adicionar_grafico(nome, total=len(self.graficos),
+                                          imagem=io.BytesIO(imagem))
+            gerador.finalizar_relatorio(arquivo_saida, conclusao, self.df_dados,
+                                        metricas=self.metricas, resumo=self.resumo)
+        except Exception as e:
+            print(f"\n❌ Erro ao gerar relatório do instantâneo: {str(e)}")
+            return False
+        
+        print(f"⚡ Relatório refeito do instantâneo em {time.perf_counter() - inicio:.2f}s: "
+              f"{arquivo_saida}")
+        return True
+
+
+def salvar_instantaneo(df_dados: pd.DataFrame,
+                       cubo: CuboAgregado,
+                       *listas_graficos: List[str],
+                       arquivo_instantaneo: str = ARQUIVO_INSTANTANEO_PADRAO,
+                       modo_rascunho: bool = False) -> str:
+    """
+    Etapa do pipeline: grava o instantâneo com os gráficos na ordem do relatório
+    
+    Args:
+        df_dados: Dados consolidados
+        cubo: Cubo agregado dos dados
+        *listas_graficos: Listas de caminhos de gráficos, na ordem do relatório
+        arquivo_instantaneo: Arquivo do instantâneo
+        modo_rascunho: Se True, imagens em miniatura
+    
+    Returns:
+        Caminho do instantâneo
+    """
+    caminhos = [caminho for lista in listas_graficos for caminho in lista]
+    return InstantaneoRelatorio.criar(df_dados, caminhos, modo_rascunho, cubo).salvar(
+        arquivo_instantaneo)
@@ -0,0 +1,474 @@
+"""
+Módulo de Linha de Comando
+Ponto de entrada não interativo (extract, charts, report, all, watch) para
+execução agendada (cron, lotes), com códigos de saída e resumo em JSON
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+from etapas_pipeline import (ETAPAS_GRAFICOS, EXTENSOES_DADOS, adicionar_etapas_extracao,
+                             adicionar_etapas_graficos_e_relatorio, adicionar_etapas_planilhas,
+                             carregar_dados)
+from monitoramento import PADRAO_ANUARIO, monitorar_anuarios
+from orquestrador import OrquestradorAssincrono, executar_sobreposto
+from pipeline import Pipeline
+
+
+# Códigos de saída
+SAIDA_SUCESSO = 0
+SAIDA_FALHA = 1
+SAIDA_USO_INVALIDO = 2
+SAIDA_SEM_PDFS = 3
+SAIDA_SEM_DADOS = 4
+
+# Subcomandos e as etapas do pipeline que cada um produz
+COMANDOS = {
+    'extract': ['exportar_dados'],
+    'charts': list(ETAPAS_GRAFICOS),
+    'report': ['relatorio'],
+    'all': ['exportar_dados', 'relatorio'],
+}
+
+FORMATOS_GRAFICOS = ('png', 'svg', 'pdf')
+FORMATOS_DADOS = tuple(EXTENSOES_DADOS)
+
+ESTADOS_PADRAO = ['Amazonas', 'Roraima', 'Acre']
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def localizar_anuarios(pasta_dados: str, anos: Optional[Sequence[int]] = None) -> Dict[int, str]:
+    """
+    Procura os arquivos anuario_AAAA.pdf da pasta de dados
+    
+    Args:
+        pasta_dados: Pasta dos PDFs
+        anos: Se informado, considera apenas estes anos
+    
+    Returns:
+        Dicionário {ano: caminho_pdf}
+    """
+    encontrados = {}
+    if os.path.isdir(pasta_dados):
+        for nome in os.listdir(pasta_dados):
+            correspondencia = PADRAO_ANUARIO.match(nome)
+            if correspondencia:
+                encontrados[int(correspondencia.group(1))] = os.path.join(pasta_dados, nome)
+    
+    if anos:
+        encontrados = {ano: caminho for ano, caminho in encontrados.items() if ano in anos}
+    return dict(sorted(encontrados.items()))
+
+
+def java_disponivel() -> bool:
+    """Verifica se o Java (necessário para o tabula-py) está instalado"""
+    try:
+        return subprocess.run(['java', '-version'], capture_output=True).returncode == 0
+    except OSError:
+        return False
+
+
+@contextlib.contextmanager
+def _mensagens_para_stderr():
+    """Redireciona a saída padrão (inclusive dos processos filhos) para o stderr"""
+    sys.stdout.flush()
+    descritor_original = os.dup(1)
+    os.dup2(2, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(descritor_original, 1)
+        os.close(descritor_original)
+
+
+def executar_comando(comando: str = 'all',
+                     anos: Optional[Sequence[int]] = None,
+                     estados: Optional[Sequence[str]] = None,
+                     formatos: Sequence[str] = ('csv', 'png'),
+                     jobs: Optional[int] = None,
+                     pasta_dados: Optional[str] = None,
+                     arquivo_dados: Optional[str] = None,
+                     planilhas: Optional[Sequence[str]] = None,
+                     arquivo_populacao: Optional[str] = None,
+                     quarentena: bool = False,
+                     sobrepor: bool = False,
+                     pasta_graficos: Optional[str] = None,
+                     arquivo_relatorio: Optional[str] = None,
+                     pasta_cache: Optional[str] = None,
+                     modo_rascunho: bool = False,
+                     termos_paginas: Optional[Sequence[str]] = None,
+                     pasta_perfil: Optional[str] = None,
+                     top_perfil: Optional[int] = None,
+                     **opcoes_relatorio) -> Dict:
+    """
+    Executa um subcomando sem nenhuma interação e retorna o resumo da execução
+    
+    Args:
+        comando: 'extract', 'charts', 'report' ou 'all'
+        anos: Anos a processar (None = todos os anuários encontrados)
+        estados: Estados-alvo (None = Amazonas, Roraima e Acre)
+        formatos: Formatos de saída de dados ('csv', 'excel', 'sqlite') e de gráficos
+                  ('png', 'svg', 'pdf'); o PNG é sempre gerado para o relatório
+        jobs: Etapas executadas em paralelo (None = número de CPUs)
+        pasta_dados: Pasta dos anuários (padrão: dados/)
+        arquivo_dados: CSV ou banco (.sqlite) já consolidado; se informado, a extração
+                       é pulada e os dados não são exportados (a entrada, já
+                       filtrada por estados e anos, nunca é sobrescrita)
+        planilhas: Planilhas XLSX/CSV do FBSP/IPEA lidas no lugar dos PDFs
+        arquivo_populacao: CSV de população feminina (IBGE) para as taxas por 100 mil
+        quarentena: Se True, valores anômalos ficam fora dos gráficos e do relatório
+        sobrepor: Se True ('all'), extração, gráficos e relatório rodam sobrepostos
+                  (ver orquestrador.py), sem o cache do pipeline
+        pasta_graficos: Pasta dos gráficos (padrão: graficos/)
+        arquivo_relatorio: Caminho do PDF do relatório
+        pasta_cache: Pasta de cache do pipeline
+        modo_rascunho: Se True, execução rápida de pré-visualização
+        termos_paginas: Se informados, só as páginas dos anuários que contêm
+                        todos os termos vão ao tabula (pré-varredura do texto)
+        pasta_perfil: Se informada, perfila as etapas e salva .pstats/.folded nela
+        top_perfil: Funções mais lentas mostradas por método perfilado
+        **opcoes_relatorio: titulo, subtitulo, autor, instituicao, introducao, conclusao
+    
+    Returns:
+        Dicionário com 'codigo_saida', arquivos gerados, etapas e avisos
+    """
+    inicio = time.perf_counter()
+    pasta_dados = pasta_dados or os.path.join(RAIZ_PROJETO, 'dados')
+    estados = list(estados or ESTADOS_PADRAO)
+    
+    resumo = {
+        'comando': comando,
+        'codigo_saida': SAIDA_SUCESSO,
+        'anos': [],
+        'anos_sem_pdf': [],
+        'estados': estados,
+        'registros': 0,
+        'anomalias': 0,
+        'arquivos': {'dados': [], 'graficos': [], 'relatorio': None},
+        'etapas_executadas': [],
+        'etapas_em_cache': [],
+        'avisos': [],
+        'erro': None,
+    }
+    
+    def finalizar(codigo: int, erro: Optional[str] = None) -> Dict:
+        resumo['codigo_saida'] = codigo
+        resumo['erro'] = erro
+        resumo['duracao_segundos'] = round(time.perf_counter() - inicio, 3)
+        return resumo
+    
+    if comando not in COMANDOS:
+        return finalizar(SAIDA_USO_INVALIDO, f"Comando desconhecido: {comando}")
+    
+    if sobrepor and comando != 'all':
+        return finalizar(SAIDA_USO_INVALIDO, "--sobrepor vale apenas para o comando 'all'")
+    
+    formatos_invalidos = set(formatos) - set(FORMATOS_DADOS) - set(FORMATOS_GRAFICOS)
+    if formatos_invalidos:
+        return finalizar(SAIDA_USO_INVALIDO,
+                         f"Formatos desconhecidos: {', '.join(sorted(formatos_invalidos))}")
+    
+    if arquivo_populacao and not os.path.exists(arquivo_populacao):
+        return finalizar(SAIDA_USO_INVALIDO,
+                         f"Arquivo de população não encontrado: {arquivo_populacao}")
+    
+    pipeline = Pipeline(pasta_cache=pasta_cache or os.path.join(RAIZ_PROJETO, '.cache_pipeline'),
+                        max_processos=jobs,
+                        pasta_perfil=pasta_perfil,
+                        top_perfil=top_perfil)
+    
+    # Fonte dos dados: CSV consolidado ou extração por ano dos anuários
+    if arquivo_dados:
+        if not os.path.exists(arquivo_dados):
+            return finalizar(SAIDA_SEM_DADOS, f"Arquivo de dados não encontrado: {arquivo_dados}")
+        pipeline.etapa('dados', carregar_dados, arquivos=[arquivo_dados],
+                       arquivo_dados=arquivo_dados,
+                       estados=estados,
+                       anos=list(anos) if anos else None)
+    elif planilhas:
+        ausentes = [caminho for caminho in planilhas if not os.path.exists(caminho)]
+        if ausentes:
+            return finalizar(SAIDA_SEM_DADOS, f"Planilha não encontrada: {', '.join(ausentes)}")
+        adicionar_etapas_planilhas(pipeline, planilhas,
+                                   estados_alvo=estados,
+                                   anos=list(anos) if anos else None,
+                                   nome_etapa='dados')
+    else:
+        pdfs = localizar_anuarios(pasta_dados, anos)
+        resumo['anos'] = sorted(pdfs)
+        resumo['anos_sem_pdf'] = sorted(set(anos or []) - set(pdfs))
+        for ano in resumo['anos_sem_pdf']:
+            resumo['avisos'].append(f"Anuário de {ano} não encontrado em {pasta_dados}")
+        
+        if not pdfs:
+            return finalizar(SAIDA_SEM_PDFS, f"Nenhum anuario_AAAA.pdf encontrado em {pasta_dados}")
+        
+        if not java_disponivel():
+            resumo['avisos'].append("Java não encontrado: o tabula-py pode não extrair tabelas")
+        
+        adicionar_etapas_extracao(pipeline, pdfs,
+                                  estados_alvo=estados,
+                                  modo_rascunho=modo_rascunho,
+                                  nome_etapa='dados',
+                                  termos_paginas=termos_paginas)
+    
+    opcoes_relatorio = {chave: valor for chave, valor in opcoes_relatorio.items() if valor}
+    if 'periodo' not in opcoes_relatorio and resumo['anos']:
+        opcoes_relatorio['periodo'] = f"{min(resumo['anos'])}-{max(resumo['anos'])}"
+    
+    opcoes_saida = dict(
+        pasta_graficos=pasta_graficos or os.path.join(RAIZ_PROJETO, 'graficos'),
+        arquivo_saida=(arquivo_relatorio
+                       or os.path.join(RAIZ_PROJETO, 'Relatorio_Violencia_Mulher_Regiao_Norte.pdf')),
+        modo_rascunho=modo_rascunho,
+        # Com --dados a entrada já é o consolidado: exportá-lo (filtrado) a substituiria
+        arquivo_dados=(None if arquivo_dados
+                       else os.path.join(pasta_dados, 'dados_consolidados.csv')),
+        formatos_dados=[f for f in formatos if f in FORMATOS_DADOS] or ['csv'],
+        formatos_graficos=[f for f in formatos if f in FORMATOS_GRAFICOS],
+        arquivo_populacao=arquivo_populacao,
+        arquivo_anomalias=os.path.join(pasta_dados, 'anomalias.csv'),
+        quarentena=quarentena,
+        **opcoes_relatorio
+    )
+    
+    if arquivo_dados and 'exportar_dados' in COMANDOS[comando]:
+        resumo['avisos'].append(f"Dados não exportados: {arquivo_dados} é a entrada (--dados)")
+    
+    if sobrepor:
+        # Mesmas fontes de dados, mas com as fases sobrepostas num laço asyncio
+        orquestrador = OrquestradorAssincrono(estados, max_processos=jobs, **opcoes_saida)
+        orquestrador.adicionar_fontes_do_pipeline(pipeline, 'dados')
+        try:
+            resultado = executar_sobreposto(orquestrador)
+        except Exception as e:
+            return finalizar(SAIDA_FALHA, f"{type(e).__name__}: {e}")
+        
+        resumo['registros'] = len(resultado['dados'])
+        resumo['anomalias'] = len(orquestrador.anomalias)
+        resumo['etapas_executadas'] = list(orquestrador.duracoes)
+        if len(orquestrador.anomalias):
+            resumo['avisos'].append(f"{len(orquestrador.anomalias)} valor(es) anômalo(s); "
+                                    f"ver {opcoes_saida['arquivo_anomalias']}")
+        if orquestrador.estados_sem_dados:
+            resumo['avisos'].append("Nenhum dado para: "
+                                    + ", ".join(orquestrador.estados_sem_dados))
+        if resultado['dados'].empty:
+            return finalizar(SAIDA_SEM_DADOS, "Nenhum dado foi extraído dos anuários")
+        if planilhas and not resumo['anos']:
+            resumo['anos'] = sorted(int(ano) for ano in resultado['dados']['Ano'].unique())
+        resumo['arquivos']['dados'] = orquestrador.arquivos_dados
+        resumo['arquivos']['graficos'] = resultado['graficos'] + orquestrador.arquivos_extras
+        resumo['arquivos']['relatorio'] = resultado['relatorio']
+        return finalizar(SAIDA_SUCESSO)
+    
+    adicionar_etapas_graficos_e_relatorio(pipeline, 'dados', **opcoes_saida)
+    
+    def registrar_etapas():
+        resumo['etapas_executadas'] += pipeline.etapas_executadas
+        resumo['etapas_em_cache'] += [nome for nome in pipeline.etapas_em_cache
+                                      if nome not in resumo['etapas_executadas']
+                                      and nome not in resumo['etapas_em_cache']]
+    
+    try:
+        # A extração vem primeiro: sem dados, gráficos e relatório não fazem sentido
+        df_dados = pipeline.executar(['dados'])['dados']
+        resumo['registros'] = len(df_dados)
+        registrar_etapas()
+        if df_dados.empty:
+            return finalizar(SAIDA_SEM_DADOS, "Nenhum dado foi extraído dos anuários")
+        if planilhas and not resumo['anos']:
+            resumo['anos'] = sorted(int(ano) for ano in df_dados['Ano'].unique())
+        
+        # Verificação de anomalias antes dos gráficos
+        anomalias = pipeline.executar(['anomalias'])['anomalias']
+        registrar_etapas()
+        resumo['anomalias'] = len(anomalias)
+        if len(anomalias):
+            destino = ("em quarentena" if quarentena
+                       else "mantidos (use --quarentena para retirá-los)")
+            resumo['avisos'].append(f"{len(anomalias)} valor(es) anômalo(s) {destino}; "
+                                    f"ver {os.path.join(pasta_dados, 'anomalias.csv')}")
+        
+        alvos = [etapa for etapa in COMANDOS[comando] if etapa in pipeline.etapas]
+        resultados = pipeline.executar(alvos) if alvos else {}
+        registrar_etapas()
+    except Exception as e:
+        return finalizar(SAIDA_FALHA, f"{type(e).__name__}: {e}")
+    
+    resumo['arquivos']['dados'] = resultados.get('exportar_dados', [])
+    resumo['arquivos']['graficos'] = [caminho for etapa in ETAPAS_GRAFICOS
+                                      for caminho in resultados.get(etapa, [])]
+    if 'relatorio' in COMANDOS[comando]:
+        resumo['arquivos']['relatorio'] = resultados['relatorio'] or None
+        if not resultados['relatorio']:
+            return finalizar(SAIDA_FALHA, "Falha ao gerar o relatório PDF")
+    
+    return finalizar(SAIDA_SUCESSO)
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria o parser de argumentos com os subcomandos"""
+    comuns = argparse.ArgumentParser(add_help=False)
+    comuns.add_argument('--anos', type=int, nargs='+', metavar='ANO',
+                        help='Anos a processar (padrão: todos os anuários encontrados)')
+    comuns.add_argument('--estados', nargs='+', metavar='ESTADO',
+                        help=f"Estados-alvo (padrão: {', '.join(ESTADOS_PADRAO)})")
+    comuns.add_argument('--formatos', nargs='+', default=['csv', 'png'],
+                        choices=FORMATOS_DADOS + FORMATOS_GRAFICOS,
+                        help='Formatos de saída de dados e gráficos (padrão: csv png)')
+    comuns.add_argument('--jobs', '-j', type=int, metavar='N',
+                        help='Etapas executadas em paralelo (padrão: número de CPUs)')
+    comuns.add_argument('--pasta-dados', help='Pasta dos anuario_AAAA.pdf (padrão: dados/)')
+    comuns.add_argument('--dados', dest='arquivo_dados',
+                        help='CSV ou banco .sqlite consolidado já existente (pula a extração)')
+    comuns.add_argument('--planilhas', nargs='+', metavar='ARQUIVO',
+                        help='Planilhas XLSX/CSV do FBSP ou do IPEA (pula a extração dos PDFs)')
+    comuns.add_argument('--populacao', dest='arquivo_populacao', metavar='CSV',
+                        help='População feminina por UF e ano (CSV do IBGE): '
+                             'acrescenta as taxas por 100 mil mulheres')
+    comuns.add_argument('--quarentena', action='store_true',
+                        help='Retira valores anômalos (ver anomalias.csv) antes dos gráficos')
+    comuns.add_argument('--sobrepor', action='store_true',
+                        help="Com 'all': sobrepõe extração, gráficos e relatório "
+                             "(asyncio, sem o cache do pipeline)")
+    comuns.add_argument('--pasta-graficos', help='Pasta dos gráficos (padrão: graficos/)')
+    comuns.add_argument('--saida', dest='arquivo_relatorio', help='Caminho do relatório PDF')
+    comuns.add_argument('--pasta-cache', help='Pasta de cache do pipeline')
+    comuns.add_argument('--autor', default='', help='Autor do relatório')
+    comuns.add_argument('--instituicao', default='', help='Instituição do relatório')
+    comuns.add_argument('--rascunho', dest='modo_rascunho', action='store_true',
+                        help='Execução rápida de pré-visualização')
+    comuns.add_argument('--paginas-com', dest='termos_paginas', nargs='+', metavar='TERMO',
+                        help='Extrai só as páginas dos anuários que contêm todos os termos '
+                             "(ex.: --paginas-com feminicídio 'unidades da federação')")
+    comuns.add_argument('--perfil', '--profile', dest='pasta_perfil', nargs='?',
+                        const='perfil', metavar='PASTA',
+                        help='Perfila extração, gráficos e relatório com cProfile e salva '
+                             '.pstats e pilhas colapsadas .folded (padrão: perfil/)')
+    comuns.add_argument('--perfil-top', dest='top_perfil', type=int, metavar='N',
+                        help='Funções mais lentas mostradas por método (padrão: 15)')
+    comuns.add_argument('--resumo', metavar='ARQUIVO',
+                        help="Grava o resumo em JSON ('-' = saída padrão; as "
+                             "mensagens de progresso vão para o stderr)")
+    
+    parser = argparse.ArgumentParser(
+        description='Análise de violência contra mulheres - execução em lote',
+        epilog=(f'Códigos de saída: {SAIDA_SUCESSO} sucesso, {SAIDA_FALHA} falha, '
+                f'{SAIDA_USO_INVALIDO} uso inválido, {SAIDA_SEM_PDFS} nenhum PDF, '
+                f'{SAIDA_SEM_DADOS} nenhum dado extraído')
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    subparsers.add_parser('extract', parents=[comuns], help='Extrai e exporta os dados')
+    subparsers.add_parser('charts', parents=[comuns], help='Gera os gráficos')
+    subparsers.add_parser('report', parents=[comuns], help='Gera o relatório PDF')
+    subparsers.add_parser('all', parents=[comuns], help='Exporta dados, gráficos e relatório')
+    
+    monitorar = subparsers.add_parser('watch', parents=[comuns],
+                                      help="Executa 'all' sempre que anuários chegam ou mudam")
+    monitorar.add_argument('--intervalo', type=float, default=2.0, metavar='SEGUNDOS',
+                           help='Intervalo entre varreduras sem inotify (padrão: 2)')
+    monitorar.add_argument('--espera', type=float, default=5.0, metavar='SEGUNDOS',
+                           help='Tempo sem mudanças antes de reconstruir (padrão: 5)')
+    return parser
+
+
+def _emitir_resumo(resumo: Dict, arquivo_resumo: Optional[str], indentacao: Optional[int] = 2):
+    """Imprime ou grava o resumo em JSON e mostra avisos e erro no stderr"""
+    if arquivo_resumo == '-':
+        print(json.dumps(resumo, ensure_ascii=False, indent=indentacao), flush=True)
+    elif arquivo_resumo:
+        with open(arquivo_resumo, 'w', encoding='utf-8') as arquivo:
+            json.dump(resumo, arquivo, ensure_ascii=False, indent=indentacao)
+    
+    for aviso in resumo['avisos']:
+        print(f"⚠️  {aviso}", file=sys.stderr)
+    if resumo['erro']:
+        print(f"❌ {resumo['erro']}", file=sys.stderr)
+
+
+def _executar_resumindo(argumentos: Dict, arquivo_resumo: Optional[str]) -> Dict:
+    """Executa o comando (mensagens no stderr se o resumo vai para o stdout)"""
+    if arquivo_resumo == '-':
+        with _mensagens_para_stderr():
+            return executar_comando(**argumentos)
+    return executar_comando(**argumentos)
+
+
+def monitorar(argumentos: Dict, arquivo_resumo: Optional[str] = None,
+              intervalo: float = 2.0, espera: float = 5.0,
+              max_reconstrucoes: Optional[int] = None) -> int:
+    """
+    Executa 'all' e repete a cada anuário novo ou alterado na pasta de dados
+    
+    O cache do pipeline garante que só o ano alterado seja extraído novamente;
+    gráficos e relatório são refeitos apenas se os dados consolidados mudarem.
+    Com `arquivo_resumo='-'`, cada reconstrução imprime uma linha JSON.
+    
+    Args:
+        argumentos: Argumentos de executar_comando
+        arquivo_resumo: Destino do resumo de cada reconstrução
+        intervalo: Segundos entre varreduras (sem inotify)
+        espera: Segundos sem mudanças antes de reconstruir
+        max_reconstrucoes: Encerra após este número de reconstruções
+    
+    Returns:
+        Código de saída da última reconstrução
+    """
+    argumentos = {**argumentos, 'comando': 'all'}
+    pasta_dados = argumentos.get('pasta_dados') or os.path.join(RAIZ_PROJETO, 'dados')
+    ultimo = {'codigo_saida': SAIDA_SUCESSO}
+    
+    def reconstruir(anos_alterados: List[int]):
+        resumo = _executar_resumindo(argumentos, arquivo_resumo)
+        resumo['anos_alterados'] = anos_alterados
+        _emitir_resumo(resumo, arquivo_resumo, indentacao=None)
+        ultimo['codigo_saida'] = resumo['codigo_saida']
+    
+    # A primeira construção roda com o monitor já ativo: anuários copiados
+    # enquanto ela roda geram uma reconstrução logo depois
+    monitorar_anuarios(pasta_dados, reconstruir, intervalo=intervalo, espera=espera,
+                       max_reconstrucoes=max_reconstrucoes,
+                       ao_iniciar=lambda: reconstruir([]))
+    return ultimo['codigo_saida']
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Executa a linha de comando
+    
+    Sem subcomando, executa 'all' (ex.: `processar_dados_reais.py --rascunho`).
+    
+    Args:
+        argv: Argumentos (padrão: sys.argv[1:])
+    
+    Returns:
+        Código de saída
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'all')
+    
+    argumentos = vars(criar_parser().parse_args(argv))
+    arquivo_resumo = argumentos.pop('resumo')
+    
+    if argumentos['comando'] == 'watch':
+        intervalo = argumentos.pop('intervalo')
+        espera = argumentos.pop('espera')
+        return monitorar(argumentos, arquivo_resumo, intervalo=intervalo, espera=espera)
+    
+    resumo = _executar_resumindo(argumentos, arquivo_resumo)
+    _emitir_resumo(resumo, arquivo_resumo)
+    return resumo['codigo_saida']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
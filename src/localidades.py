@@ -0,0 +1,363 @@
+"""
+Módulo de Localidades
+Reconhece UFs e municípios em células de tabelas extraídas de PDFs e planilhas,
+tolerando acentos, notas de rodapé ("AMAZONAS¹", "Amazonas (1)"), palavras
+hifenizadas em duas linhas e erros simples de OCR ("R0RAIMA"). O índice é
+montado uma vez a partir da tabela canônica (nomes, siglas e códigos IBGE) e
+consultado por hash; colunas inteiras são resolvidas de uma vez, valor único
+por valor único
+"""
+
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+# Códigos IBGE (dois primeiros dígitos) e siglas das UFs
+UFS = {
+    11: ('RO', 'Rondônia'), 12: ('AC', 'Acre'), 13: ('AM', 'Amazonas'),
+    14: ('RR', 'Roraima'), 15: ('PA', 'Pará'), 16: ('AP', 'Amapá'),
+    17: ('TO', 'Tocantins'), 21: ('MA', 'Maranhão'), 22: ('PI', 'Piauí'),
+    23: ('CE', 'Ceará'), 24: ('RN', 'Rio Grande do Norte'), 25: ('PB', 'Paraíba'),
+    26: ('PE', 'Pernambuco'), 27: ('AL', 'Alagoas'), 28: ('SE', 'Sergipe'),
+    29: ('BA', 'Bahia'), 31: ('MG', 'Minas Gerais'), 32: ('ES', 'Espírito Santo'),
+    33: ('RJ', 'Rio de Janeiro'), 35: ('SP', 'São Paulo'), 41: ('PR', 'Paraná'),
+    42: ('SC', 'Santa Catarina'), 43: ('RS', 'Rio Grande do Sul'),
+    50: ('MS', 'Mato Grosso do Sul'), 51: ('MT', 'Mato Grosso'), 52: ('GO', 'Goiás'),
+    53: ('DF', 'Distrito Federal'),
+}
+
+# Colunas devolvidas por IndiceLocalidades.resolver
+COLUNAS_LOCALIDADE = ['Estado', 'UF', 'Código UF', 'Município', 'Código Município']
+
+# Palavras descartadas nas pontas de uma célula ("Estado do Amazonas", "Total Acre")
+PALAVRAS_IGNORADAS = {'estado', 'uf', 'unidade', 'federacao', 'do', 'da', 'de', 'dos',
+                      'das', 'e', 'total', 'municipio', 'capital'}
+
+# Tamanho mínimo (sem espaços) para aceitar uma edição de diferença (OCR)
+TAMANHO_MINIMO_TOLERANCIA = 5
+
+# Células já identificadas guardadas por índice (as usadas há mais tempo saem)
+MAX_MEMORIA_IDENTIFICACOES = 50_000
+
+# Nomes aceitos para as colunas da tabela de municípios (sem acentos, minúsculas)
+COLUNAS_MUNICIPIOS = {
+    'codigo': ['codigo', 'cod', 'cod_ibge', 'codigo ibge', 'codigo_ibge', 'cd_mun',
+               'codigo_municipio', 'cod_municipio', 'codigo do municipio'],
+    'nome': ['nome', 'municipio', 'nome do municipio', 'nome_municipio', 'nm_mun'],
+    'uf': ['uf', 'sigla_uf', 'sigla', 'estado'],
+}
+
+_SOBRESCRITOS = str.maketrans('', '', '⁰¹²³⁴⁵⁶⁷⁸⁹*†‡ªº')
+_NOTA_ENTRE_PARENTESES = re.compile(r'\(\s*(\d{1,2}|[a-zA-Z]|\*+)\s*\)')
+_HIFENIZACAO = re.compile(r'(\w)-\s*\n\s*(\w)|(\w)- +(\w)')
+_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+_NOTA_COLADA = re.compile(r'(?<=[a-z])\d{1,2}\b')
+_ZERO_NO_LUGAR_DE_O = re.compile(r'(?<=[a-z])0|0(?=[a-z])')
+_CODIGO = re.compile(r'^(\d{2}|\d{6,7})(\.0+)?$')
+
+
+def normalizar_nome(texto) -> str:
+    """
+    Forma normalizada de um nome: sem acentos, notas de rodapé nem hifenização
+    
+    Args:
+        texto: Texto de uma célula
+    
+    Returns:
+        Palavras em minúsculas separadas por um espaço ('' para valores vazios)
+    """
+    if texto is None or (isinstance(texto, float) and np.isnan(texto)):
+        return ''
+    texto = _NOTA_ENTRE_PARENTESES.sub(' ', str(texto).translate(_SOBRESCRITOS))
+    texto = _HIFENIZACAO.sub(lambda m: (m.group(1) or m.group(3)) + (m.group(2) or m.group(4)),
+                             texto)
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode().lower()
+    texto = _NAO_ALFANUMERICO.sub(' ', texto)
+    texto = _ZERO_NO_LUGAR_DE_O.sub('o', _NOTA_COLADA.sub('', texto))
+    return ' '.join(texto.split())
+
+
+def _delecoes(chave: str) -> Set[str]:
+    """Formas da chave com um caractere a menos"""
+    return {chave[:i] + chave[i + 1:] for i in range(len(chave))}
+
+
+def _ate_uma_edicao(a: str, b: str) -> bool:
+    """Se a e b diferem em no máximo uma inserção, remoção, troca ou transposição"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return (a[i + 1:] == b[i + 1:]
+            or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:]))
+
+
+class IndiceLocalidades:
+    """Índice por hash de UFs (e, opcionalmente, municípios) para reconhecer nomes"""
+    
+    def __init__(self, municipios: Optional[pd.DataFrame] = None,
+                 tolerancia: bool = True):
+        """
+        Monta o índice das 27 UFs e, se informada, da tabela de municípios
+        
+        Args:
+            municipios: Tabela de municípios (ver adicionar_municipios)
+            tolerancia: Se True, aceita uma edição de diferença (erros de OCR)
+                        em nomes com pelo menos TAMANHO_MINIMO_TOLERANCIA letras
+        """
+        self.tolerancia = tolerancia
+        # Registro: (estado, sigla, código UF, município, código município)
+        self._registros: List[Tuple] = []
+        self._chaves: Dict[str, List[int]] = {}
+        self._delecoes: Dict[str, Set[str]] = {}
+        self._codigos: Dict[int, int] = {}
+        self._siglas: Dict[str, int] = {}
+        self._memoria: 'OrderedDict[tuple, Optional[int]]' = OrderedDict()
+        self._tabela: Optional[pd.DataFrame] = None
+        
+        for codigo, (sigla, nome) in UFS.items():
+            posicao = self._registrar((nome, sigla, codigo, None, None), nome)
+            self._codigos[codigo] = posicao
+            self._siglas[sigla.lower()] = posicao
+        if municipios is not None:
+            self.adicionar_municipios(municipios)
+    
+    def _registrar(self, registro: Tuple, nome: str) -> int:
+        """Guarda o registro e indexa a chave do nome e as suas deleções"""
+        posicao = len(self._registros)
+        self._registros.append(registro)
+        chave = normalizar_nome(nome).replace(' ', '')
+        if chave not in self._chaves:
+            self._chaves[chave] = []
+            if self.tolerancia and len(chave) >= TAMANHO_MINIMO_TOLERANCIA:
+                for forma in _delecoes(chave) | {chave}:
+                    self._delecoes.setdefault(forma, set()).add(chave)
+        self._chaves[chave].append(posicao)
+        return posicao
+    
+    def adicionar_municipios(self, municipios: pd.DataFrame) -> int:
+        """
+        Acrescenta municípios ao índice
+        
+        Args:
+            municipios: Tabela com o código IBGE (7 dígitos), o nome e, opcionalmente,
+                        a UF (sigla ou nome; sem ela, vem do código)
+        
+        Returns:
+            Número de municípios acrescentados
+        """
+        nomes = {normalizar_nome(coluna): coluna for coluna in municipios.columns}
+        colunas = {destino: next((nomes[normalizar_nome(nome)] for nome in aceitos
+                                  if normalizar_nome(nome) in nomes), None)
+                   for destino, aceitos in COLUNAS_MUNICIPIOS.items()}
+        if colunas['nome'] is None:
+            raise ValueError("Tabela de municípios sem coluna de nome")
+        
+        codigos = (pd.to_numeric(municipios[colunas['codigo']], errors='coerce')
+                   if colunas['codigo'] is not None
+                   else pd.Series(np.nan, index=municipios.index))
+        codigos_uf = codigos // 100_000
+        if colunas['uf'] is not None:
+            codigos_uf = codigos_uf.fillna(self.resolver(municipios[colunas['uf']])['Código UF']
+                                           .astype(float))
+        
+        adicionados = 0
+        for nome, codigo, codigo_uf in zip(municipios[colunas['nome']], codigos, codigos_uf):
+            if pd.isna(nome) or pd.isna(codigo_uf) or int(codigo_uf) not in UFS:
+                continue
+            sigla, estado = UFS[int(codigo_uf)]
+            codigo = None if pd.isna(codigo) else int(codigo)
+            posicao = self._registrar((estado, sigla, int(codigo_uf), str(nome).strip(), codigo),
+                                      nome)
+            if codigo is not None:
+                self._codigos[codigo] = posicao
+                self._codigos.setdefault(codigo // 10, posicao)   # código sem o dígito verificador
+            adicionados += 1
+        self._memoria.clear()
+        self._tabela = None
+        return adicionados
+    
+    @property
+    def n_municipios(self) -> int:
+        """Número de municípios no índice"""
+        return len(self._registros) - len(UFS)
+    
+    def _escolher(self, posicoes: Sequence[int], codigo_uf: Optional[int],
+                  municipios_primeiro: bool) -> Optional[int]:
+        """Registro único entre os candidatos (None se ambíguo)"""
+        if codigo_uf is not None:
+            posicoes = [p for p in posicoes if self._registros[p][2] == codigo_uf] or posicoes
+        estaduais = [p for p in posicoes if self._registros[p][3] is None]
+        municipais = [p for p in posicoes if self._registros[p][3] is not None]
+        preferidos = (municipais or estaduais) if municipios_primeiro else (estaduais or municipais)
+        return preferidos[0] if len(set(preferidos)) == 1 else None
+    
+    def _procurar(self, chave: str, codigo_uf: Optional[int],
+                  municipios_primeiro: bool) -> Optional[int]:
+        """Busca exata e, se preciso, com uma edição de diferença"""
+        if chave in self._chaves:
+            return self._escolher(self._chaves[chave], codigo_uf, municipios_primeiro)
+        if not self.tolerancia or len(chave) < TAMANHO_MINIMO_TOLERANCIA:
+            return None
+        candidatas = set()
+        for forma in _delecoes(chave) | {chave}:
+            candidatas |= self._delecoes.get(forma, set())
+        posicoes = [p for candidata in sorted(candidatas) if _ate_uma_edicao(chave, candidata)
+                    for p in self._chaves[candidata]]
+        return self._escolher(posicoes, codigo_uf, municipios_primeiro) if posicoes else None
+    
+    def identificar(self, texto, codigo_uf: Optional[int] = None,
+                    codigos: bool = True,
+                    municipios_primeiro: bool = False) -> Optional[int]:
+        """
+        Registro correspondente a uma célula
+        
+        Aceita o nome (só palavras inteiras: "Acreúna" não é "Acre"), a sigla
+        (apenas quando é a célula inteira) ou o código IBGE. Palavras como
+        "Estado do", siglas entre parênteses e números nas pontas são descartados;
+        uma sigla descartada desempata municípios homônimos.
+        
+        Args:
+            texto: Conteúdo da célula
+            codigo_uf: Código IBGE da UF conhecida para a linha (desempate)
+            codigos: Se True, reconhece códigos IBGE (2, 6 ou 7 dígitos)
+            municipios_primeiro: Se True, prefere o município quando o nome é
+                                 também o de uma UF ("São Paulo")
+        
+        Returns:
+            Posição do registro (None se não reconhecido ou ambíguo)
+        """
+        memoria = (texto, codigo_uf, codigos, municipios_primeiro)
+        if memoria in self._memoria:
+            self._memoria.move_to_end(memoria)
+            return self._memoria[memoria]
+        
+        encontrado = None
+        bruto = str(texto).strip()
+        numero = _CODIGO.match(bruto) if codigos else None
+        if numero:
+            codigo = int(numero.group(1))
+            encontrado = self._codigos.get(codigo, self._codigos.get(int(str(codigo)[:2])))
+        else:
+            palavras = normalizar_nome(texto).split()
+            if len(palavras) == 1 and palavras[0] in self._siglas:
+                encontrado = self._siglas[palavras[0]]
+            else:
+                for lado in (0, -1):
+                    while palavras and (palavras[lado] in PALAVRAS_IGNORADAS
+                                        or palavras[lado] in self._siglas
+                                        or palavras[lado].isdigit()):
+                        descartada = palavras.pop(lado)
+                        if codigo_uf is None and descartada in self._siglas:
+                            codigo_uf = self._registros[self._siglas[descartada]][2]
+                if palavras:
+                    encontrado = self._procurar(''.join(palavras), codigo_uf,
+                                                municipios_primeiro)
+        
+        self._memoria[memoria] = encontrado
+        if len(self._memoria) > MAX_MEMORIA_IDENTIFICACOES:
+            self._memoria.popitem(last=False)
+        return encontrado
+    
+    def _tabela_registros(self) -> pd.DataFrame:
+        """Registros em tabela, com uma linha vazia no fim para os não reconhecidos"""
+        if self._tabela is None:
+            tabela = pd.DataFrame(self._registros + [(None,) * len(COLUNAS_LOCALIDADE)],
+                                  columns=COLUNAS_LOCALIDADE)
+            tabela['Código UF'] = tabela['Código UF'].astype('Int64')
+            tabela['Código Município'] = tabela['Código Município'].astype('Int64')
+            self._tabela = tabela
+        return self._tabela
+    
+    def resolver(self, serie: pd.Series,
+                 estados: Optional[pd.Series] = None,
+                 codigos: bool = True,
+                 municipios_primeiro: bool = False) -> pd.DataFrame:
+        """
+        Resolve uma coluna inteira, consultando o índice só para os valores únicos
+        
+        Args:
+            serie: Coluna com nomes, siglas ou códigos
+            estados: Coluna com a UF de cada linha (desempata municípios homônimos)
+            codigos: Se True, reconhece códigos IBGE
+            municipios_primeiro: Se True, prefere municípios a UFs de mesmo nome
+        
+        Returns:
+            DataFrame com COLUNAS_LOCALIDADE, no índice da série (vazio quando não
+            reconhecido)
+        """
+        if estados is None:
+            posicoes_linhas, unicos = pd.factorize(serie)
+            contextos = [None] * len(unicos)
+        else:
+            codigos_uf = self.resolver(estados)['Código UF'].astype(object)
+            codigos_uf = codigos_uf.where(codigos_uf.notna(), None)
+            posicoes_linhas, pares = pd.factorize(
+                pd.MultiIndex.from_arrays([serie.to_numpy(), codigos_uf.to_numpy()]))
+            unicos = [par[0] for par in pares]
+            contextos = [None if pd.isna(par[1]) else int(par[1]) for par in pares]
+        
+        # Posição len(registros) = linha vazia (não reconhecido ou valor ausente)
+        ausente = len(self._registros)
+        posicoes_unicos = np.full(len(unicos) + 1, ausente, dtype=np.int64)
+        for i, (valor, contexto) in enumerate(zip(unicos, contextos)):
+            if not pd.isna(valor):
+                encontrado = self.identificar(valor, contexto, codigos, municipios_primeiro)
+                if encontrado is not None:
+                    posicoes_unicos[i] = encontrado
+        posicoes = posicoes_unicos[np.where(posicoes_linhas >= 0, posicoes_linhas, -1)]
+        resultado = self._tabela_registros().iloc[posicoes]
+        resultado.index = serie.index
+        return resultado
+    
+    def estados(self, serie: pd.Series, codigos: bool = True) -> pd.Series:
+        """
+        Nome oficial da UF de cada valor (NaN quando não reconhecido)
+        
+        Args:
+            serie: Coluna com nomes, siglas ou códigos de UFs ou municípios
+            codigos: Se True, reconhece códigos IBGE
+        
+        Returns:
+            Série com os nomes oficiais das UFs
+        """
+        return self.resolver(serie, codigos=codigos)['Estado']
+
+
+@lru_cache(maxsize=1)
+def indice_ufs() -> IndiceLocalidades:
+    """Índice só com as 27 UFs, montado uma vez e compartilhado"""
+    return IndiceLocalidades()
+
+
+def carregar_municipios(caminho: str, **opcoes) -> IndiceLocalidades:
+    """
+    Monta um índice com as UFs e a tabela de municípios de um CSV
+    
+    Args:
+        caminho: CSV com código IBGE, nome e (opcionalmente) UF de cada município,
+                 como a lista de municípios do IBGE
+        **opcoes: Repassadas ao pd.read_csv (sep, encoding...)
+    
+    Returns:
+        IndiceLocalidades com os municípios
+    """
+    opcoes.setdefault('sep', None)
+    opcoes.setdefault('engine', 'python')
+    opcoes.setdefault('dtype', str)
+    municipios = pd.read_csv(caminho, **opcoes)
+    indice = IndiceLocalidades(municipios)
+    print(f"🗺️  {indice.n_municipios} municípios carregados de {caminho}")
+    return indice
@@ -0,0 +1,285 @@
+"""
+Módulo de Memória Compartilhada
+Transporte de DataFrames entre processos sem pickle: o processo de trabalho
+grava as colunas num arquivo em memória compartilhada (/dev/shm, quando
+existe) e devolve só um descritor pequeno; o processo principal mapeia o
+arquivo (mmap) e monta o DataFrame sobre as mesmas páginas, sem desserializar.
+Usa Arrow IPC quando o pyarrow está instalado e aceita as colunas; sem ele, um
+formato próprio de colunas alinhadas (texto e categorias viram códigos
+inteiros + dicionário)
+"""
+
+import gc
+import os
+import tempfile
+import uuid
+import numpy as np
+import pandas as pd
+from typing import Any, List, Optional
+
+try:
+    import pyarrow as pa
+    from pyarrow import ipc
+except ImportError:  # Sem pyarrow: formato de colunas com numpy.memmap
+    pa = None
+
+
+# Pasta dos arquivos trocados entre processos (RAM no Linux)
+PASTA_COMPARTILHADA = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+# Abaixo deste número de células o pickle comum é mais barato
+CELULAS_MINIMAS = 20_000
+
+# Alinhamento (bytes) de cada coluna no arquivo
+ALINHAMENTO = 64
+
+# Tipos numpy gravados como estão (inteiros, reais, complexos, bool, datas)
+_TIPOS_BRUTOS = 'biufcmM'
+
+
+def _alinhar(posicao: int) -> int:
+    """Próxima posição múltipla de ALINHAMENTO"""
+    return -(-posicao // ALINHAMENTO) * ALINHAMENTO
+
+
+class TabelaCompartilhada:
+    """Descritor (picklável) de um DataFrame gravado em memória compartilhada"""
+    
+    def __init__(self, caminho: str, formato: str, esquema: Optional[dict] = None):
+        """
+        Inicializa o descritor
+        
+        Args:
+            caminho: Arquivo com as colunas
+            formato: 'arrow' (Arrow IPC) ou 'colunas' (formato próprio)
+            esquema: Colunas, tipos, posições, dicionários, índice e attrs
+                     (formato 'colunas')
+        """
+        self.caminho = caminho
+        self.formato = formato
+        self.esquema = esquema
+    
+    @classmethod
+    def gravar(cls, df: pd.DataFrame, pasta: str = PASTA_COMPARTILHADA) -> 'TabelaCompartilhada':
+        """
+        Grava um DataFrame num arquivo da pasta compartilhada
+        
+        Args:
+            df: DataFrame (colunas com nomes únicos)
+            pasta: Pasta do arquivo
+        
+        Returns:
+            Descritor do arquivo
+        """
+        caminho = os.path.join(pasta, f"tabela_{os.getpid()}_{uuid.uuid4().hex}")
+        try:
+            tabela = None
+            if pa is not None:
+                try:
+                    tabela = pa.Table.from_pandas(df, preserve_index=True)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    # Colunas de objetos com tipos misturados: formato próprio
+                    pass
+            if tabela is not None:
+                with pa.OSFile(caminho, 'wb') as destino:
+                    with ipc.new_file(destino, tabela.schema) as escritor:
+                        escritor.write_table(tabela)
+                return cls(caminho, 'arrow', {'attrs': dict(df.attrs)})
+            return cls(caminho, 'colunas', cls._gravar_colunas(df, caminho))
+        except BaseException:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+            raise
+    
+    @staticmethod
+    def _gravar_colunas(df: pd.DataFrame, caminho: str) -> dict:
+        """
+        Grava as colunas lado a lado, alinhadas, e devolve o esquema
+        
+        Colunas numpy numéricas, booleanas e de datas vão como estão; as demais
+        (texto, categorias, inteiros anuláveis) vão como códigos int32 mais o
+        dicionário de valores distintos, que segue no esquema.
+        """
+        indice = df.index
+        if isinstance(indice, pd.RangeIndex):
+            esquema_indice = {'range': (indice.start, indice.stop, indice.step),
+                              'nome': indice.name}
+        else:
+            esquema_indice = {'range': None, 'nome': indice.names}
+        
+        blocos, colunas, posicao = [], [], 0
+        series = [serie for _, serie in df.items()]
+        if esquema_indice['range'] is None:
+            quadro_indice = indice.to_frame(index=False)
+            series += [serie for _, serie in quadro_indice.items()]
+        for serie in series:
+            tipo = serie.dtype
+            if isinstance(tipo, np.dtype) and tipo.kind in _TIPOS_BRUTOS:
+                valores, dicionario = np.ascontiguousarray(serie.to_numpy()), None
+            else:
+                # Fatora o array (e não a Series) para o dicionário manter o tipo
+                original = serie.to_numpy() if isinstance(tipo, np.dtype) else serie.array
+                codigos, dicionario = pd.factorize(original, use_na_sentinel=True)
+                valores = codigos.astype(np.int32 if len(dicionario) < 2**31 else np.int64)
+            posicao = _alinhar(posicao)
+            colunas.append({'tipo': tipo, 'bruto': valores.dtype, 'posicao': posicao,
+                            'dicionario': dicionario})
+            blocos.append((posicao, valores))
+            posicao += valores.nbytes
+        
+        with open(caminho, 'wb') as arquivo:
+            for inicio, valores in blocos:
+                arquivo.seek(inicio)
+                arquivo.write(valores.view(np.uint8).data)
+            arquivo.truncate(max(posicao, 1))
+        
+        n_dados = df.shape[1]
+        return {'nomes': df.columns, 'colunas': colunas[:n_dados],
+                'indice': esquema_indice, 'colunas_indice': colunas[n_dados:],
+                'linhas': len(df), 'attrs': dict(df.attrs)}
+    
+    def carregar(self, remover: bool = True) -> pd.DataFrame:
+        """
+        Mapeia o arquivo e monta o DataFrame sobre a memória mapeada
+        
+        As colunas numéricas não são copiadas: o mapeamento é privado (cópia na
+        escrita), então alterar o DataFrame não altera o arquivo. O arquivo pode
+        ser removido logo em seguida; as páginas continuam válidas enquanto o
+        DataFrame existir.
+        
+        Args:
+            remover: Se True, apaga o arquivo depois de mapeá-lo
+        
+        Returns:
+            DataFrame
+        """
+        try:
+            if self.formato == 'arrow':
+                with pa.memory_map(self.caminho, 'r') as origem:
+                    tabela = ipc.open_file(origem).read_all()
+                df = tabela.to_pandas(split_blocks=True, self_destruct=True)
+            else:
+                df = self._carregar_colunas()
+        except BaseException:
+            if remover and os.path.exists(self.caminho):
+                os.remove(self.caminho)
+            raise
+        df.attrs.update(self.esquema.get('attrs', {}))
+        if remover:
+            try:
+                os.remove(self.caminho)
+            except PermissionError:
+                # Windows não apaga arquivos mapeados: copia e solta o mapeamento
+                df = df.copy(deep=True)
+                gc.collect()
+                os.remove(self.caminho)
+        return df
+    
+    def remover(self):
+        """Apaga o arquivo sem carregá-lo (resultado descartado)"""
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+    
+    def _carregar_colunas(self) -> pd.DataFrame:
+        """Reconstrói o DataFrame do formato 'colunas'"""
+        esquema = self.esquema
+        linhas = esquema['linhas']
+        # ndarray comum sobre o mapeamento (o memmap segue vivo em .base)
+        mapa = (np.asarray(np.memmap(self.caminho, dtype=np.uint8, mode='c'))
+                if os.path.getsize(self.caminho) > 1 else np.empty(0, dtype=np.uint8))
+        
+        def coluna(descricao: dict):
+            bruto = descricao['bruto']
+            inicio = descricao['posicao']
+            valores = mapa[inicio:inicio + linhas * bruto.itemsize].view(bruto)
+            if descricao['dicionario'] is None:
+                return valores
+            return pd.api.extensions.take(descricao['dicionario'], valores, allow_fill=True)
+        
+        if esquema['indice']['range'] is not None:
+            indice = pd.RangeIndex(*esquema['indice']['range'], name=esquema['indice']['nome'])
+        else:
+            # dtype explícito: o pandas inferiria 'str' para objetos que são texto
+            niveis = [pd.Index(coluna(descricao), dtype=descricao['tipo'], copy=False)
+                      for descricao in esquema['colunas_indice']]
+            nomes = esquema['indice']['nome']
+            indice = (niveis[0].rename(nomes[0]) if len(niveis) == 1
+                      else pd.MultiIndex.from_arrays(niveis, names=nomes))
+        
+        dados = {posicao: pd.Series(coluna(descricao), index=indice, dtype=descricao['tipo'],
+                                    copy=False)
+                 for posicao, descricao in enumerate(esquema['colunas'])}
+        df = pd.DataFrame(dados, index=indice, copy=False)
+        df.columns = esquema['nomes']
+        return df
+
+
+def compartilhar_tabela(valor: Any,
+                        celulas_minimas: int = CELULAS_MINIMAS,
+                        pasta: str = PASTA_COMPARTILHADA) -> Any:
+    """
+    Prepara um resultado para voltar ao processo principal
+    
+    DataFrames grandes viram um TabelaCompartilhada; os demais valores (e
+    DataFrames pequenos ou com nomes de colunas repetidos) seguem como estão,
+    pelo pickle comum.
+    
+    Args:
+        valor: Resultado do processo de trabalho
+        celulas_minimas: Linhas × colunas mínimas para usar a memória compartilhada
+        pasta: Pasta dos arquivos
+    
+    Returns:
+        Descritor ou o próprio valor
+    """
+    if (isinstance(valor, pd.DataFrame) and valor.size >= celulas_minimas
+            and valor.columns.is_unique):
+        return TabelaCompartilhada.gravar(valor, pasta)
+    return valor
+
+
+def receber_tabela(valor: Any) -> Any:
+    """
+    Desfaz compartilhar_tabela no processo principal
+    
+    Args:
+        valor: Descritor ou valor comum
+    
+    Returns:
+        DataFrame mapeado (o arquivo é removido) ou o próprio valor
+    """
+    if isinstance(valor, TabelaCompartilhada):
+        return valor.carregar()
+    return valor
+
+
+def descartar_tabela(valor: Any):
+    """
+    Apaga o arquivo de um resultado que não será recebido (ex.: outra tarefa falhou)
+    
+    Args:
+        valor: Descritor ou valor comum (ignorado)
+    """
+    if isinstance(valor, TabelaCompartilhada):
+        valor.remover()
+
+
+def consolidar_tabelas(valores: List[Any], **opcoes_concat) -> pd.DataFrame:
+    """
+    Recebe vários resultados e os concatena numa cópia única
+    
+    Os blocos mapeados são lidos direto das páginas compartilhadas pelo
+    pd.concat; nenhum resultado passa pelo pickle nem é copiado duas vezes.
+    
+    Args:
+        valores: Descritores ou DataFrames
+        **opcoes_concat: Opções do pd.concat (ex.: ignore_index=True)
+    
+    Returns:
+        DataFrame consolidado (vazio se não houver tabelas)
+    """
+    tabelas = [receber_tabela(valor) for valor in valores]
+    tabelas = [tabela for tabela in tabelas if tabela is not None and not tabela.empty]
+    if not tabelas:
+        return pd.DataFrame()
+    return pd.concat(tabelas, **opcoes_concat)
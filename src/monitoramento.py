@@ -0,0 +1,183 @@
+"""
+Módulo de Monitoramento da Pasta de Dados
+Observa a chegada de anuários novos ou corrigidos (anuario_AAAA.pdf) e dispara
+a reconstrução incremental apenas quando os arquivos param de mudar
+"""
+
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # Sem inotify (ex.: Windows, macOS): usa varredura periódica
+    INotify = None
+
+
+# Nome esperado dos anuários na pasta de dados
+PADRAO_ANUARIO = re.compile(r'^anuario_(\d{4})\.pdf$', re.IGNORECASE)
+
+# Assinatura de um arquivo: (tamanho, data de modificação em ns)
+Assinatura = Tuple[int, int]
+
+
+class MonitorAnuarios:
+    """Classe para detectar anuários novos, alterados ou removidos na pasta de dados"""
+    
+    def __init__(self, pasta_dados: str,
+                 intervalo: float = 2.0,
+                 espera: float = 5.0,
+                 usar_inotify: bool = True):
+        """
+        Inicializa o monitor
+        
+        Args:
+            pasta_dados: Pasta dos anuario_AAAA.pdf
+            intervalo: Segundos entre varreduras (sem inotify)
+            espera: Segundos sem mudanças antes de considerar uma rajada concluída
+            usar_inotify: Se False, usa sempre a varredura periódica
+        """
+        self.pasta_dados = pasta_dados
+        self.intervalo = intervalo
+        self.espera = espera
+        self.inotify = None
+        
+        os.makedirs(pasta_dados, exist_ok=True)
+        
+        if usar_inotify and INotify is not None:
+            self.inotify = INotify()
+            self.inotify.add_watch(pasta_dados, flags.CLOSE_WRITE | flags.MOVED_TO
+                                   | flags.CREATE | flags.DELETE | flags.MOVED_FROM)
+        
+        self.assinaturas = self.varrer()
+    
+    @property
+    def modo(self) -> str:
+        """'inotify' ou 'varredura'"""
+        return 'inotify' if self.inotify is not None else 'varredura'
+    
+    def varrer(self) -> Dict[int, Assinatura]:
+        """
+        Lê tamanho e data de modificação de cada anuário da pasta
+        
+        Returns:
+            Dicionário {ano: (tamanho, mtime_ns)}
+        """
+        assinaturas = {}
+        try:
+            entradas = list(os.scandir(self.pasta_dados))
+        except OSError:
+            return assinaturas
+        
+        for entrada in entradas:
+            correspondencia = PADRAO_ANUARIO.match(entrada.name)
+            if correspondencia and entrada.is_file():
+                estado = entrada.stat()
+                assinaturas[int(correspondencia.group(1))] = (estado.st_size, estado.st_mtime_ns)
+        return assinaturas
+    
+    def _aguardar_evento(self, timeout: float) -> bool:
+        """Bloqueia até um evento de anuário (inotify) ou até o timeout"""
+        if self.inotify is None:
+            time.sleep(timeout)
+            return True
+        
+        eventos = self.inotify.read(timeout=int(timeout * 1000))
+        return any(PADRAO_ANUARIO.match(evento.name or '') for evento in eventos)
+    
+    def _aguardar_silencio(self):
+        """Bloqueia até passar `espera` segundos sem eventos"""
+        if self.inotify is None:
+            time.sleep(self.espera)
+            return
+        
+        while self.inotify.read(timeout=int(self.espera * 1000)):
+            pass
+    
+    def aguardar_alteracoes(self, timeout: Optional[float] = None) -> List[int]:
+        """
+        Aguarda anuários novos, alterados ou removidos
+        
+        Depois da primeira mudança, espera até que a pasta fique `espera` segundos
+        sem mudanças (cópias em andamento, vários arquivos de uma vez), de modo que
+        uma rajada de eventos gera uma única reconstrução.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite)
+        
+        Returns:
+            Anos alterados, em ordem (vazio se o timeout expirar)
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        
+        # 1. Espera a primeira mudança
+        while True:
+            restante = self.intervalo if limite is None else min(self.intervalo,
+                                                                 limite - time.monotonic())
+            if restante <= 0:
+                return []
+            if self._aguardar_evento(restante) and self.varrer() != self.assinaturas:
+                break
+        
+        # 2. Debounce: aguarda a pasta estabilizar
+        atual = self.varrer()
+        while True:
+            self._aguardar_silencio()
+            nova = self.varrer()
+            if nova == atual:
+                break
+            atual = nova
+        
+        anos_alterados = sorted(ano for ano in set(atual) | set(self.assinaturas)
+                                if atual.get(ano) != self.assinaturas.get(ano))
+        self.assinaturas = atual
+        return anos_alterados
+    
+    def fechar(self):
+        """Libera o descritor do inotify"""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+
+def monitorar_anuarios(pasta_dados: str,
+                       ao_alterar: Callable[[List[int]], None],
+                       intervalo: float = 2.0,
+                       espera: float = 5.0,
+                       max_reconstrucoes: Optional[int] = None,
+                       ao_iniciar: Optional[Callable[[], None]] = None):
+    """
+    Executa `ao_alterar(anos)` a cada rajada de anuários novos ou alterados
+    
+    Args:
+        pasta_dados: Pasta dos anuario_AAAA.pdf
+        ao_alterar: Função chamada com os anos alterados
+        intervalo: Segundos entre varreduras (sem inotify)
+        espera: Segundos sem mudanças antes de reconstruir
+        max_reconstrucoes: Encerra após este número de reconstruções (None = até Ctrl+C)
+        ao_iniciar: Construção inicial, executada depois que o monitor registra a
+                    pasta; anuários que chegam durante ela disparam uma reconstrução
+                    logo em seguida (não conta em `max_reconstrucoes`)
+    """
+    # Mensagens do monitor vão para o stderr: o stdout fica livre para os resumos
+    monitor = MonitorAnuarios(pasta_dados, intervalo=intervalo, espera=espera)
+    print(f"👀 Monitorando {pasta_dados} ({monitor.modo}) - Ctrl+C para encerrar",
+          file=sys.stderr)
+    
+    reconstrucoes = 0
+    try:
+        if ao_iniciar is not None:
+            ao_iniciar()
+        while max_reconstrucoes is None or reconstrucoes < max_reconstrucoes:
+            anos = monitor.aguardar_alteracoes()
+            if not anos:
+                continue
+            print(f"\n📥 Anuários alterados: {', '.join(map(str, anos))}", file=sys.stderr)
+            ao_alterar(anos)
+            reconstrucoes += 1
+    except KeyboardInterrupt:
+        print("\n⏹️  Monitoramento encerrado.", file=sys.stderr)
+    finally:
+        monitor.fechar()
@@ -0,0 +1,483 @@
+"""
+Módulo de Orquestração Assíncrona
+Sobrepõe extração, gráficos e relatório com asyncio: as fontes (anuários por
+ano, planilhas, CSV consolidado) são lidas num pool de processos, os gráficos
+de um estado começam assim que todas as fontes que o cobrem terminam, e o
+relatório é montado em ordem à medida que os gráficos ficam prontos, em vez
+de esperar cada fase inteira terminar. Os dados e o cubo de cada estado (e da
+região) vão uma única vez para a memória compartilhada; as tarefas de gráficos
+levam só a chave do gráfico e um descritor pequeno
+"""
+
+import asyncio
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from anomalias import detectar_anomalias, salvar_anomalias, separar_quarentena
+from cubo_agregado import CuboAgregado
+from etapas_pipeline import consolidar_anos, converter_formato_longo, exportar_dados
+from gerar_graficos import GeradorGraficos
+from gerar_relatorio import GeradorRelatorioCompleto, preparar_imagem
+from memoria_compartilhada import (TabelaCompartilhada, compartilhar_tabela, descartar_tabela,
+                                   receber_tabela)
+from pipeline import Pipeline
+from populacao import ReferenciaPopulacional, adicionar_indices_de_taxa
+
+
+# Chave de um gráfico: (tipo, parâmetro) - ex.: ('serie_temporal', 'Amazonas')
+ChaveGrafico = Tuple[str, Optional[str]]
+
+# Gráficos de cada estado (começam quando os dados do estado estão completos)
+GRAFICOS_ESTADO = ('serie_temporal', 'media_movel')
+
+# Gráficos da região (precisam de todos os estados), na ordem do relatório
+GRAFICOS_INDICE = ('comparativo', 'heatmap')
+GRAFICOS_REGIAO = ('tendencia', 'crescimento', 'variacao')
+
+# Estado global dos processos de gráficos: opções do GeradorGraficos (definidas
+# pelo initializer) e um gerador por conjunto de dados já carregado
+_OPCOES_PROCESSO: Dict[str, Any] = {}
+_GERADORES_PROCESSO: Dict[str, GeradorGraficos] = {}
+
+
+class DadosGraficos:
+    """Descritor (picklável) dos dados e do cubo de um estado ou da região"""
+    
+    def __init__(self, df_dados: pd.DataFrame, cubo: CuboAgregado):
+        """
+        Grava os dados e o cubo na memória compartilhada, uma única vez
+        
+        Args:
+            df_dados: Dados do conjunto (formato longo)
+            cubo: Cubo agregado de `df_dados`
+        """
+        self.tabela = TabelaCompartilhada.gravar(df_dados)
+        self.arquivo_cubo = self.tabela.caminho + '.cubo'
+        with open(self.arquivo_cubo, 'wb') as arquivo:
+            pickle.dump(cubo, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def gerador(self) -> GeradorGraficos:
+        """GeradorGraficos deste conjunto no processo atual (carregado uma vez)"""
+        gerador = _GERADORES_PROCESSO.get(self.arquivo_cubo)
+        if gerador is None:
+            with open(self.arquivo_cubo, 'rb') as arquivo:
+                cubo = pickle.load(arquivo)
+            gerador = GeradorGraficos(self.tabela.carregar(remover=False), cubo=cubo,
+                                      **_OPCOES_PROCESSO)
+            _GERADORES_PROCESSO[self.arquivo_cubo] = gerador
+        return gerador
+    
+    def remover(self):
+        """Apaga os arquivos (depois que os processos de gráficos terminam)"""
+        for caminho in (self.tabela.caminho, self.arquivo_cubo):
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+
+def _aquecer_processo():
+    """Prepara o processo de gráficos (backend sem janela) enquanto a extração roda"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _inicializar_processo_graficos(pasta_saida: str, modo_rascunho: bool,
+                                   formatos_extras: Sequence[str]):
+    """Recebe as opções dos gráficos uma vez por processo e o aquece"""
+    _OPCOES_PROCESSO.update(pasta_saida=pasta_saida, modo_rascunho=modo_rascunho,
+                            formatos_extras=formatos_extras)
+    _aquecer_processo()
+
+
+def _executar_fonte(nome: str, funcao: Callable,
+                    parametros: Dict[str, Any]) -> Tuple[Any, float]:
+    """
+    Lê uma fonte (nível de módulo para poder rodar em outro processo), passa o
+    resultado ao formato longo e mede a leitura; tabelas grandes voltam pela
+    memória compartilhada (receber_tabela)
+    
+    Raises:
+        ValueError: Se a fonte trouxe dados que não podem ser divididos por estado
+    """
+    inicio = time.perf_counter()
+    df_fonte = funcao(**parametros)
+    df_longo = converter_formato_longo(df_fonte)
+    if not df_fonte.empty and df_longo.empty:
+        raise ValueError(f"Fonte '{nome}' trouxe {len(df_fonte)} linhas sem estados "
+                         f"ou indicadores reconhecidos: impossível dividir por estado")
+    return compartilhar_tabela(df_longo), time.perf_counter() - inicio
+
+
+def _descartar_leitura(futuro):
+    """Apaga a tabela compartilhada de uma leitura cujo resultado não será usado"""
+    if not futuro.cancelled() and futuro.exception() is None:
+        descartar_tabela(futuro.result()[0])
+
+
+def _renderizar(chave: ChaveGrafico, dados: DadosGraficos) -> Tuple[str, List[str], float]:
+    """
+    Renderiza um gráfico no processo atual
+    
+    Returns:
+        Tupla (caminho do PNG, arquivos extras, segundos de renderização)
+    """
+    inicio = time.perf_counter()
+    tipo, parametro = chave
+    gerador = dados.gerador()
+    extras = len(gerador.arquivos_extras)
+    metodos = {
+        'serie_temporal': lambda: gerador.grafico_serie_temporal_por_estado(parametro),
+        'media_movel': lambda: gerador.grafico_media_movel_estado(parametro),
+        'comparativo': lambda: gerador.grafico_comparativo_estados(parametro, tipo='linha'),
+        'heatmap': lambda: gerador.grafico_heatmap_estados_anos(parametro),
+        'tendencia': gerador.grafico_tendencia_geral,
+        'crescimento': gerador.grafico_crescimento_composto,
+        'variacao': gerador.grafico_variacao_anual,
+    }
+    caminho = metodos[tipo]()
+    return caminho, gerador.arquivos_extras[extras:], time.perf_counter() - inicio
+
+
+class OrquestradorAssincrono:
+    """Classe para executar extração, gráficos e relatório com sobreposição"""
+    
+    def __init__(self, estados_alvo: Sequence[str],
+                 pasta_graficos: str = 'graficos',
+                 arquivo_saida: str = 'relatorio.pdf',
+                 modo_rascunho: bool = False,
+                 max_processos: Optional[int] = None,
+                 formatos_graficos: Sequence[str] = (),
+                 arquivo_dados: Optional[str] = None,
+                 formatos_dados: Sequence[str] = ('csv',),
+                 arquivo_anomalias: Optional[str] = None,
+                 quarentena: bool = False,
+                 arquivo_populacao: Optional[str] = None,
+                 nivel_taxas: str = 'Estado',
+                 **opcoes_relatorio):
+        """
+        Inicializa o orquestrador
+        
+        Args:
+            estados_alvo: Estados do relatório, na ordem das seções
+            pasta_graficos: Pasta dos gráficos
+            arquivo_saida: Caminho do PDF
+            modo_rascunho: Se True, gráficos e relatório em modo rascunho
+            max_processos: Processos de cada pool (extração e gráficos; None = CPUs)
+            formatos_graficos: Formatos salvos além do PNG ('svg', 'pdf')
+            arquivo_dados: Se informado, exporta os dados consolidados
+            formatos_dados: Formatos da exportação ('csv', 'excel', 'sqlite')
+            arquivo_anomalias: CSV onde os valores anômalos são salvos
+            quarentena: Se True, os valores anômalos ficam fora dos gráficos e do relatório
+            arquivo_populacao: CSV de população feminina para as taxas por 100 mil
+            nivel_taxas: 'Estado' ou 'Município'
+            **opcoes_relatorio: titulo, subtitulo, periodo, autor, instituicao,
+                                introducao, conclusao
+        """
+        self.estados_alvo = list(estados_alvo)
+        self.pasta_graficos = pasta_graficos
+        self.arquivo_saida = arquivo_saida
+        self.modo_rascunho = modo_rascunho
+        self.max_processos = max_processos or os.cpu_count() or 1
+        self.formatos_graficos = list(formatos_graficos)
+        self.arquivo_dados = arquivo_dados
+        self.formatos_dados = list(formatos_dados)
+        self.arquivo_anomalias = arquivo_anomalias
+        self.quarentena = quarentena
+        self.arquivo_populacao = arquivo_populacao
+        self.nivel_taxas = nivel_taxas
+        self.opcoes_relatorio = opcoes_relatorio
+        
+        # Fonte: (nome, função de nível de módulo, parâmetros, estados cobertos)
+        self.fontes: List[Tuple[str, Callable, Dict[str, Any], List[str]]] = []
+        self.df_dados = pd.DataFrame()
+        self.anomalias = pd.DataFrame()
+        self.estados_sem_dados: List[str] = []
+        self.graficos: Dict[ChaveGrafico, str] = {}
+        self.ordem_graficos: List[ChaveGrafico] = []
+        self.arquivos_extras: List[str] = []
+        self.arquivos_dados: List[str] = []
+        self.relatorio: Optional[str] = None
+        # Segundos de trabalho de cada leitura e gráfico (medidos nos processos)
+        self.duracoes: Dict[str, float] = {}
+    
+    def adicionar_fonte(self, nome: str, funcao: Callable,
+                        estados: Optional[Sequence[str]] = None,
+                        **parametros) -> 'OrquestradorAssincrono':
+        """
+        Registra uma fonte de dados lida no pool de processos
+        
+        Args:
+            nome: Nome da fonte (ex.: 'extrair_2023')
+            funcao: Função de nível de módulo que devolve dados em formato longo ou
+                    tabelas extraídas (passadas ao formato longo no processo da leitura)
+            estados: Estados que a fonte pode conter (None = todos os estados-alvo);
+                     um estado fica completo quando todas as suas fontes terminam
+            **parametros: Parâmetros nomeados da função
+        
+        Returns:
+            O próprio orquestrador (permite encadear chamadas)
+        """
+        self.fontes.append((nome, funcao, parametros, list(estados or self.estados_alvo)))
+        return self
+    
+    def adicionar_fontes_do_pipeline(self, pipeline: Pipeline,
+                                     etapa_dados: str = 'dados') -> 'OrquestradorAssincrono':
+        """
+        Registra como fontes as etapas de leitura já montadas num pipeline
+        
+        As etapas de leitura sem dependências sob a etapa de dados (extração por
+        ano, planilhas) viram uma fonte cada; sem dependências, a própria etapa
+        (ex.: carregar_dados) é a fonte.
+        
+        Args:
+            pipeline: Pipeline com as etapas de leitura registradas
+            etapa_dados: Etapa que consolida os dados
+        
+        Returns:
+            O próprio orquestrador
+        """
+        pendentes, vistas = [etapa_dados], set()
+        while pendentes:
+            nome = pendentes.pop(0)
+            fonte = pipeline.etapas[nome]
+            if nome in vistas:
+                continue
+            vistas.add(nome)
+            if fonte.dependencias:
+                pendentes.extend(fonte.dependencias)
+            else:
+                self.adicionar_fonte(nome, fonte.funcao, **fonte.parametros)
+        return self
+    
+    def _preparar_estado(self, df_estado: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Anomalias, quarentena e taxas dos dados de um estado"""
+        anomalias = detectar_anomalias(df_estado) if 'Valor' in df_estado else pd.DataFrame()
+        if self.quarentena and len(anomalias):
+            df_estado, _ = separar_quarentena(df_estado, anomalias)
+        if self._referencia is not None:
+            df_estado = adicionar_indices_de_taxa(df_estado, self._referencia,
+                                                  nivel=self.nivel_taxas)
+        return df_estado, anomalias
+    
+    def _compartilhar_dados(self, df_dados: pd.DataFrame,
+                            cubo: Optional[CuboAgregado] = None) -> DadosGraficos:
+        """Grava um conjunto de dados completo para os processos de gráficos"""
+        dados = DadosGraficos(df_dados, cubo or CuboAgregado(df_dados))
+        self._dados_compartilhados.append(dados)
+        return dados
+    
+    def _agendar_grafico(self, chave: ChaveGrafico, dados: DadosGraficos):
+        """Renderiza o gráfico e prepara a sua imagem para o PDF, no pool de gráficos"""
+        async def renderizar_e_preparar() -> str:
+            laco = asyncio.get_running_loop()
+            caminho, extras, segundos = await laco.run_in_executor(
+                self._pool_graficos, _renderizar, chave, dados)
+            self.duracoes[f"grafico:{chave[0]}:{chave[1] or ''}"] = segundos
+            self.arquivos_extras += extras
+            if caminho and self._relatorio.dpi_imagens is not None:
+                buffer = await laco.run_in_executor(
+                    self._pool_graficos, preparar_imagem, caminho,
+                    self._relatorio.largura_graficos, self._relatorio.dpi_imagens)
+                self._relatorio.registrar_imagem_preparada(caminho, buffer)
+            self.graficos[chave] = caminho
+            return caminho
+        
+        self._tarefas_graficos[chave] = asyncio.ensure_future(renderizar_e_preparar())
+    
+    async def _ler_fontes(self):
+        """Lê as fontes em paralelo e agenda os gráficos de cada estado completo"""
+        pendentes = {estado: sum(estado in estados for *_, estados in self.fontes)
+                     for estado in self.estados_alvo}
+        resultados: List[pd.DataFrame] = []
+        dados_estados, anomalias = [], []
+        
+        def estado_completo(estado: str):
+            partes = [df[df['Estado'] == estado] for df in resultados if not df.empty]
+            df_estado = consolidar_anos(*partes)
+            if df_estado.empty:
+                print(f"⚠️  Nenhum dado para {estado}")
+                self.estados_sem_dados.append(estado)
+                return
+            df_estado, anomalias_estado = self._preparar_estado(df_estado)
+            dados_estados.append(df_estado)
+            anomalias.append(anomalias_estado)
+            print(f"🧩 Dados completos: {estado} ({len(df_estado)} registros) - gráficos iniciados")
+            dados = self._compartilhar_dados(df_estado)
+            for tipo in GRAFICOS_ESTADO:
+                self._agendar_grafico((tipo, estado), dados)
+        
+        # Futuros do pool (não do laço) para poder descartar leituras em caso de erro
+        leituras = {
+            self._pool_extracao.submit(_executar_fonte, nome, funcao, parametros):
+                (nome, estados)
+            for nome, funcao, parametros, estados in self.fontes
+        }
+        tarefas = {asyncio.wrap_future(leitura): leitura for leitura in leituras}
+        recebidas = set()
+        for estado in [e for e, n in pendentes.items() if n == 0]:
+            estado_completo(estado)
+        em_execucao = set(tarefas)
+        try:
+            while em_execucao:
+                concluidas, em_execucao = await asyncio.wait(
+                    em_execucao, return_when=asyncio.FIRST_COMPLETED)
+                for tarefa in concluidas:
+                    recebidas.add(tarefas[tarefa])
+                    df_fonte, segundos = tarefa.result()
+                    df_fonte = receber_tabela(df_fonte)
+                    nome, estados = leituras[tarefas[tarefa]]
+                    resultados.append(df_fonte)
+                    self.duracoes[nome] = segundos
+                    for estado in estados:
+                        pendentes[estado] -= 1
+                        if pendentes[estado] == 0:
+                            estado_completo(estado)
+        except BaseException:
+            # Leituras já concluídas (ou que ainda vão terminar) deixariam seus
+            # arquivos na memória compartilhada: são apagados sem carregar
+            for leitura in leituras:
+                if leitura not in recebidas:
+                    leitura.cancel()
+                    leitura.add_done_callback(_descartar_leitura)
+            raise
+        
+        self.df_dados = consolidar_anos(*dados_estados)
+        self.anomalias = (pd.concat(anomalias, ignore_index=True) if anomalias
+                          else pd.DataFrame())
+    
+    async def _graficos_da_regiao(self):
+        """Agenda os gráficos que dependem de todos os estados"""
+        if self.df_dados.empty:
+            return []
+        self._cubo = CuboAgregado(self.df_dados)
+        dados = self._compartilhar_dados(self.df_dados, self._cubo)
+        indices = list(self._cubo.rotulos['Índice de Violência'])
+        chaves = [(tipo, indice) for tipo in GRAFICOS_INDICE for indice in indices]
+        chaves += [(tipo, None) for tipo in GRAFICOS_REGIAO]
+        for chave in chaves:
+            self._agendar_grafico(chave, dados)
+        return chaves
+    
+    async def _montar_relatorio(self, dados_prontos: asyncio.Event,
+                                chaves_regiao: 'asyncio.Future') -> Optional[str]:
+        """Adiciona os gráficos ao PDF na ordem do relatório, à medida que ficam prontos"""
+        relatorio = self._relatorio
+        relatorio.iniciar_relatorio(self.opcoes_relatorio.get('autor', ""),
+                                    self.opcoes_relatorio.get('instituicao', ""),
+                                    self.opcoes_relatorio.get('introducao', ""))
+        await dados_prontos.wait()
+        
+        # Ordem das etapas de gráficos do pipeline: séries, comparativos, mapas,
+        # tendência, crescimento, variação e médias móveis
+        ordem = [('serie_temporal', estado) for estado in self.estados_alvo]
+        ordem += await chaves_regiao
+        ordem += [('media_movel', estado) for estado in self.estados_alvo]
+        ordem = [chave for chave in ordem if chave in self._tarefas_graficos]
+        self.ordem_graficos = ordem
+        
+        for chave in ordem:
+            caminho = await self._tarefas_graficos[chave]
+            if caminho:
+                relatorio.adicionar_grafico(caminho, total=len(ordem))
+        
+        relatorio.finalizar_relatorio(self.arquivo_saida,
+                                      self.opcoes_relatorio.get('conclusao', ""),
+                                      self.df_dados if not self.df_dados.empty else None,
+                                      self._cubo)
+        print(f"✅ RELATÓRIO GERADO COM SUCESSO: {self.arquivo_saida}")
+        return self.arquivo_saida
+    
+    async def executar(self) -> Dict[str, Any]:
+        """
+        Executa tudo com sobreposição das fases
+        
+        Returns:
+            Dicionário com 'dados' (DataFrame), 'graficos' (caminhos na ordem do
+            relatório), 'relatorio' (caminho ou None), 'duracoes' {tarefa: segundos
+            de trabalho} e 'segundos' (tempo total)
+        """
+        self._inicio = time.perf_counter()
+        self._tarefas_graficos: Dict[ChaveGrafico, 'asyncio.Future'] = {}
+        self._dados_compartilhados: List[DadosGraficos] = []
+        self._cubo: Optional[CuboAgregado] = None
+        self._referencia = (ReferenciaPopulacional.de_csv(self.arquivo_populacao)
+                            if self.arquivo_populacao else None)
+        self._relatorio = GeradorRelatorioCompleto(
+            titulo=self.opcoes_relatorio.get('titulo', "Análise de Violência contra Mulheres"),
+            subtitulo=self.opcoes_relatorio.get('subtitulo',
+                                                "Região Norte - Amazonas, Roraima e Acre"),
+            periodo=self.opcoes_relatorio.get('periodo', "2015-2025"),
+            modo_rascunho=self.modo_rascunho)
+        os.makedirs(self.pasta_graficos, exist_ok=True)
+        
+        laco = asyncio.get_running_loop()
+        dados_prontos = asyncio.Event()
+        chaves_regiao = laco.create_future()
+        
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_processos) as pool_extracao, \
+                    ProcessPoolExecutor(max_workers=self.max_processos,
+                                        initializer=_inicializar_processo_graficos,
+                                        initargs=(self.pasta_graficos, self.modo_rascunho,
+                                                  self.formatos_graficos)) as pool_graficos:
+                self._pool_extracao, self._pool_graficos = pool_extracao, pool_graficos
+                # Processos de gráficos iniciados enquanto a extração (e a JVM) ainda roda
+                for _ in range(self.max_processos):
+                    pool_graficos.submit(_aquecer_processo)
+                
+                montagem = asyncio.ensure_future(self._montar_relatorio(dados_prontos,
+                                                                        chaves_regiao))
+                try:
+                    await self._ler_fontes()
+                    dados_prontos.set()
+                    chaves_regiao.set_result(await self._graficos_da_regiao())
+                    
+                    exportacao = None
+                    if self.arquivo_dados and not self.df_dados.empty:
+                        exportacao = laco.run_in_executor(None, exportar_dados, self.df_dados,
+                                                          self.arquivo_dados, self.formatos_dados)
+                    if self.arquivo_anomalias:
+                        salvar_anomalias(self.anomalias, self.arquivo_anomalias)
+                    
+                    self.relatorio = await montagem
+                    if exportacao is not None:
+                        self.arquivos_dados = await exportacao
+                except BaseException:
+                    montagem.cancel()
+                    for tarefa in self._tarefas_graficos.values():
+                        tarefa.cancel()
+                    raise
+        finally:
+            # Os processos de gráficos já terminaram (e soltaram os mapeamentos)
+            for dados in self._dados_compartilhados:
+                dados.remover()
+        
+        total = time.perf_counter() - self._inicio
+        print(f"⏱️  Orquestração: {total:.2f}s no total, para {sum(self.duracoes.values()):.2f}s "
+              f"de leituras e gráficos somados")
+        
+        return {
+            'dados': self.df_dados,
+            'graficos': [self.graficos[chave] for chave in self.ordem_graficos
+                         if self.graficos.get(chave)],
+            'relatorio': self.relatorio,
+            'duracoes': self.duracoes,
+            'segundos': total,
+        }
+
+
+def executar_sobreposto(orquestrador: OrquestradorAssincrono) -> Dict[str, Any]:
+    """
+    Função de conveniência: executa o orquestrador num laço de eventos novo
+    
+    Args:
+        orquestrador: Orquestrador com as fontes registradas
+    
+    Returns:
+        Resultado de OrquestradorAssincrono.executar
+    """
+    return asyncio.run(orquestrador.executar())
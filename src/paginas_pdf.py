@@ -0,0 +1,326 @@
+"""
+Módulo de Acesso às Páginas dos PDFs
+Abre cada anuário por mapeamento em memória (mmap, somente leitura), lê a
+tabela xref e a árvore de páginas uma única vez por processo e guarda o texto
+de cada página, comprimido, num cache SQLite (na pasta do PDF) com chave pelo
+hash do arquivo. Procurar as páginas de outro indicador no mesmo PDF não relê
+nem reanalisa o arquivo, e vários anuários abertos ao mesmo tempo compartilham
+as páginas do cache de arquivos do sistema em vez de cada um ocupar uma cópia
+na memória. fechar_documentos solta os mapeamentos quando a extração termina
+"""
+
+import mmap
+import os
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from localidades import normalizar_nome
+from proveniencia import codigo_pdf
+
+
+# Cache de textos criado na pasta de cada PDF (ou em pasta_cache)
+ARQUIVO_CACHE_PAGINAS = '.paginas_pdf.sqlite'
+
+# Nível do zlib para os textos (o texto das páginas comprime ~4x)
+NIVEL_COMPRESSAO = 6
+
+_ESQUEMA = (
+    """CREATE TABLE IF NOT EXISTS documentos (
+        pdf INTEGER PRIMARY KEY,
+        paginas INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS paginas (
+        pdf INTEGER NOT NULL,
+        pagina INTEGER NOT NULL,
+        texto BLOB NOT NULL,
+        PRIMARY KEY (pdf, pagina)
+    ) WITHOUT ROWID""",
+)
+
+
+class CacheTextoPaginas:
+    """Textos de páginas de PDFs em SQLite, com chave (código do PDF, página)"""
+    
+    def __init__(self, caminho: str):
+        """
+        Abre (ou cria) o cache
+        
+        Args:
+            caminho: Arquivo SQLite (':memory:' para um cache temporário)
+        """
+        self.caminho = caminho
+        pasta = os.path.dirname(caminho)
+        if pasta and caminho != ':memory:':
+            os.makedirs(pasta, exist_ok=True)
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        for comando in _ESQUEMA:
+            self.conexao.execute(comando)
+        self.conexao.commit()
+    
+    def __enter__(self) -> 'CacheTextoPaginas':
+        return self
+    
+    def __exit__(self, *erro):
+        self.fechar()
+    
+    def fechar(self):
+        """Fecha a conexão"""
+        if self.conexao is not None:
+            self.conexao.close()
+            self.conexao = None
+    
+    def numero_paginas(self, codigo: int) -> Optional[int]:
+        """Número de páginas registrado para o PDF, ou None"""
+        linha = self.conexao.execute("SELECT paginas FROM documentos WHERE pdf = ?",
+                                     (codigo,)).fetchone()
+        return linha[0] if linha else None
+    
+    def registrar_documento(self, codigo: int, paginas: int):
+        """Registra o número de páginas de um PDF"""
+        self.conexao.execute("INSERT OR REPLACE INTO documentos (pdf, paginas) VALUES (?, ?)",
+                             (codigo, paginas))
+        self.conexao.commit()
+    
+    def ler(self, codigo: int, paginas: Sequence[int]) -> Dict[int, str]:
+        """
+        Textos já guardados de algumas páginas
+        
+        Args:
+            codigo: Código do PDF (codigo_pdf)
+            paginas: Páginas desejadas (1-based)
+        
+        Returns:
+            {página: texto} das páginas encontradas
+        """
+        textos = {}
+        paginas = list(paginas)
+        # Consultas em lotes (limite de parâmetros do SQLite)
+        for inicio in range(0, len(paginas), 500):
+            lote = paginas[inicio:inicio + 500]
+            marcadores = ', '.join('?' * len(lote))
+            for pagina, texto in self.conexao.execute(
+                    f"SELECT pagina, texto FROM paginas WHERE pdf = ? AND pagina IN ({marcadores})",
+                    (codigo, *lote)):
+                textos[pagina] = zlib.decompress(texto).decode('utf-8')
+        return textos
+    
+    def gravar(self, codigo: int, textos: Dict[int, str]):
+        """
+        Guarda textos de páginas (substitui os existentes)
+        
+        Args:
+            codigo: Código do PDF
+            textos: {página: texto}
+        """
+        self.conexao.executemany(
+            "INSERT OR REPLACE INTO paginas (pdf, pagina, texto) VALUES (?, ?, ?)",
+            [(codigo, pagina, zlib.compress(texto.encode('utf-8'), NIVEL_COMPRESSAO))
+             for pagina, texto in textos.items()])
+        self.conexao.commit()
+
+
+class DocumentoPDF:
+    """PDF mapeado em memória, com o texto das páginas em cache"""
+    
+    def __init__(self, caminho_pdf: str, cache: Optional[CacheTextoPaginas] = None,
+                 pasta_cache: Optional[str] = None):
+        """
+        Mapeia o arquivo (a análise da estrutura do PDF só ocorre quando uma
+        página ainda não está no cache)
+        
+        Args:
+            caminho_pdf: Caminho do PDF
+            cache: Cache de textos já aberto; sem ele, o documento abre (e
+                   fecha com fechar) ARQUIVO_CACHE_PAGINAS em pasta_cache
+            pasta_cache: Pasta do cache de textos (padrão: a pasta do PDF)
+        """
+        self.caminho = caminho_pdf
+        self.codigo = codigo_pdf(caminho_pdf)
+        self._cache_proprio = cache is None
+        self.pasta_cache = None
+        if cache is None:
+            self.pasta_cache = os.path.abspath(pasta_cache or os.path.dirname(caminho_pdf))
+            cache = CacheTextoPaginas(os.path.join(self.pasta_cache, ARQUIVO_CACHE_PAGINAS))
+        self.cache = cache
+        estado = os.stat(caminho_pdf)
+        self.assinatura = (estado.st_size, estado.st_mtime_ns)
+        self._arquivo = open(caminho_pdf, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._leitor = None
+        self._textos: Dict[int, str] = {}
+        self._normalizados: Dict[int, str] = {}
+    
+    def __enter__(self) -> 'DocumentoPDF':
+        return self
+    
+    def __exit__(self, *erro):
+        self.fechar()
+    
+    def fechar(self):
+        """Solta o leitor e o mapeamento do arquivo (e fecha o cache próprio)"""
+        self._leitor = None
+        if self._mapa is not None:
+            self._mapa.close()
+            self._arquivo.close()
+            self._mapa = None
+        if self._cache_proprio:
+            self.cache.fechar()
+    
+    @property
+    def leitor(self):
+        """PdfReader sobre o mapeamento (xref e árvore de páginas lidas uma vez)"""
+        if self._leitor is None:
+            from PyPDF2 import PdfReader
+            self._leitor = PdfReader(self._mapa)
+        return self._leitor
+    
+    def __len__(self) -> int:
+        paginas = self.cache.numero_paginas(self.codigo)
+        if paginas is None:
+            paginas = len(self.leitor.pages)
+            self.cache.registrar_documento(self.codigo, paginas)
+        return paginas
+    
+    def textos(self, paginas: Optional[Iterable[int]] = None) -> Dict[int, str]:
+        """
+        Texto de várias páginas
+        
+        Procura primeiro na memória, depois no cache em disco; só as páginas
+        que faltam são extraídas do PDF (e gravadas no cache de uma vez).
+        
+        Args:
+            paginas: Páginas (1-based; padrão: todas)
+        
+        Returns:
+            {página: texto}
+        """
+        paginas = list(paginas) if paginas is not None else list(range(1, len(self) + 1))
+        faltantes = [pagina for pagina in paginas if pagina not in self._textos]
+        if faltantes:
+            self._textos.update(self.cache.ler(self.codigo, faltantes))
+            faltantes = [pagina for pagina in faltantes if pagina not in self._textos]
+        if faltantes:
+            extraidos = {pagina: self.leitor.pages[pagina - 1].extract_text() or ''
+                         for pagina in faltantes}
+            self.cache.gravar(self.codigo, extraidos)
+            self._textos.update(extraidos)
+        return {pagina: self._textos[pagina] for pagina in paginas}
+    
+    def texto(self, pagina: int) -> str:
+        """Texto de uma página (1-based)"""
+        return self.textos([pagina])[pagina]
+    
+    def localizar(self, termos: Sequence[str], todos: bool = True,
+                  paginas: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Páginas cujo texto contém os termos (sem diferença de acentos e caixa)
+        
+        Args:
+            termos: Termos procurados (ex.: ['feminicidio', 'unidades da federação'])
+            todos: Se True, a página precisa conter todos os termos; senão, qualquer um
+            paginas: Páginas examinadas (padrão: todas)
+        
+        Returns:
+            Páginas encontradas, em ordem
+        """
+        termos = [normalizar_nome(termo) for termo in termos]
+        combinar = all if todos else any
+        encontradas = []
+        for pagina, texto in self.textos(paginas).items():
+            if pagina not in self._normalizados:
+                self._normalizados[pagina] = normalizar_nome(texto)
+            normalizado = self._normalizados[pagina]
+            if combinar(termo in normalizado for termo in termos):
+                encontradas.append(pagina)
+        return sorted(encontradas)
+
+
+# Documentos abertos neste processo: caminho absoluto -> DocumentoPDF
+_documentos: Dict[str, DocumentoPDF] = {}
+
+
+def abrir_pdf(caminho_pdf: str, cache: Optional[CacheTextoPaginas] = None,
+              pasta_cache: Optional[str] = None) -> DocumentoPDF:
+    """
+    Documento mapeado de um PDF, reaproveitado enquanto o arquivo não muda
+    (até fechar_documentos)
+    
+    Args:
+        caminho_pdf: Caminho do PDF
+        cache: Cache de textos já aberto (padrão: o do próprio documento)
+        pasta_cache: Pasta do cache de textos (padrão: a pasta do PDF)
+    
+    Returns:
+        DocumentoPDF
+    """
+    chave = os.path.abspath(caminho_pdf)
+    documento = _documentos.get(chave)
+    estado = os.stat(caminho_pdf)
+    if (documento is not None and documento._mapa is not None
+            and documento.assinatura == (estado.st_size, estado.st_mtime_ns)
+            and (cache is None or documento.cache is cache)
+            and (pasta_cache is None or documento.pasta_cache == os.path.abspath(pasta_cache))):
+        return documento
+    if documento is not None:
+        documento.fechar()
+    documento = _documentos[chave] = DocumentoPDF(caminho_pdf, cache, pasta_cache)
+    return documento
+
+
+def fechar_documentos(caminhos_pdfs: Optional[Iterable[str]] = None):
+    """
+    Fecha documentos abertos por abrir_pdf (mapeamento, arquivo e cache próprio)
+    
+    Args:
+        caminhos_pdfs: PDFs a fechar (padrão: todos os abertos neste processo)
+    """
+    chaves = (list(_documentos) if caminhos_pdfs is None
+              else [os.path.abspath(caminho) for caminho in caminhos_pdfs])
+    for chave in chaves:
+        documento = _documentos.pop(chave, None)
+        if documento is not None:
+            documento.fechar()
+
+
+def especificacao_paginas(paginas: Iterable[int]) -> str:
+    """
+    Especificação de páginas no formato do tabula, com faixas agrupadas
+    
+    Args:
+        paginas: Números de página
+    
+    Returns:
+        Texto como '3-5,9,12-13' ('' se não houver páginas)
+    """
+    partes: List[str] = []
+    paginas = sorted(set(paginas))
+    inicio = anterior = None
+    for pagina in paginas + [None]:
+        if anterior is not None and pagina == anterior + 1:
+            anterior = pagina
+            continue
+        if inicio is not None:
+            partes.append(str(inicio) if inicio == anterior else f"{inicio}-{anterior}")
+        inicio = anterior = pagina
+    return ','.join(partes)
+
+
+def localizar_paginas(caminho_pdf: str, termos: Sequence[str], todos: bool = True,
+                      pasta_cache: Optional[str] = None) -> str:
+    """
+    Pré-varredura: páginas de um PDF que mencionam um indicador
+    
+    Args:
+        caminho_pdf: Caminho do PDF
+        termos: Termos procurados (sem diferença de acentos e caixa)
+        todos: Se True, a página precisa conter todos os termos
+        pasta_cache: Pasta do cache de textos (padrão: a pasta do PDF)
+    
+    Returns:
+        Especificação de páginas para o tabula ('' se nenhuma página tiver os termos)
+    """
+    documento = abrir_pdf(caminho_pdf, pasta_cache=pasta_cache)
+    return especificacao_paginas(documento.localizar(termos, todos))
@@ -0,0 +1,256 @@
+"""
+Módulo de Perfilamento
+Executa os principais métodos de extração, gráficos e relatório sob o cProfile,
+salvando arquivos pstats e pilhas colapsadas (formato aceito por flamegraph.pl,
+speedscope e inferno) e mostrando os pontos mais lentos de cada etapa
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import time
+from typing import Dict, List, Optional, Tuple
+
+from extracao_dados import ExtratorDadosPDF
+from gerar_graficos import GeradorGraficos
+from gerar_relatorio import GeradorRelatorioCompleto
+
+
+# Métodos perfilados de cada classe. Os orquestradores (processar_pdf,
+# gerar_todos_graficos...) ficam de fora para que cada método abaixo tenha
+# seu próprio perfil, em vez de aparecer apenas dentro do perfil do chamador.
+METODOS_PERFILADOS = {
+    ExtratorDadosPDF: ['extrair_tabelas_do_pdf', 'limpar_e_filtrar_dados',
+                       'transformar_para_formato_longo', 'salvar_dados'],
+    GeradorGraficos: ['grafico_serie_temporal_por_estado', 'grafico_comparativo_estados',
+                      'grafico_heatmap_estados_anos', 'grafico_tendencia_geral',
+                      'grafico_crescimento_composto', 'grafico_variacao_anual',
+                      'grafico_media_movel_estado'],
+    GeradorRelatorioCompleto: ['gerar_relatorio'],
+}
+
+TOP_PADRAO = 15
+
+# Limites das pilhas reconstruídas a partir do grafo de chamadas: profundidade e
+# fração mínima do tempo total para seguir um ramo (sem isso, enumerar os caminhos
+# do grafo de chamadas do matplotlib levaria minutos)
+PROFUNDIDADE_MAXIMA_PILHA = 64
+FRACAO_MINIMA_RAMO = 1e-4
+
+# Função no formato do pstats: (arquivo, linha, nome)
+Funcao = Tuple[str, int, str]
+
+
+def nome_funcao(funcao: Funcao) -> str:
+    """Rótulo curto de uma função do pstats (arquivo:nome:linha)"""
+    arquivo, linha, nome = funcao
+    if arquivo == '~':
+        rotulo = nome.strip('<>')
+    else:
+        rotulo = f"{os.path.basename(arquivo)}:{nome}:{linha}"
+    # ';' separa os quadros e ' ' separa o valor no formato colapsado
+    return rotulo.replace(';', ',').replace(' ', '_')
+
+
+def pilhas_colapsadas(estatisticas: pstats.Stats) -> Dict[str, int]:
+    """
+    Reconstrói pilhas colapsadas a partir do grafo de chamadas do cProfile
+    
+    O cProfile registra apenas pares chamador → chamado; o tempo de cada
+    chamado é distribuído entre os chamadores na proporção do tempo acumulado
+    de cada aresta (aproximação usual dos conversores de cProfile). O tempo
+    dado aos filhos nunca excede o do pai, mesmo com recursão.
+    
+    Args:
+        estatisticas: Estatísticas do pstats
+    
+    Returns:
+        Dicionário {"raiz;...;função": microssegundos de tempo próprio}
+    """
+    dados = estatisticas.stats
+    filhos: Dict[Funcao, List[Tuple[Funcao, float]]] = {}
+    for funcao, (_, _, _, _, chamadores) in dados.items():
+        for chamador, (_, _, _, tempo_acumulado) in chamadores.items():
+            if funcao != chamador:
+                filhos.setdefault(chamador, []).append((funcao, tempo_acumulado))
+    for lista in filhos.values():
+        lista.sort(key=lambda item: item[1], reverse=True)
+    
+    raizes = [funcao for funcao, valores in dados.items() if not valores[4]]
+    minimo = FRACAO_MINIMA_RAMO * sum(dados[raiz][3] for raiz in raizes)
+    pilhas: Dict[str, int] = {}
+    
+    def visitar(funcao: Funcao, tempo: float, pilha: Tuple[str, ...], visitadas: frozenset):
+        _, _, tempo_proprio, tempo_acumulado, _ = dados[funcao]
+        pilha = pilha + (nome_funcao(funcao),)
+        escala = min(1.0, tempo / tempo_acumulado) if tempo_acumulado > 0 else 0.0
+        
+        # O tempo do nó é dividido entre o tempo próprio e o dos filhos
+        restante = tempo - tempo_proprio * escala
+        if len(pilha) < PROFUNDIDADE_MAXIMA_PILHA:
+            for filho, tempo_aresta in filhos.get(funcao, []):
+                tempo_filho = min(tempo_aresta * escala, restante)
+                if tempo_filho < minimo:
+                    continue
+                if filho not in visitadas and filho in dados:
+                    visitar(filho, tempo_filho, pilha, visitadas | {filho})
+                    restante -= tempo_filho
+        
+        # O tempo não atribuído a filhos (ramos podados) fica como tempo próprio
+        valor = int((tempo_proprio * escala + restante) * 1e6)
+        if valor > 0:
+            chave = ';'.join(pilha)
+            pilhas[chave] = pilhas.get(chave, 0) + valor
+    
+    for raiz in raizes:
+        visitar(raiz, dados[raiz][3], (), frozenset([raiz]))
+    return pilhas
+
+
+class Perfilador:
+    """Classe para perfilar os métodos de METODOS_PERFILADOS durante uma etapa"""
+    
+    def __init__(self, pasta_saida: str = 'perfil',
+                 etapa: str = 'execucao',
+                 top_n: int = TOP_PADRAO):
+        """
+        Inicializa o perfilador
+        
+        Args:
+            pasta_saida: Pasta dos arquivos .pstats e .folded
+            etapa: Nome da etapa (prefixo dos arquivos)
+            top_n: Número de funções mostradas por método
+        """
+        self.pasta_saida = pasta_saida
+        self.etapa = etapa
+        self.top_n = top_n
+        self.estatisticas: Dict[str, pstats.Stats] = {}
+        self.chamadas: Dict[str, int] = {}
+        self.duracoes: Dict[str, float] = {}
+        self._originais = []
+        self._em_execucao = False
+        
+        os.makedirs(pasta_saida, exist_ok=True)
+    
+    def _envolver(self, nome: str, metodo):
+        """Cria a versão perfilada de um método"""
+        @functools.wraps(metodo)
+        def perfilado(*args, **kwargs):
+            # Chamadas aninhadas já aparecem no perfil do método externo
+            if self._em_execucao:
+                return metodo(*args, **kwargs)
+            
+            perfil = cProfile.Profile()
+            self._em_execucao = True
+            inicio = time.perf_counter()
+            perfil.enable()
+            try:
+                return metodo(*args, **kwargs)
+            finally:
+                perfil.disable()
+                self._em_execucao = False
+                self._registrar(nome, perfil, time.perf_counter() - inicio)
+        return perfilado
+    
+    def _registrar(self, nome: str, perfil: cProfile.Profile, duracao: float):
+        """Acumula o perfil de uma chamada nas estatísticas do método"""
+        perfil.create_stats()
+        if nome in self.estatisticas:
+            self.estatisticas[nome].add(perfil)
+        else:
+            self.estatisticas[nome] = pstats.Stats(perfil)
+        self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+        self.duracoes[nome] = self.duracoes.get(nome, 0.0) + duracao
+    
+    def ativar(self) -> 'Perfilador':
+        """Substitui os métodos de METODOS_PERFILADOS pelas versões perfiladas"""
+        for classe, metodos in METODOS_PERFILADOS.items():
+            for metodo in metodos:
+                original = classe.__dict__[metodo]
+                self._originais.append((classe, metodo, original))
+                setattr(classe, metodo, self._envolver(f"{classe.__name__}.{metodo}", original))
+        return self
+    
+    def desativar(self):
+        """Restaura os métodos originais"""
+        for classe, metodo, original in reversed(self._originais):
+            setattr(classe, metodo, original)
+        self._originais = []
+    
+    def __enter__(self) -> 'Perfilador':
+        return self.ativar()
+    
+    def __exit__(self, *excecao):
+        self.desativar()
+        self.salvar()
+        return False
+    
+    def salvar(self) -> List[str]:
+        """
+        Salva, para cada método, o arquivo .pstats e as pilhas colapsadas (.folded)
+        
+        Returns:
+            Caminhos dos arquivos salvos
+        """
+        caminhos = []
+        for nome, estatisticas in self.estatisticas.items():
+            base = os.path.join(self.pasta_saida, f"{self.etapa}.{nome}")
+            estatisticas.dump_stats(base + '.pstats')
+            
+            with open(base + '.folded', 'w', encoding='utf-8') as arquivo:
+                for pilha, valor in sorted(pilhas_colapsadas(estatisticas).items()):
+                    arquivo.write(f"{pilha} {valor}\n")
+            caminhos += [base + '.pstats', base + '.folded']
+        return caminhos
+    
+    def pontos_criticos(self, nome: str) -> List[Tuple[str, int, float, float]]:
+        """
+        Funções com maior tempo próprio em um método perfilado
+        
+        Args:
+            nome: Nome do método ('Classe.metodo')
+        
+        Returns:
+            Lista de (função, chamadas, tempo próprio, tempo acumulado)
+        """
+        dados = self.estatisticas[nome].stats
+        ordenadas = sorted(dados.items(), key=lambda item: item[1][2], reverse=True)
+        return [(nome_funcao(funcao), valores[1], valores[2], valores[3])
+                for funcao, valores in ordenadas[:self.top_n]]
+    
+    def imprimir_resumo(self):
+        """Mostra o tempo de cada método e seus pontos mais lentos"""
+        if not self.estatisticas:
+            return
+        
+        print(f"\n⏱️  Perfil da etapa '{self.etapa}':")
+        for nome in sorted(self.duracoes, key=self.duracoes.get, reverse=True):
+            duracao = self.duracoes[nome]
+            print(f"   {nome}: {self.chamadas[nome]} chamada(s), {duracao:.3f}s")
+            for funcao, chamadas, proprio, acumulado in self.pontos_criticos(nome):
+                percentual = 100 * proprio / duracao if duracao else 0.0
+                print(f"      {percentual:5.1f}%  {proprio:8.3f}s  {acumulado:8.3f}s  "
+                      f"{chamadas:>7}  {funcao}")
+
+
+def perfilar_etapa(funcao, argumentos: list, parametros: Dict,
+                   pasta_saida: str, etapa: str, top_n: Optional[int] = None):
+    """
+    Executa uma etapa do pipeline com os métodos principais perfilados
+    
+    Args:
+        funcao: Função da etapa
+        argumentos: Resultados das dependências
+        parametros: Parâmetros nomeados
+        pasta_saida: Pasta dos arquivos de perfil
+        etapa: Nome da etapa
+        top_n: Funções mostradas por método
+    
+    Returns:
+        Resultado da etapa
+    """
+    with Perfilador(pasta_saida, etapa, top_n or TOP_PADRAO) as perfilador:
+        resultado = funcao(*argumentos, **parametros)
+    perfilador.imprimir_resumo()
+    return resultado
@@ -0,0 +1,363 @@
+"""
+Módulo de Pipeline com Cache
+Executa etapas (extração, gráficos, relatório) como um grafo de dependências,
+reaproveitando resultados em cache quando entradas e código não mudaram
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from memoria_compartilhada import compartilhar_tabela, receber_tabela
+
+
+class Etapa:
+    """Etapa do pipeline: uma função, suas dependências e suas entradas"""
+    
+    def __init__(self, nome: str,
+                 funcao: Callable,
+                 dependencias: Sequence[str] = (),
+                 arquivos: Sequence[str] = (),
+                 parametros: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa a etapa
+        
+        Args:
+            nome: Nome único da etapa
+            funcao: Função de nível de módulo chamada como
+                    funcao(*resultados_das_dependencias, **parametros)
+            dependencias: Nomes das etapas cujos resultados são entradas
+            arquivos: Arquivos de entrada (o conteúdo entra no hash)
+            parametros: Parâmetros nomeados (entram no hash)
+        """
+        self.nome = nome
+        self.funcao = funcao
+        self.dependencias = list(dependencias)
+        self.arquivos = list(arquivos)
+        self.parametros = parametros or {}
+
+
+def _hash_bytes(dados: bytes) -> str:
+    """Retorna o hash SHA-256 de um bloco de bytes"""
+    return hashlib.sha256(dados).hexdigest()
+
+
+def hash_valor(valor: Any) -> str:
+    """
+    Calcula um hash estável do conteúdo de um resultado
+    
+    Args:
+        valor: Resultado de uma etapa (DataFrame, lista, dicionário, ...)
+    
+    Returns:
+        Hash hexadecimal
+    """
+    if isinstance(valor, pd.DataFrame):
+        linhas = pd.util.hash_pandas_object(valor, index=True).to_numpy()
+        cabecalho = repr((list(valor.columns), [str(t) for t in valor.dtypes])).encode()
+        return _hash_bytes(cabecalho + linhas.tobytes())
+    return _hash_bytes(pickle.dumps(valor, protocol=4))
+
+
+def _caminhos_do_resultado(resultado: Any) -> List[str]:
+    """Caminhos de arquivo contidos no resultado (str ou lista/tupla de str)"""
+    if isinstance(resultado, str):
+        return [resultado] if resultado else []
+    if isinstance(resultado, (list, tuple)) and all(isinstance(v, str) for v in resultado):
+        return [v for v in resultado if v]
+    return []
+
+
+def _resultado_vazio(resultado: Any) -> bool:
+    """
+    Se o resultado indica etapa que falhou ou não produziu nada ('' de um
+    relatório não gerado, DataFrame vazio após erro de leitura): não vai ao cache
+    """
+    if resultado is None:
+        return True
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return resultado.empty
+    if isinstance(resultado, (str, list, tuple, dict)):
+        return not resultado
+    return False
+
+
+def _executar_etapa(funcao: Callable, argumentos: list, parametros: Dict[str, Any],
+                    nome: str = '', pasta_perfil: Optional[str] = None,
+                    top_perfil: Optional[int] = None) -> Any:
+    """Executa uma etapa (nível de módulo para poder rodar em outro processo)"""
+    if pasta_perfil:
+        from perfilamento import perfilar_etapa
+        return perfilar_etapa(funcao, argumentos, parametros, pasta_perfil, nome, top_perfil)
+    return funcao(*argumentos, **parametros)
+
+
+def _executar_etapa_em_processo(*argumentos) -> Any:
+    """Executa uma etapa noutro processo; tabelas grandes voltam pela memória compartilhada"""
+    return compartilhar_tabela(_executar_etapa(*argumentos))
+
+
+class Pipeline:
+    """Classe para executar etapas com cache por hash de conteúdo"""
+    
+    def __init__(self, pasta_cache: str = '.cache_pipeline',
+                 max_processos: Optional[int] = None,
+                 pastas_codigo: Optional[List[str]] = None,
+                 pasta_perfil: Optional[str] = None,
+                 top_perfil: Optional[int] = None):
+        """
+        Inicializa o pipeline
+        
+        Args:
+            pasta_cache: Pasta onde os resultados das etapas são guardados
+            max_processos: Etapas independentes executadas em paralelo (None = CPUs)
+            pastas_codigo: Pastas cujos .py compõem a versão do código
+                           (padrão: a pasta src deste módulo)
+            pasta_perfil: Se informada, perfila cada etapa (ver perfilamento.py) e
+                          salva os perfis nesta pasta; o cache não é lido
+            top_perfil: Funções mais lentas mostradas por método perfilado
+        """
+        self.pasta_cache = pasta_cache
+        self.pasta_perfil = pasta_perfil
+        self.top_perfil = top_perfil
+        self.max_processos = max_processos or os.cpu_count() or 1
+        self.pastas_codigo = pastas_codigo or [os.path.dirname(os.path.abspath(__file__))]
+        self.etapas: Dict[str, Etapa] = {}
+        self.resultados: Dict[str, Any] = {}
+        self.etapas_executadas: List[str] = []
+        self.etapas_em_cache: List[str] = []
+        
+        os.makedirs(pasta_cache, exist_ok=True)
+        self._caminho_hashes = os.path.join(pasta_cache, 'hashes_arquivos.json')
+        self._hashes_arquivos = self._carregar_json(self._caminho_hashes)
+        self._versao_base = self._calcular_versao_base()
+    
+    def etapa(self, nome: str,
+              funcao: Callable,
+              dependencias: Sequence[str] = (),
+              arquivos: Sequence[str] = (),
+              **parametros) -> 'Pipeline':
+        """
+        Registra uma etapa no pipeline
+        
+        Args:
+            nome: Nome único da etapa
+            funcao: Função da etapa (deve ser de nível de módulo)
+            dependencias: Etapas das quais esta depende
+            arquivos: Arquivos de entrada
+            **parametros: Parâmetros nomeados da função
+        
+        Returns:
+            O próprio pipeline (permite encadear chamadas)
+        """
+        self.etapas[nome] = Etapa(nome, funcao, dependencias, arquivos, parametros)
+        return self
+    
+    @staticmethod
+    def _carregar_json(caminho: str) -> Dict:
+        """Carrega um JSON, retornando dicionário vazio se não existir"""
+        try:
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+    
+    def _calcular_versao_base(self) -> str:
+        """Hash do conteúdo de todos os .py das pastas de código"""
+        hasher = hashlib.sha256()
+        for pasta in self.pastas_codigo:
+            for nome in sorted(os.listdir(pasta)):
+                if nome.endswith('.py'):
+                    with open(os.path.join(pasta, nome), 'rb') as arquivo:
+                        hasher.update(nome.encode() + arquivo.read())
+        return hasher.hexdigest()
+    
+    def hash_arquivo(self, caminho: str) -> str:
+        """
+        Hash do conteúdo de um arquivo, reaproveitado enquanto tamanho e data não mudam
+        
+        Args:
+            caminho: Caminho do arquivo
+        
+        Returns:
+            Hash hexadecimal ('ausente' se o arquivo não existir)
+        """
+        try:
+            estado = os.stat(caminho)
+        except OSError:
+            return 'ausente'
+        
+        assinatura = f"{estado.st_size}:{estado.st_mtime_ns}"
+        chave = os.path.abspath(caminho)
+        memorizado = self._hashes_arquivos.get(chave)
+        if memorizado and memorizado['assinatura'] == assinatura:
+            return memorizado['hash']
+        
+        hasher = hashlib.sha256()
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+                hasher.update(bloco)
+        
+        self._hashes_arquivos[chave] = {'assinatura': assinatura, 'hash': hasher.hexdigest()}
+        return hasher.hexdigest()
+    
+    def _chave_etapa(self, etapa: Etapa, hashes_dependencias: List[str]) -> str:
+        """Chave de cache: código + parâmetros + arquivos + resultados das dependências"""
+        try:
+            codigo = inspect.getsource(etapa.funcao)
+        except (OSError, TypeError):
+            codigo = etapa.funcao.__qualname__
+        
+        partes = {
+            'versao': self._versao_base,
+            'codigo': codigo,
+            'parametros': repr(sorted(etapa.parametros.items())),
+            'arquivos': [self.hash_arquivo(caminho) for caminho in etapa.arquivos],
+            'dependencias': hashes_dependencias,
+        }
+        return _hash_bytes(json.dumps(partes, sort_keys=True).encode())
+    
+    def _caminho_cache(self, nome: str) -> str:
+        """Arquivo de cache de uma etapa"""
+        nome_seguro = ''.join(c if c.isalnum() or c in '-_' else '_' for c in nome)
+        return os.path.join(self.pasta_cache, f'{nome_seguro}.pkl')
+    
+    def _ler_cache(self, nome: str, chave: str) -> Optional[Dict]:
+        """Retorna a entrada de cache se a chave bate e os arquivos gerados estão intactos"""
+        try:
+            with open(self._caminho_cache(nome), 'rb') as arquivo:
+                entrada = pickle.load(arquivo)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        
+        if entrada.get('chave') != chave or _resultado_vazio(entrada.get('resultado')):
+            return None
+        
+        for caminho, hash_salvo in entrada.get('arquivos_gerados', {}).items():
+            if self.hash_arquivo(caminho) != hash_salvo:
+                return None
+        
+        return entrada
+    
+    def _gravar_cache(self, nome: str, chave: str, resultado: Any) -> Dict:
+        """
+        Grava o resultado de uma etapa e retorna a entrada de cache
+        
+        Resultados vazios não são gravados (e apagam o cache anterior da etapa):
+        a etapa roda de novo na próxima execução.
+        """
+        entrada = {
+            'chave': chave,
+            'resultado': resultado,
+            'hash_resultado': hash_valor(resultado),
+            'arquivos_gerados': {caminho: self.hash_arquivo(caminho)
+                                 for caminho in _caminhos_do_resultado(resultado)},
+        }
+        if _resultado_vazio(resultado):
+            if os.path.exists(self._caminho_cache(nome)):
+                os.remove(self._caminho_cache(nome))
+            return entrada
+        with open(self._caminho_cache(nome), 'wb') as arquivo:
+            pickle.dump(entrada, arquivo, protocol=4)
+        return entrada
+    
+    def _etapas_necessarias(self, alvos: Optional[List[str]]) -> List[str]:
+        """Etapas necessárias para os alvos, em ordem topológica"""
+        ordem, visitadas = [], set()
+        
+        def visitar(nome: str, caminho: tuple):
+            if nome in caminho:
+                raise ValueError(f"Dependência circular: {' -> '.join(caminho + (nome,))}")
+            if nome in visitadas:
+                return
+            if nome not in self.etapas:
+                raise KeyError(f"Etapa não registrada: {nome}")
+            for dependencia in self.etapas[nome].dependencias:
+                visitar(dependencia, caminho + (nome,))
+            visitadas.add(nome)
+            ordem.append(nome)
+        
+        for alvo in (alvos or list(self.etapas)):
+            visitar(alvo, ())
+        return ordem
+    
+    def executar(self, alvos: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Executa as etapas necessárias para os alvos, reaproveitando o cache
+        
+        Etapas cujas dependências já estão prontas são executadas em paralelo.
+        
+        Args:
+            alvos: Etapas desejadas (None = todas)
+        
+        Returns:
+            Dicionário {nome da etapa: resultado}
+        """
+        pendentes = self._etapas_necessarias(alvos)
+        hashes: Dict[str, str] = {}
+        self.etapas_executadas, self.etapas_em_cache = [], []
+        
+        executor = (ProcessPoolExecutor(max_workers=self.max_processos)
+                    if self.max_processos > 1 else None)
+        em_execucao = {}
+        
+        try:
+            while pendentes or em_execucao:
+                # Inicia toda etapa cujas dependências já terminaram
+                for nome in [n for n in pendentes
+                             if all(d in hashes for d in self.etapas[n].dependencias)]:
+                    pendentes.remove(nome)
+                    etapa = self.etapas[nome]
+                    chave = self._chave_etapa(etapa, [hashes[d] for d in etapa.dependencias])
+                    
+                    entrada = None if self.pasta_perfil else self._ler_cache(nome, chave)
+                    if entrada is not None:
+                        print(f"♻️  Etapa em cache: {nome}")
+                        self.resultados[nome] = entrada['resultado']
+                        hashes[nome] = entrada['hash_resultado']
+                        self.etapas_em_cache.append(nome)
+                        continue
+                    
+                    print(f"▶️  Executando etapa: {nome}")
+                    argumentos = [self.resultados[d] for d in etapa.dependencias]
+                    perfil = (nome, self.pasta_perfil, self.top_perfil)
+                    if executor is None:
+                        resultado = _executar_etapa(etapa.funcao, argumentos,
+                                                    etapa.parametros, *perfil)
+                        entrada = self._gravar_cache(nome, chave, resultado)
+                        self.resultados[nome] = resultado
+                        hashes[nome] = entrada['hash_resultado']
+                        self.etapas_executadas.append(nome)
+                    else:
+                        futuro = executor.submit(_executar_etapa_em_processo, etapa.funcao,
+                                                 argumentos, etapa.parametros, *perfil)
+                        em_execucao[futuro] = (nome, chave)
+                
+                if not em_execucao:
+                    continue
+                
+                # Aguarda ao menos uma etapa terminar
+                concluidos, _ = wait(list(em_execucao), return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    nome, chave = em_execucao.pop(futuro)
+                    resultado = receber_tabela(futuro.result())
+                    entrada = self._gravar_cache(nome, chave, resultado)
+                    self.resultados[nome] = resultado
+                    hashes[nome] = entrada['hash_resultado']
+                    self.etapas_executadas.append(nome)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            with open(self._caminho_hashes, 'w', encoding='utf-8') as arquivo:
+                json.dump(self._hashes_arquivos, arquivo)
+        
+        print(f"✅ Pipeline: {len(self.etapas_executadas)} etapa(s) executada(s), "
+              f"{len(self.etapas_em_cache)} em cache")
+        
+        return self.resultados
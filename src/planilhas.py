@@ -0,0 +1,364 @@
+"""
+Módulo de Leitura de Planilhas
+Lê as planilhas XLSX (openpyxl em modo somente leitura, linha a linha) e os
+CSVs (em lotes) publicados pelo FBSP e pelo IPEA, mapeia as colunas para o
+formato longo do projeto (Estado, [Município], Ano, Índice de Violência,
+Valor) e filtra os estados-alvo durante a leitura, com memória constante
+mesmo para arquivos de centenas de MB
+"""
+
+import os
+import re
+import unicodedata
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from localidades import UFS, indice_ufs
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # Sem openpyxl, apenas CSVs podem ser lidos
+    load_workbook = None
+
+
+# Linhas lidas por lote (CSV) ou acumuladas antes de cada conversão (XLSX)
+TAMANHO_LOTE = 50_000
+
+# Linhas do início de cada aba examinadas à procura do cabeçalho
+LINHAS_CABECALHO = 30
+
+# Nomes aceitos para cada coluna (comparados sem acentos e em minúsculas)
+COLUNAS_PLANILHA = {
+    'Estado': ['estado', 'uf', 'unidade da federacao', 'nome da uf', 'nome_uf',
+               'sigla_uf', 'sigla da uf'],
+    'Município': ['municipio', 'nome do municipio', 'nome_municipio'],
+    'Ano': ['ano', 'periodo', 'ano de referencia'],
+    'Índice de Violência': ['indice de violencia', 'indicador', 'indice', 'natureza',
+                            'tipo de violencia', 'serie'],
+    'Valor': ['valor', 'quantidade', 'ocorrencias', 'numero de ocorrencias', 'total',
+              'vitimas', 'numero de vitimas'],
+}
+# Séries do IPEA (Atlas da Violência): cod;nome;período;valor
+COLUNA_CODIGO = ['cod', 'codigo', 'cod_ibge', 'codigo ibge']
+COLUNA_NOME = ['nome']
+
+COLUNAS_SAIDA = ['Estado', 'Município', 'Ano', 'Índice de Violência', 'Valor']
+VALORES_AUSENTES = ['...', '..', '-', '–', 'X', 'x', 'NA', 'n/d', '']
+
+_ANO = re.compile(r'^(19|20)\d{2}$')
+_MILHAR = re.compile(r'^-?\d{1,3}(\.\d{3})+$')
+_ANO_EM_TEXTO = re.compile(r'(19|20)\d{2}')
+
+
+def _normalizar(texto) -> str:
+    """Texto em minúsculas, sem acentos e sem espaços nas pontas"""
+    sem_acentos = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode()
+    return ' '.join(sem_acentos.lower().split())
+
+
+def _numero(texto) -> float:
+    """Número de um texto no padrão brasileiro ('1.234,5') ou internacional ('1234.5')"""
+    texto = str(texto).strip().replace(' ', '').replace('\u00a0', '')
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    elif _MILHAR.match(texto):
+        texto = texto.replace('.', '')
+    try:
+        return float(texto)
+    except ValueError:
+        return float('nan')
+
+
+def converter_numeros(serie: pd.Series) -> pd.Series:
+    """
+    Converte números escritos como texto no padrão brasileiro ou internacional
+    
+    '1.234' e '1.234,5' (milhar com ponto) viram 1234 e 1234.5; '1234.5' é
+    mantido. Valores já numéricos passam direto; cada texto distinto é
+    convertido uma única vez.
+    
+    Args:
+        serie: Série com números ou textos
+    
+    Returns:
+        Série float (NaN onde não há número)
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    unicos = pd.unique(serie.dropna())
+    mapa = {valor: (float(valor) if isinstance(valor, (int, float)) else _numero(valor))
+            for valor in unicos}
+    return serie.map(mapa).astype(float)
+
+
+def converter_anos(serie: pd.Series) -> pd.Series:
+    """Ano de cada valor (2019, '2019', 2019.0 ou '2019*'); NaN sem ano reconhecível"""
+    unicos = pd.unique(serie.dropna())
+    mapa = {}
+    for valor in unicos:
+        encontrado = _ANO_EM_TEXTO.search(str(valor))
+        mapa[valor] = float(encontrado.group(0)) if encontrado else float('nan')
+    return serie.map(mapa).astype(float)
+
+
+def nomes_de_estado(serie: pd.Series) -> pd.Series:
+    """
+    Nome oficial da UF a partir do nome (com ou sem acento, com notas de rodapé
+    ou erros de OCR) ou da sigla
+    
+    Args:
+        serie: Série com nomes ou siglas
+    
+    Returns:
+        Série com os nomes oficiais (o texto original quando não reconhecido)
+    """
+    nomes = indice_ufs().estados(serie, codigos=False)
+    return nomes.fillna(serie.astype(str).str.strip().where(serie.notna()))
+
+
+def estados_dos_codigos(serie: pd.Series) -> pd.Series:
+    """Nome da UF a partir do código IBGE da UF (2 dígitos) ou do município (7 dígitos)"""
+    codigos = pd.to_numeric(serie, errors='coerce')
+    uf = codigos.where(codigos < 100, codigos // 100_000)
+    return uf.map({codigo: nome for codigo, (_, nome) in UFS.items()})
+
+
+class LeitorPlanilhas:
+    """Classe para ler planilhas XLSX/CSV do FBSP e do IPEA no formato longo"""
+    
+    def __init__(self, estados_alvo: Optional[List[str]] = None,
+                 tamanho_lote: int = TAMANHO_LOTE):
+        """
+        Inicializa o leitor
+        
+        Args:
+            estados_alvo: Estados mantidos (padrão: Amazonas, Roraima, Acre;
+                          lista vazia = todos)
+            tamanho_lote: Linhas por lote de leitura
+        """
+        self.estados_alvo = (['Amazonas', 'Roraima', 'Acre'] if estados_alvo is None
+                             else list(estados_alvo))
+        self.tamanho_lote = tamanho_lote
+        self._alvos = set(nomes_de_estado(pd.Series(self.estados_alvo, dtype=object)))
+    
+    def _mapear_colunas(self, colunas: Sequence) -> Dict[str, object]:
+        """Coluna de origem de cada coluna do formato longo (e do código IBGE)"""
+        nomes = {}
+        for coluna in colunas:
+            nomes.setdefault(_normalizar(coluna), coluna)
+        mapa = {}
+        for destino, aceitos in COLUNAS_PLANILHA.items():
+            encontrada = next((nomes[nome] for nome in aceitos if nome in nomes), None)
+            if encontrada is not None:
+                mapa[destino] = encontrada
+        codigo = next((nomes[nome] for nome in COLUNA_CODIGO if nome in nomes), None)
+        nome = next((nomes[nome] for nome in COLUNA_NOME if nome in nomes), None)
+        if codigo is not None:
+            mapa['codigo'] = codigo
+            if 'Estado' not in mapa and 'Município' not in mapa and nome is not None:
+                mapa['nome'] = nome
+        return mapa
+    
+    def _cabecalho_valido(self, colunas: Sequence) -> bool:
+        """True se a linha tem uma coluna de estado/código e valores ou anos"""
+        mapa = self._mapear_colunas(colunas)
+        anos = [coluna for coluna in colunas if _ANO.match(str(coluna).strip())]
+        tem_chave = 'Estado' in mapa or 'codigo' in mapa
+        return tem_chave and ('Valor' in mapa or bool(anos) or len(colunas) > 2)
+    
+    def arrumar_lote(self, lote: pd.DataFrame,
+                     indice: Optional[str] = None) -> pd.DataFrame:
+        """
+        Converte um lote de linhas para o formato longo, já filtrado
+        
+        Aceita tabelas longas (com coluna de valor), largas por ano (colunas
+        2017, 2018...) e largas por índice (uma coluna por tipo de violência).
+        
+        Args:
+            lote: Linhas da planilha com os nomes de coluna originais
+            indice: Índice de Violência quando a planilha não tem essa coluna
+                    (ex.: nome da aba ou da série do IPEA)
+        
+        Returns:
+            DataFrame com COLUNAS_SAIDA (Município só se existir na origem)
+        """
+        mapa = self._mapear_colunas(lote.columns)
+        dados = pd.DataFrame(index=lote.index)
+        
+        # Estado: coluna própria, código IBGE ou, nas séries do IPEA, o nome
+        if 'Estado' in mapa:
+            dados['Estado'] = nomes_de_estado(lote[mapa['Estado']])
+        elif 'codigo' in mapa:
+            dados['Estado'] = estados_dos_codigos(lote[mapa['codigo']])
+        else:
+            return pd.DataFrame(columns=COLUNAS_SAIDA)
+        if 'Município' in mapa:
+            dados['Município'] = lote[mapa['Município']]
+        elif 'nome' in mapa:
+            codigos = pd.to_numeric(lote[mapa['codigo']], errors='coerce')
+            if (codigos >= 1_000_000).any():
+                dados['Município'] = lote[mapa['nome']].where(codigos >= 1_000_000)
+        
+        # Filtro dos estados-alvo antes de qualquer outra conversão
+        if self._alvos:
+            manter = dados['Estado'].isin(self._alvos).to_numpy()
+            lote, dados = lote[manter], dados[manter]
+        if lote.empty:
+            return pd.DataFrame(columns=COLUNAS_SAIDA)
+        
+        usadas = set(mapa.values())
+        if 'Valor' in mapa:
+            # Tabela longa
+            if 'Ano' in mapa:
+                dados['Ano'] = lote[mapa['Ano']]
+            if 'Índice de Violência' in mapa:
+                dados['Índice de Violência'] = lote[mapa['Índice de Violência']]
+            else:
+                dados['Índice de Violência'] = indice
+            dados['Valor'] = lote[mapa['Valor']]
+            longo = dados
+        else:
+            colunas_anos = [c for c in lote.columns
+                            if c not in usadas and _ANO.match(str(c).strip())]
+            if colunas_anos:
+                # Larga por ano: uma coluna por ano
+                dados['Índice de Violência'] = (lote[mapa['Índice de Violência']]
+                                                if 'Índice de Violência' in mapa else indice)
+                largo = pd.concat([dados, lote[colunas_anos]], axis=1)
+                longo = largo.melt(id_vars=list(dados.columns), value_vars=colunas_anos,
+                                   var_name='Ano', value_name='Valor')
+            else:
+                # Larga por índice: uma coluna por tipo de violência
+                colunas_valor = [c for c in lote.columns
+                                 if c not in usadas and c is not None
+                                 and not str(c).startswith('Unnamed')]
+                if 'Ano' in mapa:
+                    dados['Ano'] = lote[mapa['Ano']]
+                largo = pd.concat([dados, lote[colunas_valor]], axis=1)
+                longo = largo.melt(id_vars=list(dados.columns), value_vars=colunas_valor,
+                                   var_name='Índice de Violência', value_name='Valor')
+        
+        if 'Ano' not in longo:
+            return pd.DataFrame(columns=COLUNAS_SAIDA)
+        longo['Ano'] = converter_anos(longo['Ano'])
+        longo['Valor'] = converter_numeros(longo['Valor'])
+        longo = longo.dropna(subset=['Estado', 'Ano', 'Índice de Violência', 'Valor'])
+        longo['Ano'] = longo['Ano'].astype(int)
+        longo['Índice de Violência'] = longo['Índice de Violência'].astype(str).str.strip()
+        return longo[[c for c in COLUNAS_SAIDA if c in longo]].reset_index(drop=True)
+    
+    def _lotes_csv(self, caminho: str, separador: Optional[str],
+                   encoding: Optional[str]) -> Iterator[pd.DataFrame]:
+        """Lotes de um CSV lidos com pandas (chunksize)"""
+        codificacoes = [encoding] if encoding else ['utf-8-sig', 'latin-1']
+        for codificacao in codificacoes:
+            try:
+                with open(caminho, encoding=codificacao) as arquivo:
+                    primeira_linha = arquivo.readline()
+                    arquivo.read(1 << 20)
+                break
+            except UnicodeDecodeError:
+                continue
+        if separador is None:
+            separador = ';' if primeira_linha.count(';') > primeira_linha.count(',') else ','
+        
+        yield from pd.read_csv(caminho, sep=separador, encoding=codificacao, dtype=str,
+                               keep_default_na=False, na_values=VALORES_AUSENTES,
+                               skipinitialspace=True, chunksize=self.tamanho_lote)
+    
+    def _lotes_xlsx(self, caminho: str,
+                    abas: Optional[Sequence[str]]) -> Iterator[tuple]:
+        """Lotes (aba, DataFrame) de uma planilha XLSX lida em modo somente leitura"""
+        if load_workbook is None:
+            raise ImportError("openpyxl é necessário para ler planilhas XLSX "
+                              "(pip install openpyxl)")
+        livro = load_workbook(caminho, read_only=True, data_only=True)
+        try:
+            for nome_aba in (abas or livro.sheetnames):
+                linhas = livro[nome_aba].iter_rows(values_only=True)
+                
+                # Cabeçalho: primeira linha reconhecível entre as iniciais (títulos antes dela)
+                cabecalho = None
+                for _, linha in zip(range(LINHAS_CABECALHO), linhas):
+                    colunas = [c if c is None else str(c).strip() for c in linha]
+                    if self._cabecalho_valido([c for c in colunas if c]):
+                        cabecalho = [c if c else f'Unnamed: {i}' for i, c in enumerate(colunas)]
+                        break
+                if cabecalho is None:
+                    print(f"   ⚠️  Aba '{nome_aba}': cabeçalho não reconhecido")
+                    continue
+                
+                lote = []
+                for linha in linhas:
+                    if any(valor is not None for valor in linha):
+                        lote.append(linha[:len(cabecalho)])
+                    if len(lote) >= self.tamanho_lote:
+                        yield nome_aba, pd.DataFrame(lote, columns=cabecalho)
+                        lote = []
+                if lote:
+                    yield nome_aba, pd.DataFrame(lote, columns=cabecalho)
+        finally:
+            livro.close()
+    
+    def ler(self, caminho: str,
+            indice: Optional[str] = None,
+            abas: Optional[Sequence[str]] = None,
+            separador: Optional[str] = None,
+            encoding: Optional[str] = None) -> pd.DataFrame:
+        """
+        Lê uma planilha XLSX ou CSV para o formato longo do projeto
+        
+        Só as linhas dos estados-alvo são guardadas: a memória usada depende
+        do lote e do resultado filtrado, não do tamanho do arquivo.
+        
+        Args:
+            caminho: Caminho do .xlsx/.xlsm ou .csv
+            indice: Índice de Violência de planilhas sem essa coluna (padrão:
+                    nome da aba no XLSX, nome do arquivo no CSV)
+            abas: Abas do XLSX a ler (padrão: todas)
+            separador: Separador do CSV (padrão: detectado)
+            encoding: Codificação do CSV (padrão: UTF-8, com Latin-1 como alternativa)
+        
+        Returns:
+            DataFrame com Estado, [Município], Ano, Índice de Violência e Valor
+        """
+        extensao = os.path.splitext(caminho)[1].lower()
+        partes = []
+        linhas_lidas = 0
+        if extensao in ('.xlsx', '.xlsm'):
+            for nome_aba, lote in self._lotes_xlsx(caminho, abas):
+                linhas_lidas += len(lote)
+                partes.append(self.arrumar_lote(lote, indice or nome_aba))
+        else:
+            nome = indice or os.path.splitext(os.path.basename(caminho))[0]
+            for lote in self._lotes_csv(caminho, separador, encoding):
+                linhas_lidas += len(lote)
+                partes.append(self.arrumar_lote(lote, nome))
+        
+        partes = [parte for parte in partes if not parte.empty]
+        if not partes:
+            print(f"⚠️  {os.path.basename(caminho)}: nenhum registro dos estados-alvo")
+            return pd.DataFrame(columns=[c for c in COLUNAS_SAIDA if c != 'Município'])
+        df = pd.concat(partes, ignore_index=True)
+        print(f"📗 {os.path.basename(caminho)}: {linhas_lidas:,} linhas lidas, "
+              f"{len(df):,} registros dos estados-alvo")
+        return df
+
+
+def ler_planilhas(caminhos: Sequence[str],
+                  estados_alvo: Optional[List[str]] = None,
+                  **opcoes) -> pd.DataFrame:
+    """
+    Função de conveniência para ler e concatenar várias planilhas
+    
+    Args:
+        caminhos: Arquivos XLSX/CSV
+        estados_alvo: Estados mantidos
+        **opcoes: indice, abas, separador, encoding (ver LeitorPlanilhas.ler)
+    
+    Returns:
+        DataFrame consolidado no formato longo
+    """
+    leitor = LeitorPlanilhas(estados_alvo)
+    dfs = [df for df in (leitor.ler(caminho, **opcoes) for caminho in caminhos) if not df.empty]
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
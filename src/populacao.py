@@ -0,0 +1,281 @@
+"""
+Módulo de População de Referência
+Carrega a população feminina por UF/município e ano (CSV no formato do IBGE),
+interpola os anos entre censos e estimativas e calcula taxas por 100 mil
+mulheres, com junção indexada (sem produto cartesiano município × ano)
+"""
+
+import unicodedata
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence
+
+
+# Nomes aceitos para cada coluna do CSV (comparados sem acentos e em minúsculas)
+COLUNAS_POPULACAO = {
+    'Estado': ['estado', 'uf', 'unidade da federacao', 'nome da uf'],
+    'Município': ['municipio', 'nome do municipio'],
+    'Ano': ['ano'],
+    'População': ['populacao feminina', 'populacao_feminina', 'mulheres',
+                  'populacao', 'valor'],
+}
+COLUNA_SEXO = 'sexo'
+VALORES_SEXO_FEMININO = ('mulheres', 'feminino', 'f')
+
+POR_100_MIL = 100_000
+SUFIXO_TAXA = ' (por 100 mil mulheres)'
+
+# Fator de combinação (unidade, ano) em uma única chave ordenável
+_ESCALA_CHAVE = 10_000
+
+
+def _normalizar(texto: str) -> str:
+    """Texto em minúsculas e sem acentos"""
+    sem_acentos = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode()
+    return sem_acentos.strip().lower()
+
+
+def carregar_populacao(caminho_csv: str,
+                       separador: Optional[str] = None,
+                       encoding: Optional[str] = None) -> pd.DataFrame:
+    """
+    Lê um CSV de população no formato do IBGE (SIDRA ou estimativas)
+    
+    Aceita separador ',' ou ';', arquivos em UTF-8 ou Latin-1, uma coluna
+    'Sexo' (mantém as mulheres) e valores ausentes como '...', '-' ou 'X'.
+    
+    Args:
+        caminho_csv: Caminho do CSV
+        separador: Separador (padrão: detectado na primeira linha)
+        encoding: Codificação (padrão: UTF-8, com Latin-1 como alternativa)
+    
+    Returns:
+        DataFrame com Estado, [Município], Ano e População
+    """
+    codificacoes = [encoding] if encoding else ['utf-8-sig', 'latin-1']
+    for codificacao in codificacoes:
+        try:
+            with open(caminho_csv, encoding=codificacao) as arquivo:
+                primeira_linha = arquivo.readline()
+            break
+        except UnicodeDecodeError:
+            continue
+    if separador is None:
+        separador = ';' if primeira_linha.count(';') > primeira_linha.count(',') else ','
+    
+    df = pd.read_csv(caminho_csv, sep=separador, encoding=codificacao, dtype=str,
+                     na_values=['...', '-', '..', 'X'], skipinitialspace=True)
+    nomes = {_normalizar(coluna): coluna for coluna in df.columns}
+    
+    if COLUNA_SEXO in nomes:
+        sexo = df[nomes[COLUNA_SEXO]].map(_normalizar)
+        df = df[sexo.isin(VALORES_SEXO_FEMININO)]
+    
+    colunas = {}
+    for destino, aceitos in COLUNAS_POPULACAO.items():
+        encontrada = next((nomes[nome] for nome in aceitos if nome in nomes), None)
+        if encontrada is not None:
+            colunas[destino] = encontrada
+    faltando = {'Estado', 'Ano', 'População'} - set(colunas)
+    if faltando:
+        raise ValueError(f"Colunas ausentes no CSV de população: {', '.join(sorted(faltando))}")
+    
+    populacao = pd.DataFrame({destino: df[origem] for destino, origem in colunas.items()})
+    populacao['Ano'] = pd.to_numeric(populacao['Ano'], errors='coerce')
+    populacao['População'] = pd.to_numeric(
+        populacao['População'].str.replace('.', '', regex=False)
+        if separador == ';' else populacao['População'],
+        errors='coerce'
+    )
+    populacao = populacao.dropna(subset=['Estado', 'Ano', 'População'])
+    populacao['Ano'] = populacao['Ano'].astype(int)
+    return populacao.reset_index(drop=True)
+
+
+class ReferenciaPopulacional:
+    """Classe com a população por unidade e ano, ordenada e indexada para consultas"""
+    
+    def __init__(self, df_populacao: pd.DataFrame, metodo: str = 'geometrica'):
+        """
+        Monta a referência a partir de Estado, [Município], Ano e População
+        
+        As linhas ficam ordenadas por (unidade, ano) em arrays NumPy, com o
+        início de cada unidade; as consultas usam um índice de hash das
+        unidades e busca binária nos anos.
+        
+        Args:
+            df_populacao: Resultado de carregar_populacao (ou equivalente)
+            metodo: 'geometrica' (crescimento composto, como nas projeções do
+                    IBGE) ou 'linear' entre dois anos conhecidos
+        """
+        if metodo not in ('geometrica', 'linear'):
+            raise ValueError(f"Método de interpolação desconhecido: {metodo}")
+        self.metodo = metodo
+        
+        municipal = ('Município' in df_populacao.columns
+                     and df_populacao['Município'].notna().any())
+        self.chaves = ['Estado', 'Município'] if municipal else ['Estado']
+        if municipal:
+            df_populacao = df_populacao.dropna(subset=['Município'])
+        
+        agregada = (df_populacao.groupby(self.chaves + ['Ano'], sort=True, observed=True)
+                    ['População'].sum().reset_index())
+        self._tabela = agregada
+        
+        if municipal:
+            self.unidades = pd.MultiIndex.from_frame(agregada[self.chaves]).unique()
+        else:
+            self.unidades = pd.Index(agregada['Estado'].unique(), name='Estado')
+        codigos = self._codigos(agregada[self.chaves])
+        
+        self.anos = agregada['Ano'].to_numpy(dtype=np.int64)
+        self.populacao = agregada['População'].to_numpy(dtype=float)
+        self._chave = codigos * _ESCALA_CHAVE + self.anos
+        self.inicio = np.searchsorted(codigos, np.arange(len(self.unidades) + 1))
+        self._estadual: Optional['ReferenciaPopulacional'] = None
+    
+    @classmethod
+    def de_csv(cls, caminho_csv: str, metodo: str = 'geometrica',
+               **opcoes_leitura) -> 'ReferenciaPopulacional':
+        """Carrega a referência de um CSV no formato do IBGE"""
+        return cls(carregar_populacao(caminho_csv, **opcoes_leitura), metodo)
+    
+    @property
+    def municipal(self) -> bool:
+        """True se a referência é por município"""
+        return len(self.chaves) == 2
+    
+    def _codigos(self, chaves: pd.DataFrame) -> np.ndarray:
+        """Posição de cada linha de chaves nas unidades (-1 se ausente)"""
+        if self.municipal:
+            return self.unidades.get_indexer(pd.MultiIndex.from_frame(chaves[self.chaves]))
+        return self.unidades.get_indexer(chaves['Estado'])
+    
+    def estadual(self) -> 'ReferenciaPopulacional':
+        """Referência por UF (soma dos municípios em cada ano informado)"""
+        if not self.municipal:
+            return self
+        if self._estadual is None:
+            self._estadual = ReferenciaPopulacional(self._tabela.drop(columns='Município'),
+                                                    self.metodo)
+        return self._estadual
+    
+    def consultar(self, chaves: pd.DataFrame, anos: Sequence[int]) -> np.ndarray:
+        """
+        População de cada (unidade, ano) consultado
+        
+        Anos conhecidos são usados diretamente; entre dois anos conhecidos, a
+        população é interpolada; fora do intervalo, o crescimento dos dois anos
+        mais próximos é estendido. Unidades com um único ano mantêm esse valor.
+        
+        Args:
+            chaves: DataFrame com as colunas de `self.chaves` (uma linha por consulta)
+            anos: Ano de cada consulta
+        
+        Returns:
+            Array de populações (NaN para unidades ausentes da referência)
+        """
+        codigos = self._codigos(chaves)
+        anos = np.asarray(anos, dtype=np.int64)
+        resultado = np.full(len(codigos), np.nan)
+        encontrados = codigos >= 0
+        codigos, anos_busca = codigos[encontrados], anos[encontrados]
+        
+        # Par de anos conhecidos usado na interpolação (ou extrapolação)
+        primeiro, fim = self.inicio[codigos], self.inicio[codigos + 1]
+        posicao = np.searchsorted(self._chave, codigos * _ESCALA_CHAVE + anos_busca)
+        direita = np.clip(posicao, primeiro + 1, fim - 1)
+        direita = np.maximum(direita, primeiro)
+        esquerda = np.maximum(direita - 1, primeiro)
+        
+        ano_esq, ano_dir = self.anos[esquerda], self.anos[direita]
+        pop_esq, pop_dir = self.populacao[esquerda], self.populacao[direita]
+        intervalo = np.maximum(ano_dir - ano_esq, 1)
+        fracao = np.where(ano_dir > ano_esq, (anos_busca - ano_esq) / intervalo, 0.0)
+        
+        if self.metodo == 'geometrica':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                razao = np.where((pop_esq > 0) & (pop_dir > 0), pop_dir / pop_esq, np.nan)
+                valores = pop_esq * razao ** fracao
+            linear = pop_esq + (pop_dir - pop_esq) * fracao
+            valores = np.where(np.isfinite(valores), valores, linear)
+        else:
+            valores = pop_esq + (pop_dir - pop_esq) * fracao
+        
+        resultado[encontrados] = np.maximum(valores, 0)
+        return resultado
+
+
+def calcular_taxas(df_dados: pd.DataFrame,
+                   referencia: ReferenciaPopulacional,
+                   nivel: str = 'Estado',
+                   por: int = POR_100_MIL) -> pd.DataFrame:
+    """
+    Soma as ocorrências no nível pedido e calcula a taxa por `por` mulheres
+    
+    Cada (unidade, ano) é consultado uma única vez na referência, e o
+    resultado é levado às linhas por códigos inteiros (junção indexada).
+    
+    Args:
+        df_dados: Dados em formato longo (Ano, Estado, [Município], Índice, Valor)
+        referencia: População de referência
+        nivel: 'Estado' ou 'Município' (exige referência e dados municipais)
+        por: Base da taxa (padrão: 100 mil)
+    
+    Returns:
+        DataFrame com as chaves, Índice de Violência, Valor, População e Taxa
+    """
+    if nivel == 'Município':
+        if not referencia.municipal or 'Município' not in df_dados.columns:
+            raise ValueError("Taxas por município exigem dados e população por município")
+        chaves = ['Estado', 'Município']
+    elif nivel == 'Estado':
+        chaves = ['Estado']
+        referencia = referencia.estadual()
+    else:
+        raise ValueError(f"Nível desconhecido: {nivel}")
+    
+    ocorrencias = (df_dados.groupby(chaves + ['Ano', 'Índice de Violência'],
+                                    sort=True, observed=True)['Valor'].sum().reset_index())
+    
+    # Uma consulta por (unidade, ano) distinto
+    unidades_anos = ocorrencias[chaves + ['Ano']]
+    codigos = unidades_anos.groupby(chaves + ['Ano'], sort=False, observed=True).ngroup()
+    codigos = codigos.to_numpy()
+    distintos = unidades_anos.drop_duplicates()
+    populacao = referencia.consultar(distintos[chaves], distintos['Ano'].to_numpy())
+    
+    ocorrencias['População'] = populacao[codigos]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taxa = ocorrencias['Valor'].to_numpy(dtype=float) / ocorrencias['População'].to_numpy()
+    ocorrencias['Taxa'] = np.where(ocorrencias['População'] > 0, taxa * por, np.nan)
+    return ocorrencias
+
+
+def adicionar_indices_de_taxa(df_dados: pd.DataFrame,
+                              referencia: ReferenciaPopulacional,
+                              nivel: str = 'Estado',
+                              por: int = POR_100_MIL,
+                              sufixo: str = SUFIXO_TAXA) -> pd.DataFrame:
+    """
+    Acrescenta as taxas como novos índices (ex.: 'Feminicídio (por 100 mil mulheres)')
+    
+    As linhas novas têm a taxa em 'Valor' e podem ser plotadas por
+    GeradorGraficos como qualquer outro índice.
+    
+    Args:
+        df_dados: Dados em formato longo
+        referencia: População de referência
+        nivel: 'Estado' ou 'Município'
+        por: Base da taxa
+        sufixo: Texto acrescentado ao nome do índice
+    
+    Returns:
+        DataFrame com as linhas originais seguidas das linhas de taxa
+    """
+    taxas = calcular_taxas(df_dados, referencia, nivel, por).dropna(subset=['Taxa'])
+    taxas['Índice de Violência'] = taxas['Índice de Violência'].astype(str) + sufixo
+    taxas['Valor'] = taxas['Taxa'].round(2)
+    colunas = [coluna for coluna in df_dados.columns if coluna in taxas.columns]
+    return pd.concat([df_dados, taxas[colunas]], ignore_index=True)
+
@@ -0,0 +1,149 @@
+"""
+Módulo de Proveniência das Linhas Extraídas
+Cada linha extraída de um PDF carrega, em colunas inteiras (e não em texto),
+de onde veio: hash do PDF, página, tabela na página, linha na tabela e método
+do tabula. Com isso um valor suspeito em dados_consolidados.csv aponta para a
+página exata, que pode ser extraída de novo sozinha
+(ver ExtratorDadosPDF.reextrair_pagina)
+"""
+
+import glob
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+
+# Colunas de proveniência e seus tipos (inteiros compactos)
+COLUNAS_ORIGEM = {
+    'Origem PDF': 'int64',      # primeiros 60 bits do SHA-256 do arquivo
+    'Origem Página': 'int32',   # 1-based; 0 = desconhecida
+    'Origem Tabela': 'int16',   # posição da tabela na página (0-based)
+    'Origem Linha': 'int32',    # linha na tabela, sem o cabeçalho (0-based)
+    'Origem Método': 'int8',    # ver CODIGOS_METODO
+}
+
+# Métodos de extração do tabula
+CODIGOS_METODO = {'stream': 1, 'lattice': 2}
+METODOS_POR_CODIGO = {codigo: metodo for metodo, codigo in CODIGOS_METODO.items()}
+
+# Hashes já calculados: caminho -> (tamanho, data de modificação, código)
+_codigos_memorizados: Dict[str, tuple] = {}
+
+
+def codigo_pdf(caminho_pdf: str) -> int:
+    """
+    Código inteiro de um PDF: os primeiros 60 bits do SHA-256 do conteúdo
+    
+    O hash é reaproveitado enquanto tamanho e data do arquivo não mudam.
+    
+    Args:
+        caminho_pdf: Caminho do PDF
+    
+    Returns:
+        Código (inteiro positivo que cabe em int64)
+    """
+    estado = os.stat(caminho_pdf)
+    chave = os.path.abspath(caminho_pdf)
+    memorizado = _codigos_memorizados.get(chave)
+    if memorizado and memorizado[:2] == (estado.st_size, estado.st_mtime_ns):
+        return memorizado[2]
+    
+    hasher = hashlib.sha256()
+    with open(caminho_pdf, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+            hasher.update(bloco)
+    codigo = int(hasher.hexdigest()[:15], 16)
+    _codigos_memorizados[chave] = (estado.st_size, estado.st_mtime_ns, codigo)
+    return codigo
+
+
+def adicionar_origem(df: pd.DataFrame,
+                     codigo: int,
+                     pagina: int,
+                     tabela: int,
+                     metodo: str) -> pd.DataFrame:
+    """
+    Acrescenta as colunas de proveniência às linhas de uma tabela
+    
+    A linha de origem é o rótulo do índice de `df`, que deve ser a posição da
+    linha na tabela extraída (filtros que preservam o índice a mantêm).
+    
+    Args:
+        df: Linhas limpas de uma tabela
+        codigo: Código do PDF (codigo_pdf)
+        pagina: Página da tabela (0 se desconhecida)
+        tabela: Posição da tabela na página
+        metodo: Método do tabula ('stream' ou 'lattice')
+    
+    Returns:
+        Cópia de `df` com as colunas de COLUNAS_ORIGEM
+    """
+    df = df.copy()
+    valores = {'Origem PDF': codigo, 'Origem Página': pagina, 'Origem Tabela': tabela,
+               'Origem Linha': df.index.to_numpy(), 'Origem Método': CODIGOS_METODO[metodo]}
+    for coluna, tipo in COLUNAS_ORIGEM.items():
+        df[coluna] = np.broadcast_to(valores[coluna], len(df)).astype(tipo)
+    return df
+
+
+def tem_origem(df: pd.DataFrame) -> bool:
+    """Indica se o DataFrame tem as colunas de proveniência"""
+    return all(coluna in df.columns for coluna in COLUNAS_ORIGEM)
+
+
+def mascara_pagina(df: pd.DataFrame, codigo: int, pagina: int) -> pd.Series:
+    """
+    Linhas extraídas de uma página de um PDF
+    
+    Args:
+        df: Dados com colunas de proveniência
+        codigo: Código do PDF
+        pagina: Página
+    
+    Returns:
+        Máscara booleana alinhada a `df`
+    """
+    return (df['Origem PDF'] == codigo) & (df['Origem Página'] == pagina)
+
+
+def localizar_pdf(codigo: int, candidatos: Iterable[str]) -> Optional[str]:
+    """
+    Procura, entre os arquivos candidatos, o PDF de um código
+    
+    Args:
+        codigo: Código do PDF (coluna 'Origem PDF')
+        candidatos: Caminhos de PDFs ou padrões glob (ex.: 'dados/*.pdf')
+    
+    Returns:
+        Caminho do PDF, ou None se nenhum candidato tiver esse conteúdo
+    """
+    for candidato in candidatos:
+        for caminho in sorted(glob.glob(candidato)) or [candidato]:
+            if os.path.isfile(caminho) and codigo_pdf(caminho) == int(codigo):
+                return caminho
+    return None
+
+
+def descrever_origem(df: pd.DataFrame,
+                     candidatos: Iterable[str] = (os.path.join('dados', '*.pdf'),)) -> pd.DataFrame:
+    """
+    Traduz as colunas de proveniência em texto legível
+    
+    Args:
+        df: Linhas com colunas de proveniência (ex.: as de um valor suspeito)
+        candidatos: PDFs ou padrões glob onde procurar os arquivos de origem
+    
+    Returns:
+        DataFrame com PDF (caminho, se encontrado), Página, Tabela, Linha e Método
+    """
+    candidatos = list(candidatos)
+    caminhos = {codigo: localizar_pdf(codigo, candidatos) for codigo in df['Origem PDF'].unique()}
+    return pd.DataFrame({
+        'PDF': df['Origem PDF'].map(lambda codigo: caminhos[codigo] or f"{int(codigo):015x}"),
+        'Página': df['Origem Página'],
+        'Tabela': df['Origem Tabela'] + 1,
+        'Linha': df['Origem Linha'] + 1,
+        'Método': df['Origem Método'].map(METODOS_POR_CODIGO),
+    }, index=df.index)
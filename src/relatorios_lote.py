@@ -0,0 +1,337 @@
+"""
+Módulo de Geração de Relatórios em Lote
+Gera vários relatórios (por estado, por índice e da região) em uma única execução,
+renderizando e preparando cada gráfico apenas uma vez e compartilhando-o entre os
+relatórios, junto com a diagramação das seções fixas
+"""
+
+import pandas as pd
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from gerar_graficos import GeradorGraficos
+from gerar_relatorio import (DPI_IMAGEM_FINAL, DPI_IMAGEM_RASCUNHO, LARGURA_IMAGEM_FINAL,
+                             LARGURA_MINIATURA_RASCUNHO, GeradorRelatorioCompleto,
+                             decodificar_imagem_pdf, diagramar_textos, preparar_imagem,
+                             registrar_diagramacao)
+
+
+# Chave de um gráfico: (tipo, parâmetro) - ex.: ('serie_temporal', 'Amazonas')
+ChaveGrafico = Tuple[str, Optional[str]]
+
+# Gráfico renderizado: (chave, caminho, imagem preparada para o relatório ou None)
+GraficoRenderizado = Tuple[ChaveGrafico, str, Optional[bytes]]
+
+# Estado global dos processos de renderização (definido pelo initializer)
+_GERADOR_PROCESSO: Optional[GeradorGraficos] = None
+
+# Estado global dos processos de relatórios: {caminho: imagem preparada} e
+# imagens já decodificadas pelo fpdf (definido pelo initializer)
+_IMAGENS_PROCESSO: Dict[str, bytes] = {}
+_DECODIFICADAS_PROCESSO: Dict[str, dict] = {}
+
+
+def _inicializar_processo_graficos(df_dados: pd.DataFrame,
+                                   pasta_saida: str,
+                                   modo_rascunho: bool):
+    """Cria um GeradorGraficos por processo, recebendo o DataFrame uma única vez"""
+    global _GERADOR_PROCESSO
+    import matplotlib
+    matplotlib.use('Agg')
+    _GERADOR_PROCESSO = GeradorGraficos(df_dados, pasta_saida, modo_rascunho=modo_rascunho)
+
+
+def _renderizar_grafico(chave: ChaveGrafico) -> GraficoRenderizado:
+    """
+    Renderiza um gráfico no processo atual e já o prepara (preparar_imagem)
+    para a largura e o DPI com que os relatórios o incorporam
+    """
+    tipo, parametro = chave
+    gerador = _GERADOR_PROCESSO
+    
+    if tipo == 'serie_temporal':
+        caminho = gerador.grafico_serie_temporal_por_estado(parametro)
+    elif tipo == 'comparativo':
+        caminho = gerador.grafico_comparativo_estados(parametro, tipo='linha')
+    elif tipo == 'heatmap':
+        caminho = gerador.grafico_heatmap_estados_anos(parametro)
+    elif tipo == 'tendencia':
+        caminho = gerador.grafico_tendencia_geral()
+    else:
+        print(f"⚠️  Tipo de gráfico desconhecido: {tipo}")
+        caminho = ""
+    
+    imagem = None
+    if caminho.lower().endswith('.png') and os.path.exists(caminho):
+        rascunho = gerador.modo_rascunho
+        imagem = preparar_imagem(
+            caminho,
+            LARGURA_MINIATURA_RASCUNHO if rascunho else LARGURA_IMAGEM_FINAL,
+            DPI_IMAGEM_RASCUNHO if rascunho else DPI_IMAGEM_FINAL
+        ).getvalue()
+    return chave, caminho, imagem
+
+
+def _inicializar_processo_relatorios(imagens: Dict[str, bytes],
+                                     decodificadas: Dict[str, dict],
+                                     diagramacao: Dict[tuple, list]):
+    """
+    Recebe, uma única vez por processo, os gráficos preparados, as imagens
+    decodificadas e as quebras de linha das seções fixas
+    """
+    _IMAGENS_PROCESSO.update(imagens)
+    _DECODIFICADAS_PROCESSO.update(decodificadas)
+    registrar_diagramacao(diagramacao)
+
+
+def _gerar_relatorio_processo(especificacao: Dict,
+                              caminhos_graficos: List[str],
+                              modo_rascunho: bool) -> Tuple[str, bool]:
+    """Gera um relatório a partir da especificação e dos gráficos já renderizados"""
+    gerador = GeradorRelatorioCompleto(
+        titulo=especificacao.get('titulo', "Análise de Violência contra Mulheres"),
+        subtitulo=especificacao.get('subtitulo', "Região Norte - Amazonas, Roraima e Acre"),
+        periodo=especificacao.get('periodo', "2015-2025"),
+        modo_rascunho=modo_rascunho
+    )
+    for caminho in caminhos_graficos:
+        if caminho in _IMAGENS_PROCESSO:
+            gerador.registrar_imagem_preparada(caminho, io.BytesIO(_IMAGENS_PROCESSO[caminho]))
+    gerador.registrar_imagens_decodificadas(_DECODIFICADAS_PROCESSO)
+    
+    sucesso = gerador.gerar_relatorio(
+        caminhos_graficos=caminhos_graficos,
+        arquivo_saida=especificacao['arquivo_saida'],
+        autor=especificacao.get('autor', ""),
+        instituicao=especificacao.get('instituicao', ""),
+        introducao=especificacao.get('introducao', ""),
+        conclusao=especificacao.get('conclusao', ""),
+        metadados_graficos=especificacao.get('metadados_graficos')
+    )
+    return especificacao['arquivo_saida'], sucesso
+
+
+class GeradorRelatoriosLote:
+    """Classe para gerar vários relatórios compartilhando gráficos e processos"""
+    
+    def __init__(self, df_dados: pd.DataFrame,
+                 pasta_graficos: str = 'graficos',
+                 modo_rascunho: bool = False,
+                 max_processos: Optional[int] = None):
+        """
+        Inicializa o gerador em lote
+        
+        Args:
+            df_dados: DataFrame com os dados consolidados (formato longo)
+            pasta_graficos: Pasta onde os gráficos compartilhados serão salvos
+            modo_rascunho: Se True, gráficos e relatórios em modo rascunho
+            max_processos: Número máximo de processos (None = número de CPUs)
+        """
+        self.df = df_dados
+        self.pasta_graficos = pasta_graficos
+        self.modo_rascunho = modo_rascunho
+        self.max_processos = max_processos or os.cpu_count() or 1
+        self.graficos_renderizados: Dict[ChaveGrafico, str] = {}
+        # Gráficos preparados para o relatório ({caminho: imagem}) e decodificados
+        self.imagens_preparadas: Dict[str, bytes] = {}
+        self.imagens_decodificadas: Dict[str, dict] = {}
+        
+        os.makedirs(pasta_graficos, exist_ok=True)
+    
+    def graficos_da_especificacao(self, especificacao: Dict) -> List[ChaveGrafico]:
+        """
+        Lista os gráficos usados por um relatório
+        
+        A especificação pode listar os gráficos explicitamente em 'graficos'
+        ou restringir 'estados' e 'indices'; sem restrição, usa todos os
+        gráficos da região (incluindo a tendência geral).
+        
+        Args:
+            especificacao: Dicionário da especificação do relatório
+        
+        Returns:
+            Lista ordenada de chaves de gráficos
+        """
+        if especificacao.get('graficos'):
+            return [tuple(chave) if len(chave) == 2 else (chave[0], None)
+                    for chave in especificacao['graficos']]
+        
+        estados = especificacao.get('estados') or list(self.df['Estado'].unique())
+        indices = (especificacao.get('indices')
+                   or list(self.df['Índice de Violência'].unique()))
+        
+        chaves = [('serie_temporal', estado) for estado in estados]
+        chaves += [('comparativo', indice) for indice in indices]
+        chaves += [('heatmap', indice) for indice in indices]
+        
+        regional = not especificacao.get('estados') and not especificacao.get('indices')
+        if especificacao.get('incluir_tendencia', regional):
+            chaves.append(('tendencia', None))
+        
+        return chaves
+    
+    def renderizar_graficos(self, chaves: List[ChaveGrafico]) -> Dict[ChaveGrafico, str]:
+        """
+        Renderiza, em paralelo, cada gráfico ainda não renderizado exatamente uma vez
+        
+        Os processos de renderização também preparam cada imagem para o
+        relatório; aqui ela é decodificada no formato do fpdf, também uma vez.
+        
+        Args:
+            chaves: Chaves dos gráficos necessários (podem se repetir)
+        
+        Returns:
+            Dicionário {chave: caminho do arquivo}
+        """
+        pendentes = list(dict.fromkeys(
+            chave for chave in chaves if chave not in self.graficos_renderizados
+        ))
+        
+        if not pendentes:
+            return self.graficos_renderizados
+        
+        print(f"🎨 Renderizando {len(pendentes)} gráfico(s) únicos "
+              f"em até {self.max_processos} processo(s)...")
+        
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_processos, len(pendentes)),
+            initializer=_inicializar_processo_graficos,
+            initargs=(self.df, self.pasta_graficos, self.modo_rascunho)
+        ) as executor:
+            for chave, caminho, imagem in executor.map(_renderizar_grafico, pendentes):
+                self.graficos_renderizados[chave] = caminho
+                if imagem is not None:
+                    self.imagens_preparadas[caminho] = imagem
+                    decodificada = decodificar_imagem_pdf(imagem)
+                    if decodificada is not None:
+                        self.imagens_decodificadas[decodificada[0]] = decodificada[1]
+        
+        return self.graficos_renderizados
+    
+    def gerar_relatorios(self, especificacoes: List[Dict]) -> Dict[str, bool]:
+        """
+        Gera todos os relatórios das especificações
+        
+        Cada especificação é um dicionário com 'arquivo_saida' (obrigatório) e,
+        opcionalmente, 'titulo', 'subtitulo', 'periodo', 'autor', 'instituicao',
+        'introducao', 'conclusao', 'metadados_graficos', 'estados', 'indices',
+        'incluir_tendencia' e 'graficos'.
+        
+        Args:
+            especificacoes: Lista de especificações de relatórios
+        
+        Returns:
+            Dicionário {arquivo_saida: sucesso}
+        """
+        print("\n" + "="*70)
+        print(f"📚 GERANDO {len(especificacoes)} RELATÓRIO(S) EM LOTE")
+        print("="*70 + "\n")
+        
+        # 1. Gráficos: união de todas as especificações, cada um renderizado uma vez
+        graficos_por_relatorio = [self.graficos_da_especificacao(espec)
+                                  for espec in especificacoes]
+        self.renderizar_graficos([chave for chaves in graficos_por_relatorio
+                                  for chave in chaves])
+        
+        # 2. Seções fixas e textos comuns diagramados uma vez
+        diagramacao = diagramar_textos(dict.fromkeys(
+            espec.get(campo) for espec in especificacoes
+            for campo in ('introducao', 'conclusao') if espec.get(campo)
+        ))
+        
+        # 3. Relatórios em paralelo; cada processo recebe uma vez os gráficos
+        #    preparados e a diagramação
+        resultados = {}
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_processos, len(especificacoes)) or 1,
+            initializer=_inicializar_processo_relatorios,
+            initargs=(self.imagens_preparadas, self.imagens_decodificadas, diagramacao)
+        ) as executor:
+            futuros = []
+            for espec, chaves in zip(especificacoes, graficos_por_relatorio):
+                caminhos = [self.graficos_renderizados[chave] for chave in chaves
+                            if self.graficos_renderizados.get(chave)]
+                futuros.append(executor.submit(
+                    _gerar_relatorio_processo, espec, caminhos, self.modo_rascunho
+                ))
+            
+            for futuro in futuros:
+                arquivo, sucesso = futuro.result()
+                resultados[arquivo] = sucesso
+        
+        total_ok = sum(resultados.values())
+        print("\n" + "="*70)
+        print(f"✅ RELATÓRIOS GERADOS: {total_ok}/{len(especificacoes)}")
+        print("="*70 + "\n")
+        
+        return resultados
+
+
+def especificacoes_padrao(df_dados: pd.DataFrame,
+                          pasta_saida: str = '.',
+                          **kwargs) -> List[Dict]:
+    """
+    Monta as especificações padrão: um relatório por estado, um por índice e um da região
+    
+    Args:
+        df_dados: DataFrame com os dados consolidados
+        pasta_saida: Pasta onde os PDFs serão salvos
+        **kwargs: Campos comuns a todas as especificações (autor, instituicao, periodo...)
+    
+    Returns:
+        Lista de especificações
+    """
+    especificacoes = []
+    
+    for estado in df_dados['Estado'].unique():
+        especificacoes.append({
+            **kwargs,
+            'arquivo_saida': os.path.join(
+                pasta_saida, f'Relatorio_{estado.lower().replace(" ", "_")}.pdf'
+            ),
+            'subtitulo': f"Estado: {estado}",
+            'estados': [estado],
+        })
+    
+    for indice in df_dados['Índice de Violência'].unique():
+        especificacoes.append({
+            **kwargs,
+            'arquivo_saida': os.path.join(
+                pasta_saida, f'Relatorio_{indice.lower().replace(" ", "_")}.pdf'
+            ),
+            'subtitulo': f"Índice: {indice}",
+            'indices': [indice],
+        })
+    
+    especificacoes.append({
+        **kwargs,
+        'arquivo_saida': os.path.join(pasta_saida, 'Relatorio_Regiao_Norte.pdf'),
+    })
+    
+    return especificacoes
+
+
+# Função de conveniência
+def gerar_relatorios_em_lote(df_dados: pd.DataFrame,
+                             especificacoes: Optional[List[Dict]] = None,
+                             pasta_graficos: str = 'graficos',
+                             **kwargs) -> Dict[str, bool]:
+    """
+    Função de conveniência para gerar vários relatórios de uma vez
+    
+    Args:
+        df_dados: DataFrame com os dados consolidados
+        especificacoes: Lista de especificações (None = especificações padrão)
+        pasta_graficos: Pasta dos gráficos compartilhados
+        **kwargs: Argumentos do GeradorRelatoriosLote (modo_rascunho, max_processos)
+    
+    Returns:
+        Dicionário {arquivo_saida: sucesso}
+    """
+    if especificacoes is None:
+        especificacoes = especificacoes_padrao(df_dados)
+    
+    gerador = GeradorRelatoriosLote(df_dados, pasta_graficos, **kwargs)
+    return gerador.gerar_relatorios(especificacoes)
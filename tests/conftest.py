@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do projeto ficam em src/ e se importam pelo nome
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
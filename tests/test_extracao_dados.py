@@ -0,0 +1,88 @@
+"""Testes da extração de dados dos PDFs"""
+
+import pandas as pd
+import pytest
+import tabula
+
+from extracao_dados import ExtratorDadosPDF, corrigir_pagina
+
+ESTADOS = ['Acre', 'Amazonas', 'Roraima', 'Pará', 'Bahia']
+
+
+def _celula(texto, esquerda, largura=40):
+    return {'text': texto, 'left': esquerda, 'width': largura, 'top': 0, 'height': 10}
+
+
+def _tabela(fator=1):
+    """Tabela no formato JSON do tabula: UF, Feminicídio, Estupro"""
+    linhas = [[_celula('UF', 0), _celula('Feminicídio', 50), _celula('Estupro', 100)]]
+    for i, estado in enumerate(ESTADOS):
+        linhas.append([_celula(estado, 0), _celula(str((i + 1) * fator), 50),
+                       _celula(str((i + 1) * 10 * fator), 100)])
+    return [{'data': linhas, 'page_number': 1}]
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    caminho = tmp_path / 'anuario_2023.pdf'
+    caminho.write_bytes(b'%PDF-1.4 anuario')
+    tabelas = {'fator': 1}
+    monkeypatch.setattr(tabula, 'read_pdf', lambda *args, **kwargs: _tabela(tabelas['fator']))
+    return str(caminho), tabelas
+
+
+def test_corrigir_pagina_mantem_estados_do_arquivo(tmp_path, pdf):
+    """Corrigir uma página não apaga os estados fora dos estados-alvo padrão"""
+    caminho_pdf, tabelas = pdf
+    arquivo_dados = str(tmp_path / 'dados_consolidados.csv')
+    extrator = ExtratorDadosPDF(estados_alvo=ESTADOS)
+    extrator.salvar_dados(extrator.processar_pdf(caminho_pdf, 2023), arquivo_dados, formato='csv')
+    
+    tabelas['fator'] = 2
+    corrigido = corrigir_pagina(arquivo_dados, caminho_pdf, 1)
+    
+    assert sorted(corrigido['UF']) == sorted(ESTADOS)
+    assert list(corrigido['Feminicídio']) == [2, 4, 6, 8, 10]
+    assert len(pd.read_csv(arquivo_dados, encoding='utf-8-sig')) == len(ESTADOS)
+
+
+def test_banco_recebe_cada_ano_no_formato_longo(tmp_path, pdf):
+    """processar_multiplos_pdfs(banco=...) grava os indicadores de cada estado e ano"""
+    from armazenamento import BancoDados
+    
+    caminho_pdf, _ = pdf
+    extrator = ExtratorDadosPDF(estados_alvo=ESTADOS)
+    with BancoDados(str(tmp_path / 'dados.sqlite')) as banco:
+        df_largo = extrator.processar_multiplos_pdfs({2023: caminho_pdf}, banco=banco)
+        gravados = banco.consultar()
+    
+    assert 'UF' in df_largo.columns
+    assert len(gravados) == len(ESTADOS) * 2
+    acre = gravados[gravados['Estado'] == 'Acre'].set_index('Índice de Violência')['Valor']
+    assert acre.to_dict() == {'Feminicídio': 1, 'Estupro': 10}
+
+
+def test_salvar_dados_sqlite_aceita_tabelas_extraidas(tmp_path, pdf):
+    """O formato 'sqlite' passa as tabelas extraídas ao formato longo antes de gravar"""
+    from armazenamento import BancoDados
+    
+    caminho_pdf, _ = pdf
+    extrator = ExtratorDadosPDF(estados_alvo=ESTADOS)
+    arquivo = str(tmp_path / 'dados.sqlite')
+    assert extrator.salvar_dados(extrator.processar_pdf(caminho_pdf, 2023), arquivo, 'sqlite')
+    with BancoDados(arquivo) as banco:
+        assert len(banco.consultar()) == len(ESTADOS) * 2
+
+
+def test_tabela_json_com_ponto_de_milhar():
+    """Células como '1.234' e '12.345,6' viram 1234 e 12345.6, não 1.234"""
+    from extracao_dados import tabela_json_para_dataframe
+    
+    linhas = [[_celula('UF', 0), _celula('Estupro', 50), _celula('Taxa', 100)],
+              [_celula('Acre', 0), _celula('1.234', 50), _celula('12.345,6', 100)],
+              [_celula('Amazonas', 0), _celula('987', 50), _celula('7,5', 100)]]
+    df = tabela_json_para_dataframe({'data': linhas})
+    
+    assert list(df['Estupro']) == [1234, 987]
+    assert df['Taxa'].tolist() == pytest.approx([12345.6, 7.5])
+    assert list(df['UF']) == ['Acre', 'Amazonas']
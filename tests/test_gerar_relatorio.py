@@ -0,0 +1,99 @@
+"""Testes da geração do relatório PDF"""
+
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+import gerar_relatorio
+from gerar_relatorio import (TEXTO_METODOLOGIA, RelatorioPDF, diagramar_textos,
+                             registrar_diagramacao)
+
+
+def _pdf():
+    pdf = RelatorioPDF()
+    pdf.add_page()
+    pdf.set_font('Arial', '', 11)
+    return pdf
+
+
+def test_texto_justificado_igual_ao_multi_cell():
+    """As linhas diagramadas e reaproveitadas são as mesmas do multi_cell"""
+    texto = "Parágrafo com palavras suficientes para várias linhas. " * 12 + "\n\nFim."
+    pdf = _pdf()
+    esperado = pdf.multi_cell(0, 6, texto, 0, 'J', dry_run=True, output='LINES')
+    assert [linha for linha, _ in pdf._linhas_texto(texto)] == esperado
+    
+    y = pdf.get_y()
+    pdf.texto_justificado(texto, 6)
+    assert pdf.get_y() == y + 6 * len(esperado)
+
+
+def test_diagramacao_entregue_a_outro_processo(monkeypatch):
+    """Com a diagramação registrada, as seções fixas não são quebradas de novo"""
+    diagramacao = diagramar_textos()
+    monkeypatch.setattr(gerar_relatorio, '_DIAGRAMACAO', OrderedDict())
+    registrar_diagramacao(diagramacao)
+    
+    pdf = _pdf()
+    monkeypatch.setattr(pdf, 'multi_cell', lambda *args, **kwargs: 1 / 0)
+    pdf.texto_paragrafo(TEXTO_METODOLOGIA)
+
+
+def test_diagramacao_limitada(monkeypatch):
+    """Só os textos usados mais recentemente ficam guardados"""
+    monkeypatch.setattr(gerar_relatorio, '_DIAGRAMACAO', OrderedDict())
+    monkeypatch.setattr(gerar_relatorio, 'MAX_TEXTOS_DIAGRAMADOS', 3)
+    pdf = _pdf()
+    for i in range(5):
+        pdf._linhas_texto(f"Tendência do ano {i}.")
+    pdf._linhas_texto("Tendência do ano 2.")
+    
+    textos = [chave[0] for chave in gerar_relatorio._DIAGRAMACAO]
+    assert textos == ["Tendência do ano 3.", "Tendência do ano 4.", "Tendência do ano 2."]
+
+
+def _tabela_desenhada(monkeypatch, df):
+    """Desenha a tabela e devolve as chamadas de _desenhar_tabela"""
+    pdf = _pdf()
+    chamadas = []
+    original = pdf._desenhar_tabela
+    
+    def registrar(*args):
+        chamadas.append(args)
+        original(*args)
+    
+    monkeypatch.setattr(pdf, '_desenhar_tabela', registrar)
+    pdf.tabela_dados(df)
+    return pdf, chamadas
+
+
+def test_tabela_larga_mede_colunas_na_fonte_usada(monkeypatch):
+    """Com a fonte reduzida, cada texto cabe na sua coluna e a tabela na página"""
+    df = pd.DataFrame({f'Coluna {i}': [123456.5 * i, 7.25] for i in range(12)})
+    pdf, chamadas = _tabela_desenhada(monkeypatch, df)
+    assert len(chamadas) == 1
+    colunas, textos, _, larguras, cabecalhos, celulas, tamanho, _ = chamadas[0]
+    assert gerar_relatorio.TAMANHO_MINIMO_FONTE_TABELA < tamanho < 8
+    assert larguras.sum() <= pdf.largura_util + 1e-9
+    
+    pdf.set_font('Arial', '', tamanho)
+    for largura, textos_coluna, medidas in zip(larguras, textos, celulas):
+        reais = [pdf.get_string_width(texto) for texto in textos_coluna]
+        assert reais == pytest.approx(list(medidas))
+        assert max(reais) + 2 * gerar_relatorio.MARGEM_CELULA_TABELA <= largura + 1e-9
+
+
+def test_tabela_larga_demais_divide_colunas(monkeypatch):
+    """Na fonte mínima sem caber, as colunas seguem em grupos com a primeira repetida"""
+    df = pd.DataFrame({'Estado': ['Amazonas', 'Acre']})
+    for i in range(40):
+        df[f'Indicador {i}'] = [1234567.25, 2.5]
+    pdf, chamadas = _tabela_desenhada(monkeypatch, df)
+    assert len(chamadas) > 1
+    assert all(chamada[0][0] == 'Estado' for chamada in chamadas)
+    assert sorted(nome for chamada in chamadas for nome in chamada[0][1:]) == \
+        sorted(df.columns[1:])
+    for chamada in chamadas:
+        assert chamada[6] == gerar_relatorio.TAMANHO_MINIMO_FONTE_TABELA
+        assert chamada[3].sum() <= pdf.largura_util + 1e-9
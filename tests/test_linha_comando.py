@@ -0,0 +1,71 @@
+"""Testes da linha de comando"""
+
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+
+import pandas as pd
+import pytest
+
+from dados_sinteticos import gerar_dados_sinteticos
+from linha_comando import SAIDA_SUCESSO, executar_comando
+
+
+@pytest.mark.parametrize('comando', ['extract', 'all'])
+def test_dados_de_entrada_nao_sao_sobrescritos(tmp_path, comando):
+    """--dados apontando para o consolidado da pasta de dados não o substitui filtrado"""
+    pasta_dados = tmp_path / 'dl'
+    pasta_dados.mkdir()
+    arquivo_dados = pasta_dados / 'dados_consolidados.csv'
+    df = gerar_dados_sinteticos('todos', anos=range(2019, 2025), arredondar=True)
+    df.to_csv(arquivo_dados, index=False, encoding='utf-8-sig')
+    original = arquivo_dados.read_bytes()
+    
+    resumo = executar_comando(comando,
+                              estados=['Acre'],
+                              jobs=1,
+                              pasta_dados=str(pasta_dados),
+                              arquivo_dados=str(arquivo_dados),
+                              pasta_graficos=str(tmp_path / 'graficos'),
+                              arquivo_relatorio=str(tmp_path / 'relatorio.pdf'),
+                              pasta_cache=str(tmp_path / 'cache'),
+                              modo_rascunho=True)
+    
+    assert resumo['codigo_saida'] == SAIDA_SUCESSO, resumo['erro']
+    assert resumo['registros'] == int((df['Estado'] == 'Acre').sum())
+    assert resumo['arquivos']['dados'] == []
+    assert arquivo_dados.read_bytes() == original
+    assert set(os.listdir(pasta_dados)) <= {'dados_consolidados.csv', 'anomalias.csv'}
+    assert pd.read_csv(arquivo_dados, encoding='utf-8-sig')['Estado'].nunique() == 27
+
+
+@pytest.mark.parametrize('sobrepor', [False, True])
+def test_all_a_partir_das_tabelas_extraidas(tmp_path, monkeypatch, sobrepor):
+    """As tabelas dos anuários (uma coluna por indicador) chegam ao relatório no formato longo"""
+    import tabula
+    from test_extracao_dados import ESTADOS, _tabela
+    
+    pasta_dados = tmp_path / 'dl'
+    pasta_dados.mkdir()
+    for ano in (2022, 2023):
+        (pasta_dados / f'anuario_{ano}.pdf').write_bytes(b'%PDF-1.4 anuario')
+    monkeypatch.setattr(tabula, 'read_pdf', lambda *args, **kwargs: _tabela())
+    
+    resumo = executar_comando('all',
+                              estados=ESTADOS[:2],
+                              jobs=1,
+                              pasta_dados=str(pasta_dados),
+                              pasta_graficos=str(tmp_path / 'graficos'),
+                              arquivo_relatorio=str(tmp_path / 'relatorio.pdf'),
+                              pasta_cache=str(tmp_path / 'cache'),
+                              sobrepor=sobrepor)
+    
+    assert resumo['codigo_saida'] == SAIDA_SUCESSO, resumo['erro']
+    assert not any('Nenhum dado' in aviso for aviso in resumo['avisos'])
+    assert resumo['arquivos']['graficos']
+    # 2 estados x 2 indicadores x 2 anos
+    assert resumo['registros'] == 8
+    assert os.listdir(tmp_path / 'graficos')
+    df = pd.read_csv(pasta_dados / 'dados_consolidados.csv', encoding='utf-8-sig')
+    assert {'Estado', 'Ano', 'Índice de Violência', 'Valor'} <= set(df.columns)
@@ -0,0 +1,15 @@
+"""Testes do índice de UFs e municípios"""
+
+import localidades
+from localidades import IndiceLocalidades
+
+
+def test_memoria_de_identificacoes_limitada(monkeypatch):
+    """Só as células identificadas mais recentemente ficam guardadas"""
+    monkeypatch.setattr(localidades, 'MAX_MEMORIA_IDENTIFICACOES', 2)
+    indice = IndiceLocalidades()
+    posicoes = [indice.identificar(texto) for texto in ('Acre', 'AM', 'Roraima', 'AM')]
+    
+    assert [indice._registros[p][0] for p in posicoes] == ['Acre', 'Amazonas', 'Roraima',
+                                                            'Amazonas']
+    assert [chave[0] for chave in indice._memoria] == ['Roraima', 'AM']
@@ -0,0 +1,55 @@
+"""Testes do transporte de DataFrames pela memória compartilhada"""
+
+import os
+import types
+
+import pandas as pd
+import pytest
+
+import memoria_compartilhada
+from memoria_compartilhada import TabelaCompartilhada
+
+
+def _misturado():
+    return pd.DataFrame({'Estado': ['Acre', 'Amazonas', 'Roraima'],
+                         'Nota': [1, 'ver rodapé', 2.5],
+                         'Valor': [1.0, 2.0, 3.0]})
+
+
+class _ArrowInvalid(ValueError):
+    pass
+
+
+class _ArrowTypeError(TypeError):
+    pass
+
+
+def _pa_que_recusa(erro):
+    """Substituto do pyarrow cujo from_pandas falha como nas colunas misturadas"""
+    def from_pandas(df, preserve_index=True):
+        raise erro("Could not convert 'ver rodapé' with type str: tried to convert to int64")
+    
+    return types.SimpleNamespace(ArrowInvalid=_ArrowInvalid, ArrowTypeError=_ArrowTypeError,
+                                 Table=types.SimpleNamespace(from_pandas=from_pandas))
+
+
+@pytest.mark.parametrize('erro', [_ArrowInvalid, _ArrowTypeError])
+def test_arrow_recusado_usa_formato_de_colunas(tmp_path, monkeypatch, erro):
+    """Se o Arrow não aceita as colunas, a tabela vai no formato próprio"""
+    monkeypatch.setattr(memoria_compartilhada, 'pa', _pa_que_recusa(erro))
+    df = _misturado()
+    
+    tabela = TabelaCompartilhada.gravar(df, pasta=str(tmp_path))
+    assert tabela.formato == 'colunas'
+    pd.testing.assert_frame_equal(tabela.carregar(), df)
+    assert os.listdir(tmp_path) == []
+
+
+def test_arrow_com_colunas_misturadas(tmp_path):
+    """Com o pyarrow instalado, colunas misturadas também voltam iguais"""
+    pytest.importorskip('pyarrow')
+    df = _misturado()
+    
+    tabela = TabelaCompartilhada.gravar(df, pasta=str(tmp_path))
+    pd.testing.assert_frame_equal(tabela.carregar(), df)
+    assert os.listdir(tmp_path) == []
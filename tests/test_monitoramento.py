@@ -0,0 +1,16 @@
+"""Testes do monitoramento da pasta de dados"""
+
+from monitoramento import monitorar_anuarios
+
+
+def test_anuario_durante_construcao_inicial(tmp_path):
+    """Um anuário copiado durante a primeira construção gera uma reconstrução"""
+    chamadas = []
+    
+    def construcao_inicial():
+        chamadas.append([])
+        (tmp_path / 'anuario_2024.pdf').write_bytes(b'%PDF-1.4 anuario')
+    
+    monitorar_anuarios(str(tmp_path), chamadas.append, intervalo=0.05, espera=0.05,
+                       max_reconstrucoes=1, ao_iniciar=construcao_inicial)
+    assert chamadas == [[], [2024]]
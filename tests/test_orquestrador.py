@@ -0,0 +1,74 @@
+"""Testes da orquestração assíncrona"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import memoria_compartilhada
+import orquestrador
+from cubo_agregado import CuboAgregado
+from orquestrador import DadosGraficos, OrquestradorAssincrono, executar_sobreposto
+
+
+def test_dados_graficos_carregados_uma_vez_por_processo(tmp_path, monkeypatch):
+    """Cada processo monta o gerador de um conjunto uma vez, com o cubo enviado"""
+    df = pd.DataFrame({'Estado': ['Acre', 'Acre', 'Roraima'],
+                       'Índice de Violência': ['Estupro'] * 3,
+                       'Ano': [2022, 2023, 2023],
+                       'Valor': [1.0, 2.0, 3.0]})
+    monkeypatch.setattr(orquestrador, '_GERADORES_PROCESSO', {})
+    monkeypatch.setattr(orquestrador, '_OPCOES_PROCESSO', {'pasta_saida': str(tmp_path)})
+    dados = DadosGraficos(df, CuboAgregado(df))
+    
+    gerador = dados.gerador()
+    assert dados.gerador() is gerador
+    pd.testing.assert_frame_equal(gerador.df, df)
+    assert gerador.cubo.soma.sum() == 6.0
+    
+    dados.remover()
+    assert not os.path.exists(dados.tabela.caminho)
+    assert not os.path.exists(dados.arquivo_cubo)
+
+
+def _fonte_grande(segundos):
+    time.sleep(segundos)
+    return pd.DataFrame({'Estado': ['Acre'] * 10_000, 'Ano': 2023,
+                         'Índice de Violência': 'Estupro', 'Valor': 1.0})
+
+
+def _fonte_com_erro():
+    raise ValueError('anuário corrompido')
+
+
+def test_fonte_com_erro_nao_deixa_tabelas_compartilhadas(tmp_path, monkeypatch):
+    """Se uma fonte falha, as tabelas das outras leituras são apagadas"""
+    monkeypatch.setattr(memoria_compartilhada, 'PASTA_COMPARTILHADA', str(tmp_path))
+    monkeypatch.setattr(orquestrador, 'compartilhar_tabela',
+                        lambda valor: memoria_compartilhada.compartilhar_tabela(
+                            valor, pasta=str(tmp_path)))
+    orquestrador_teste = OrquestradorAssincrono(['Acre'], pasta_graficos=str(tmp_path / 'g'),
+                                                arquivo_saida=str(tmp_path / 'r.pdf'),
+                                                max_processos=2)
+    orquestrador_teste.adicionar_fonte('grande', _fonte_grande, segundos=1.0)
+    orquestrador_teste.adicionar_fonte('erro', _fonte_com_erro)
+    
+    with pytest.raises(ValueError):
+        executar_sobreposto(orquestrador_teste)
+    assert [arquivo for arquivo in os.listdir(tmp_path) if arquivo.startswith('tabela_')] == []
+
+
+def _fonte_sem_estados():
+    return pd.DataFrame({'Região': ['Norte', 'Sul'], 'Estupro': [1, 2]})
+
+
+def test_fonte_sem_estados_falha(tmp_path):
+    """Dados que não podem ser divididos por estado interrompem a execução"""
+    orquestrador_teste = OrquestradorAssincrono(['Acre'], pasta_graficos=str(tmp_path / 'g'),
+                                                arquivo_saida=str(tmp_path / 'r.pdf'),
+                                                max_processos=1)
+    orquestrador_teste.adicionar_fonte('regioes', _fonte_sem_estados)
+    
+    with pytest.raises(ValueError, match='regioes'):
+        executar_sobreposto(orquestrador_teste)
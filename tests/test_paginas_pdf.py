@@ -0,0 +1,75 @@
+"""Testes da pré-varredura e do cache de texto das páginas"""
+
+import os
+
+import pytest
+import tabula
+from fpdf import FPDF
+
+import paginas_pdf
+from extracao_dados import ExtratorDadosPDF
+from paginas_pdf import ARQUIVO_CACHE_PAGINAS, abrir_pdf, fechar_documentos, localizar_paginas
+
+TEXTOS_PAGINAS = ['Sumario do anuario',
+                  'Feminicidio por Unidades da Federacao',
+                  'Estupro por Unidades da Federacao',
+                  'Feminicidio por municipio']
+
+
+@pytest.fixture
+def anuario(tmp_path):
+    pdf = FPDF()
+    pdf.set_font('helvetica', '', 12)
+    for texto in TEXTOS_PAGINAS:
+        pdf.add_page()
+        pdf.cell(0, 10, texto)
+    caminho = tmp_path / 'anuario_2023.pdf'
+    pdf.output(str(caminho))
+    yield str(caminho)
+    fechar_documentos()
+
+
+def test_localizar_paginas_com_cache_na_pasta_do_pdf(anuario, tmp_path, monkeypatch):
+    """O texto das páginas fica ao lado do PDF e é reaproveitado depois de fechado"""
+    monkeypatch.chdir(tmp_path / '..')
+    assert localizar_paginas(anuario, ['feminicídio', 'unidades da federação']) == '2'
+    assert os.path.exists(tmp_path / ARQUIVO_CACHE_PAGINAS)
+    assert not os.path.exists('dados')
+    
+    fechar_documentos()
+    documento = abrir_pdf(anuario)
+    assert documento.localizar(['federação'], todos=False) == [2, 3]
+    assert documento._leitor is None
+    
+    pasta_cache = tmp_path / 'cache'
+    assert localizar_paginas(anuario, ['municipio'], pasta_cache=str(pasta_cache)) == '4'
+    assert os.path.exists(pasta_cache / ARQUIVO_CACHE_PAGINAS)
+
+
+def test_fechar_documentos(anuario):
+    """Mapeamento, arquivo e cache próprio são fechados"""
+    documento = abrir_pdf(anuario)
+    assert len(documento) == len(TEXTOS_PAGINAS)
+    
+    fechar_documentos([anuario])
+    assert paginas_pdf._documentos == {}
+    assert documento._mapa is None and documento._arquivo.closed
+    assert documento.cache.conexao is None
+    assert abrir_pdf(anuario) is not documento
+
+
+def test_extrator_envia_ao_tabula_so_as_paginas_localizadas(anuario, monkeypatch):
+    """Com termos_paginas, o tabula recebe só as páginas com os termos, e o PDF é fechado"""
+    chamadas = []
+    monkeypatch.setattr(tabula, 'read_pdf',
+                        lambda *args, **kwargs: chamadas.append(kwargs['pages']) or [])
+    extrator = ExtratorDadosPDF(termos_paginas=['unidades da federação'])
+    
+    assert extrator.extrair_tabelas_do_pdf(anuario) == []
+    assert set(chamadas) == {'2-3'}
+    assert paginas_pdf._documentos == {}
+    
+    chamadas.clear()
+    extrator = ExtratorDadosPDF(termos_paginas=['homicídio'])
+    assert extrator.extrair_tabelas_do_pdf(anuario) == []
+    assert chamadas == []
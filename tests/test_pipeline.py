@@ -0,0 +1,42 @@
+"""Testes do pipeline com cache"""
+
+import pandas as pd
+
+from pipeline import Pipeline
+
+_chamadas = []
+
+
+def _leitura_que_falha():
+    _chamadas.append('leitura')
+    return pd.DataFrame()
+
+
+def _relatorio_que_falha(df):
+    _chamadas.append('relatorio')
+    return ""
+
+
+def _leitura():
+    _chamadas.append('leitura')
+    return pd.DataFrame({'Valor': [1.0]})
+
+
+def test_resultados_vazios_nao_ficam_em_cache(tmp_path):
+    """Etapas que falharam ('' ou DataFrame vazio) rodam de novo na execução seguinte"""
+    _chamadas.clear()
+    for _ in range(2):
+        pipeline = Pipeline(pasta_cache=str(tmp_path), max_processos=1)
+        pipeline.etapa('dados', _leitura_que_falha)
+        pipeline.etapa('relatorio', _relatorio_que_falha, dependencias=['dados'])
+        pipeline.executar()
+        assert pipeline.etapas_em_cache == []
+    assert _chamadas == ['leitura', 'relatorio'] * 2
+    
+    _chamadas.clear()
+    for _ in range(2):
+        pipeline = Pipeline(pasta_cache=str(tmp_path), max_processos=1)
+        pipeline.etapa('dados', _leitura)
+        pipeline.executar()
+    assert _chamadas == ['leitura']
+    assert pipeline.etapas_em_cache == ['dados']
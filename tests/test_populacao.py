@@ -0,0 +1,21 @@
+"""Testes da população de referência"""
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_populacao_sintetica
+from populacao import ReferenciaPopulacional, carregar_populacao
+
+
+def test_populacao_sintetica_serve_de_referencia(tmp_path):
+    """A população sintética (direta ou pelo CSV) monta a referência das taxas"""
+    df = gerar_populacao_sintetica(['Acre', 'Amazonas'], anos=(2010, 2022))
+    arquivo = tmp_path / 'populacao.csv'
+    df.to_csv(arquivo, index=False)
+    
+    for populacao in (df, carregar_populacao(str(arquivo))):
+        referencia = ReferenciaPopulacional(populacao)
+        chaves = pd.DataFrame({'Estado': ['Acre', 'Amazonas']})
+        esperado = df[df['Ano'] == 2022].set_index('Estado').loc[['Acre', 'Amazonas'],
+                                                                 'População']
+        np.testing.assert_allclose(referencia.consultar(chaves, [2022, 2022]), esperado)